@@ -5,11 +5,16 @@
 Create SQLite database and insert test data for laihdutanyt app.
 python3 create_db.py
 This script creates schema and inserts a test user and test admin and one example food.
+SCHEMA is the original layout; create_db migrates it to the current schema
+version (migrations/run_migrations.py) before inserting anything.
 """
 import os
 import sqlite3
 import uuid
-import hashlib
+
+from migrations import add_dietary_periods, migrate_to_v2_1
+from migrations.run_migrations import run_migrations
+from repositories.credentials import hash_password
 
 DB_DIR = os.path.join(os.path.dirname(__file__), "data")
 DB_PATH = os.path.join(DB_DIR, "laihdutanyt.db")
@@ -52,6 +57,7 @@ CREATE TABLE IF NOT EXISTS food (
     protein_per_portion REAL,
     fat_per_portion REAL
 );
+CREATE INDEX IF NOT EXISTS idx_food_name ON food(name);
 
 -- FOODLOG
 CREATE TABLE IF NOT EXISTS foodlog (
@@ -71,6 +77,7 @@ CREATE TABLE IF NOT EXISTS activity (
     unit TEXT,
     kcal_per_unit REAL
 );
+CREATE INDEX IF NOT EXISTS idx_activity_name ON activity(name);
 
 -- ACTIVITYLOG
 CREATE TABLE IF NOT EXISTS activitylog (
@@ -84,6 +91,31 @@ CREATE TABLE IF NOT EXISTS activitylog (
     FOREIGN KEY(activity_id) REFERENCES activity(activity_id) ON DELETE SET NULL
 );
 
+-- Covering indexes for the per-user, per-date dashboard queries
+CREATE INDEX IF NOT EXISTS idx_foodlog_user_date
+    ON foodlog(user_id, date, food_id, portion_size_g);
+CREATE INDEX IF NOT EXISTS idx_activitylog_user_date
+    ON activitylog(user_id, date, activity_id, activity_count, kcal_burned);
+-- Keyset pagination of a user's history by (date, log_id)
+CREATE INDEX IF NOT EXISTS idx_foodlog_user_date_log ON foodlog(user_id, date, log_id);
+CREATE INDEX IF NOT EXISTS idx_activitylog_user_date_log ON activitylog(user_id, date, log_id);
+
+-- PLANNED LOGS (recurring entries, copied into the logs up to a horizon)
+CREATE TABLE IF NOT EXISTS planned_log (
+    plan_id TEXT PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    kind TEXT NOT NULL CHECK (kind IN ('food', 'activity')),
+    item_id TEXT NOT NULL,
+    amount REAL NOT NULL,
+    rule TEXT NOT NULL,
+    start_date TEXT NOT NULL,
+    end_date TEXT,
+    materialized_through TEXT,
+    created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY(user_id) REFERENCES "user"(user_id) ON DELETE CASCADE
+);
+CREATE INDEX IF NOT EXISTS idx_planned_log_user_kind ON planned_log(user_id, kind);
+
 -- STATISTICS (aggregated)
 CREATE TABLE IF NOT EXISTS statistics (
     stats_id TEXT PRIMARY KEY,
@@ -128,17 +160,32 @@ CREATE TABLE IF NOT EXISTS user_constraint (
 def ensure_dir(path):
     os.makedirs(path, exist_ok=True)
 
-def _hash_password(password: str, salt: bytes, iterations: int = 100_000) -> str:
-    dk = hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt, iterations)
-    return dk.hex()
+def migrate_schema(path: str):
+    """Bring a database created from SCHEMA to the current schema version"""
+    # weightlog and dietary_period come from these unversioned migrations
+    migrate_to_v2_1.migrate_database(path)
+    add_dietary_periods.add_dietary_periods_table(path)
+    run_migrations(path)
+
+
+def create_db(path: str = DB_PATH, insert_test: bool = True, migrate: bool = True):
+    """
+    Create the database at path (or complete an existing one).
 
-def create_db(path: str = DB_PATH, insert_test: bool = True):
+    Args:
+        path: SQLite database file
+        insert_test: Insert the test user, admin, food and activity
+        migrate: Migrate to the current schema version; False leaves the
+            version 0 layout of SCHEMA (e.g. to benchmark the migrations)
+    """
     ensure_dir(os.path.dirname(path))
     conn = sqlite3.connect(path)
     try:
         cur = conn.cursor()
         cur.executescript(SCHEMA)
         conn.commit()
+        if migrate:
+            migrate_schema(path)
         print(f"Database created/updated at: {path}")
 
         if insert_test:
@@ -153,25 +200,23 @@ def create_db(path: str = DB_PATH, insert_test: bool = True):
             cur.execute('SELECT 1 FROM "user" WHERE username = ?', (test_username,))
             if not cur.fetchone():
                 user_id = str(uuid.uuid4())
-                salt = os.urandom(16)
-                pwd_hash = _hash_password(test_password, salt)
+                pwd_hash, salt = hash_password(test_password)
                 cur.execute("""
                     INSERT INTO "user" (
                         user_id, username, password_hash, salt, weight, length, age, activity_level, allergies, kcal_min, kcal_max, weight_loss_target
                     ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?,?)
-                """, (user_id, test_username, pwd_hash, salt.hex(), 80.0, 175.0, 35, 2, "Citrus", 1500, 2500, 5))
+                """, (user_id, test_username, pwd_hash, salt, 80.0, 175.0, 35, 2, "Citrus", 1500, 2500, 5))
                 print(f"Inserted test user: username='{test_username}', password='{test_password}'")
 
             # Check and insert test admin
             cur.execute("SELECT 1 FROM admin WHERE username = ?", (test_admin,))
             if not cur.fetchone():
                 admin_id = str(uuid.uuid4())
-                salt = os.urandom(16)
-                pwd_hash = _hash_password(test_admin_pw, salt)
+                pwd_hash, salt = hash_password(test_admin_pw)
                 cur.execute("""
                     INSERT INTO admin (admin_id, username, password_hash, salt)
                     VALUES (?, ?, ?, ?)
-                """, (admin_id, test_admin, pwd_hash, salt.hex()))
+                """, (admin_id, test_admin, pwd_hash, salt))
                 print(f"Inserted test admin: username='{test_admin}', password='{test_admin_pw}'")
 
             # Insert a sample food row
@@ -6,6 +6,8 @@ Refactored version with layered architecture
 import os
 from tkinter import messagebox
 from ui.app import LaihdutanytApp
+from repositories.connection_pool import close_all_pools
+from migrations.run_migrations import run_migrations
 
 BASE_DIR = os.path.dirname(__file__)
 DB_PATH = os.path.join(BASE_DIR, "data", "laihdutanyt.db")
@@ -19,8 +21,14 @@ def main():
         )
         return
     
+    # Bring older databases up to the current schema version
+    run_migrations(DB_PATH)
+    
     app = LaihdutanytApp(DB_PATH)
-    app.mainloop()
+    try:
+        app.mainloop()
+    finally:
+        close_all_pools()
 
 if __name__ == "__main__":
     main()
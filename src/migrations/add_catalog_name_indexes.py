@@ -0,0 +1,78 @@
+"""
+Database migration: Name indexes for the food and activity catalogs
+Schema version: 4
+
+The CSV import upserts catalog rows by name (UPDATE ... WHERE name = ? and
+INSERT ... WHERE NOT EXISTS name), and the catalog lists are ordered by
+name. Without an index every imported row scans the whole catalog.
+
+Run with: poetry run python src/migrations/add_catalog_name_indexes.py
+"""
+
+import os
+import sqlite3
+
+SCHEMA_VERSION = 4
+
+INDEXES = {
+    'idx_food_name': "CREATE INDEX IF NOT EXISTS idx_food_name ON food(name)",
+    'idx_activity_name': "CREATE INDEX IF NOT EXISTS idx_activity_name ON activity(name)",
+}
+
+
+def migrate_database(db_path: str):
+    """Create the name indexes and bump the schema version"""
+    conn = sqlite3.connect(db_path)
+    try:
+        cur = conn.cursor()
+
+        print(f"Starting database migration to schema version {SCHEMA_VERSION}...")
+
+        for name, ddl in INDEXES.items():
+            cur.execute(ddl)
+            print(f"  ✓ Index {name} ready")
+
+        cur.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+        conn.commit()
+        print("✓ Migration completed successfully!")
+
+    except Exception as e:
+        conn.rollback()
+        print(f"✗ Migration failed: {e}")
+        raise
+    finally:
+        conn.close()
+
+
+def verify_migration(db_path: str):
+    """Verify that name lookups use the new indexes"""
+    conn = sqlite3.connect(db_path)
+    try:
+        cur = conn.cursor()
+
+        print("\nVerifying query plans...")
+
+        for name, table in (('idx_food_name', 'food'), ('idx_activity_name', 'activity')):
+            cur.execute(f"EXPLAIN QUERY PLAN SELECT 1 FROM {table} WHERE name = ?", ('',))
+            plan = "\n".join(row[3] for row in cur.fetchall())
+            assert name in plan, f"name lookup on {table} does not use {name}:\n{plan}"
+            print(f"  ✓ {table}: {plan.strip()}")
+
+        print("✓ Migration verification passed!")
+
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    DB_DIR = os.path.join(os.path.dirname(__file__), "..", "data")
+    DB_PATH = os.path.join(DB_DIR, "laihdutanyt.db")
+
+    if not os.path.exists(DB_PATH):
+        print(f"Database not found at {DB_PATH}")
+        print("Please run create_db.py first")
+        exit(1)
+
+    migrate_database(DB_PATH)
+    verify_migration(DB_PATH)
@@ -0,0 +1,121 @@
+"""
+Database migration: Full-text search for the food and activity catalogs
+Schema version: 3
+
+FoodRepository.find_by_name and ActivityRepository.find_by_name filter with
+LIKE '%name%', which cannot use an index and scans the whole catalog. This
+migration adds FTS5 tables with the trigram tokenizer (substring matching,
+case-insensitive) and triggers that keep them in sync with `food` and
+`activity`. The search() repository methods query these tables.
+
+The catalog ids are TEXT keys, so the FTS rows carry the id in an UNINDEXED
+column instead of relying on the implicit rowid (VACUUM may renumber it).
+
+Run with: poetry run python src/migrations/add_catalog_search.py
+"""
+
+import os
+import sqlite3
+
+SCHEMA_VERSION = 3
+
+# (catalog table, FTS table, id column)
+SEARCH_TABLES = [
+    ('food', 'food_fts', 'food_id'),
+    ('activity', 'activity_fts', 'activity_id'),
+]
+
+
+def search_ddl(table: str, fts_table: str, id_column: str) -> list:
+    """FTS table, sync triggers and initial fill for one catalog table"""
+    return [
+        f"""
+        CREATE VIRTUAL TABLE IF NOT EXISTS {fts_table}
+        USING fts5(name, {id_column} UNINDEXED, tokenize = 'trigram')
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_{table}_fts_insert
+        AFTER INSERT ON {table}
+        BEGIN
+            INSERT INTO {fts_table} (name, {id_column}) VALUES (NEW.name, NEW.{id_column});
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_{table}_fts_delete
+        AFTER DELETE ON {table}
+        BEGIN
+            DELETE FROM {fts_table} WHERE {id_column} = OLD.{id_column};
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_{table}_fts_update
+        AFTER UPDATE OF name, {id_column} ON {table}
+        BEGIN
+            DELETE FROM {fts_table} WHERE {id_column} = OLD.{id_column};
+            INSERT INTO {fts_table} (name, {id_column}) VALUES (NEW.name, NEW.{id_column});
+        END
+        """,
+        f"DELETE FROM {fts_table}",
+        f"INSERT INTO {fts_table} (name, {id_column}) SELECT name, {id_column} FROM {table}",
+    ]
+
+
+def migrate_database(db_path: str):
+    """Create the search tables and bump the schema version"""
+    conn = sqlite3.connect(db_path)
+    try:
+        cur = conn.cursor()
+
+        print(f"Starting database migration to schema version {SCHEMA_VERSION}...")
+
+        for table, fts_table, id_column in SEARCH_TABLES:
+            for ddl in search_ddl(table, fts_table, id_column):
+                cur.execute(ddl)
+            print(f"  ✓ Search table {fts_table} filled and synced with {table}")
+
+        cur.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+        conn.commit()
+        print("✓ Migration completed successfully!")
+
+    except Exception as e:
+        conn.rollback()
+        print(f"✗ Migration failed: {e}")
+        raise
+    finally:
+        conn.close()
+
+
+def verify_migration(db_path: str):
+    """Verify that every catalog row is searchable"""
+    conn = sqlite3.connect(db_path)
+    try:
+        cur = conn.cursor()
+
+        print("\nVerifying migration...")
+
+        for table, fts_table, id_column in SEARCH_TABLES:
+            cur.execute(f"SELECT COUNT(*) FROM {table}")
+            rows = cur.fetchone()[0]
+            cur.execute(f"SELECT COUNT(*) FROM {fts_table}")
+            indexed = cur.fetchone()[0]
+            assert rows == indexed, f"{fts_table} has {indexed} rows, {table} has {rows}"
+            print(f"  ✓ {fts_table}: {indexed} rows indexed")
+
+        print("✓ Migration verification passed!")
+
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    DB_DIR = os.path.join(os.path.dirname(__file__), "..", "data")
+    DB_PATH = os.path.join(DB_DIR, "laihdutanyt.db")
+
+    if not os.path.exists(DB_PATH):
+        print(f"Database not found at {DB_PATH}")
+        print("Please run create_db.py first")
+        exit(1)
+
+    migrate_database(DB_PATH)
+    verify_migration(DB_PATH)
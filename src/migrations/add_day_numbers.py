@@ -0,0 +1,237 @@
+"""
+Database migration: Integer day numbers for dated rows
+Schema version: 8
+
+Dates are stored as YYYY-MM-DD text. Range filters compared strings and
+the services parsed them back into dates per row, e.g. to bucket weigh-ins
+by week or to measure a period. This migration adds a generated column with
+the day number (days since 1970-01-01, see repositories/day_numbers.py):
+
+- foodlog.day, activitylog.day, weightlog.day
+- dietary_period.start_day and dietary_period.end_day
+
+The columns are VIRTUAL generated columns, so SQLite derives them from the
+date on every insert and update and no writer has to set them. The values
+are stored only in the new indexes.
+
+foodlog and activitylog get no day index: SQLite never answers a query from
+an index alone when it reads a generated column, so the per-day sums stay on
+the covering (user_key, date, ...) indexes and compute the day from the date
+(repositories/day_numbers.day_sql). A second, non-covering index would only
+cost on every write; one left by an earlier run of this migration is dropped.
+
+A date SQLite cannot read (e.g. an unpadded 2026-1-5) gives a NULL day and
+the row would drop out of every day range. Such dates are rewritten in
+YYYY-MM-DD form where the numbers make a valid date, and triggers reject
+new ones on the log tables (the services normalize dates before writing,
+see repositories/day_numbers.normalize_date).
+
+weightlog and dietary_period are created by unversioned migrations and are
+skipped when they do not exist yet.
+
+Run with: poetry run python src/migrations/add_day_numbers.py
+"""
+
+import os
+import sqlite3
+from datetime import date
+from typing import Optional
+
+SCHEMA_VERSION = 8
+
+# Whole days since 1970-01-01; NULL for a NULL or malformed date
+DAY_EXPRESSION = "CAST(julianday({column}) - 2440587.5 AS INTEGER)"
+
+# table -> {day column: date column}
+DAY_COLUMNS = {
+    'foodlog': {'day': 'date'},
+    'activitylog': {'day': 'date'},
+    'weightlog': {'day': 'date'},
+    'dietary_period': {'start_day': 'start_date', 'end_day': 'end_date'},
+}
+
+# index name -> (table, indexed columns)
+INDEXES = {
+    'idx_weightlog_user_day': ('weightlog', 'user_id, day'),
+    'idx_dietary_period_user_days': ('dietary_period', 'user_id, start_day, end_day'),
+}
+
+SUPERSEDED_INDEXES = ('idx_foodlog_user_day', 'idx_activitylog_user_day')
+
+# Log tables whose inserts and date updates must have a YYYY-MM-DD date
+CHECKED_TABLES = ('foodlog', 'activitylog', 'weightlog')
+
+
+def date_check_ddl(table: str) -> list:
+    """CREATE TRIGGER statements rejecting dates that are not YYYY-MM-DD"""
+    # NULL for a malformed date; a day past the month's end (2025-02-30) is
+    # read as a day of the next month and does not round-trip either
+    condition = "date(julianday(NEW.date)) IS NOT NEW.date"
+    return [
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_{table}_date_insert
+        BEFORE INSERT ON {table}
+        WHEN {condition}
+        BEGIN
+            SELECT RAISE(ABORT, 'Invalid {table} date, use YYYY-MM-DD');
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_{table}_date_update
+        BEFORE UPDATE OF date ON {table}
+        WHEN {condition}
+        BEGIN
+            SELECT RAISE(ABORT, 'Invalid {table} date, use YYYY-MM-DD');
+        END
+        """,
+    ]
+
+
+def repaired_date(text: str) -> Optional[str]:
+    """YYYY-MM-DD form of an unpadded or over-padded date, None if it is not a date"""
+    # Same rules as repositories/day_numbers.normalize_date
+    parts = text.strip().split("-")
+    if len(parts) != 3 or not all(part.isdigit() for part in parts):
+        return None
+    try:
+        return date(*(int(part) for part in parts)).isoformat()
+    except ValueError:
+        return None
+
+
+def repair_dates(cur: sqlite3.Cursor, table: str, date_column: str) -> int:
+    """
+    Rewrite the dates that are not in YYYY-MM-DD form (no or a wrong day number).
+
+    Returns:
+        Number of rows whose date could not be repaired
+    """
+    cur.execute(f"SELECT rowid, {date_column} FROM {table} "
+                f"WHERE {date_column} IS NOT NULL AND date(julianday({date_column})) IS NOT {date_column}")
+    unrepaired = 0
+    for rowid, text in cur.fetchall():
+        repaired = repaired_date(str(text))
+        if repaired is None:
+            unrepaired += 1
+            continue
+        cur.execute(f"UPDATE {table} SET {date_column} = ? WHERE rowid = ?", (repaired, rowid))
+        print(f"  ✓ {table}.{date_column} '{text}' repaired as {repaired}")
+    return unrepaired
+
+
+def migrate_database(db_path: str):
+    """Add the day number columns with their indexes and bump the schema version"""
+    conn = sqlite3.connect(db_path)
+    try:
+        cur = conn.cursor()
+
+        print(f"Starting database migration to schema version {SCHEMA_VERSION}...")
+
+        cur.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+        tables = {row[0] for row in cur.fetchall()}
+        for table, columns in DAY_COLUMNS.items():
+            if table not in tables:
+                print(f"  - Table {table} not found, skipping")
+                continue
+            # table_xinfo lists generated columns too
+            cur.execute(f"PRAGMA table_xinfo({table})")
+            existing = {row[1] for row in cur.fetchall()}
+            for day_column, date_column in columns.items():
+                if day_column in existing:
+                    continue
+                cur.execute(f"""
+                    ALTER TABLE {table} ADD COLUMN {day_column} INTEGER
+                    GENERATED ALWAYS AS ({DAY_EXPRESSION.format(column=date_column)}) VIRTUAL
+                """)
+                print(f"  ✓ Column {table}.{day_column} added")
+            for day_column, date_column in columns.items():
+                unrepaired = repair_dates(cur, table, date_column)
+                if unrepaired:
+                    print(f"  - {unrepaired} {table} rows have a {date_column} that is not a date (no {day_column})")
+
+        for table in CHECKED_TABLES:
+            if table not in tables:
+                continue
+            for ddl in date_check_ddl(table):
+                cur.execute(ddl)
+            print(f"  ✓ Date check triggers on {table} ready")
+
+        for name, (table, columns) in INDEXES.items():
+            if table not in tables:
+                continue
+            cur.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {table}({columns})")
+            print(f"  ✓ Index {name} ready")
+        for name in SUPERSEDED_INDEXES:
+            cur.execute(f"DROP INDEX IF EXISTS {name}")
+
+        cur.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+        conn.commit()
+        print("✓ Migration completed successfully!")
+
+    except Exception as e:
+        conn.rollback()
+        print(f"✗ Migration failed: {e}")
+        raise
+    finally:
+        conn.close()
+
+
+def verify_migration(db_path: str):
+    """Verify that the day numbers match the dates"""
+    conn = sqlite3.connect(db_path)
+    try:
+        cur = conn.cursor()
+
+        print("\nVerifying migration...")
+
+        cur.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+        tables = {row[0] for row in cur.fetchall()}
+        for table, columns in DAY_COLUMNS.items():
+            if table not in tables:
+                continue
+            for day_column, date_column in columns.items():
+                cur.execute(f"""
+                    SELECT COUNT(*) FROM {table}
+                    WHERE {day_column} IS NOT NULL
+                      AND date({day_column} * 86400, 'unixepoch') IS NOT {date_column}
+                """)
+                mismatches = cur.fetchone()[0]
+                assert mismatches == 0, f"{mismatches} {table} rows have a wrong {day_column}"
+                cur.execute(f"SELECT COUNT(*) FROM {table} "
+                            f"WHERE {date_column} IS NOT NULL AND date(julianday({date_column})) IS NOT {date_column}")
+                malformed = cur.fetchone()[0]
+                if malformed:
+                    print(f"  - {malformed} {table} rows have a malformed {date_column} (no {day_column})")
+            print(f"  ✓ {table} day numbers match the dates")
+
+        for table in CHECKED_TABLES:
+            if table not in tables:
+                continue
+            cur.execute("SELECT COUNT(*) FROM sqlite_master WHERE type = 'trigger' AND name LIKE ?",
+                        (f"trg_{table}_date_%",))
+            assert cur.fetchone()[0] == 2, f"Date check triggers on {table} not found"
+        print("  ✓ Date check triggers exist")
+
+        cur.execute("SELECT name FROM sqlite_master WHERE type = 'index'")
+        indexes = {row[0] for row in cur.fetchall()}
+        for name in SUPERSEDED_INDEXES:
+            assert name not in indexes, f"Index {name} not dropped"
+
+        print("✓ Migration verification passed!")
+
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    DB_DIR = os.path.join(os.path.dirname(__file__), "..", "data")
+    DB_PATH = os.path.join(DB_DIR, "laihdutanyt.db")
+
+    if not os.path.exists(DB_PATH):
+        print(f"Database not found at {DB_PATH}")
+        print("Please run create_db.py first")
+        exit(1)
+
+    migrate_database(DB_PATH)
+    verify_migration(DB_PATH)
@@ -11,11 +11,11 @@ from pathlib import Path
 DB_PATH = Path(__file__).parent.parent / 'data' / 'laihdutanyt.db'
 
 
-def add_dietary_periods_table():
+def add_dietary_periods_table(db_path=DB_PATH):
     """Add dietary_period table to database"""
     print("Adding dietary_period table...")
     
-    conn = sqlite3.connect(DB_PATH)
+    conn = sqlite3.connect(db_path)
     cur = conn.cursor()
     
     # Create dietary_period table
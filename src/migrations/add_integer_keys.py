@@ -0,0 +1,348 @@
+"""
+Database migration: Integer surrogate keys for users, catalogs and logs
+Schema version: 7
+
+Every key used to be a 36-character UUID string. foodlog and activitylog
+repeated the user and catalog UUIDs in every row and again in each of their
+indexes, so most of their pages held copies of the same strings, and each
+join compared text.
+
+This migration gives "user", food and activity an INTEGER PRIMARY KEY
+(<name>_key, an alias of the rowid, so existing rowids are kept) and turns
+the UUID into a UNIQUE column. foodlog and activitylog are rebuilt with
+integer user_key/food_key/activity_key foreign keys instead of the UUIDs,
+copied in (user, date) order. log_id stays the external UUID of a log, so
+the repositories keep their UUID-based API and resolve keys in SQL.
+
+The statistics triggers are re-created for the keyed columns; the
+statistics table itself keeps user_id.
+
+Benchmark: poetry run python src/scripts/benchmark_keys.py
+Run with: poetry run python src/migrations/add_integer_keys.py
+"""
+
+import os
+import re
+import sqlite3
+
+SCHEMA_VERSION = 7
+
+# Parent table -> (UUID column, new integer key column)
+PARENT_KEYS = {
+    'user': ('user_id', 'user_key'),
+    'food': ('food_id', 'food_key'),
+    'activity': ('activity_id', 'activity_key'),
+}
+
+FOODLOG_DDL = """
+CREATE TABLE foodlog_new (
+    log_key INTEGER PRIMARY KEY,
+    log_id TEXT NOT NULL UNIQUE,
+    user_key INTEGER NOT NULL,
+    food_key INTEGER,
+    date TEXT NOT NULL,
+    portion_size_g REAL,
+    FOREIGN KEY(user_key) REFERENCES "user"(user_key) ON DELETE CASCADE,
+    FOREIGN KEY(food_key) REFERENCES food(food_key) ON DELETE SET NULL
+)
+"""
+
+ACTIVITYLOG_DDL = """
+CREATE TABLE activitylog_new (
+    log_key INTEGER PRIMARY KEY,
+    log_id TEXT NOT NULL UNIQUE,
+    user_key INTEGER NOT NULL,
+    activity_key INTEGER,
+    date TEXT NOT NULL,
+    activity_count REAL,
+    kcal_burned REAL,
+    FOREIGN KEY(user_key) REFERENCES "user"(user_key) ON DELETE CASCADE,
+    FOREIGN KEY(activity_key) REFERENCES activity(activity_key) ON DELETE SET NULL
+)
+"""
+
+# Logs of users that no longer exist are dropped; a missing catalog row becomes NULL
+FOODLOG_COPY = """
+INSERT INTO foodlog_new (log_id, user_key, food_key, date, portion_size_g)
+SELECT fl.log_id, u.user_key, f.food_key, fl.date, fl.portion_size_g
+FROM foodlog fl
+JOIN "user" u ON u.user_id = fl.user_id
+LEFT JOIN food f ON f.food_id = fl.food_id
+ORDER BY u.user_key, fl.date, fl.log_id
+"""
+
+ACTIVITYLOG_COPY = """
+INSERT INTO activitylog_new (log_id, user_key, activity_key, date, activity_count, kcal_burned)
+SELECT al.log_id, u.user_key, a.activity_key, al.date, al.activity_count, al.kcal_burned
+FROM activitylog al
+JOIN "user" u ON u.user_id = al.user_id
+LEFT JOIN activity a ON a.activity_id = al.activity_id
+ORDER BY u.user_key, al.date, al.log_id
+"""
+
+# table -> (rebuild DDL, copy statement)
+LOG_TABLES = {
+    'foodlog': (FOODLOG_DDL, FOODLOG_COPY),
+    'activitylog': (ACTIVITYLOG_DDL, ACTIVITYLOG_COPY),
+}
+
+# Same index names as before (covering dashboard index + keyset index), now on integer keys
+LOG_INDEXES = {
+    'idx_foodlog_user_date': 'foodlog(user_key, date, food_key, portion_size_g)',
+    'idx_foodlog_user_date_log': 'foodlog(user_key, date, log_id)',
+    'idx_activitylog_user_date': 'activitylog(user_key, date, activity_key, activity_count, kcal_burned)',
+    'idx_activitylog_user_date_log': 'activitylog(user_key, date, log_id)',
+}
+
+
+def keyed_table_sql(create_sql: str, table: str) -> str:
+    """
+    Rewrite a parent table's CREATE TABLE for the keyed layout.
+
+    Args:
+        create_sql: The table's current sql from sqlite_master
+        table: Key of PARENT_KEYS
+
+    Returns:
+        CREATE TABLE <table>_new with <name>_key INTEGER PRIMARY KEY and
+        the UUID column as TEXT NOT NULL UNIQUE
+    """
+    id_column, key_column = PARENT_KEYS[table]
+    sql, replaced = re.subn(
+        rf'\b{id_column}\s+TEXT\s+PRIMARY\s+KEY',
+        f'{key_column} INTEGER PRIMARY KEY,\n    {id_column} TEXT NOT NULL UNIQUE',
+        create_sql, count=1, flags=re.IGNORECASE
+    )
+    if not replaced:
+        raise ValueError(f"{table}.{id_column} is not a TEXT PRIMARY KEY")
+    return re.sub(r'^\s*CREATE\s+TABLE\s+(IF\s+NOT\s+EXISTS\s+)?("\w+"|\w+)',
+                  f'CREATE TABLE {table}_new', sql, count=1, flags=re.IGNORECASE)
+
+
+def refresh_day_sql(ref: str) -> str:
+    """
+    SQL that recomputes one statistics row inside a trigger (keyed layout).
+
+    Args:
+        ref: 'NEW' or 'OLD' - which row version names the affected day
+
+    Returns:
+        Upsert + cleanup statements for the (user_key, date) of that row
+    """
+    return f"""
+        INSERT INTO statistics (
+            stats_id, user_id, date,
+            total_kcal_consumed, total_carbs_g, total_protein_g, total_fat_g, food_entries_count,
+            total_kcal_burned, activity_entries_count, net_kcal
+        )
+        SELECT lower(hex(randomblob(16))), u.user_id, {ref}.date,
+               ft.kcal, ft.carbs, ft.protein, ft.fat, ft.entries,
+               at.kcal, at.entries, ft.kcal - at.kcal
+        FROM "user" u, (
+            SELECT COALESCE(SUM((fl.portion_size_g / 100.0) * COALESCE(f.kcal_per_portion, 0.0)), 0.0) AS kcal,
+                   COALESCE(SUM((fl.portion_size_g / 100.0) * COALESCE(f.carbs_per_portion, 0.0)), 0.0) AS carbs,
+                   COALESCE(SUM((fl.portion_size_g / 100.0) * COALESCE(f.protein_per_portion, 0.0)), 0.0) AS protein,
+                   COALESCE(SUM((fl.portion_size_g / 100.0) * COALESCE(f.fat_per_portion, 0.0)), 0.0) AS fat,
+                   COUNT(*) AS entries
+            FROM foodlog fl
+            LEFT JOIN food f ON f.food_key = fl.food_key
+            WHERE fl.user_key = {ref}.user_key AND fl.date = {ref}.date
+        ) ft, (
+            SELECT COALESCE(SUM(COALESCE(al.kcal_burned, 0.0)), 0.0) AS kcal,
+                   COUNT(*) AS entries
+            FROM activitylog al
+            WHERE al.user_key = {ref}.user_key AND al.date = {ref}.date
+        ) at
+        WHERE u.user_key = {ref}.user_key
+        ON CONFLICT(user_id, date) DO UPDATE SET
+            total_kcal_consumed = excluded.total_kcal_consumed,
+            total_carbs_g = excluded.total_carbs_g,
+            total_protein_g = excluded.total_protein_g,
+            total_fat_g = excluded.total_fat_g,
+            food_entries_count = excluded.food_entries_count,
+            total_kcal_burned = excluded.total_kcal_burned,
+            activity_entries_count = excluded.activity_entries_count,
+            net_kcal = excluded.net_kcal;
+
+        DELETE FROM statistics
+        WHERE user_id = (SELECT user_id FROM "user" WHERE user_key = {ref}.user_key)
+          AND date = {ref}.date
+          AND food_entries_count = 0 AND activity_entries_count = 0
+          AND total_weight IS NULL;
+    """
+
+
+def trigger_ddl(table: str) -> list:
+    """CREATE TRIGGER statements keeping statistics in sync with one keyed log table"""
+    return [
+        f"""
+        CREATE TRIGGER trg_{table}_stats_insert
+        AFTER INSERT ON {table}
+        BEGIN
+            {refresh_day_sql('NEW')}
+        END
+        """,
+        f"""
+        CREATE TRIGGER trg_{table}_stats_delete
+        AFTER DELETE ON {table}
+        BEGIN
+            {refresh_day_sql('OLD')}
+        END
+        """,
+        # An edit may move a log to another day: refresh both days
+        f"""
+        CREATE TRIGGER trg_{table}_stats_update
+        AFTER UPDATE ON {table}
+        BEGIN
+            {refresh_day_sql('OLD')}
+            {refresh_day_sql('NEW')}
+        END
+        """,
+    ]
+
+
+def _dependent_sql(cur: sqlite3.Cursor, table: str) -> list:
+    """CREATE statements of the indexes and triggers defined on a table"""
+    cur.execute("""
+        SELECT sql FROM sqlite_master
+        WHERE tbl_name = ? AND type IN ('index', 'trigger') AND sql IS NOT NULL
+        ORDER BY type, name
+    """, (table,))
+    return [row[0] for row in cur.fetchall()]
+
+
+def _columns(cur: sqlite3.Cursor, table: str) -> list:
+    cur.execute(f'PRAGMA table_info("{table}")')
+    return [row[1] for row in cur.fetchall()]
+
+
+def migrate_database(db_path: str):
+    """Rebuild the parent and log tables with integer keys"""
+    conn = sqlite3.connect(db_path)
+    try:
+        # Foreign keys cannot be switched inside a transaction; the tables are
+        # dropped and renamed one at a time, so checks must wait until the end
+        conn.execute("PRAGMA foreign_keys = OFF")
+        conn.isolation_level = None
+        cur = conn.cursor()
+        cur.execute("BEGIN IMMEDIATE")
+
+        print(f"Starting database migration to schema version {SCHEMA_VERSION}...")
+
+        # The statistics triggers name the old columns; re-created below
+        for table in LOG_TABLES:
+            for action in ('insert', 'delete', 'update'):
+                cur.execute(f"DROP TRIGGER IF EXISTS trg_{table}_stats_{action}")
+
+        for table in PARENT_KEYS:
+            cur.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (table,))
+            create_sql = cur.fetchone()[0]
+            dependents = _dependent_sql(cur, table)
+            columns = ', '.join(f'"{c}"' for c in _columns(cur, table))
+            id_column, key_column = PARENT_KEYS[table]
+
+            cur.execute(keyed_table_sql(create_sql, table))
+            cur.execute(f'INSERT INTO {table}_new ({key_column}, {columns}) '
+                        f'SELECT rowid, {columns} FROM "{table}"')
+            cur.execute(f'DROP TABLE "{table}"')
+            cur.execute(f'ALTER TABLE {table}_new RENAME TO "{table}"')
+            for sql in dependents:
+                cur.execute(sql)
+            print(f"  ✓ {table}: {key_column} INTEGER PRIMARY KEY, {id_column} UNIQUE")
+
+        for table, (ddl, copy) in LOG_TABLES.items():
+            cur.execute(f"SELECT COUNT(*) FROM {table}")
+            before = cur.fetchone()[0]
+            cur.execute(ddl)
+            cur.execute(copy)
+            cur.execute(f"SELECT COUNT(*) FROM {table}_new")
+            after = cur.fetchone()[0]
+            cur.execute(f"DROP TABLE {table}")
+            cur.execute(f"ALTER TABLE {table}_new RENAME TO {table}")
+            print(f"  ✓ {table} rebuilt with integer keys ({after} rows)")
+            if before != after:
+                print(f"  ✓ Dropped {before - after} {table} rows of deleted users")
+
+        for name, target in LOG_INDEXES.items():
+            cur.execute(f"CREATE INDEX {name} ON {target}")
+        print(f"  ✓ {len(LOG_INDEXES)} log indexes re-created on integer keys")
+
+        for table in LOG_TABLES:
+            for ddl in trigger_ddl(table):
+                cur.execute(ddl)
+            print(f"  ✓ Statistics triggers on {table} re-created")
+
+        violations = []
+        for table in LOG_TABLES:
+            cur.execute(f"PRAGMA foreign_key_check({table})")
+            violations += cur.fetchall()
+        if violations:
+            raise sqlite3.IntegrityError(f"{len(violations)} foreign key violations, first: {violations[0]}")
+
+        cur.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        cur.execute("COMMIT")
+        print("✓ Migration completed successfully!")
+
+    except Exception as e:
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+        print(f"✗ Migration failed: {e}")
+        raise
+    finally:
+        conn.close()
+
+    # Reclaim the pages of the dropped text-keyed tables
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.execute("VACUUM")
+    finally:
+        conn.close()
+    print("  ✓ Database vacuumed")
+
+
+def verify_migration(db_path: str):
+    """Verify the keyed columns, indexes and triggers"""
+    conn = sqlite3.connect(db_path)
+    try:
+        cur = conn.cursor()
+
+        print("\nVerifying migration...")
+
+        for table, (id_column, key_column) in PARENT_KEYS.items():
+            cur.execute(f'PRAGMA table_info("{table}")')
+            pk = [row[1] for row in cur.fetchall() if row[5]]
+            assert pk == [key_column], f"{table} primary key is {pk}"
+        print("  ✓ Parent tables have integer primary keys")
+
+        for table, key_column in (('foodlog', 'food_key'), ('activitylog', 'activity_key')):
+            columns = set(_columns(cur, table))
+            assert {'log_id', 'user_key', key_column} <= columns, f"{table} columns: {columns}"
+            assert 'user_id' not in columns, f"{table} still has user_id"
+        print("  ✓ Log tables reference integer keys")
+
+        for name in LOG_INDEXES:
+            cur.execute("SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = ?", (name,))
+            assert cur.fetchone(), f"Index {name} not found"
+        print(f"  ✓ {len(LOG_INDEXES)} log indexes exist")
+
+        cur.execute("SELECT COUNT(*) FROM sqlite_master WHERE type='trigger' AND name LIKE 'trg_%_stats_%'")
+        assert cur.fetchone()[0] == 6, "statistics triggers missing"
+        print("  ✓ 6 statistics triggers exist")
+
+        print("✓ Migration verification passed!")
+
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    DB_DIR = os.path.join(os.path.dirname(__file__), "..", "data")
+    DB_PATH = os.path.join(DB_DIR, "laihdutanyt.db")
+
+    if not os.path.exists(DB_PATH):
+        print(f"Database not found at {DB_PATH}")
+        print("Please run create_db.py first")
+        exit(1)
+
+    migrate_database(DB_PATH)
+    verify_migration(DB_PATH)
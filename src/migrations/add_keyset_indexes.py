@@ -0,0 +1,98 @@
+"""
+Database migration: Keyset pagination indexes for the history tables
+Schema version: 5
+
+The log windows and exports page through a user's history ordered by
+(date, log_id) and continue after the last key they saw. The existing
+(user_id, date, ...) indexes only order by date, so SQLite sorted every
+date group in a temp b-tree. These indexes end with the row id, making each
+page a plain index range scan.
+
+weightlog is created by an unversioned migration and is skipped when it
+does not exist yet. dietary_period needs no new index: a user has a handful
+of periods and idx_dietary_period_user_dates already narrows to them.
+
+Run with: poetry run python src/migrations/add_keyset_indexes.py
+"""
+
+import os
+import sqlite3
+
+SCHEMA_VERSION = 5
+
+# index name -> (table, indexed columns)
+INDEXES = {
+    'idx_foodlog_user_date_log': ('foodlog', 'user_id, date, log_id'),
+    'idx_activitylog_user_date_log': ('activitylog', 'user_id, date, log_id'),
+    'idx_weightlog_user_date_log': ('weightlog', 'user_id, date, log_id'),
+}
+
+
+def migrate_database(db_path: str):
+    """Create the keyset indexes and bump the schema version"""
+    conn = sqlite3.connect(db_path)
+    try:
+        cur = conn.cursor()
+
+        print(f"Starting database migration to schema version {SCHEMA_VERSION}...")
+
+        cur.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+        tables = {row[0] for row in cur.fetchall()}
+        for name, (table, columns) in INDEXES.items():
+            if table not in tables:
+                print(f"  - Table {table} not found, skipping {name}")
+                continue
+            cur.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {table}({columns})")
+            print(f"  ✓ Index {name} ready")
+
+        cur.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+        conn.commit()
+        print("✓ Migration completed successfully!")
+
+    except Exception as e:
+        conn.rollback()
+        print(f"✗ Migration failed: {e}")
+        raise
+    finally:
+        conn.close()
+
+
+def verify_migration(db_path: str):
+    """Verify that keyset pages are read in index order"""
+    conn = sqlite3.connect(db_path)
+    try:
+        cur = conn.cursor()
+
+        print("\nVerifying query plans...")
+
+        for name, (table, columns) in INDEXES.items():
+            _, sort_column, id_column = [c.strip() for c in columns.split(",")]
+            cur.execute(f"""
+                EXPLAIN QUERY PLAN
+                SELECT * FROM {table}
+                WHERE user_id = ? AND ({sort_column}, {id_column}) > (?, ?)
+                ORDER BY {sort_column}, {id_column} LIMIT 100
+            """, ('', '', ''))
+            plan = "\n".join(row[3] for row in cur.fetchall())
+            assert name in plan, f"{table} page does not use {name}:\n{plan}"
+            assert "TEMP B-TREE" not in plan, f"{table} page still sorts in a temp b-tree:\n{plan}"
+            print(f"  ✓ {table}: {plan.strip()}")
+
+        print("✓ Migration verification passed!")
+
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    DB_DIR = os.path.join(os.path.dirname(__file__), "..", "data")
+    DB_PATH = os.path.join(DB_DIR, "laihdutanyt.db")
+
+    if not os.path.exists(DB_PATH):
+        print(f"Database not found at {DB_PATH}")
+        print("Please run create_db.py first")
+        exit(1)
+
+    migrate_database(DB_PATH)
+    verify_migration(DB_PATH)
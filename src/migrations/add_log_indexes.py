@@ -0,0 +1,127 @@
+"""
+Database migration: Covering indexes for foodlog and activitylog
+Schema version: 1
+
+The dashboard queries (FoodLogRepository.find_by_user_and_date,
+FoodService.get_daily_food_totals, ActivityService.get_daily_activity_totals)
+filter on user_id and date. Without secondary indexes they scan the whole
+log table. These indexes contain every column the daily totals read, so
+SQLite answers them from the index alone.
+
+Schema version 7 (add_integer_keys.py) rebuilds the log tables with integer
+user_key/food_key/activity_key columns and the same indexes over them; the
+verification checks whichever layout the database has.
+
+Run with: poetry run python src/migrations/add_log_indexes.py
+"""
+
+import os
+import sqlite3
+
+SCHEMA_VERSION = 1
+
+INDEXES = {
+    'idx_foodlog_user_date': """
+        CREATE INDEX IF NOT EXISTS idx_foodlog_user_date
+        ON foodlog(user_id, date, food_id, portion_size_g)
+    """,
+    'idx_activitylog_user_date': """
+        CREATE INDEX IF NOT EXISTS idx_activitylog_user_date
+        ON activitylog(user_id, date, activity_id, activity_count, kcal_burned)
+    """,
+}
+
+# Hot queries and the covering index each one must use. {user} and {food}
+# are the log columns referencing the user and the food (see _key_columns)
+HOT_QUERIES = [
+    ('daily food totals', 'idx_foodlog_user_date', """
+        SELECT fl.date, SUM((fl.portion_size_g / 100) * COALESCE(f.kcal_per_portion, 0.0)), COUNT(*)
+        FROM foodlog fl
+        LEFT JOIN food f ON fl.{food} = f.{food}
+        WHERE fl.{user} = ?
+        GROUP BY fl.date
+        ORDER BY fl.date DESC
+    """),
+    ('daily activity totals', 'idx_activitylog_user_date', """
+        SELECT al.date, SUM(COALESCE(al.kcal_burned, 0.0)), COUNT(*)
+        FROM activitylog al
+        WHERE al.{user} = ?
+        GROUP BY al.date
+        ORDER BY al.date DESC
+    """),
+]
+
+
+def migrate_database(db_path: str):
+    """Create the covering indexes and bump the schema version"""
+    conn = sqlite3.connect(db_path)
+    try:
+        cur = conn.cursor()
+
+        print(f"Starting database migration to schema version {SCHEMA_VERSION}...")
+
+        for name, ddl in INDEXES.items():
+            cur.execute(ddl)
+            print(f"  ✓ Index {name} ready")
+
+        # Refresh planner statistics so the new indexes get picked
+        cur.execute("ANALYZE")
+        cur.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+        conn.commit()
+        print("✓ Migration completed successfully!")
+
+    except Exception as e:
+        conn.rollback()
+        print(f"✗ Migration failed: {e}")
+        raise
+    finally:
+        conn.close()
+
+
+def explain(conn: sqlite3.Connection, sql: str) -> str:
+    """Return the EXPLAIN QUERY PLAN output of a query as one string"""
+    cur = conn.cursor()
+    cur.execute(f"EXPLAIN QUERY PLAN {sql}", ('',))
+    return "\n".join(row[3] for row in cur.fetchall())
+
+
+def _key_columns(conn: sqlite3.Connection) -> dict:
+    """Log columns referencing the user and the food: TEXT ids, or integer keys from version 7 on"""
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(foodlog)")}
+    if 'user_key' in columns:
+        return {'user': 'user_key', 'food': 'food_key'}
+    return {'user': 'user_id', 'food': 'food_id'}
+
+
+def verify_migration(db_path: str):
+    """Verify that the hot queries are answered from the covering indexes"""
+    conn = sqlite3.connect(db_path)
+    try:
+        print("\nVerifying query plans...")
+
+        key_columns = _key_columns(conn)
+        for label, index_name, sql in HOT_QUERIES:
+            plan = explain(conn, sql.format(**key_columns))
+            assert f"COVERING INDEX {index_name}" in plan, \
+                f"{label} does not use {index_name}:\n{plan}"
+            assert "TEMP B-TREE" not in plan, f"{label} still sorts in a temp b-tree:\n{plan}"
+            print(f"  ✓ {label}: {plan.splitlines()[0].strip()}")
+
+        print("✓ Migration verification passed!")
+
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    DB_DIR = os.path.join(os.path.dirname(__file__), "..", "data")
+    DB_PATH = os.path.join(DB_DIR, "laihdutanyt.db")
+
+    if not os.path.exists(DB_PATH):
+        print(f"Database not found at {DB_PATH}")
+        print("Please run create_db.py first")
+        exit(1)
+
+    migrate_database(DB_PATH)
+    verify_migration(DB_PATH)
@@ -0,0 +1,102 @@
+"""
+Database migration: Recurring plans for food and activity logs
+Schema version: 6
+
+A planned_log row is one repeated entry ("oatmeal 80 g every weekday"):
+the food or activity, the amount and an RRULE-style rule (see
+services/recurrence.py). Occurrences are copied into foodlog/activitylog
+only up to a short horizon; materialized_through records how far, so
+rolling the horizon forward never inserts a day twice and long plans do
+not fill the log tables in advance.
+
+Run with: poetry run python src/migrations/add_planned_logs.py
+"""
+
+import os
+import sqlite3
+
+SCHEMA_VERSION = 6
+
+PLANNED_LOG_DDL = """
+CREATE TABLE IF NOT EXISTS planned_log (
+    plan_id TEXT PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    kind TEXT NOT NULL CHECK (kind IN ('food', 'activity')),
+    item_id TEXT NOT NULL,
+    amount REAL NOT NULL,
+    rule TEXT NOT NULL,
+    start_date TEXT NOT NULL,
+    end_date TEXT,
+    materialized_through TEXT,
+    created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY(user_id) REFERENCES "user"(user_id) ON DELETE CASCADE
+)
+"""
+
+PLANNED_LOG_INDEX_DDL = """
+CREATE INDEX IF NOT EXISTS idx_planned_log_user_kind ON planned_log(user_id, kind)
+"""
+
+
+def migrate_database(db_path: str):
+    """Create the planned_log table and bump the schema version"""
+    conn = sqlite3.connect(db_path)
+    try:
+        cur = conn.cursor()
+
+        print(f"Starting database migration to schema version {SCHEMA_VERSION}...")
+
+        cur.execute(PLANNED_LOG_DDL)
+        print("  ✓ Table planned_log ready")
+        cur.execute(PLANNED_LOG_INDEX_DDL)
+        print("  ✓ Index idx_planned_log_user_kind ready")
+
+        cur.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+        conn.commit()
+        print("✓ Migration completed successfully!")
+
+    except Exception as e:
+        conn.rollback()
+        print(f"✗ Migration failed: {e}")
+        raise
+    finally:
+        conn.close()
+
+
+def verify_migration(db_path: str):
+    """Verify that the planned_log table exists with its index"""
+    conn = sqlite3.connect(db_path)
+    try:
+        cur = conn.cursor()
+
+        print("\nVerifying migration...")
+
+        cur.execute("PRAGMA table_info(planned_log)")
+        columns = {row[1] for row in cur.fetchall()}
+        expected = {'plan_id', 'user_id', 'kind', 'item_id', 'amount', 'rule',
+                    'start_date', 'end_date', 'materialized_through', 'created_at'}
+        assert expected <= columns, f"planned_log is missing {expected - columns}"
+        print(f"  ✓ planned_log has {len(columns)} columns")
+
+        cur.execute("SELECT name FROM sqlite_master WHERE type = 'index' AND name = 'idx_planned_log_user_kind'")
+        assert cur.fetchone(), "Index idx_planned_log_user_kind not found"
+        print("  ✓ Index idx_planned_log_user_kind exists")
+
+        print("✓ Migration verification passed!")
+
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    DB_DIR = os.path.join(os.path.dirname(__file__), "..", "data")
+    DB_PATH = os.path.join(DB_DIR, "laihdutanyt.db")
+
+    if not os.path.exists(DB_PATH):
+        print(f"Database not found at {DB_PATH}")
+        print("Please run create_db.py first")
+        exit(1)
+
+    migrate_database(DB_PATH)
+    verify_migration(DB_PATH)
@@ -0,0 +1,221 @@
+"""
+Database migration: Cached week and month rollups
+Schema version: 9
+
+A weekly or monthly report used to mean summing every day of the period
+from the logs again. The rollup table keeps one row per user, granularity
+and period with the period's food, activity and weight figures
+(repositories/rollup_repository.py fills it on first read):
+
+- week: Sunday to Saturday
+- iso_week: Monday to Sunday, labelled with the ISO year and week
+- month: calendar month
+
+Periods are stored as day numbers (repositories/day_numbers.py); the key
+is (user_id, granularity, first_day). Triggers delete only the rows of the
+periods that contain the day of an inserted, updated or deleted food,
+activity or weight log, so the next read recomputes those periods and reads
+the rest from the table. Editing a food's nutrients clears all rollups (the
+logs have no index by food), and editing a user's kcal range clears that
+user's rollups (days on target depend on it).
+
+Run with: poetry run python src/migrations/add_rollups.py
+"""
+
+import os
+import sqlite3
+
+SCHEMA_VERSION = 9
+
+ROLLUP_DDL = """
+CREATE TABLE IF NOT EXISTS rollup (
+    user_id TEXT NOT NULL,
+    granularity TEXT NOT NULL CHECK (granularity IN ('week', 'iso_week', 'month')),
+    first_day INTEGER NOT NULL,
+    last_day INTEGER NOT NULL,
+    period TEXT NOT NULL,
+    days_logged INTEGER NOT NULL DEFAULT 0,
+    total_kcal_consumed REAL NOT NULL DEFAULT 0.0,
+    total_carbs_g REAL NOT NULL DEFAULT 0.0,
+    total_protein_g REAL NOT NULL DEFAULT 0.0,
+    total_fat_g REAL NOT NULL DEFAULT 0.0,
+    food_entries_count INTEGER NOT NULL DEFAULT 0,
+    total_kcal_burned REAL NOT NULL DEFAULT 0.0,
+    activity_entries_count INTEGER NOT NULL DEFAULT 0,
+    net_kcal REAL NOT NULL DEFAULT 0.0,
+    days_on_target INTEGER NOT NULL DEFAULT 0,
+    weigh_ins INTEGER NOT NULL DEFAULT 0,
+    weight_start REAL,
+    weight_end REAL,
+    PRIMARY KEY (user_id, granularity, first_day),
+    FOREIGN KEY(user_id) REFERENCES "user"(user_id) ON DELETE CASCADE
+) WITHOUT ROWID
+"""
+
+# A period is at most 31 days long, so the periods containing a day are
+# three short key ranges: one per granularity
+GRANULARITIES = ('week', 'iso_week', 'month')
+
+
+def invalidate_sql(user_id: str, day: str) -> str:
+    """
+    SQL that deletes the rollups of the periods containing one day.
+
+    Args:
+        user_id: SQL expression of the user's ID
+        day: SQL expression of the day number (e.g. 'NEW.day')
+
+    Returns:
+        A DELETE statement for use inside a trigger
+    """
+    granularities = ", ".join(f"'{g}'" for g in GRANULARITIES)
+    return f"""
+        DELETE FROM rollup
+        WHERE user_id = {user_id}
+          AND granularity IN ({granularities})
+          AND first_day BETWEEN {day} - 30 AND {day}
+          AND last_day >= {day};
+    """
+
+
+def trigger_ddl(table: str, user_id: str) -> list:
+    """
+    CREATE TRIGGER statements invalidating rollups on one log table.
+
+    Args:
+        table: foodlog, activitylog or weightlog
+        user_id: SQL expression of the user's ID with {ref} for NEW/OLD
+    """
+    new_user, old_user = user_id.format(ref='NEW'), user_id.format(ref='OLD')
+    return [
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_{table}_rollup_insert
+        AFTER INSERT ON {table}
+        BEGIN
+            {invalidate_sql(new_user, 'NEW.day')}
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_{table}_rollup_delete
+        AFTER DELETE ON {table}
+        BEGIN
+            {invalidate_sql(old_user, 'OLD.day')}
+        END
+        """,
+        # An edit may move a log to another day: invalidate both periods
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_{table}_rollup_update
+        AFTER UPDATE ON {table}
+        BEGIN
+            {invalidate_sql(old_user, 'OLD.day')}
+            {invalidate_sql(new_user, 'NEW.day')}
+        END
+        """,
+    ]
+
+
+# table -> SQL expression of the log's user_id; the keyed logs store user_key
+LOG_USERS = {
+    'foodlog': '(SELECT user_id FROM "user" WHERE user_key = {ref}.user_key)',
+    'activitylog': '(SELECT user_id FROM "user" WHERE user_key = {ref}.user_key)',
+    'weightlog': '{ref}.user_id',
+}
+
+CATALOG_TRIGGERS_DDL = [
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_food_rollup_update
+    AFTER UPDATE OF kcal_per_portion, carbs_per_portion, protein_per_portion, fat_per_portion ON food
+    WHEN OLD.kcal_per_portion IS NOT NEW.kcal_per_portion
+      OR OLD.carbs_per_portion IS NOT NEW.carbs_per_portion
+      OR OLD.protein_per_portion IS NOT NEW.protein_per_portion
+      OR OLD.fat_per_portion IS NOT NEW.fat_per_portion
+    BEGIN
+        DELETE FROM rollup;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_user_rollup_update
+    AFTER UPDATE OF kcal_min, kcal_max ON "user"
+    WHEN OLD.kcal_min IS NOT NEW.kcal_min OR OLD.kcal_max IS NOT NEW.kcal_max
+    BEGIN
+        DELETE FROM rollup WHERE user_id = NEW.user_id;
+    END
+    """,
+]
+
+
+def migrate_database(db_path: str):
+    """Create the rollup table with its invalidation triggers and bump the schema version"""
+    conn = sqlite3.connect(db_path)
+    try:
+        cur = conn.cursor()
+
+        print(f"Starting database migration to schema version {SCHEMA_VERSION}...")
+
+        cur.execute(ROLLUP_DDL)
+        print("  ✓ Table rollup ready")
+
+        cur.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+        tables = {row[0] for row in cur.fetchall()}
+        for table, user_id in LOG_USERS.items():
+            if table not in tables:
+                print(f"  - Table {table} not found, skipping")
+                continue
+            for ddl in trigger_ddl(table, user_id):
+                cur.execute(ddl)
+            print(f"  ✓ Rollup triggers on {table} ready")
+        for ddl in CATALOG_TRIGGERS_DDL:
+            cur.execute(ddl)
+        print("  ✓ Rollup triggers on food and user ready")
+
+        cur.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+        conn.commit()
+        print("✓ Migration completed successfully!")
+
+    except Exception as e:
+        conn.rollback()
+        print(f"✗ Migration failed: {e}")
+        raise
+    finally:
+        conn.close()
+
+
+def verify_migration(db_path: str):
+    """Verify that the rollup table and its triggers exist"""
+    conn = sqlite3.connect(db_path)
+    try:
+        cur = conn.cursor()
+
+        print("\nVerifying migration...")
+
+        cur.execute("PRAGMA table_info(rollup)")
+        columns = {row[1] for row in cur.fetchall()}
+        expected = {'user_id', 'granularity', 'first_day', 'last_day', 'period',
+                    'days_logged', 'net_kcal', 'weigh_ins', 'weight_start', 'weight_end'}
+        assert expected <= columns, f"rollup is missing {expected - columns}"
+        print(f"  ✓ rollup has {len(columns)} columns")
+
+        cur.execute("SELECT name FROM sqlite_master WHERE type = 'trigger' AND name LIKE 'trg_%_rollup_%'")
+        triggers = {row[0] for row in cur.fetchall()}
+        assert {'trg_foodlog_rollup_insert', 'trg_activitylog_rollup_insert',
+                'trg_food_rollup_update'} <= triggers, "Rollup triggers not found"
+        print(f"  ✓ {len(triggers)} rollup triggers exist")
+
+        print("✓ Migration verification passed!")
+
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    DB_DIR = os.path.join(os.path.dirname(__file__), "..", "data")
+    DB_PATH = os.path.join(DB_DIR, "laihdutanyt.db")
+
+    if not os.path.exists(DB_PATH):
+        print(f"Database not found at {DB_PATH}")
+        print("Please run create_db.py first")
+        exit(1)
+
+    migrate_database(DB_PATH)
+    verify_migration(DB_PATH)
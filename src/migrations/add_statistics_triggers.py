@@ -0,0 +1,271 @@
+"""
+Database migration: Incrementally maintained daily statistics
+Schema version: 2
+
+Installs triggers on foodlog and activitylog that recompute the affected
+(user_id, date) row of the `statistics` table on every insert, update and
+delete, then backfills the table from existing logs. The daily totals
+dashboards read these rows directly, so a refresh costs O(days shown)
+instead of aggregating the full log history.
+
+Run with: poetry run python src/migrations/add_statistics_triggers.py
+"""
+
+import os
+import sqlite3
+
+SCHEMA_VERSION = 2
+
+# Columns added in v2.1 (migrate_to_v2_1.py); re-checked so older databases work
+STATISTICS_COLUMNS = {
+    'total_kcal_burned': 'REAL DEFAULT 0.0',
+    'net_kcal': 'REAL DEFAULT 0.0',
+    'total_carbs_g': 'REAL DEFAULT 0.0',
+    'total_protein_g': 'REAL DEFAULT 0.0',
+    'total_fat_g': 'REAL DEFAULT 0.0',
+    'food_entries_count': 'INTEGER DEFAULT 0',
+    'activity_entries_count': 'INTEGER DEFAULT 0'
+}
+
+
+# Every day that has at least one log, with its food and activity totals.
+# Written against this version's schema; StatisticsRepository.rebuild follows
+# the current one.
+BACKFILL_SQL = """
+    WITH food_totals AS (
+        SELECT fl.user_id, fl.date,
+               SUM((fl.portion_size_g / 100.0) * COALESCE(f.kcal_per_portion, 0.0)) AS kcal,
+               SUM((fl.portion_size_g / 100.0) * COALESCE(f.carbs_per_portion, 0.0)) AS carbs,
+               SUM((fl.portion_size_g / 100.0) * COALESCE(f.protein_per_portion, 0.0)) AS protein,
+               SUM((fl.portion_size_g / 100.0) * COALESCE(f.fat_per_portion, 0.0)) AS fat,
+               COUNT(*) AS entries
+        FROM foodlog fl
+        LEFT JOIN food f ON fl.food_id = f.food_id
+        GROUP BY fl.user_id, fl.date
+    ),
+    activity_totals AS (
+        SELECT al.user_id, al.date,
+               SUM(COALESCE(al.kcal_burned, 0.0)) AS kcal,
+               COUNT(*) AS entries
+        FROM activitylog al
+        GROUP BY al.user_id, al.date
+    ),
+    days AS (
+        SELECT user_id, date FROM food_totals
+        UNION
+        SELECT user_id, date FROM activity_totals
+    )
+    INSERT INTO statistics (
+        stats_id, user_id, date,
+        total_kcal_consumed, total_carbs_g, total_protein_g, total_fat_g, food_entries_count,
+        total_kcal_burned, activity_entries_count, net_kcal
+    )
+    SELECT lower(hex(randomblob(16))), d.user_id, d.date,
+           COALESCE(ft.kcal, 0.0), COALESCE(ft.carbs, 0.0), COALESCE(ft.protein, 0.0),
+           COALESCE(ft.fat, 0.0), COALESCE(ft.entries, 0),
+           COALESCE(at.kcal, 0.0), COALESCE(at.entries, 0),
+           COALESCE(ft.kcal, 0.0) - COALESCE(at.kcal, 0.0)
+    FROM days d
+    LEFT JOIN food_totals ft ON ft.user_id = d.user_id AND ft.date = d.date
+    LEFT JOIN activity_totals at ON at.user_id = d.user_id AND at.date = d.date
+    WHERE true
+    ON CONFLICT(user_id, date) DO UPDATE SET
+        total_kcal_consumed = excluded.total_kcal_consumed,
+        total_carbs_g = excluded.total_carbs_g,
+        total_protein_g = excluded.total_protein_g,
+        total_fat_g = excluded.total_fat_g,
+        food_entries_count = excluded.food_entries_count,
+        total_kcal_burned = excluded.total_kcal_burned,
+        activity_entries_count = excluded.activity_entries_count,
+        net_kcal = excluded.net_kcal
+"""
+
+
+def refresh_day_sql(ref: str) -> str:
+    """
+    SQL that recomputes one statistics row inside a trigger.
+
+    Args:
+        ref: 'NEW' or 'OLD' - which row version names the affected day
+
+    Returns:
+        Upsert + cleanup statements for the (user_id, date) of that row
+    """
+    return f"""
+        INSERT INTO statistics (
+            stats_id, user_id, date,
+            total_kcal_consumed, total_carbs_g, total_protein_g, total_fat_g, food_entries_count,
+            total_kcal_burned, activity_entries_count, net_kcal
+        )
+        SELECT lower(hex(randomblob(16))), {ref}.user_id, {ref}.date,
+               ft.kcal, ft.carbs, ft.protein, ft.fat, ft.entries,
+               at.kcal, at.entries, ft.kcal - at.kcal
+        FROM (
+            SELECT COALESCE(SUM((fl.portion_size_g / 100.0) * COALESCE(f.kcal_per_portion, 0.0)), 0.0) AS kcal,
+                   COALESCE(SUM((fl.portion_size_g / 100.0) * COALESCE(f.carbs_per_portion, 0.0)), 0.0) AS carbs,
+                   COALESCE(SUM((fl.portion_size_g / 100.0) * COALESCE(f.protein_per_portion, 0.0)), 0.0) AS protein,
+                   COALESCE(SUM((fl.portion_size_g / 100.0) * COALESCE(f.fat_per_portion, 0.0)), 0.0) AS fat,
+                   COUNT(*) AS entries
+            FROM foodlog fl
+            LEFT JOIN food f ON fl.food_id = f.food_id
+            WHERE fl.user_id = {ref}.user_id AND fl.date = {ref}.date
+        ) ft, (
+            SELECT COALESCE(SUM(COALESCE(al.kcal_burned, 0.0)), 0.0) AS kcal,
+                   COUNT(*) AS entries
+            FROM activitylog al
+            WHERE al.user_id = {ref}.user_id AND al.date = {ref}.date
+        ) at
+        WHERE true
+        ON CONFLICT(user_id, date) DO UPDATE SET
+            total_kcal_consumed = excluded.total_kcal_consumed,
+            total_carbs_g = excluded.total_carbs_g,
+            total_protein_g = excluded.total_protein_g,
+            total_fat_g = excluded.total_fat_g,
+            food_entries_count = excluded.food_entries_count,
+            total_kcal_burned = excluded.total_kcal_burned,
+            activity_entries_count = excluded.activity_entries_count,
+            net_kcal = excluded.net_kcal;
+
+        DELETE FROM statistics
+        WHERE user_id = {ref}.user_id AND date = {ref}.date
+          AND food_entries_count = 0 AND activity_entries_count = 0
+          AND total_weight IS NULL;
+    """
+
+
+def trigger_ddl(table: str) -> list:
+    """CREATE TRIGGER statements keeping statistics in sync with one log table"""
+    return [
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_{table}_stats_insert
+        AFTER INSERT ON {table}
+        BEGIN
+            {refresh_day_sql('NEW')}
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_{table}_stats_delete
+        AFTER DELETE ON {table}
+        BEGIN
+            {refresh_day_sql('OLD')}
+        END
+        """,
+        # An edit may move a log to another day: refresh both days
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_{table}_stats_update
+        AFTER UPDATE ON {table}
+        BEGIN
+            {refresh_day_sql('OLD')}
+            {refresh_day_sql('NEW')}
+        END
+        """,
+    ]
+
+
+def migrate_database(db_path: str):
+    """Install statistics triggers and backfill the statistics table"""
+    conn = sqlite3.connect(db_path)
+    try:
+        cur = conn.cursor()
+
+        print(f"Starting database migration to schema version {SCHEMA_VERSION}...")
+
+        cur.execute("PRAGMA table_info(statistics)")
+        existing_columns = {row[1] for row in cur.fetchall()}
+        for col_name, col_type in STATISTICS_COLUMNS.items():
+            if col_name not in existing_columns:
+                cur.execute(f"ALTER TABLE statistics ADD COLUMN {col_name} {col_type}")
+                print(f"  ✓ Column {col_name} added")
+
+        # The upserts need (user_id, date) to be unique: keep the newest duplicate
+        cur.execute("""
+            DELETE FROM statistics
+            WHERE rowid NOT IN (
+                SELECT MAX(rowid) FROM statistics GROUP BY user_id, date
+            )
+        """)
+        if cur.rowcount:
+            print(f"  ✓ Removed {cur.rowcount} duplicate statistics rows")
+        cur.execute("""
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_statistics_user_date
+            ON statistics(user_id, date)
+        """)
+        print("  ✓ Unique index idx_statistics_user_date ready")
+
+        for table in ('foodlog', 'activitylog'):
+            for ddl in trigger_ddl(table):
+                cur.execute(ddl)
+            print(f"  ✓ Statistics triggers on {table} installed")
+
+        # Reset log-derived figures so days whose logs are gone drop out
+        cur.execute("""
+            UPDATE statistics
+            SET total_kcal_consumed = 0.0, total_carbs_g = 0.0, total_protein_g = 0.0,
+                total_fat_g = 0.0, food_entries_count = 0, total_kcal_burned = 0.0,
+                activity_entries_count = 0, net_kcal = 0.0
+        """)
+        cur.execute(BACKFILL_SQL)
+        # cursor.rowcount is -1 for statements starting with WITH
+        written = cur.execute("SELECT changes()").fetchone()[0]
+        cur.execute("""
+            DELETE FROM statistics
+            WHERE food_entries_count = 0 AND activity_entries_count = 0
+              AND total_weight IS NULL
+        """)
+        print(f"  ✓ Backfilled {written} daily statistics rows")
+
+        cur.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+        conn.commit()
+        print("✓ Migration completed successfully!")
+
+    except Exception as e:
+        conn.rollback()
+        print(f"✗ Migration failed: {e}")
+        raise
+    finally:
+        conn.close()
+
+
+def verify_migration(db_path: str):
+    """Verify that triggers exist and statistics match the logs"""
+    conn = sqlite3.connect(db_path)
+    try:
+        cur = conn.cursor()
+
+        print("\nVerifying migration...")
+
+        cur.execute("SELECT COUNT(*) FROM sqlite_master WHERE type='trigger' AND name LIKE 'trg_%_stats_%'")
+        assert cur.fetchone()[0] == 6, "statistics triggers missing"
+        print("  ✓ 6 statistics triggers exist")
+
+        cur.execute("""
+            SELECT COUNT(*) FROM (
+                SELECT fl.user_id, fl.date, COUNT(*) AS entries
+                FROM foodlog fl
+                GROUP BY fl.user_id, fl.date
+            ) logs
+            LEFT JOIN statistics s ON s.user_id = logs.user_id AND s.date = logs.date
+            WHERE s.food_entries_count IS NOT logs.entries
+        """)
+        mismatches = cur.fetchone()[0]
+        assert mismatches == 0, f"{mismatches} days differ from foodlog"
+        print("  ✓ Food entry counts match foodlog")
+
+        print("✓ Migration verification passed!")
+
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    DB_DIR = os.path.join(os.path.dirname(__file__), "..", "data")
+    DB_PATH = os.path.join(DB_DIR, "laihdutanyt.db")
+
+    if not os.path.exists(DB_PATH):
+        print(f"Database not found at {DB_PATH}")
+        print("Please run create_db.py first")
+        exit(1)
+
+    migrate_database(DB_PATH)
+    verify_migration(DB_PATH)
@@ -0,0 +1,77 @@
+"""
+Versioned migration runner.
+
+The schema version is stored in SQLite's PRAGMA user_version. Every
+versioned migration module defines SCHEMA_VERSION and migrate_database(db_path)
+and bumps user_version when it completes; this runner applies the ones the
+database has not seen yet, in order.
+
+Run with: poetry run python src/migrations/run_migrations.py
+"""
+
+import importlib
+import os
+import sqlite3
+import sys
+from typing import Optional
+
+# (schema version, module name) in application order
+MIGRATIONS = [
+    (1, 'add_log_indexes'),
+    (2, 'add_statistics_triggers'),
+    (3, 'add_catalog_search'),
+    (4, 'add_catalog_name_indexes'),
+    (5, 'add_keyset_indexes'),
+    (6, 'add_planned_logs'),
+    (7, 'add_integer_keys'),
+    (8, 'add_day_numbers'),
+    (9, 'add_rollups'),
+]
+
+
+def get_schema_version(db_path: str) -> int:
+    """Read the schema version of a database"""
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute("PRAGMA user_version").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def run_migrations(db_path: str, target: Optional[int] = None) -> int:
+    """
+    Apply all pending versioned migrations.
+
+    Args:
+        db_path: Database file
+        target: Stop after this schema version (None = latest)
+
+    Returns:
+        Number of migrations applied
+    """
+    current = get_schema_version(db_path)
+    applied = 0
+    for version, module_name in MIGRATIONS:
+        if version <= current:
+            continue
+        if target is not None and version > target:
+            break
+        module = importlib.import_module(f"migrations.{module_name}")
+        module.migrate_database(db_path)
+        applied += 1
+    return applied
+
+
+if __name__ == "__main__":
+    sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+    DB_DIR = os.path.join(os.path.dirname(__file__), "..", "data")
+    DB_PATH = os.path.join(DB_DIR, "laihdutanyt.db")
+
+    if not os.path.exists(DB_PATH):
+        print(f"Database not found at {DB_PATH}")
+        print("Please run create_db.py first")
+        exit(1)
+
+    count = run_migrations(DB_PATH)
+    print(f"\n✓ Applied {count} migration(s), schema version {get_schema_version(DB_PATH)}")
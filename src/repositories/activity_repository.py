@@ -4,39 +4,71 @@ ActivityRepository; SQLite-repo for Activity-entity.
 Methods:
 - find_all()
 - find_by_name(name)
+- search(query, limit)  # ranked substring search via activity_fts
 - find_by_id(activity_id)
 - create(activity_dict)  # returns inserted row as dict
 """
-import sqlite3
 import uuid
 from typing import List, Optional, Dict
 
+from repositories.connection_pool import get_connection, get_read_connection
+
+# The trigram tokenizer needs at least three characters to use the index
+MIN_SEARCH_LENGTH = 3
+
 
 class ActivityRepository:
     def __init__(self, db_path: str):
         self.db_path = db_path
 
     def _conn(self):
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        return conn
+        return get_connection(self.db_path)
+
+    def _read_conn(self):
+        return get_read_connection(self.db_path)
 
     def find_all(self) -> List[Dict]:
-        with self._conn() as conn:
+        with self._read_conn() as conn:
             cur = conn.cursor()
             cur.execute("SELECT * FROM Activity ORDER BY name")
             return [dict(r) for r in cur.fetchall()]
 
     def find_by_name(self, name: str) -> List[Dict]:
-        with self._conn() as conn:
+        with self._read_conn() as conn:
             cur = conn.cursor()
-            cur.execute(
-                "SELECT * FROM Activity WHERE name LIKE ? ORDER BY name", (f"%{name}%",)
-            )
+            if len(name) < MIN_SEARCH_LENGTH:
+                cur.execute("SELECT * FROM Activity WHERE name LIKE ? ORDER BY name", (f"%{name}%",))
+            else:
+                cur.execute("""
+                    SELECT * FROM Activity
+                    WHERE activity_id IN (SELECT activity_id FROM activity_fts WHERE name LIKE ?)
+                    ORDER BY name
+                """, (f"%{name}%",))
+            return [dict(r) for r in cur.fetchall()]
+
+    def search(self, query: str, limit: int = 20) -> List[Dict]:
+        """Best matches first: names starting with the query, then FTS rank"""
+        query = query.strip()
+        with self._read_conn() as conn:
+            cur = conn.cursor()
+            if not query:
+                cur.execute("SELECT * FROM Activity ORDER BY name LIMIT ?", (limit,))
+            elif len(query) < MIN_SEARCH_LENGTH:
+                cur.execute("SELECT * FROM Activity WHERE name LIKE ? ORDER BY name LIMIT ?",
+                            (f"{query}%", limit))
+            else:
+                phrase = '"' + query.replace('"', '""') + '"'
+                cur.execute("""
+                    SELECT a.* FROM activity_fts
+                    JOIN Activity a ON a.activity_id = activity_fts.activity_id
+                    WHERE activity_fts MATCH ?
+                    ORDER BY a.name LIKE ? DESC, activity_fts.rank, a.name
+                    LIMIT ?
+                """, (phrase, f"{query}%", limit))
             return [dict(r) for r in cur.fetchall()]
 
     def find_by_id(self, activity_id: str) -> Optional[Dict]:
-        with self._conn() as conn:
+        with self._read_conn() as conn:
             cur = conn.cursor()
             cur.execute("SELECT * FROM Activity WHERE activity_id = ?", (activity_id,))
             row = cur.fetchone()
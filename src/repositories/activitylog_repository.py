@@ -4,21 +4,50 @@
 activitylogRepository: SQLite-repos for food logs.
 Methods:
 - create_log(user_id, activity_id, date, activity_count, kcal_burned)
-- find_by_user_and_date(user_id, date)
+- find_by_user_and_date(user_id, date, columns)
 - find_all_for_user(user_id)
+- find_page_for_user(user_id, after, limit, columns, descending)
+- iter_for_user(user_id, columns, descending)
+- count_for_user(user_id)
 """
-import sqlite3
 import uuid
-from typing import List, Dict, Optional
+from typing import Iterable, Iterator, List, Dict, Optional, Tuple
+
+from repositories.connection_pool import get_connection, get_read_connection
+from repositories.keyset import DEFAULT_PAGE_SIZE, RowFactory, iter_keyset, keyset_clause, select_list
+
+# activitylog references users and activities by integer key; the UUIDs are joined in
+LOG_FROM = """
+    FROM activitylog al
+    JOIN "user" u ON u.user_key = al.user_key
+    JOIN activity a ON a.activity_key = al.activity_key
+"""
+
+# Columns available to find_page_for_user/iter_for_user projections
+PAGE_COLUMNS = {
+    'log_id': 'al.log_id',
+    'user_id': 'u.user_id',
+    'activity_id': 'a.activity_id',
+    'date': 'al.date',
+    'activity_count': 'al.activity_count',
+    'kcal_burned': 'al.kcal_burned',
+    'name': 'a.name',
+    'kcal_per_unit': 'a.kcal_per_unit',
+    # kcal_burned as the statistics rows sum it
+    'kcal': 'COALESCE(al.kcal_burned, 0.0)',
+}
+KEY_COLUMNS = ('date', 'log_id')
+LOG_COLUMNS = ('log_id', 'user_id', 'activity_id', 'date', 'activity_count', 'kcal_burned')
 
 class ActivityLogRepository:
     def __init__(self, db_path: str):
         self.db_path = db_path
 
     def _conn(self):
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        return conn
+        return get_connection(self.db_path)
+
+    def _read_conn(self):
+        return get_read_connection(self.db_path)
 
     def create_log(
         self,
@@ -33,36 +62,95 @@ class ActivityLogRepository:
             cur = conn.cursor()
             cur.execute(
                 """
-                INSERT INTO activitylog (log_id, user_id, activity_id, date, activity_count, kcal_burned)
-                VALUES (?, ?, ?, ?, ?, ?)
+                INSERT INTO activitylog (log_id, user_key, activity_key, date, activity_count, kcal_burned)
+                SELECT ?, u.user_key, a.activity_key, ?, ?, ?
+                FROM "user" u, activity a
+                WHERE u.user_id = ? AND a.activity_id = ?
             """,
-                (log_id, user_id, activity_id, date, activity_count, kcal_burned),
+                (log_id, date, activity_count, kcal_burned, user_id, activity_id),
             )
+            if cur.rowcount != 1:
+                raise ValueError("Unknown user or activity")
             conn.commit()
         return self.find_by_id(log_id)
 
     def find_by_id(self, log_id: str) -> Optional[Dict]:
-        with self._conn() as conn:
+        with self._read_conn() as conn:
             cur = conn.cursor()
-            cur.execute("SELECT * FROM activitylog WHERE log_id = ?", (log_id,))
+            cur.execute(f"""
+                SELECT {select_list(LOG_COLUMNS, PAGE_COLUMNS, KEY_COLUMNS)}
+                FROM activitylog al
+                JOIN "user" u ON u.user_key = al.user_key
+                LEFT JOIN activity a ON a.activity_key = al.activity_key
+                WHERE al.log_id = ?
+            """, (log_id,))
             row = cur.fetchone()
             return dict(row) if row else None
 
-    def find_by_user_and_date(self, user_id: str, date: str) -> List[Dict]:
-        with self._conn() as conn:
+    def find_by_user_and_date(self, user_id: str, date: str, columns: Optional[Iterable[str]] = None,
+                              row_factory: Optional[RowFactory] = None) -> List:
+        with self._read_conn() as conn:
             cur = conn.cursor()
+            if row_factory is not None:
+                cur.row_factory = row_factory
             cur.execute(
-                "SELECT al.*, a.name, a.kcal_per_unit FROM activitylog al JOIN activity a ON al.activity_id = a.activity_id WHERE al.user_id = ? AND al.date = ? ORDER BY al.date DESC",
+                f"SELECT {select_list(columns, PAGE_COLUMNS, KEY_COLUMNS)} {LOG_FROM} WHERE u.user_id = ? AND al.date = ? ORDER BY al.date DESC",
                 (user_id, date),
             )
+            if row_factory is not None:
+                return cur.fetchall()
             return [dict(r) for r in cur.fetchall()]
 
     def find_all_for_user(self, user_id: str) -> List[Dict]:
-        with self._conn() as conn:
+        with self._read_conn() as conn:
             cur = conn.cursor()
             cur.execute(
-                "SELECT al.*, a.name, a.kcal_per_unit FROM activitylog al JOIN activity a ON al.activity_id = a.activity_id WHERE al.user_id = ?",
+                f"SELECT {select_list(None, PAGE_COLUMNS, KEY_COLUMNS)} {LOG_FROM} WHERE u.user_id = ?",
                 (user_id,))
             return [dict(r) for r in cur.fetchall()]
 
         # week 4: refactoroitu aiemmin generoitu koodi päättyy
+
+    def find_page_for_user(self, user_id: str, after: Optional[Tuple[str, str]] = None,
+                           limit: int = 200, columns: Optional[Iterable[str]] = None,
+                           descending: bool = False, row_factory: Optional[RowFactory] = None) -> List:
+        """
+        Logs ordered by (date, log_id), starting after the given (date, log_id) key.
+
+        Rows are dicts, or whatever row_factory builds from the row tuple
+        (its values in the order of `columns`, key columns appended).
+        """
+        select = select_list(columns, PAGE_COLUMNS, KEY_COLUMNS)
+        condition, order = keyset_clause(("al.date", "al.log_id"), descending)
+        sql = f"SELECT {select} {LOG_FROM} WHERE u.user_id = ?"
+        params = [user_id]
+        if after is not None:
+            sql += f" AND {condition}"
+            params.extend(after)
+        sql += f" ORDER BY {order} LIMIT ?"
+        params.append(limit)
+        with self._read_conn() as conn:
+            cur = conn.cursor()
+            if row_factory is not None:
+                cur.row_factory = row_factory
+                return cur.execute(sql, params).fetchall()
+            cur.execute(sql, params)
+            return [dict(r) for r in cur.fetchall()]
+
+    def iter_for_user(self, user_id: str, columns: Optional[Iterable[str]] = None,
+                      descending: bool = False, page_size: int = DEFAULT_PAGE_SIZE,
+                      row_factory: Optional[RowFactory] = None) -> Iterator:
+        """Stream all logs of a user page by page (memory use is one page)"""
+        return iter_keyset(
+            lambda after, limit: self.find_page_for_user(user_id, after, limit, columns, descending,
+                                                         row_factory),
+            KEY_COLUMNS, page_size
+        )
+
+    def count_for_user(self, user_id: str) -> int:
+        with self._read_conn() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                f"SELECT COUNT(*) {LOG_FROM} WHERE u.user_id = ?",
+                (user_id,))
+            return cur.fetchone()[0]
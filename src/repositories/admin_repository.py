@@ -2,12 +2,11 @@
 # admin_repository.py
 # Repository for admin account management
 
-import sqlite3
 import uuid
-import os
-import hashlib
 from typing import Optional
-from contextlib import contextmanager
+
+from repositories.connection_pool import get_connection
+from repositories.credentials import hash_password, needs_rehash, verify_dummy, verify_password
 
 class Admin:
     """Admin dataclass"""
@@ -21,18 +20,8 @@ class AdminRepository:
     def __init__(self, db_path: str):
         self.db_path = db_path
 
-    @contextmanager
     def _conn(self):
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        try:
-            yield conn
-        finally:
-            conn.close()
-
-    def _hash_password(self, password: str, salt: bytes, iterations: int = 100_000) -> str:
-        dk = hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt, iterations)
-        return dk.hex()
+        return get_connection(self.db_path)
 
     def find_by_username(self, username: str) -> Optional[Admin]:
         with self._conn() as conn:
@@ -51,25 +40,35 @@ class AdminRepository:
     def verify_password(self, username: str, password: str) -> bool:
         admin = self.find_by_username(username)
         if not admin:
+            return verify_dummy(password)
+        if not verify_password(password, admin.password_hash, admin.salt):
             return False
-        salt = bytes.fromhex(admin.salt)
-        pwd_hash = self._hash_password(password, salt)
-        return pwd_hash == admin.password_hash
+        if needs_rehash(admin.password_hash):
+            # Upgrade the stored hash to the current KDF parameters
+            self.update_password_hash(admin.admin_id, *hash_password(password))
+        return True
+
+    def update_password_hash(self, admin_id: str, password_hash: str, salt: str):
+        with self._conn() as conn:
+            conn.execute(
+                "UPDATE admin SET password_hash = ?, salt = ? WHERE admin_id = ?",
+                (password_hash, salt, admin_id),
+            )
+            conn.commit()
 
     def create_admin(self, username: str, password: str) -> Admin:
         admin_id = str(uuid.uuid4())
-        salt = os.urandom(16)
-        pwd_hash = self._hash_password(password, salt)
+        pwd_hash, salt = hash_password(password)
         
         with self._conn() as conn:
             cur = conn.cursor()
             cur.execute("""
                 INSERT INTO admin (admin_id, username, password_hash, salt)
                 VALUES (?, ?, ?, ?)
-            """, (admin_id, username, pwd_hash, salt.hex()))
+            """, (admin_id, username, pwd_hash, salt))
             conn.commit()
         
-        return Admin(admin_id, username, pwd_hash, salt.hex())
+        return Admin(admin_id, username, pwd_hash, salt)
 
     def find_all(self):
         """Get all admin accounts (for super admin view)"""
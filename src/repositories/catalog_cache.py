@@ -0,0 +1,119 @@
+"""
+CatalogCache: in-memory cache for the food and activity catalogs.
+
+The catalogs are small, read constantly (dropdowns, name -> id lookups)
+and change only through create() or a CSV import. The cache loads the
+whole catalog once and keeps dict indexes by id and by name, so lookups
+do not touch the database.
+
+One cache exists per (database file, catalog); every service shares it.
+
+Methods:
+- find_all() - All catalog rows ordered by name
+- find_by_id(item_id) - Row by primary key
+- find_by_exact_name(name) - Row by exact name (first match in name order)
+- names() - Names in name order for dropdowns
+- create(...) - Create through the repository and invalidate
+- invalidate() - Drop the cached data (reloaded on next access)
+"""
+import os
+import threading
+from typing import Dict, List, Optional
+
+from repositories.food_repository import FoodRepository
+from repositories.activity_repository import ActivityRepository
+
+
+class CatalogCache:
+    """Lazy-loaded catalog with hash indexes by id and name"""
+
+    def __init__(self, repository, id_field: str):
+        self.repository = repository
+        self.id_field = id_field
+        self._lock = threading.Lock()
+        self._items: Optional[List[Dict]] = None
+        self._by_id: Dict[str, Dict] = {}
+        self._by_name: Dict[str, Dict] = {}
+        self._names: List[str] = []
+
+    def _ensure_loaded(self) -> List[Dict]:
+        """Load the catalog and build the indexes on first access"""
+        items = self._items
+        if items is not None:
+            return items
+        with self._lock:
+            if self._items is None:
+                items = self.repository.find_all()
+                by_name: Dict[str, Dict] = {}
+                for item in items:
+                    # Names are not unique: keep the first, like a linear scan would
+                    by_name.setdefault(item['name'], item)
+                self._by_id = {item[self.id_field]: item for item in items}
+                self._by_name = by_name
+                self._names = [item['name'] for item in items]
+                self._items = items
+            return self._items
+
+    def find_all(self) -> List[Dict]:
+        return list(self._ensure_loaded())
+
+    def find_by_id(self, item_id: str) -> Optional[Dict]:
+        self._ensure_loaded()
+        return self._by_id.get(item_id)
+
+    def find_by_exact_name(self, name: str) -> Optional[Dict]:
+        self._ensure_loaded()
+        return self._by_name.get(name)
+
+    def names(self) -> List[str]:
+        self._ensure_loaded()
+        return list(self._names)
+
+    def create(self, *args, **kwargs) -> Dict:
+        item = self.repository.create(*args, **kwargs)
+        self.invalidate()
+        return item
+
+    def invalidate(self):
+        with self._lock:
+            self._items = None
+            self._by_id = {}
+            self._by_name = {}
+            self._names = []
+
+
+_caches: Dict[tuple, CatalogCache] = {}
+_caches_lock = threading.Lock()
+
+
+def _get_cache(db_path: str, catalog: str, factory) -> CatalogCache:
+    key = (os.path.abspath(str(db_path)), catalog)
+    cache = _caches.get(key)
+    if cache is None:
+        with _caches_lock:
+            cache = _caches.get(key)
+            if cache is None:
+                cache = factory()
+                _caches[key] = cache
+    return cache
+
+
+def get_food_catalog(db_path: str) -> CatalogCache:
+    """Get the shared food catalog cache for a database file"""
+    return _get_cache(db_path, 'food',
+                      lambda: CatalogCache(FoodRepository(db_path), 'food_id'))
+
+
+def get_activity_catalog(db_path: str) -> CatalogCache:
+    """Get the shared activity catalog cache for a database file"""
+    return _get_cache(db_path, 'activity',
+                      lambda: CatalogCache(ActivityRepository(db_path), 'activity_id'))
+
+
+def invalidate_catalogs(db_path: str):
+    """Drop cached catalogs of a database file (after a CSV import)"""
+    prefix = os.path.abspath(str(db_path))
+    with _caches_lock:
+        caches = [cache for (path, _), cache in _caches.items() if path == prefix]
+    for cache in caches:
+        cache.invalidate()
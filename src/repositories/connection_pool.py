@@ -0,0 +1,129 @@
+"""
+ConnectionPool: shared SQLite connections for repositories and services.
+
+One pool exists per database file. Every thread gets its own long-lived
+connection (SQLite connections must not be shared between threads), so
+repositories no longer pay a connect/close cycle per query.
+
+Usage:
+    with get_connection(db_path) as conn:
+        conn.execute(...)
+
+The `with` block commits on success and rolls back on error, exactly like
+a freshly opened sqlite3 connection, but the connection stays open.
+
+Every connection gets the engine settings (WAL, busy timeout, ...; see
+repositories/engine_settings.py). Repositories read through
+get_read_connection(), a second per-thread connection that is read-only,
+so a view's query never holds or waits for the write lock.
+"""
+import os
+import sqlite3
+import threading
+from typing import Dict, List, Tuple
+
+from repositories.engine_settings import DEFAULT_SETTINGS, apply_settings
+from repositories.engine_settings import checkpoint as wal_checkpoint
+
+# Size of the per-connection prepared statement cache (sqlite3 default is 128)
+STATEMENT_CACHE_SIZE = 256
+
+
+class ConnectionPool:
+    """Thread-affine pool of SQLite connections for one database file"""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections: List[sqlite3.Connection] = []
+
+    def _open(self, read_only: bool = False) -> sqlite3.Connection:
+        """Open and configure a new connection for the calling thread"""
+        # check_same_thread=False only so close_all() can run from any thread;
+        # each connection is still used by the thread that created it.
+        conn = sqlite3.connect(
+            self.db_path,
+            cached_statements=STATEMENT_CACHE_SIZE,
+            check_same_thread=False,
+            timeout=DEFAULT_SETTINGS.busy_timeout_ms / 1000.0,
+        )
+        conn.row_factory = sqlite3.Row
+        apply_settings(conn, read_only)
+        return conn
+
+    def _thread_connection(self, attr: str, read_only: bool) -> sqlite3.Connection:
+        conn = getattr(self._local, attr, None)
+        if conn is None:
+            conn = self._open(read_only)
+            setattr(self._local, attr, conn)
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    def connection(self) -> sqlite3.Connection:
+        """Get the calling thread's read-write connection, opening it on first use"""
+        return self._thread_connection("conn", False)
+
+    def read_connection(self) -> sqlite3.Connection:
+        """Get the calling thread's read-only connection, opening it on first use"""
+        return self._thread_connection("read_conn", True)
+
+    def checkpoint(self, mode: str = "PASSIVE") -> Tuple[int, int, int]:
+        """Checkpoint the WAL from the calling thread (see engine_settings.checkpoint)"""
+        return wal_checkpoint(self.connection(), mode)
+
+    def close_all(self):
+        """Close every connection opened by this pool"""
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            if not conn.in_transaction:
+                try:
+                    # Leave no -wal file behind; skipped if another process holds it
+                    wal_checkpoint(conn, "TRUNCATE")
+                except sqlite3.Error:
+                    pass
+            conn.close()
+        self._local = threading.local()
+
+
+_pools: Dict[str, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(db_path: str) -> ConnectionPool:
+    """Get the shared pool for a database file, creating it once"""
+    key = os.path.abspath(str(db_path))
+    pool = _pools.get(key)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(key)
+            if pool is None:
+                pool = ConnectionPool(key)
+                _pools[key] = pool
+    return pool
+
+
+def get_connection(db_path: str) -> sqlite3.Connection:
+    """Get the calling thread's pooled connection for a database file"""
+    return get_pool(db_path).connection()
+
+
+def get_read_connection(db_path: str) -> sqlite3.Connection:
+    """Get the calling thread's pooled read-only connection for a database file"""
+    return get_pool(db_path).read_connection()
+
+
+def checkpoint(db_path: str, mode: str = "PASSIVE") -> Tuple[int, int, int]:
+    """Checkpoint a database's WAL (periodically and after bulk writes)"""
+    return get_pool(db_path).checkpoint(mode)
+
+
+def close_all_pools():
+    """Close all pooled connections (application shutdown)"""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close_all()
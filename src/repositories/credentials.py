@@ -0,0 +1,131 @@
+"""
+Password hashing shared by users, admins and create_db.
+
+Hashes are stored as self-describing strings, so the KDF and its cost can be
+changed without a schema change:
+    $scrypt$n=16384,r=8,p=1$<salt hex>$<hash hex>
+    $pbkdf2-sha256$i=600000$<salt hex>$<hash hex>
+Hashes written before this module are bare PBKDF2-SHA256 hex digests (100k
+iterations) with the salt in the separate `salt` column; they still verify
+and are upgraded by needs_rehash() on the next successful login.
+
+Both KDFs release the GIL inside OpenSSL, so running them on the UI task
+runner's worker threads keeps the Tk main loop responsive.
+"""
+import hashlib
+import hmac
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional, Tuple
+
+SALT_BYTES = 16
+LEGACY_PBKDF2_ITERATIONS = 100_000
+
+
+@dataclass(frozen=True)
+class HashPolicy:
+    """KDF and parameters used for new hashes"""
+    scheme: str = "scrypt"            # "scrypt" or "pbkdf2-sha256"
+    scrypt_n: int = 2 ** 14           # CPU/memory cost: 128 * n * r bytes (16 MiB)
+    scrypt_r: int = 8
+    scrypt_p: int = 1
+    pbkdf2_iterations: int = 600_000
+    dklen: int = 32
+
+
+# Policy for new hashes; assign another HashPolicy to tune it
+DEFAULT_POLICY = HashPolicy()
+
+
+def _scrypt(password: str, salt: bytes, n: int, r: int, p: int, dklen: int) -> bytes:
+    return hashlib.scrypt(password.encode("utf-8"), salt=salt, n=n, r=r, p=p,
+                          maxmem=256 * n * r + 1024 * 1024, dklen=dklen)
+
+
+def _pbkdf2(password: str, salt: bytes, iterations: int, dklen: int) -> bytes:
+    return hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt, iterations, dklen)
+
+
+def hash_password(password: str, policy: Optional[HashPolicy] = None,
+                  salt: Optional[bytes] = None) -> Tuple[str, str]:
+    """
+    Hash a password with the policy's KDF (default: DEFAULT_POLICY).
+
+    Returns:
+        (encoded hash, salt hex) -- the salt is also kept in the salt column
+    """
+    policy = policy or DEFAULT_POLICY
+    salt = salt or os.urandom(SALT_BYTES)
+    if policy.scheme == "scrypt":
+        digest = _scrypt(password, salt, policy.scrypt_n, policy.scrypt_r, policy.scrypt_p, policy.dklen)
+        params = f"n={policy.scrypt_n},r={policy.scrypt_r},p={policy.scrypt_p}"
+    elif policy.scheme == "pbkdf2-sha256":
+        digest = _pbkdf2(password, salt, policy.pbkdf2_iterations, policy.dklen)
+        params = f"i={policy.pbkdf2_iterations}"
+    else:
+        raise ValueError(f"Unknown password hash scheme: {policy.scheme}")
+    return f"${policy.scheme}${params}${salt.hex()}${digest.hex()}", salt.hex()
+
+
+def _parse(encoded: str, legacy_salt: Optional[str]):
+    """(scheme, params dict, salt, digest) of a stored hash"""
+    if not encoded.startswith("$"):
+        if not legacy_salt:
+            raise ValueError("Legacy password hash without salt")
+        return ("pbkdf2-sha256", {"i": LEGACY_PBKDF2_ITERATIONS},
+                bytes.fromhex(legacy_salt), bytes.fromhex(encoded))
+    _, scheme, params, salt_hex, digest_hex = encoded.split("$")
+    values = dict(item.split("=") for item in params.split(","))
+    return scheme, {k: int(v) for k, v in values.items()}, bytes.fromhex(salt_hex), bytes.fromhex(digest_hex)
+
+
+def verify_password(password: str, encoded: str, legacy_salt: Optional[str] = None) -> bool:
+    """
+    Check a password against a stored hash in constant time.
+
+    Args:
+        password: Password to check
+        encoded: Stored password_hash value
+        legacy_salt: Salt column value, needed for pre-module hashes
+    """
+    try:
+        scheme, params, salt, expected = _parse(encoded, legacy_salt)
+    except ValueError:
+        return False
+    if scheme == "scrypt":
+        actual = _scrypt(password, salt, params["n"], params["r"], params["p"], len(expected))
+    elif scheme == "pbkdf2-sha256":
+        actual = _pbkdf2(password, salt, params["i"], len(expected))
+    else:
+        return False
+    return hmac.compare_digest(actual, expected)
+
+
+def needs_rehash(encoded: str, policy: Optional[HashPolicy] = None) -> bool:
+    """True if the stored hash was made with another KDF or other parameters"""
+    policy = policy or DEFAULT_POLICY
+    if not encoded.startswith("$"):
+        return True
+    scheme, params, _, digest = _parse(encoded, None)
+    if scheme != policy.scheme or len(digest) != policy.dklen:
+        return True
+    if scheme == "scrypt":
+        return params != {"n": policy.scrypt_n, "r": policy.scrypt_r, "p": policy.scrypt_p}
+    return params != {"i": policy.pbkdf2_iterations}
+
+
+@lru_cache(maxsize=1)
+def _dummy_hash() -> str:
+    return hash_password("", salt=bytes(SALT_BYTES))[0]
+
+
+def verify_dummy(password: str) -> bool:
+    """
+    Spend one KDF run and fail.
+
+    Called for unknown usernames, so they take as long to reject as a wrong
+    password for an existing account.
+    """
+    verify_password(password, _dummy_hash())
+    return False
@@ -0,0 +1,85 @@
+"""
+Day numbers: dates as integer days since 1970-01-01 ("epoch days").
+
+foodlog, activitylog and weightlog have a `day` column and dietary_period
+has `start_day`/`end_day` (migrations/add_day_numbers.py). SQLite computes
+them from the YYYY-MM-DD text, so every write keeps them in sync. Range
+filters and week buckets are then integer comparisons and arithmetic in SQL
+instead of date parsing in Python. The log sums read the dates from covering
+indexes and compute the day with day_sql() instead.
+
+The generated columns are NULL for a date SQLite cannot read, e.g. an
+unpadded 2026-1-5, and such a row drops out of every day range. Writers
+pass dates through normalize_date() first.
+
+1970-01-01 was a Thursday, so the Monday-based weekday of a day is
+(day + 3) % 7.
+"""
+from datetime import date
+from typing import Union
+
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+def epoch_day(value: Union[str, date]) -> int:
+    """Day number of a date or a YYYY-MM-DD string"""
+    if isinstance(value, str):
+        value = date.fromisoformat(value)
+    return value.toordinal() - EPOCH_ORDINAL
+
+
+def normalize_date(value: Union[str, date]) -> str:
+    """
+    YYYY-MM-DD form of a date.
+
+    Args:
+        value: A date, or a year-month-day string whose numbers may be
+            unpadded or zero-padded (2026-1-5, 2025-12-010)
+
+    Raises:
+        ValueError: Not a valid date
+    """
+    if isinstance(value, date):
+        return value.strftime("%Y-%m-%d")
+    parts = str(value).strip().split("-")
+    try:
+        if len(parts) != 3 or not all(part.isdigit() for part in parts):
+            raise ValueError
+        return date(*(int(part) for part in parts)).isoformat()
+    except ValueError:
+        raise ValueError(f"Invalid date '{value}', use YYYY-MM-DD") from None
+
+
+def from_epoch_day(day: int) -> str:
+    """YYYY-MM-DD date of a day number"""
+    return date.fromordinal(day + EPOCH_ORDINAL).isoformat()
+
+
+def day_sql(column: str) -> str:
+    """
+    SQL expression of the day number of a YYYY-MM-DD column.
+
+    The same expression as the generated `day` columns. SQLite never reads a
+    generated column from an index alone, so queries meant to be answered by
+    a covering (user, date, ...) index compute the day from the date.
+    """
+    return f"CAST(julianday({column}) - 2440587.5 AS INTEGER)"
+
+
+def iso_week_sql(day: str) -> str:
+    """
+    SELECT expressions for the ISO week of a day number column.
+
+    Args:
+        day: SQL expression of the day number (e.g. 'w.day')
+
+    Returns:
+        "... AS week_start_date, ... AS year, ... AS week_number": the
+        week's Monday, ISO year and ISO week number. The ISO year and week
+        are those of the week's Thursday.
+    """
+    monday = f"({day} - ({day} + 3) % 7)"
+    thursday = f"date(({monday} + 3) * 86400, 'unixepoch')"
+    return f"""date({monday} * 86400, 'unixepoch') AS week_start_date,
+               CAST(strftime('%Y', {thursday}) AS INTEGER) AS year,
+               (CAST(strftime('%j', {thursday}) AS INTEGER) - 1) / 7 + 1 AS week_number"""
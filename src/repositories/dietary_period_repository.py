@@ -9,6 +9,9 @@ Examples:
 
 Methods:
 - find_all(user_id) - Get all periods for a user
+- find_page(user_id, after, limit, columns) - Keyset page ordered by (start_date, period_id)
+- iter_all(user_id, columns) - Stream all periods page by page
+- summarize(user_id, today, period_id) - Periods with weights and kcal totals in one query
 - find_active(user_id) - Get currently active periods
 - find_by_date(user_id, date) - Get periods containing a specific date
 - create(...) - Create new period
@@ -16,11 +19,33 @@ Methods:
 - update(...) - Update period details
 - delete(period_id) - Delete period
 """
-import sqlite3
 import uuid
-from typing import List, Optional, Dict
+from typing import Iterable, Iterator, List, Optional, Dict, Tuple
 from datetime import datetime, date
 
+from repositories.connection_pool import get_connection, get_read_connection
+from repositories.day_numbers import epoch_day
+from repositories.keyset import DEFAULT_PAGE_SIZE, iter_keyset, keyset_clause, select_list
+
+# Columns available to find_page/iter_all projections
+PAGE_COLUMNS = {c: c for c in (
+    'period_id',
+    'user_id',
+    'start_date',
+    'end_date',
+    'period_name',
+    'description',
+    'protocol_type',
+    'notes',
+    'is_active',
+    'created_at',
+)}
+KEY_COLUMNS = ('start_date', 'period_id')
+
+# A weigh-in at most this many days from a period's start/end date counts
+# as the weight on that date
+NEAREST_WEIGHIN_DAYS = 7
+
 
 class DietaryPeriodRepository:
     """Repository for dietary period database operations"""
@@ -29,10 +54,12 @@ class DietaryPeriodRepository:
         self.db_path = db_path
 
     def _conn(self):
-        """Create database connection with row factory"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        return conn
+        """Get the shared pooled connection (row factory already set)"""
+        return get_connection(self.db_path)
+
+    def _read_conn(self):
+        """Get the pooled read-only connection for queries"""
+        return get_read_connection(self.db_path)
 
     def find_all(self, user_id: str) -> List[Dict]:
         """
@@ -44,7 +71,7 @@ class DietaryPeriodRepository:
         Returns:
             List of period dictionaries
         """
-        with self._conn() as conn:
+        with self._read_conn() as conn:
             cur = conn.cursor()
             cur.execute("""
                 SELECT period_id, user_id, start_date, end_date, period_name,
@@ -55,6 +82,131 @@ class DietaryPeriodRepository:
             """, (user_id,))
             return [dict(r) for r in cur.fetchall()]
 
+    def find_page(self, user_id: str, after: Optional[Tuple[str, str]] = None,
+                  limit: int = DEFAULT_PAGE_SIZE, columns: Optional[Iterable[str]] = None,
+                  descending: bool = False) -> List[Dict]:
+        """
+        Get one page of periods ordered by (start_date, period_id).
+        
+        Args:
+            user_id: The user's ID
+            after: (start_date, period_id) of the last row of the previous page
+            limit: Page size
+            columns: Columns to select (default: all; the key columns are always included)
+            descending: Newest first
+            
+        Returns:
+            List of period dictionaries
+        """
+        condition, order = keyset_clause(KEY_COLUMNS, descending)
+        sql = f"SELECT {select_list(columns, PAGE_COLUMNS, KEY_COLUMNS)} FROM dietary_period WHERE user_id = ?"
+        params = [user_id]
+        if after is not None:
+            sql += f" AND {condition}"
+            params.extend(after)
+        sql += f" ORDER BY {order} LIMIT ?"
+        params.append(limit)
+        with self._read_conn() as conn:
+            cur = conn.cursor()
+            cur.execute(sql, params)
+            return [dict(r) for r in cur.fetchall()]
+
+    def iter_all(self, user_id: str, columns: Optional[Iterable[str]] = None,
+                 descending: bool = False, page_size: int = DEFAULT_PAGE_SIZE) -> Iterator[Dict]:
+        """
+        Stream all periods of a user with keyset pagination.
+        
+        Only one page is held in memory, so exports of long histories stay
+        bounded. Arguments as in find_page.
+        """
+        return iter_keyset(
+            lambda after, limit: self.find_page(user_id, after, limit, columns, descending),
+            KEY_COLUMNS, page_size
+        )
+
+    def summarize(self, user_id: str, today: str, period_id: Optional[str] = None) -> List[Dict]:
+        """
+        Get periods with their effectiveness figures in one query.
+        
+        For every period this finds the weigh-ins nearest to the start and
+        end date (within NEAREST_WEIGHIN_DAYS; ongoing periods end today) and
+        sums the consumed and burned kcal of the daily statistics between them.
+        
+        Args:
+            user_id: The user's ID
+            today: End date used for ongoing periods (YYYY-MM-DD)
+            period_id: Only summarize this period (default: all periods)
+            
+        Returns:
+            List of period dictionaries with duration_days (inclusive),
+            start_weight, start_weight_date, end_weight, end_weight_date,
+            weighin_days (days between the two weigh-ins), kcal_in and
+            kcal_out, ordered by start_date descending
+        """
+        # The distance is computed in a derived table: SQLite does not resolve
+        # outer columns in the ORDER BY of a correlated scalar subquery
+        nearest = """
+            SELECT n.log_rowid FROM (
+                SELECT w.rowid AS log_rowid, w.date, w.created_at,
+                       abs(w.day - {day}) AS distance
+                FROM weightlog w
+                WHERE w.user_id = p.user_id
+                  AND w.day BETWEEN {day} - :window AND {day} + :window
+            ) n
+            ORDER BY n.distance, n.date, n.created_at DESC
+            LIMIT 1
+        """
+        sql = f"""
+            WITH periods AS (
+                SELECT period_id, user_id, start_date, end_date, period_name,
+                       description, protocol_type, notes, is_active, created_at,
+                       COALESCE(end_date, :today) AS last_date,
+                       start_day, COALESCE(end_day, :today_day) AS last_day
+                FROM dietary_period
+                WHERE user_id = :user_id
+                  AND (:period_id IS NULL OR period_id = :period_id)
+            ),
+            kcal AS (
+                SELECT p.period_id,
+                       SUM(s.total_kcal_consumed) AS kcal_in,
+                       SUM(s.total_kcal_burned) AS kcal_out
+                FROM periods p
+                JOIN statistics s
+                  ON s.user_id = p.user_id AND s.date BETWEEN p.start_date AND p.last_date
+                GROUP BY p.period_id
+            ),
+            weighins AS (
+                SELECT p.period_id,
+                       ({nearest.format(day='p.start_day')}) AS start_log,
+                       ({nearest.format(day='p.last_day')}) AS end_log
+                FROM periods p
+            )
+            SELECT p.period_id, p.user_id, p.start_date, p.end_date, p.period_name,
+                   p.description, p.protocol_type, p.notes, p.is_active, p.created_at,
+                   p.last_day - p.start_day + 1 AS duration_days,
+                   sw.weight AS start_weight, sw.date AS start_weight_date,
+                   ew.weight AS end_weight, ew.date AS end_weight_date,
+                   ew.day - sw.day AS weighin_days,
+                   COALESCE(k.kcal_in, 0) AS kcal_in, COALESCE(k.kcal_out, 0) AS kcal_out
+            FROM periods p
+            JOIN weighins wi ON wi.period_id = p.period_id
+            LEFT JOIN weightlog sw ON sw.rowid = wi.start_log
+            LEFT JOIN weightlog ew ON ew.rowid = wi.end_log
+            LEFT JOIN kcal k ON k.period_id = p.period_id
+            ORDER BY p.start_date DESC, p.created_at DESC
+        """
+        params = {
+            'user_id': user_id,
+            'today': today,
+            'today_day': epoch_day(today),
+            'period_id': period_id,
+            'window': NEAREST_WEIGHIN_DAYS,
+        }
+        with self._read_conn() as conn:
+            cur = conn.cursor()
+            cur.execute(sql, params)
+            return [dict(r) for r in cur.fetchall()]
+
     def find_active(self, user_id: str) -> List[Dict]:
         """
         Get currently active periods (end_date is NULL or in future).
@@ -65,9 +217,9 @@ class DietaryPeriodRepository:
         Returns:
             List of active period dictionaries
         """
-        today = date.today().isoformat()
+        today = epoch_day(date.today())
         
-        with self._conn() as conn:
+        with self._read_conn() as conn:
             cur = conn.cursor()
             cur.execute("""
                 SELECT period_id, user_id, start_date, end_date, period_name,
@@ -75,7 +227,7 @@ class DietaryPeriodRepository:
                 FROM dietary_period
                 WHERE user_id = ? 
                   AND is_active = 1
-                  AND (end_date IS NULL OR end_date >= ?)
+                  AND (end_day IS NULL OR end_day >= ?)
                 ORDER BY start_date DESC
             """, (user_id, today))
             return [dict(r) for r in cur.fetchall()]
@@ -91,17 +243,17 @@ class DietaryPeriodRepository:
         Returns:
             List of periods containing this date
         """
-        with self._conn() as conn:
+        with self._read_conn() as conn:
             cur = conn.cursor()
             cur.execute("""
                 SELECT period_id, user_id, start_date, end_date, period_name,
                        description, protocol_type, notes, is_active, created_at
                 FROM dietary_period
                 WHERE user_id = ?
-                  AND start_date <= ?
-                  AND (end_date IS NULL OR end_date >= ?)
+                  AND start_day <= ?
+                  AND (end_day IS NULL OR end_day >= ?)
                 ORDER BY start_date DESC
-            """, (user_id, check_date, check_date))
+            """, (user_id, epoch_day(check_date), epoch_day(check_date)))
             return [dict(r) for r in cur.fetchall()]
 
     def find_by_id(self, period_id: str) -> Optional[Dict]:
@@ -114,7 +266,7 @@ class DietaryPeriodRepository:
         Returns:
             Period dictionary or None
         """
-        with self._conn() as conn:
+        with self._read_conn() as conn:
             cur = conn.cursor()
             cur.execute("""
                 SELECT period_id, user_id, start_date, end_date, period_name,
@@ -0,0 +1,95 @@
+"""
+Engine settings: PRAGMAs applied to every SQLite connection.
+
+Up to eight dashboards, the CSV import and the demo generator use the same
+database file at once. With these settings:
+- journal_mode=WAL: readers keep reading the last committed snapshot while
+  a writer (e.g. a bulk import) works; writers still take turns
+- synchronous=NORMAL: only checkpoints fsync in WAL mode; a power cut can
+  lose the last commits but cannot corrupt the file
+- busy_timeout: a writer waits for the other writer to finish instead of
+  failing at once with "database is locked"
+- mmap_size / cache_size: pages are read through a memory map and kept in a
+  larger per-connection cache
+
+WAL is a property of the database file, so it is switched on by the first
+read-write connection and stays on. Read-only connections (query_only) are
+for the views: they can never take the write lock.
+
+Usage outside the connection pool (scripts):
+    conn = connect(db_path)
+"""
+import sqlite3
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+# Modes of PRAGMA wal_checkpoint
+CHECKPOINT_MODES = ("PASSIVE", "FULL", "RESTART", "TRUNCATE")
+
+
+@dataclass(frozen=True)
+class EngineSettings:
+    """Connection-level SQLite settings"""
+    journal_mode: str = "WAL"
+    synchronous: str = "NORMAL"
+    busy_timeout_ms: int = 5000
+    mmap_size: int = 256 * 1024 * 1024   # bytes; 0 disables memory mapping
+    cache_size_kib: int = 16 * 1024      # per connection
+    temp_store: str = "MEMORY"
+
+    def pragmas(self, read_only: bool = False) -> List[str]:
+        """PRAGMA statements in the order they must run"""
+        # busy_timeout first, so switching the journal mode waits for other connections
+        pragmas = [f"PRAGMA busy_timeout = {int(self.busy_timeout_ms)}"]
+        if not read_only:
+            pragmas.append(f"PRAGMA journal_mode = {self.journal_mode}")
+        pragmas += [
+            f"PRAGMA synchronous = {self.synchronous}",
+            f"PRAGMA mmap_size = {int(self.mmap_size)}",
+            # Negative cache_size is in KiB rather than pages
+            f"PRAGMA cache_size = {-int(self.cache_size_kib)}",
+            f"PRAGMA temp_store = {self.temp_store}",
+        ]
+        if read_only:
+            pragmas.append("PRAGMA query_only = ON")
+        return pragmas
+
+
+# Settings for new connections; assign another EngineSettings to tune them
+DEFAULT_SETTINGS = EngineSettings()
+
+
+def apply_settings(conn: sqlite3.Connection, read_only: bool = False,
+                   settings: Optional[EngineSettings] = None) -> None:
+    """Run the settings' PRAGMAs on an open connection"""
+    settings = settings or DEFAULT_SETTINGS
+    for pragma in settings.pragmas(read_only):
+        conn.execute(pragma)
+
+
+def connect(db_path: str, read_only: bool = False,
+            settings: Optional[EngineSettings] = None, **kwargs) -> sqlite3.Connection:
+    """Open a sqlite3 connection with the engine settings applied"""
+    settings = settings or DEFAULT_SETTINGS
+    kwargs.setdefault("timeout", settings.busy_timeout_ms / 1000.0)
+    conn = sqlite3.connect(db_path, **kwargs)
+    apply_settings(conn, read_only, settings)
+    return conn
+
+
+def checkpoint(conn: sqlite3.Connection, mode: str = "PASSIVE") -> Tuple[int, int, int]:
+    """
+    Copy committed WAL pages back into the database file.
+
+    Args:
+        conn: Read-write connection
+        mode: PASSIVE never waits for readers or writers; TRUNCATE also
+            empties the -wal file (used at shutdown)
+
+    Returns:
+        (busy flag, WAL frames, frames checkpointed)
+    """
+    mode = mode.upper()
+    if mode not in CHECKPOINT_MODES:
+        raise ValueError(f"Unknown checkpoint mode: {mode}")
+    return tuple(conn.execute(f"PRAGMA wal_checkpoint({mode})").fetchone())
@@ -4,36 +4,70 @@ FoodRepository; SQLite-repo for Food-entity.
 Methods:
 - find_all()
 - find_by_name(name)
+- search(query, limit)  # ranked substring search via food_fts
 - find_by_id(food_id)
 - create(food_dict)  # returns inserted row as dict
 """
-import sqlite3
 import uuid
 from typing import List, Optional, Dict
 
+from repositories.connection_pool import get_connection, get_read_connection
+
+# The trigram tokenizer needs at least three characters to use the index
+MIN_SEARCH_LENGTH = 3
+
 class FoodRepository:
     def __init__(self, db_path: str):
         self.db_path = db_path
 
     def _conn(self):
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        return conn
+        return get_connection(self.db_path)
+
+    def _read_conn(self):
+        return get_read_connection(self.db_path)
 
     def find_all(self) -> List[Dict]:
-        with self._conn() as conn:
+        with self._read_conn() as conn:
             cur = conn.cursor()
             cur.execute("SELECT * FROM food ORDER BY name")
             return [dict(r) for r in cur.fetchall()]
 
     def find_by_name(self, name: str) -> List[Dict]:
-        with self._conn() as conn:
+        with self._read_conn() as conn:
             cur = conn.cursor()
-            cur.execute("SELECT * FROM food WHERE name LIKE ? ORDER BY name", (f"%{name}%",))
+            if len(name) < MIN_SEARCH_LENGTH:
+                cur.execute("SELECT * FROM food WHERE name LIKE ? ORDER BY name", (f"%{name}%",))
+            else:
+                cur.execute("""
+                    SELECT * FROM food
+                    WHERE food_id IN (SELECT food_id FROM food_fts WHERE name LIKE ?)
+                    ORDER BY name
+                """, (f"%{name}%",))
+            return [dict(r) for r in cur.fetchall()]
+
+    def search(self, query: str, limit: int = 20) -> List[Dict]:
+        """Best matches first: names starting with the query, then FTS rank"""
+        query = query.strip()
+        with self._read_conn() as conn:
+            cur = conn.cursor()
+            if not query:
+                cur.execute("SELECT * FROM food ORDER BY name LIMIT ?", (limit,))
+            elif len(query) < MIN_SEARCH_LENGTH:
+                cur.execute("SELECT * FROM food WHERE name LIKE ? ORDER BY name LIMIT ?",
+                            (f"{query}%", limit))
+            else:
+                phrase = '"' + query.replace('"', '""') + '"'
+                cur.execute("""
+                    SELECT f.* FROM food_fts
+                    JOIN food f ON f.food_id = food_fts.food_id
+                    WHERE food_fts MATCH ?
+                    ORDER BY f.name LIKE ? DESC, food_fts.rank, f.name
+                    LIMIT ?
+                """, (phrase, f"{query}%", limit))
             return [dict(r) for r in cur.fetchall()]
 
     def find_by_id(self, food_id: str) -> Optional[Dict]:
-        with self._conn() as conn:
+        with self._read_conn() as conn:
             cur = conn.cursor()
             cur.execute("SELECT * FROM food WHERE food_id = ?", (food_id,))
             row = cur.fetchone()
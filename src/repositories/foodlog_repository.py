@@ -4,50 +4,166 @@
 FoodLogRepository: SQLite-repos for food logs.
 Methods:
 - create_log(user_id, food_id, date, portion_size_g)
-- find_by_user_and_date(user_id, date)
+- create_logs(user_id, date, items)
+- find_by_user_and_date(user_id, date, columns)
 - find_all_for_user(user_id)
+- find_page_for_user(user_id, after, limit, columns, descending)
+- iter_for_user(user_id, columns, descending)
+- count_for_user(user_id)
 """
-import sqlite3
 import uuid
-from typing import List, Dict, Optional
+from typing import Iterable, Iterator, List, Dict, Optional, Tuple
+
+from repositories.connection_pool import get_connection, get_read_connection
+from repositories.keyset import DEFAULT_PAGE_SIZE, RowFactory, iter_keyset, keyset_clause, select_list
+
+# foodlog references users and foods by integer key; the UUIDs are joined in
+LOG_FROM = """
+    FROM foodlog fl
+    JOIN "user" u ON u.user_key = fl.user_key
+    JOIN food f ON f.food_key = fl.food_key
+"""
+
+# Columns available to find_page_for_user/iter_for_user projections
+PAGE_COLUMNS = {
+    'log_id': 'fl.log_id',
+    'user_id': 'u.user_id',
+    'food_id': 'f.food_id',
+    'date': 'fl.date',
+    'portion_size_g': 'fl.portion_size_g',
+    'name': 'f.name',
+    'kcal_per_portion': 'f.kcal_per_portion',
+}
+# Nutrients of the logged portion (the food's values are per 100 g), the
+# same expressions the statistics rows sum, so a day's logs add up to its totals
+PORTION_NUTRIENTS = {
+    'kcal': '(fl.portion_size_g / 100.0) * COALESCE(f.kcal_per_portion, 0.0)',
+    'carbs_g': '(fl.portion_size_g / 100.0) * COALESCE(f.carbs_per_portion, 0.0)',
+    'protein_g': '(fl.portion_size_g / 100.0) * COALESCE(f.protein_per_portion, 0.0)',
+    'fat_g': '(fl.portion_size_g / 100.0) * COALESCE(f.fat_per_portion, 0.0)',
+}
+PAGE_COLUMNS.update(PORTION_NUTRIENTS)
+KEY_COLUMNS = ('date', 'log_id')
+LOG_COLUMNS = ('log_id', 'user_id', 'food_id', 'date', 'portion_size_g')
 
 class FoodLogRepository:
     def __init__(self, db_path: str):
         self.db_path = db_path
 
     def _conn(self):
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        return conn
+        return get_connection(self.db_path)
+
+    def _read_conn(self):
+        return get_read_connection(self.db_path)
 
     def create_log(self, user_id: str, food_id: str, date: str, portion_size_g: float) -> Dict:
-        log_id = str(uuid.uuid4())
+        return self.create_logs(user_id, date, [(food_id, portion_size_g)])[0]
+
+    def create_logs(self, user_id: str, date: str,
+                    items: Iterable[Tuple[str, float]]) -> List[Dict]:
+        """
+        Insert several logs for one date in a single transaction.
+
+        Args:
+            user_id: Owner of the logs
+            date: YYYY-MM-DD date of every log
+            items: (food_id, portion_size_g) pairs
+
+        Returns:
+            The created foodlog rows, built from the inserted values (no re-read)
+
+        Raises:
+            ValueError: Unknown user_id or food_id (nothing is inserted)
+        """
+        rows = [
+            {'log_id': str(uuid.uuid4()), 'user_id': user_id, 'food_id': food_id,
+             'date': date, 'portion_size_g': portion_size_g}
+            for food_id, portion_size_g in items
+        ]
+        if not rows:
+            return rows
         with self._conn() as conn:
-            cur = conn.cursor()
-            cur.execute("""
-                INSERT INTO foodlog (log_id, user_id, food_id, date, portion_size_g)
-                VALUES (?, ?, ?, ?, ?)
-            """, (log_id, user_id, food_id, date, portion_size_g))
+            cur = conn.executemany("""
+                INSERT INTO foodlog (log_id, user_key, food_key, date, portion_size_g)
+                SELECT :log_id, u.user_key, f.food_key, :date, :portion_size_g
+                FROM "user" u, food f
+                WHERE u.user_id = :user_id AND f.food_id = :food_id
+            """, rows)
+            if cur.rowcount != len(rows):
+                raise ValueError("Unknown user or food")
             conn.commit()
-        return self.find_by_id(log_id)
+        return rows
 
     def find_by_id(self, log_id: str) -> Optional[Dict]:
-        with self._conn() as conn:
+        with self._read_conn() as conn:
             cur = conn.cursor()
-            cur.execute("SELECT * FROM foodlog WHERE log_id = ?", (log_id,))
+            cur.execute(f"""
+                SELECT {select_list(LOG_COLUMNS, PAGE_COLUMNS, KEY_COLUMNS)}
+                FROM foodlog fl
+                JOIN "user" u ON u.user_key = fl.user_key
+                LEFT JOIN food f ON f.food_key = fl.food_key
+                WHERE fl.log_id = ?
+            """, (log_id,))
             row = cur.fetchone()
             return dict(row) if row else None
 
-    def find_by_user_and_date(self, user_id: str, date: str) -> List[Dict]:
-        with self._conn() as conn:
+    def find_by_user_and_date(self, user_id: str, date: str, columns: Optional[Iterable[str]] = None,
+                              row_factory: Optional[RowFactory] = None) -> List:
+        with self._read_conn() as conn:
             cur = conn.cursor()
-            cur.execute("SELECT fl.*, f.name, f.kcal_per_portion FROM foodlog fl JOIN food f ON fl.food_id = f.food_id WHERE fl.user_id = ? AND fl.date = ? ORDER BY fl.date", (user_id, date))
+            if row_factory is not None:
+                cur.row_factory = row_factory
+            cur.execute(f"SELECT {select_list(columns, PAGE_COLUMNS, KEY_COLUMNS)} {LOG_FROM} WHERE u.user_id = ? AND fl.date = ? ORDER BY fl.date", (user_id, date))
+            if row_factory is not None:
+                return cur.fetchall()
             return [dict(r) for r in cur.fetchall()]
 
     def find_all_for_user(self, user_id: str) -> List[Dict]:
-        with self._conn() as conn:
+        with self._read_conn() as conn:
             cur = conn.cursor()
-            cur.execute("SELECT fl.*, f.name, f.kcal_per_portion FROM foodlog fl JOIN food f ON fl.food_id = f.food_id WHERE fl.user_id = ?", (user_id,))
+            cur.execute(f"SELECT {select_list(None, PAGE_COLUMNS, KEY_COLUMNS)} {LOG_FROM} WHERE u.user_id = ?", (user_id,))
             return [dict(r) for r in cur.fetchall()]
         
-        # generoitu koodi päättyy
\ No newline at end of file
+        # generoitu koodi päättyy
+
+    def find_page_for_user(self, user_id: str, after: Optional[Tuple[str, str]] = None,
+                           limit: int = 200, columns: Optional[Iterable[str]] = None,
+                           descending: bool = False, row_factory: Optional[RowFactory] = None) -> List:
+        """
+        Logs ordered by (date, log_id), starting after the given (date, log_id) key.
+
+        Rows are dicts, or whatever row_factory builds from the row tuple
+        (its values in the order of `columns`, key columns appended).
+        """
+        select = select_list(columns, PAGE_COLUMNS, KEY_COLUMNS)
+        condition, order = keyset_clause(("fl.date", "fl.log_id"), descending)
+        sql = f"SELECT {select} {LOG_FROM} WHERE u.user_id = ?"
+        params = [user_id]
+        if after is not None:
+            sql += f" AND {condition}"
+            params.extend(after)
+        sql += f" ORDER BY {order} LIMIT ?"
+        params.append(limit)
+        with self._read_conn() as conn:
+            cur = conn.cursor()
+            if row_factory is not None:
+                cur.row_factory = row_factory
+                return cur.execute(sql, params).fetchall()
+            cur.execute(sql, params)
+            return [dict(r) for r in cur.fetchall()]
+
+    def iter_for_user(self, user_id: str, columns: Optional[Iterable[str]] = None,
+                      descending: bool = False, page_size: int = DEFAULT_PAGE_SIZE,
+                      row_factory: Optional[RowFactory] = None) -> Iterator:
+        """Stream all logs of a user page by page (memory use is one page)"""
+        return iter_keyset(
+            lambda after, limit: self.find_page_for_user(user_id, after, limit, columns, descending,
+                                                         row_factory),
+            KEY_COLUMNS, page_size
+        )
+
+    def count_for_user(self, user_id: str) -> int:
+        with self._read_conn() as conn:
+            cur = conn.cursor()
+            cur.execute(f"SELECT COUNT(*) {LOG_FROM} WHERE u.user_id = ?", (user_id,))
+            return cur.fetchone()[0]
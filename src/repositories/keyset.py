@@ -0,0 +1,77 @@
+"""
+Keyset pagination helpers shared by the log repositories.
+
+A page query continues strictly after the (sort value, id) key of the last
+row it returned, so every page is an index range scan no matter how deep
+into the history it is (OFFSET would re-read all skipped rows).
+iter_keyset() chains such pages into a generator whose memory use is one
+page, not the whole history.
+
+Pages are lists of dicts by default; with a sqlite3 row factory they can be
+lists of records (e.g. the slotted dataclasses in repositories/models.py)
+that have the key columns as attributes.
+"""
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+# sqlite3 row factory: (cursor, row tuple) -> record
+RowFactory = Callable[[Any, tuple], Any]
+
+DEFAULT_PAGE_SIZE = 1000
+
+# fetch_page(after_key, limit) -> rows
+PageFetcher = Callable[[Optional[Tuple], int], List]
+
+
+def select_list(columns: Optional[Iterable[str]], allowed: Dict[str, str],
+                key_columns: Sequence[str]) -> str:
+    """
+    Build a SELECT column list for a projection.
+
+    Args:
+        columns: Wanted column names (None = all allowed columns)
+        allowed: Column name -> SQL expression, in default order
+        key_columns: Columns the keyset needs; always included
+
+    Returns:
+        "expr AS name, ..." string
+
+    Raises:
+        ValueError: Unknown column name (names are never interpolated unchecked)
+    """
+    if columns is None:
+        names = list(allowed)
+    else:
+        names = list(columns)
+        unknown = [c for c in names if c not in allowed]
+        if unknown:
+            raise ValueError(f"Unknown columns: {', '.join(unknown)}")
+        names += [c for c in key_columns if c not in names]
+    return ", ".join(f"{allowed[c]} AS {c}" for c in names)
+
+
+def keyset_clause(key_exprs: Sequence[str], descending: bool = False) -> Tuple[str, str]:
+    """WHERE condition and ORDER BY list continuing after a key"""
+    op = "<" if descending else ">"
+    direction = " DESC" if descending else ""
+    condition = f"({', '.join(key_exprs)}) {op} ({', '.join('?' for _ in key_exprs)})"
+    order = ", ".join(expr + direction for expr in key_exprs)
+    return condition, order
+
+
+def row_key(row, key_columns: Sequence[str]) -> Tuple:
+    """Keyset key of a row: a dict or a record with the key columns as attributes"""
+    if isinstance(row, dict):
+        return tuple(row[c] for c in key_columns)
+    return tuple(getattr(row, c) for c in key_columns)
+
+
+def iter_keyset(fetch_page: PageFetcher, key_columns: Sequence[str],
+                page_size: int = DEFAULT_PAGE_SIZE) -> Iterator:
+    """Yield every row of a keyset-paginated query, one page in memory at a time"""
+    after = None
+    while True:
+        page = fetch_page(after, page_size)
+        yield from page
+        if len(page) < page_size:
+            return
+        after = row_key(page[-1], key_columns)
@@ -3,7 +3,8 @@
 # Dataluokat sovellusolioille
 
 from dataclasses import dataclass
-from typing import Optional
+from sys import intern
+from typing import Optional, Sequence
 
 
 @dataclass
@@ -93,3 +94,141 @@ class DietaryPeriod:
     notes: Optional[str] = None
     is_active: int = 1
     created_at: Optional[str] = None
+
+
+# Row records: what the services return for long log histories. They are
+# built by sqlite3 row factories straight from the row tuples, one object per
+# row with no intermediate dict, and slots=True leaves out the per-instance
+# __dict__ (scripts/benchmark_rows.py measures the bytes per row).
+
+
+@dataclass(slots=True)
+class FoodLogEntry:
+    date: str
+    log_id: str
+    name: str
+    portion: float
+    kcal: float
+    carbs: float
+    protein: float
+    fat: float
+
+    @classmethod
+    def from_row(cls, cursor, row) -> "FoodLogEntry":
+        """Row factory for (date, log_id, name, portion_size_g, kcal, carbs_g, protein_g, fat_g) rows"""
+        date, log_id, name, portion, kcal, carbs, protein, fat = row
+        # Dates and names repeat from row to row: one copy of each
+        return cls(intern(date), log_id, intern(name or "?"), portion, kcal, carbs, protein, fat)
+
+
+@dataclass(slots=True)
+class ActivityLogEntry:
+    date: str
+    log_id: str
+    name: str
+    count: float
+    kcal_burned: float
+
+    @classmethod
+    def from_row(cls, cursor, row) -> "ActivityLogEntry":
+        """Row factory for (date, log_id, name, activity_count, kcal) rows"""
+        date, log_id, name, count, kcal_burned = row
+        return cls(intern(date), log_id, intern(name or "?"), count, kcal_burned)
+
+
+@dataclass(slots=True)
+class WeightHistoryEntry:
+    log_id: str
+    user_id: str
+    date: str
+    weight: float
+    notes: Optional[str]
+    created_at: Optional[str]
+    week_start_date: str
+    year: int
+    week_number: int
+    is_week_start: bool = False
+    active_periods: Sequence[str] = ()
+    period_markers: Sequence[str] = ()
+
+    @classmethod
+    def from_row(cls, cursor, row) -> "WeightHistoryEntry":
+        """Row factory for WeightLogRepository.find_by_date_range_with_weeks"""
+        log_id, user_id, date, weight, notes, created_at, week_start_date, year, week_number = row
+        # One copy of the strings shared by many rows
+        return cls(log_id, intern(user_id), intern(date), weight, notes, created_at,
+                   intern(week_start_date), year, week_number)
+
+    @property
+    def week_label(self) -> str:
+        return f"Week {self.week_number}, {self.year}"
+
+    @property
+    def has_periods(self) -> bool:
+        return len(self.active_periods) > 0
+
+
+@dataclass(slots=True)
+class DailyNutrition:
+    date: str
+    kcal: float
+    carbs: float
+    protein: float
+    fat: float
+    food_entries: int
+    burned: float
+    activity_entries: int
+    net_kcal: float
+
+    @classmethod
+    def from_row(cls, cursor, row) -> "DailyNutrition":
+        """Row factory for NutritionRepository.find_daily"""
+        return cls(*row)
+
+
+@dataclass(slots=True)
+class Rollup:
+    granularity: str
+    period: str
+    start_date: str
+    end_date: str
+    days_logged: int
+    kcal: float
+    carbs: float
+    protein: float
+    fat: float
+    food_entries: int
+    burned: float
+    activity_entries: int
+    net_kcal: float
+    days_on_target: int
+    weigh_ins: int
+    weight_start: Optional[float]
+    weight_end: Optional[float]
+
+    @classmethod
+    def from_row(cls, cursor, row) -> "Rollup":
+        """Row factory for RollupRepository.find_range"""
+        return cls(intern(row[0]), *row[1:])
+
+    @property
+    def avg_kcal(self) -> float:
+        """Average kcal consumed per logged day"""
+        return self.kcal / self.days_logged if self.days_logged else 0.0
+
+    @property
+    def avg_burned(self) -> float:
+        """Average kcal burned per logged day"""
+        return self.burned / self.days_logged if self.days_logged else 0.0
+
+    @property
+    def adherence_pct(self) -> float:
+        """Share of the logged days with net kcal within the user's range"""
+        return 100.0 * self.days_on_target / self.days_logged if self.days_logged else 0.0
+
+    @property
+    def weight_change(self) -> Optional[float]:
+        """Last minus first weigh-in of the period, None without two weigh-ins"""
+        if self.weigh_ins < 2:
+            return None
+        return self.weight_end - self.weight_start
@@ -0,0 +1,107 @@
+"""
+NutritionRepository: daily nutrition of a user computed from the logs.
+
+One grouped query per call: food logs are summed per day with the
+PORTION_NUTRIENTS expressions of foodlog_repository, activity logs per day
+as the statistics rows sum them, and both are index-only range scans of the
+covering (user_key, date, ...) indexes (migrations/add_integer_keys.py).
+Unlike the statistics rows the figures follow later edits of a food's
+nutrients.
+
+Methods:
+- find_daily(user_id, start_date, end_date) - DailyNutrition rows, newest first
+"""
+from typing import List, Optional
+
+from repositories.connection_pool import get_read_connection
+from repositories.day_numbers import day_sql, epoch_day, from_epoch_day
+from repositories.foodlog_repository import PORTION_NUTRIENTS
+from repositories.models import DailyNutrition
+
+# CTEs food_days, activity_days and days: one row per day and side, to be
+# summed per day (or per rollup bucket, repositories/rollup_repository.py).
+# {food_range}/{activity_range} are empty or "AND <alias>.date BETWEEN ...".
+# The day number is computed from the indexed date (see day_numbers.day_sql).
+# Logs with an unparseable date (day NULL) belong to no day and are left out.
+DAY_TOTALS_SQL = f"""
+    WITH food_days AS (
+        SELECT {day_sql('fl.date')} AS day,
+               SUM({PORTION_NUTRIENTS['kcal']}) AS kcal,
+               SUM({PORTION_NUTRIENTS['carbs_g']}) AS carbs,
+               SUM({PORTION_NUTRIENTS['protein_g']}) AS protein,
+               SUM({PORTION_NUTRIENTS['fat_g']}) AS fat,
+               COUNT(*) AS entries
+        FROM foodlog fl
+        LEFT JOIN food f ON f.food_key = fl.food_key
+        WHERE fl.user_key = (SELECT user_key FROM "user" WHERE user_id = :user_id)
+          {{food_range}}
+        GROUP BY fl.date
+    ),
+    activity_days AS (
+        SELECT {day_sql('al.date')} AS day, SUM(COALESCE(al.kcal_burned, 0.0)) AS burned, COUNT(*) AS entries
+        FROM activitylog al
+        WHERE al.user_key = (SELECT user_key FROM "user" WHERE user_id = :user_id)
+          {{activity_range}}
+        GROUP BY al.date
+    ),
+    days AS (
+        SELECT day, kcal, carbs, protein, fat, entries AS food_entries,
+               0.0 AS burned, 0 AS activity_entries
+        FROM food_days
+        WHERE day IS NOT NULL
+        UNION ALL
+        SELECT day, 0.0, 0.0, 0.0, 0.0, 0, burned, entries
+        FROM activity_days
+        WHERE day IS NOT NULL
+    )
+"""
+
+_DAILY_SQL = DAY_TOTALS_SQL + """
+    SELECT date(day * 86400, 'unixepoch') AS date,
+           TOTAL(kcal), TOTAL(carbs), TOTAL(protein), TOTAL(fat), SUM(food_entries),
+           TOTAL(burned), SUM(activity_entries), TOTAL(kcal) - TOTAL(burned)
+    FROM days
+    GROUP BY day
+    ORDER BY day DESC
+"""
+
+
+class NutritionRepository:
+    """Read-only daily nutrition queries over the log tables"""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+
+    def _read_conn(self):
+        """Get the pooled read-only connection for queries"""
+        return get_read_connection(self.db_path)
+
+    def find_daily(self, user_id: str, start_date: Optional[str] = None,
+                   end_date: Optional[str] = None) -> List[DailyNutrition]:
+        """
+        Get kcal, macros, activity burn and net kcal per day.
+
+        Args:
+            user_id: The user's ID
+            start_date: First date (YYYY-MM-DD, inclusive; None = no limit)
+            end_date: Last date (YYYY-MM-DD, inclusive; None = no limit)
+
+        Returns:
+            One DailyNutrition per day with food or activity logs, newest first
+        """
+        params = {'user_id': user_id}
+        conditions = []
+        if start_date is not None:
+            conditions.append("{alias}.date >= :first_date")
+            params['first_date'] = from_epoch_day(epoch_day(start_date))
+        if end_date is not None:
+            conditions.append("{alias}.date <= :last_date")
+            params['last_date'] = from_epoch_day(epoch_day(end_date))
+        day_range = "".join(f" AND {condition}" for condition in conditions)
+        sql = _DAILY_SQL.format(food_range=day_range.format(alias='fl'),
+                                activity_range=day_range.format(alias='al'))
+        with self._read_conn() as conn:
+            cur = conn.cursor()
+            cur.row_factory = DailyNutrition.from_row
+            cur.execute(sql, params)
+            return cur.fetchall()
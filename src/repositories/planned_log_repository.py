@@ -0,0 +1,115 @@
+"""
+PlannedLogRepository: SQLite repository for recurring food/activity plans.
+
+A plan row holds the rule; its occurrences are inserted into foodlog or
+activitylog up to `materialized_through` (see services/recurrence.py).
+
+Methods:
+- create(plan, logs) - Insert a plan and its first materialised logs in one transaction
+- find_for_user(user_id, kind) - Plans of one kind for a user
+- find_behind(user_id, kind, through) - Plans not yet materialised up to a date
+- materialize(kind, logs, progress) - Insert logs and advance plans in one transaction
+- delete(plan_id) - Delete a plan (logs already materialised are kept)
+"""
+import uuid
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+from repositories.connection_pool import get_connection, get_read_connection
+
+# Log rows carry log_id, user_id, item_id, date, amount and (activity) kcal;
+# the UUIDs are resolved to the log tables' integer keys
+LOG_INSERTS = {
+    'food': """
+        INSERT INTO foodlog (log_id, user_key, food_key, date, portion_size_g)
+        SELECT :log_id, u.user_key, f.food_key, :date, :amount
+        FROM "user" u, food f
+        WHERE u.user_id = :user_id AND f.food_id = :item_id
+    """,
+    'activity': """
+        INSERT INTO activitylog (log_id, user_key, activity_key, date, activity_count, kcal_burned)
+        SELECT :log_id, u.user_key, a.activity_key, :date, :amount, :kcal
+        FROM "user" u, activity a
+        WHERE u.user_id = :user_id AND a.activity_id = :item_id
+    """,
+}
+
+
+def _with_ids(logs: Iterable[Dict]) -> Iterator[Dict]:
+    for log in logs:
+        yield dict(log, log_id=str(uuid.uuid4()))
+
+
+class PlannedLogRepository:
+    """Repository for the planned_log table"""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+
+    def _conn(self):
+        return get_connection(self.db_path)
+
+    def _read_conn(self):
+        return get_read_connection(self.db_path)
+
+    def create(self, plan: Dict, logs: Iterable[Dict]) -> Dict:
+        """
+        Insert a plan together with its first materialised logs.
+
+        Args:
+            plan: planned_log values without plan_id
+            logs: Log rows (without log_id) for the plan kind's log table
+
+        Returns:
+            The plan dictionary with its new plan_id
+        """
+        plan = dict(plan, plan_id=str(uuid.uuid4()))
+        with self._conn() as conn:
+            conn.execute("""
+                INSERT INTO planned_log (plan_id, user_id, kind, item_id, amount, rule,
+                                         start_date, end_date, materialized_through)
+                VALUES (:plan_id, :user_id, :kind, :item_id, :amount, :rule,
+                        :start_date, :end_date, :materialized_through)
+            """, plan)
+            conn.executemany(LOG_INSERTS[plan['kind']], _with_ids(logs))
+        return plan
+
+    def find_for_user(self, user_id: str, kind: str) -> List[Dict]:
+        with self._read_conn() as conn:
+            cur = conn.execute(
+                "SELECT * FROM planned_log WHERE user_id = ? AND kind = ? ORDER BY start_date, plan_id",
+                (user_id, kind)
+            )
+            return [dict(r) for r in cur.fetchall()]
+
+    def find_behind(self, user_id: str, kind: str, through: str) -> List[Dict]:
+        """Plans with occurrences up to `through` that are not in the logs yet"""
+        with self._read_conn() as conn:
+            cur = conn.execute("""
+                SELECT * FROM planned_log
+                WHERE user_id = ? AND kind = ?
+                  AND (materialized_through IS NULL OR materialized_through < ?)
+                  AND (end_date IS NULL OR materialized_through IS NULL OR end_date > materialized_through)
+                ORDER BY start_date, plan_id
+            """, (user_id, kind, through))
+            return [dict(r) for r in cur.fetchall()]
+
+    def materialize(self, kind: str, logs: Iterable[Dict],
+                    progress: Iterable[Tuple[str, str]]) -> None:
+        """
+        Insert plan occurrences into the log table and record how far each plan got.
+
+        Args:
+            kind: 'food' or 'activity'
+            logs: Log rows (without log_id) to insert
+            progress: (materialized_through, plan_id) pairs
+        """
+        with self._conn() as conn:
+            conn.executemany(LOG_INSERTS[kind], _with_ids(logs))
+            conn.executemany(
+                "UPDATE planned_log SET materialized_through = ? WHERE plan_id = ?", progress
+            )
+
+    def delete(self, plan_id: str) -> bool:
+        with self._conn() as conn:
+            cur = conn.execute("DELETE FROM planned_log WHERE plan_id = ?", (plan_id,))
+            return cur.rowcount > 0
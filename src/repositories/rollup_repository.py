@@ -0,0 +1,268 @@
+"""
+RollupRepository: cached week and month totals of a user (`rollup` table).
+
+A rollup row holds one period of one granularity (migrations/add_rollups.py):
+food, macro and activity totals summed from the logs like
+NutritionRepository sums a day, the days on target (net kcal within the
+user's kcal_min..kcal_max) and the first and last weigh-in. Rows are
+computed on first read and stay until a trigger deletes the period because
+a log inside it changed, so a report over a multi-year history reads the
+table by its key and recomputes only the invalidated periods.
+
+Periods are day-number ranges (repositories/day_numbers.py):
+- week: Sunday to Saturday, labelled with the Sunday (YYYY-MM-DD)
+- iso_week: Monday to Sunday, labelled YYYY-Www
+- month: calendar month, labelled YYYY-MM
+
+Methods:
+- find_range(user_id, granularity, first_day, last_day) - Cached periods, newest first
+- find_log_days(user_id) - First and last day with any log
+- refresh(user_id, granularity, periods) - Compute and store periods
+- clear_rollups(conn, user_id=None) - Drop cached periods on a caller's transaction
+"""
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from repositories.connection_pool import get_connection, get_read_connection
+from repositories.day_numbers import EPOCH_ORDINAL, day_sql, epoch_day, from_epoch_day
+from repositories.models import Rollup
+from repositories.nutrition_repository import DAY_TOTALS_SQL
+
+GRANULARITIES = ('week', 'iso_week', 'month')
+
+# Food and activity totals per period; {bucket} is period_start_sql('day')
+_PERIOD_TOTALS_SQL = DAY_TOTALS_SQL + """,
+    day_totals AS (
+        SELECT day, TOTAL(kcal) AS kcal, TOTAL(carbs) AS carbs, TOTAL(protein) AS protein,
+               TOTAL(fat) AS fat, SUM(food_entries) AS food_entries,
+               TOTAL(burned) AS burned, SUM(activity_entries) AS activity_entries
+        FROM days
+        GROUP BY day
+    )
+    SELECT {bucket} AS first_day, COUNT(*),
+           TOTAL(kcal), TOTAL(carbs), TOTAL(protein), TOTAL(fat), SUM(food_entries),
+           TOTAL(burned), SUM(activity_entries), TOTAL(kcal) - TOTAL(burned),
+           COUNT(CASE WHEN kcal - burned BETWEEN u.kcal_min AND u.kcal_max THEN 1 END)
+    FROM day_totals, (SELECT kcal_min, kcal_max FROM "user" WHERE user_id = :user_id) u
+    GROUP BY 1
+"""
+
+# Weigh-ins per period with the first and last weight; {bucket} is period_start_sql('w.day')
+_PERIOD_WEIGHTS_SQL = """
+    SELECT DISTINCT bucket,
+           COUNT(*) OVER period, FIRST_VALUE(weight) OVER period, LAST_VALUE(weight) OVER period
+    FROM (
+        SELECT {bucket} AS bucket, w.day, w.created_at, w.weight
+        FROM weightlog w
+        WHERE w.user_id = :user_id AND w.day BETWEEN :first_day AND :last_day
+    )
+    WINDOW period AS (PARTITION BY bucket ORDER BY day, created_at
+                      ROWS BETWEEN UNBOUNDED PRECEDING AND UNBOUNDED FOLLOWING)
+"""
+
+# Each scalar subquery is one seek in a (user, date) or (user, day) index
+_LOG_DAYS_SQL = f"""
+    SELECT MIN(day), MAX(day) FROM (
+        SELECT (SELECT {day_sql('MIN(date)')} FROM foodlog WHERE user_key = :user_key) AS day
+        UNION ALL SELECT (SELECT {day_sql('MAX(date)')} FROM foodlog WHERE user_key = :user_key)
+        UNION ALL SELECT (SELECT {day_sql('MIN(date)')} FROM activitylog WHERE user_key = :user_key)
+        UNION ALL SELECT (SELECT {day_sql('MAX(date)')} FROM activitylog WHERE user_key = :user_key)
+        UNION ALL SELECT (SELECT MIN(day) FROM weightlog WHERE user_id = :user_id)
+        UNION ALL SELECT (SELECT MAX(day) FROM weightlog WHERE user_id = :user_id)
+    )
+"""
+
+_INSERT_SQL = """
+    INSERT OR REPLACE INTO rollup (
+        user_id, granularity, first_day, last_day, period,
+        days_logged, total_kcal_consumed, total_carbs_g, total_protein_g, total_fat_g,
+        food_entries_count, total_kcal_burned, activity_entries_count, net_kcal,
+        days_on_target, weigh_ins, weight_start, weight_end
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Figures of a period without logs
+_EMPTY_TOTALS = (0, 0.0, 0.0, 0.0, 0.0, 0, 0.0, 0, 0.0, 0)
+
+
+def _check_granularity(granularity: str):
+    if granularity not in GRANULARITIES:
+        raise ValueError(f"Unknown granularity '{granularity}', expected one of {', '.join(GRANULARITIES)}")
+
+
+def period_start(granularity: str, day: int) -> int:
+    """First day number of the period containing a day"""
+    _check_granularity(granularity)
+    if granularity == 'week':
+        return day - (day + 4) % 7
+    if granularity == 'iso_week':
+        return day - (day + 3) % 7
+    return day - date.fromordinal(day + EPOCH_ORDINAL).day + 1
+
+
+def period_end(granularity: str, first_day: int) -> int:
+    """Last day number of the period starting on first_day"""
+    if granularity != 'month':
+        return first_day + 6
+    first = date.fromordinal(first_day + EPOCH_ORDINAL)
+    next_month = (first.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return epoch_day(next_month) - 1
+
+
+def period_label(granularity: str, first_day: int) -> str:
+    """Display label of the period starting on first_day"""
+    first = date.fromordinal(first_day + EPOCH_ORDINAL)
+    if granularity == 'iso_week':
+        year, week, _ = first.isocalendar()
+        return f"{year}-W{week:02d}"
+    if granularity == 'month':
+        return f"{first:%Y-%m}"
+    return first.isoformat()
+
+
+def periods_between(granularity: str, first_day: int, last_day: int) -> List[Tuple[int, int]]:
+    """(first_day, last_day) of every period overlapping first_day..last_day, oldest first"""
+    periods = []
+    start = period_start(granularity, first_day)
+    while start <= last_day:
+        end = period_end(granularity, start)
+        periods.append((start, end))
+        start = end + 1
+    return periods
+
+
+def period_start_sql(granularity: str, day: str) -> str:
+    """SQL expression of the first day number of the period containing a day column"""
+    _check_granularity(granularity)
+    if granularity == 'week':
+        return f"({day} - ({day} + 4) % 7)"
+    if granularity == 'iso_week':
+        return f"({day} - ({day} + 3) % 7)"
+    return f"({day} - CAST(strftime('%d', {day} * 86400, 'unixepoch') AS INTEGER) + 1)"
+
+
+def clear_rollups(conn, user_id: Optional[str] = None) -> int:
+    """
+    Delete cached periods on the given connection, inside its transaction.
+
+    Bulk writers that suspend the rollup triggers (scripts/generate_demo_data.py)
+    call this before committing.
+
+    Returns:
+        Number of rows deleted
+    """
+    if user_id is None:
+        cur = conn.execute("DELETE FROM rollup")
+    else:
+        cur = conn.execute("DELETE FROM rollup WHERE user_id = ?", (user_id,))
+    return cur.rowcount
+
+
+def _contiguous(periods: List[Tuple[int, int]]) -> List[List[Tuple[int, int]]]:
+    """Split sorted periods into runs without gaps"""
+    runs = []
+    for period in periods:
+        if runs and runs[-1][-1][1] + 1 == period[0]:
+            runs[-1].append(period)
+        else:
+            runs.append([period])
+    return runs
+
+
+class RollupRepository:
+    """Repository for the cached week and month rollups"""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+
+    def _conn(self):
+        """Get the shared pooled connection (row factory already set)"""
+        return get_connection(self.db_path)
+
+    def _read_conn(self):
+        """Get the pooled read-only connection for queries"""
+        return get_read_connection(self.db_path)
+
+    def find_range(self, user_id: str, granularity: str, first_day: int, last_day: int) -> List[Rollup]:
+        """
+        Get the cached periods starting within a day range.
+
+        Args:
+            user_id: The user's ID
+            granularity: 'week', 'iso_week' or 'month'
+            first_day: First period start (day number, inclusive)
+            last_day: Last period start (day number, inclusive)
+
+        Returns:
+            Rollup records, newest first
+        """
+        with self._read_conn() as conn:
+            cur = conn.cursor()
+            cur.row_factory = Rollup.from_row
+            cur.execute("""
+                SELECT granularity, period,
+                       date(first_day * 86400, 'unixepoch'), date(last_day * 86400, 'unixepoch'),
+                       days_logged, total_kcal_consumed, total_carbs_g, total_protein_g, total_fat_g,
+                       food_entries_count, total_kcal_burned, activity_entries_count, net_kcal,
+                       days_on_target, weigh_ins, weight_start, weight_end
+                FROM rollup
+                WHERE user_id = ? AND granularity = ? AND first_day BETWEEN ? AND ?
+                ORDER BY first_day DESC
+            """, (user_id, granularity, first_day, last_day))
+            return cur.fetchall()
+
+    def find_log_days(self, user_id: str) -> Optional[Tuple[int, int]]:
+        """First and last day number with a food, activity or weight log, None without logs"""
+        with self._read_conn() as conn:
+            cur = conn.cursor()
+            cur.execute('SELECT user_key FROM "user" WHERE user_id = ?', (user_id,))
+            row = cur.fetchone()
+            if row is None:
+                return None
+            cur.execute(_LOG_DAYS_SQL, {'user_id': user_id, 'user_key': row[0]})
+            first_day, last_day = cur.fetchone()
+            return None if first_day is None else (first_day, last_day)
+
+    def refresh(self, user_id: str, granularity: str, periods: List[Tuple[int, int]]) -> int:
+        """
+        Compute periods from the logs and store them.
+
+        Each run of adjacent periods is one grouped query over its days.
+        The logs are read and the rows written in one write transaction, so
+        a log saved meanwhile cannot be missed by both the query and its
+        invalidation trigger.
+
+        Args:
+            user_id: The user's ID
+            granularity: 'week', 'iso_week' or 'month'
+            periods: (first_day, last_day) of whole periods, oldest first
+
+        Returns:
+            Number of periods stored
+        """
+        rows = []
+        with self._conn() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            for run in _contiguous(periods):
+                params = {'user_id': user_id, 'first_day': run[0][0], 'last_day': run[-1][1],
+                          'first_date': from_epoch_day(run[0][0]), 'last_date': from_epoch_day(run[-1][1])}
+                day_range = " AND {alias}.date BETWEEN :first_date AND :last_date"
+                totals: Dict[int, tuple] = {
+                    row[0]: tuple(row[1:]) for row in conn.execute(
+                        _PERIOD_TOTALS_SQL.format(food_range=day_range.format(alias='fl'),
+                                                  activity_range=day_range.format(alias='al'),
+                                                  bucket=period_start_sql(granularity, 'day')),
+                        params)
+                }
+                weights: Dict[int, tuple] = {
+                    row[0]: tuple(row[1:]) for row in conn.execute(
+                        _PERIOD_WEIGHTS_SQL.format(bucket=period_start_sql(granularity, 'w.day')),
+                        params)
+                }
+                for first_day, last_day in run:
+                    rows.append((user_id, granularity, first_day, last_day,
+                                 period_label(granularity, first_day),
+                                 *totals.get(first_day, _EMPTY_TOTALS),
+                                 *weights.get(first_day, (0, None, None))))
+            conn.executemany(_INSERT_SQL, rows)
+        return len(rows)
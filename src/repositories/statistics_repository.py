@@ -0,0 +1,178 @@
+"""
+StatisticsRepository: SQLite repository for the per-day `statistics` table.
+
+The table holds one row per (user_id, date) with food, macro and activity
+totals. Database triggers (migrations/add_integer_keys.py) keep the
+rows current on every foodlog/activitylog insert, update and delete, so the
+totals dashboards read finished numbers instead of aggregating all logs.
+
+Methods:
+- find_daily_totals(user_id, start_date, end_date) - Day rows of a user, newest first
+- rebuild(user_id=None) - Recompute rows from the logs (backfill/repair)
+- rebuild_statistics(conn, user_id=None) - The same on a caller's transaction
+"""
+from typing import List, Dict, Optional
+
+from repositories.connection_pool import get_connection, get_read_connection
+
+# Every day that has at least one log, with its food and activity totals.
+# The logs reference users by user_key; statistics rows keep the user_id.
+# {food_filter}/{activity_filter} are empty (all users) or _USER_FILTER.
+_REBUILD_SQL = """
+    WITH food_totals AS (
+        SELECT fl.user_key, fl.date,
+               SUM((fl.portion_size_g / 100.0) * COALESCE(f.kcal_per_portion, 0.0)) AS kcal,
+               SUM((fl.portion_size_g / 100.0) * COALESCE(f.carbs_per_portion, 0.0)) AS carbs,
+               SUM((fl.portion_size_g / 100.0) * COALESCE(f.protein_per_portion, 0.0)) AS protein,
+               SUM((fl.portion_size_g / 100.0) * COALESCE(f.fat_per_portion, 0.0)) AS fat,
+               COUNT(*) AS entries
+        FROM foodlog fl
+        LEFT JOIN food f ON f.food_key = fl.food_key
+        {food_filter}
+        GROUP BY fl.user_key, fl.date
+    ),
+    activity_totals AS (
+        SELECT al.user_key, al.date,
+               SUM(COALESCE(al.kcal_burned, 0.0)) AS kcal,
+               COUNT(*) AS entries
+        FROM activitylog al
+        {activity_filter}
+        GROUP BY al.user_key, al.date
+    ),
+    -- One row per (user, day) from either side, summed below. Joining the
+    -- two CTEs to a list of days instead makes SQLite scan one of them for
+    -- every day (quadratic in the number of days).
+    day_totals AS (
+        SELECT user_key, date, kcal, carbs, protein, fat, entries AS food_entries,
+               0.0 AS burned, 0 AS activity_entries
+        FROM food_totals
+        UNION ALL
+        SELECT user_key, date, 0.0, 0.0, 0.0, 0.0, 0, kcal, entries
+        FROM activity_totals
+    )
+    INSERT INTO statistics (
+        stats_id, user_id, date,
+        total_kcal_consumed, total_carbs_g, total_protein_g, total_fat_g, food_entries_count,
+        total_kcal_burned, activity_entries_count, net_kcal
+    )
+    SELECT lower(hex(randomblob(16))), u.user_id, d.date,
+           TOTAL(d.kcal), TOTAL(d.carbs), TOTAL(d.protein), TOTAL(d.fat), SUM(d.food_entries),
+           TOTAL(d.burned), SUM(d.activity_entries), TOTAL(d.kcal) - TOTAL(d.burned)
+    FROM day_totals d
+    JOIN "user" u ON u.user_key = d.user_key
+    WHERE true
+    GROUP BY d.user_key, d.date
+    ON CONFLICT(user_id, date) DO UPDATE SET
+        total_kcal_consumed = excluded.total_kcal_consumed,
+        total_carbs_g = excluded.total_carbs_g,
+        total_protein_g = excluded.total_protein_g,
+        total_fat_g = excluded.total_fat_g,
+        food_entries_count = excluded.food_entries_count,
+        total_kcal_burned = excluded.total_kcal_burned,
+        activity_entries_count = excluded.activity_entries_count,
+        net_kcal = excluded.net_kcal
+"""
+
+# One user's logs. A plain equality so the (user_key, ...) indexes are used;
+# "OR :user_id IS NULL" would turn every rebuild into a full table scan.
+_USER_FILTER = 'WHERE {alias}.user_key = (SELECT user_key FROM "user" WHERE user_id = :user_id)'
+
+
+def rebuild_statistics(conn, user_id: Optional[str] = None) -> int:
+    """
+    Recompute statistics rows on the given connection, inside its transaction.
+
+    Bulk writers that suspend the triggers (scripts/generate_demo_data.py)
+    call this before committing; StatisticsRepository.rebuild otherwise.
+
+    Returns:
+        Number of day rows written
+    """
+    if user_id is None:
+        stats_filter, food_filter, activity_filter = "true", "", ""
+    else:
+        stats_filter = "user_id = :user_id"
+        food_filter, activity_filter = _USER_FILTER.format(alias='fl'), _USER_FILTER.format(alias='al')
+    cur = conn.cursor()
+    # Reset log-derived figures so days whose logs are gone drop out
+    cur.execute(f"""
+        UPDATE statistics
+        SET total_kcal_consumed = 0.0, total_carbs_g = 0.0, total_protein_g = 0.0,
+            total_fat_g = 0.0, food_entries_count = 0, total_kcal_burned = 0.0,
+            activity_entries_count = 0, net_kcal = 0.0
+        WHERE {stats_filter}
+    """, {'user_id': user_id})
+    cur.execute(_REBUILD_SQL.format(food_filter=food_filter, activity_filter=activity_filter),
+                {'user_id': user_id})
+    # cursor.rowcount is -1 for statements starting with WITH
+    written = cur.execute("SELECT changes()").fetchone()[0]
+    cur.execute(f"""
+        DELETE FROM statistics
+        WHERE {stats_filter}
+          AND food_entries_count = 0 AND activity_entries_count = 0
+          AND total_weight IS NULL
+    """, {'user_id': user_id})
+    return written
+
+
+class StatisticsRepository:
+    """Repository for the per-day statistics table"""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+
+    def _conn(self):
+        """Get the shared pooled connection (row factory already set)"""
+        return get_connection(self.db_path)
+
+    def _read_conn(self):
+        """Get the pooled read-only connection for queries"""
+        return get_read_connection(self.db_path)
+
+    def find_daily_totals(self, user_id: str, start_date: Optional[str] = None,
+                          end_date: Optional[str] = None) -> List[Dict]:
+        """
+        Get the per-day statistics rows of a user, newest first.
+
+        A range scan of idx_statistics_user_date when bounded.
+
+        Args:
+            user_id: The user's ID
+            start_date: First date (YYYY-MM-DD, inclusive; None = no limit)
+            end_date: Last date (YYYY-MM-DD, inclusive; None = no limit)
+
+        Returns:
+            List of statistics dictionaries
+        """
+        conditions = ["user_id = :user_id"]
+        if start_date is not None:
+            conditions.append("date >= :start_date")
+        if end_date is not None:
+            conditions.append("date <= :end_date")
+        with self._read_conn() as conn:
+            cur = conn.cursor()
+            cur.execute(f"""
+                SELECT date, total_kcal_consumed, total_carbs_g, total_protein_g,
+                       total_fat_g, food_entries_count, total_kcal_burned,
+                       activity_entries_count, net_kcal
+                FROM statistics
+                WHERE {" AND ".join(conditions)}
+                ORDER BY date DESC
+            """, {'user_id': user_id, 'start_date': start_date, 'end_date': end_date})
+            return [dict(r) for r in cur.fetchall()]
+
+    def rebuild(self, user_id: Optional[str] = None) -> int:
+        """
+        Recompute statistics rows from the logs in one set-based pass.
+
+        Needed once after installing the triggers (backfill) and after
+        changes the triggers cannot see, such as editing a food's nutrients.
+
+        Args:
+            user_id: Rebuild only this user (None = all users)
+
+        Returns:
+            Number of day rows written
+        """
+        with self._conn() as conn:
+            return rebuild_statistics(conn, user_id)
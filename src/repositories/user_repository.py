@@ -2,20 +2,14 @@
 # expanded user-record of repositories/user_repository.py
 # SQLite: UserRepository: create, find_by_username, authenticate
 
-import sqlite3
 import uuid
-import hashlib
 import os
 from typing import Optional
 
 # Import the User dataclass from the package
 from repositories.models import User
-
-
-def _hash_password(password: str, salt: bytes, iterations: int = 100_000) -> str:
-    # pbkdf2_hmac tuottaa bytes; palautetaan hex
-    dk = hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt, iterations)
-    return dk.hex()
+from repositories.connection_pool import get_connection
+from repositories.credentials import hash_password, needs_rehash, verify_dummy, verify_password
 
 
 class UserRepository:
@@ -26,15 +20,12 @@ class UserRepository:
             raise FileNotFoundError(f"Database not found: {db_path}")
 
     def _conn(self):
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        return conn
+        return get_connection(self.db_path)
 
     def create_user(self, username: str, password: str, **kwargs) -> User:
-        # generoi uuid ja salt
+        # generoi uuid; suola sisältyy hash-merkkijonoon ja tallennetaan myös salt-sarakkeeseen
         user_id = str(uuid.uuid4())
-        salt = os.urandom(16)
-        password_hash = _hash_password(password, salt)
+        password_hash, salt = hash_password(password)
 
         with self._conn() as conn:
             cur = conn.cursor()
@@ -49,7 +40,7 @@ class UserRepository:
                     user_id,
                     username,
                     password_hash,
-                    salt.hex(),
+                    salt,
                     kwargs.get("weight"),
                     kwargs.get("length"),
                     kwargs.get("age"),
@@ -66,7 +57,7 @@ class UserRepository:
             user_id=user_id,
             username=username,
             password_hash=password_hash,
-            salt=salt.hex(),
+            salt=salt,
             weight=kwargs.get("weight"),
             length=kwargs.get("length"),
             age=kwargs.get("age"),
@@ -99,13 +90,32 @@ class UserRepository:
                 weight_loss_target=row["weight_loss_target"],
             )
 
+    def find_weight_target(self, user_id: str) -> Optional[float]:
+        """Weight loss target (kg) of a user, None if not set"""
+        with self._conn() as conn:
+            cur = conn.cursor()
+            cur.execute('SELECT weight_loss_target FROM "user" WHERE user_id = ?', (user_id,))
+            row = cur.fetchone()
+            return row[0] if row else None
+
     def authenticate(self, username: str, password: str) -> bool:
         user = self.find_by_username(username)
         if not user:
+            return verify_dummy(password)
+        if not verify_password(password, user.password_hash, user.salt):
             return False
-        salt = bytes.fromhex(user.salt)
-        expected = _hash_password(password, salt)
-        return expected == user.password_hash
+        if needs_rehash(user.password_hash):
+            # Salasana on nyt tiedossa: päivitetään hash nykyisiin parametreihin
+            self.update_password_hash(user.user_id, *hash_password(password))
+        return True
+
+    def update_password_hash(self, user_id: str, password_hash: str, salt: str):
+        with self._conn() as conn:
+            conn.execute(
+                'UPDATE "user" SET password_hash = ?, salt = ? WHERE user_id = ?',
+                (password_hash, salt, user_id),
+            )
+            conn.commit()
 
 
 # Refactoroitu, aiemmin generoitu koodi päättyy
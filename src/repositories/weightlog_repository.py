@@ -3,18 +3,36 @@ WeightLogRepository: SQLite repository for WeightLog entity.
 
 Methods:
 - find_all(user_id) - Get all weight logs for a user
+- find_page(user_id, after, limit, columns) - Keyset page ordered by (date, log_id)
+- iter_all(user_id, columns) - Stream all weight logs page by page
+- find_series(user_id) - (date, weight) pairs in ascending order for analytics
 - find_by_id(log_id) - Get a specific weight log by ID
 - find_by_date_range(user_id, start_date, end_date) - Get weight logs in date range
+- find_by_date_range_with_weeks(user_id, start_date, end_date) - Same with ISO week columns
 - find_latest(user_id) - Get the most recent weight log for a user
 - create(user_id, date, weight, notes) - Create a new weight log entry
 - update(log_id, weight, notes) - Update an existing weight log
 - delete(log_id) - Delete a weight log entry
 """
-import sqlite3
 import uuid
-from typing import List, Optional, Dict
+from typing import Iterable, Iterator, List, Optional, Dict, Tuple
 from datetime import datetime
 
+from repositories.connection_pool import get_connection, get_read_connection
+from repositories.day_numbers import epoch_day, iso_week_sql
+from repositories.keyset import DEFAULT_PAGE_SIZE, RowFactory, iter_keyset, keyset_clause, select_list
+
+# Columns available to find_page/iter_all projections
+PAGE_COLUMNS = {c: c for c in (
+    'log_id',
+    'user_id',
+    'date',
+    'weight',
+    'notes',
+    'created_at',
+)}
+KEY_COLUMNS = ('date', 'log_id')
+
 
 class WeightLogRepository:
     """Repository for weight log database operations"""
@@ -23,10 +41,12 @@ class WeightLogRepository:
         self.db_path = db_path
 
     def _conn(self):
-        """Create database connection with row factory"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        return conn
+        """Get the shared pooled connection (row factory already set)"""
+        return get_connection(self.db_path)
+
+    def _read_conn(self):
+        """Get the pooled read-only connection for queries"""
+        return get_read_connection(self.db_path)
 
     def find_all(self, user_id: str) -> List[Dict]:
         """
@@ -38,7 +58,7 @@ class WeightLogRepository:
         Returns:
             List of weight log dictionaries
         """
-        with self._conn() as conn:
+        with self._read_conn() as conn:
             cur = conn.cursor()
             cur.execute("""
                 SELECT log_id, user_id, date, weight, notes, created_at
@@ -48,6 +68,71 @@ class WeightLogRepository:
             """, (user_id,))
             return [dict(r) for r in cur.fetchall()]
 
+    def find_page(self, user_id: str, after: Optional[Tuple[str, str]] = None,
+                  limit: int = DEFAULT_PAGE_SIZE, columns: Optional[Iterable[str]] = None,
+                  descending: bool = False) -> List[Dict]:
+        """
+        Get one page of weight logs ordered by (date, log_id).
+        
+        Args:
+            user_id: The user's ID
+            after: (date, log_id) of the last row of the previous page
+            limit: Page size
+            columns: Columns to select (default: all; the key columns are always included)
+            descending: Newest first
+            
+        Returns:
+            List of weight log dictionaries
+        """
+        condition, order = keyset_clause(KEY_COLUMNS, descending)
+        sql = f"SELECT {select_list(columns, PAGE_COLUMNS, KEY_COLUMNS)} FROM weightlog WHERE user_id = ?"
+        params = [user_id]
+        if after is not None:
+            sql += f" AND {condition}"
+            params.extend(after)
+        sql += f" ORDER BY {order} LIMIT ?"
+        params.append(limit)
+        with self._read_conn() as conn:
+            cur = conn.cursor()
+            cur.execute(sql, params)
+            return [dict(r) for r in cur.fetchall()]
+
+    def iter_all(self, user_id: str, columns: Optional[Iterable[str]] = None,
+                 descending: bool = False, page_size: int = DEFAULT_PAGE_SIZE) -> Iterator[Dict]:
+        """
+        Stream all weight logs of a user with keyset pagination.
+        
+        Only one page is held in memory, so exports of long histories stay
+        bounded. Arguments as in find_page.
+        """
+        return iter_keyset(
+            lambda after, limit: self.find_page(user_id, after, limit, columns, descending),
+            KEY_COLUMNS, page_size
+        )
+
+    def find_series(self, user_id: str) -> List[Tuple[str, float]]:
+        """
+        Get the whole weight series of a user as (date, weight) tuples.
+        
+        Lighter than find_all for analytics: two columns, no dicts, ascending
+        order (same-day entries in the order they were logged).
+        
+        Args:
+            user_id: The user's ID
+            
+        Returns:
+            List of (date, weight) tuples
+        """
+        with self._read_conn() as conn:
+            cur = conn.cursor()
+            cur.execute("""
+                SELECT date, weight
+                FROM weightlog
+                WHERE user_id = ?
+                ORDER BY date, created_at
+            """, (user_id,))
+            return [(r[0], r[1]) for r in cur.fetchall()]
+
     def find_by_id(self, log_id: str) -> Optional[Dict]:
         """
         Get a specific weight log by ID.
@@ -58,7 +143,7 @@ class WeightLogRepository:
         Returns:
             Weight log dictionary or None if not found
         """
-        with self._conn() as conn:
+        with self._read_conn() as conn:
             cur = conn.cursor()
             cur.execute("""
                 SELECT log_id, user_id, date, weight, notes, created_at
@@ -80,14 +165,49 @@ class WeightLogRepository:
         Returns:
             List of weight log dictionaries
         """
-        with self._conn() as conn:
+        with self._read_conn() as conn:
             cur = conn.cursor()
             cur.execute("""
                 SELECT log_id, user_id, date, weight, notes, created_at
                 FROM weightlog
-                WHERE user_id = ? AND date BETWEEN ? AND ?
-                ORDER BY date DESC
-            """, (user_id, start_date, end_date))
+                WHERE user_id = ? AND day BETWEEN ? AND ?
+                ORDER BY day DESC
+            """, (user_id, epoch_day(start_date), epoch_day(end_date)))
+            return [dict(r) for r in cur.fetchall()]
+
+    def find_by_date_range_with_weeks(self, user_id: str, start_date: str, end_date: str,
+                                      row_factory: Optional[RowFactory] = None) -> List:
+        """
+        Get weight logs in a date range with the ISO week of each log.
+        
+        The week is computed in SQL from the day number, so no date is
+        parsed in Python.
+        
+        Args:
+            user_id: The user's ID
+            start_date: Start date (YYYY-MM-DD format)
+            end_date: End date (YYYY-MM-DD format)
+            row_factory: Build each row from the (log_id, user_id, date, weight,
+                notes, created_at, week_start_date, year, week_number) tuple
+                instead of a dictionary
+            
+        Returns:
+            List of weight log dictionaries (or row_factory records) with
+            week_start_date, year and week_number, newest first
+        """
+        with self._read_conn() as conn:
+            cur = conn.cursor()
+            if row_factory is not None:
+                cur.row_factory = row_factory
+            cur.execute(f"""
+                SELECT log_id, user_id, date, weight, notes, created_at,
+                       {iso_week_sql('day')}
+                FROM weightlog
+                WHERE user_id = ? AND day BETWEEN ? AND ?
+                ORDER BY day DESC
+            """, (user_id, epoch_day(start_date), epoch_day(end_date)))
+            if row_factory is not None:
+                return cur.fetchall()
             return [dict(r) for r in cur.fetchall()]
 
     def find_latest(self, user_id: str) -> Optional[Dict]:
@@ -100,7 +220,7 @@ class WeightLogRepository:
         Returns:
             Weight log dictionary or None if no logs exist
         """
-        with self._conn() as conn:
+        with self._read_conn() as conn:
             cur = conn.cursor()
             cur.execute("""
                 SELECT log_id, user_id, date, weight, notes, created_at
@@ -123,7 +243,7 @@ class WeightLogRepository:
         Returns:
             Weight log dictionary or None if not found
         """
-        with self._conn() as conn:
+        with self._read_conn() as conn:
             cur = conn.cursor()
             cur.execute("""
                 SELECT log_id, user_id, date, weight, notes, created_at
@@ -216,7 +336,7 @@ class WeightLogRepository:
         Returns:
             Number of weight log entries
         """
-        with self._conn() as conn:
+        with self._read_conn() as conn:
             cur = conn.cursor()
             cur.execute("SELECT COUNT(*) FROM weightlog WHERE user_id = ?", (user_id,))
             return cur.fetchone()[0]
@@ -33,8 +33,9 @@ def aggregate_daily_activities_totals(conn: sqlite3.Connection, user_id: str):
                SUM( (al.activity_count / 1000.0) * COALESCE(al.kcal_burned, 0.0) ) AS total_calories,
                COUNT(*) AS entries
         FROM activitylog al
-        LEFT JOIN activity a ON al.activity_id = a.activity_id
-        WHERE al.user_id = ?
+        JOIN "user" u ON u.user_key = al.user_key
+        LEFT JOIN activity a ON a.activity_key = al.activity_key
+        WHERE u.user_id = ?
         GROUP BY al.date
         ORDER BY al.date DESC
     """, (user_id,))
@@ -34,8 +34,9 @@ def aggregate_daily_foods_totals(conn: sqlite3.Connection, user_id: str):
                SUM( (fl.portion_size_g / 100.0) * COALESCE(f.kcal_per_portion, 0.0) ) AS total_calories,
                COUNT(*) AS entries
         FROM foodlog fl
-        LEFT JOIN food f ON fl.food_id = f.food_id
-        WHERE fl.user_id = ?
+        JOIN "user" u ON u.user_key = fl.user_key
+        LEFT JOIN food f ON f.food_key = fl.food_key
+        WHERE u.user_id = ?
         GROUP BY fl.date
         ORDER BY fl.date DESC
     """, (user_id,))
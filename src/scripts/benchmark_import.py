@@ -0,0 +1,90 @@
+"""
+scripts/benchmark_import.py
+CLI: Compare the batched CSV import engine with the old row-by-row import.
+Both paths import the same generated foods CSV into fresh temporary
+databases; time and peak Python memory (tracemalloc) are printed.
+Usage:
+    python3 scripts/benchmark_import.py [--rows N] [--batch-size N]
+Example:
+    python3 scripts/benchmark_import.py --rows 200000
+"""
+import argparse
+import csv
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+import tracemalloc
+import uuid
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from create_db import create_db
+from scripts.csv_import import DEFAULT_BATCH_SIZE
+from scripts.import_foods import import_csv
+
+
+def write_foods_csv(path: str, rows: int):
+    with open(path, "w", newline="", encoding="utf-8") as fh:
+        writer = csv.writer(fh)
+        writer.writerow(["name", "calories_per_portion", "carbs_per_portion",
+                         "protein_per_portion", "fat_per_portion"])
+        for i in range(rows):
+            writer.writerow([f"Benchmark food {i}", 50 + i % 400, i % 60, i % 30, i % 20])
+
+
+def legacy_import(csv_path: str, db_path: str):
+    """The previous import: one execute() and one uuid4 per row"""
+    conn = sqlite3.connect(db_path)
+    cur = conn.cursor()
+    with open(csv_path, newline="", encoding="utf-8") as fh:
+        for row in csv.DictReader(fh):
+            cur.execute("""
+                INSERT INTO food (food_id, name, kcal_per_portion, carbs_per_portion, protein_per_portion, fat_per_portion)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, (str(uuid.uuid4()), row["name"], float(row["calories_per_portion"]),
+                  float(row["carbs_per_portion"]), float(row["protein_per_portion"]),
+                  float(row["fat_per_portion"])))
+    conn.commit()
+    conn.close()
+
+
+def measure(label: str, func, rows: int):
+    tracemalloc.start()
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<28} {elapsed:8.2f} s  {rows / elapsed:10.0f} rows/s  peak {peak / 1024 / 1024:6.1f} MiB")
+
+
+def fresh_db(directory: str, name: str) -> str:
+    path = os.path.join(directory, name)
+    create_db(path, insert_test=False)
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the foods CSV import")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, "foods.csv")
+        write_foods_csv(csv_path, args.rows)
+        legacy_db = fresh_db(tmp, "legacy.db")
+        batched_db = fresh_db(tmp, "batched.db")
+
+        print(f"\nImporting {args.rows} foods")
+        measure("row by row (old)", lambda: legacy_import(csv_path, legacy_db), args.rows)
+        measure(f"executemany x{args.batch_size}",
+                lambda: import_csv(csv_path, batched_db, args.batch_size), args.rows)
+        measure("re-import (upsert)",
+                lambda: import_csv(csv_path, batched_db, args.batch_size), args.rows)
+
+
+if __name__ == "__main__":
+    main()
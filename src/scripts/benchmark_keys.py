@@ -0,0 +1,190 @@
+"""
+scripts/benchmark_keys.py
+CLI: Measure the integer surrogate keys migration (schema version 7).
+A database at schema version 6 (UUID text keys) is filled with generated
+food logs, copied and migrated to version 7; file and log table sizes and
+the per-user daily totals query time are printed before and after. Insert
+throughput is measured on fresh databases of both layouts with the same logs.
+Usage:
+    python3 scripts/benchmark_keys.py [--rows N] [--users N] [--batch-size N]
+Example:
+    python3 scripts/benchmark_keys.py --rows 200000
+"""
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+import uuid
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from create_db import create_db
+from migrations.add_integer_keys import SCHEMA_VERSION
+from migrations.run_migrations import run_migrations
+from repositories.engine_settings import connect
+from repositories.planned_log_repository import LOG_INSERTS
+
+# Food log insert of schema version 6, same parameters as LOG_INSERTS['food']
+UUID_INSERT = """
+    INSERT INTO foodlog (log_id, user_id, food_id, date, portion_size_g)
+    VALUES (:log_id, :user_id, :item_id, :date, :amount)
+"""
+
+# Daily kcal of one user, per layout
+TOTALS_QUERIES = {
+    'uuid': """
+        SELECT fl.date, SUM((fl.portion_size_g / 100.0) * f.kcal_per_portion), COUNT(*)
+        FROM foodlog fl JOIN food f ON f.food_id = fl.food_id
+        WHERE fl.user_id = ?
+        GROUP BY fl.date
+    """,
+    'keyed': """
+        SELECT fl.date, SUM((fl.portion_size_g / 100.0) * f.kcal_per_portion), COUNT(*)
+        FROM foodlog fl
+        JOIN "user" u ON u.user_key = fl.user_key
+        JOIN food f ON f.food_key = fl.food_key
+        WHERE u.user_id = ?
+        GROUP BY fl.date
+    """,
+}
+
+FOOD_COUNT = 500
+
+
+def fresh_db(directory: str, name: str, target: int) -> str:
+    path = os.path.join(directory, name)
+    create_db(path, insert_test=False, migrate=False)
+    run_migrations(path, target=target)
+    return path
+
+
+def seed_catalog(db_path: str, users: int):
+    """Users and foods with UUID ids; returns (user ids, food ids)"""
+    user_ids = [str(uuid.uuid4()) for _ in range(users)]
+    food_ids = [str(uuid.uuid4()) for _ in range(FOOD_COUNT)]
+    conn = connect(db_path)
+    with conn:
+        conn.executemany(
+            'INSERT INTO "user" (user_id, username, password_hash, salt) VALUES (?, ?, ?, ?)',
+            [(uid, f"bench{i}", "x", "x") for i, uid in enumerate(user_ids)]
+        )
+        conn.executemany(
+            "INSERT INTO food (food_id, name, kcal_per_portion) VALUES (?, ?, ?)",
+            [(fid, f"Benchmark food {i}", 50 + i % 400) for i, fid in enumerate(food_ids)]
+        )
+    conn.close()
+    return user_ids, food_ids
+
+
+def generate_logs(user_ids, food_ids, rows: int, seed: int = 1):
+    """Log rows in arrival order: each day, every user logs a few foods"""
+    rng = random.Random(seed)
+    start = date.today() - timedelta(days=rows // (len(user_ids) * 4) + 1)
+    logs = []
+    day = 0
+    while len(logs) < rows:
+        date_str = (start + timedelta(days=day)).isoformat()
+        for user_id in user_ids:
+            for _ in range(4):
+                logs.append({'log_id': str(uuid.uuid4()), 'user_id': user_id,
+                             'item_id': rng.choice(food_ids), 'date': date_str,
+                             'amount': float(rng.randint(50, 400))})
+        day += 1
+    return logs[:rows]
+
+
+def insert_logs(db_path: str, sql: str, logs, batch_size: int) -> float:
+    """Insert logs in transactions of batch_size rows; returns rows/s"""
+    conn = connect(db_path)
+    start = time.perf_counter()
+    for i in range(0, len(logs), batch_size):
+        with conn:
+            conn.executemany(sql, logs[i:i + batch_size])
+    elapsed = time.perf_counter() - start
+    conn.close()
+    return len(logs) / elapsed
+
+
+def sizes(db_path: str) -> dict:
+    """Bytes of the file and of the foodlog table with its indexes (vacuumed)"""
+    conn = connect(db_path)
+    try:
+        conn.execute("VACUUM")
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        rows = conn.execute("""
+            SELECT name, SUM(pgsize) FROM dbstat
+            WHERE name = 'foodlog'
+               OR name IN (SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'foodlog')
+            GROUP BY name
+        """).fetchall()
+    finally:
+        conn.close()
+    result = dict(rows)
+    result['file'] = os.path.getsize(db_path)
+    return result
+
+
+def time_totals(db_path: str, layout: str, user_ids, repeat: int = 20) -> float:
+    """Milliseconds per daily totals query, averaged over users"""
+    conn = connect(db_path, read_only=True)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for user_id in user_ids:
+            conn.execute(TOTALS_QUERIES[layout], (user_id,)).fetchall()
+    elapsed = time.perf_counter() - start
+    conn.close()
+    return elapsed * 1000 / (repeat * len(user_ids))
+
+
+def mib(value: int) -> str:
+    return f"{value / 1024 / 1024:8.2f} MiB"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark integer surrogate keys")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        before_db = fresh_db(tmp, "uuid.db", SCHEMA_VERSION - 1)
+        user_ids, food_ids = seed_catalog(before_db, args.users)
+        logs = generate_logs(user_ids, food_ids, args.rows)
+        uuid_rate = insert_logs(before_db, UUID_INSERT, logs, args.batch_size)
+
+        after_db = os.path.join(tmp, "migrated.db")
+        shutil.copy(before_db, after_db)
+        start = time.perf_counter()
+        run_migrations(after_db)
+        migrate_seconds = time.perf_counter() - start
+
+        keyed_db = fresh_db(tmp, "keyed.db", SCHEMA_VERSION)
+        conn = connect(keyed_db)
+        with conn:
+            conn.execute("ATTACH DATABASE ? AS src", (before_db,))
+            conn.execute('INSERT INTO "user" (user_id, username, password_hash, salt) '
+                         'SELECT user_id, username, password_hash, salt FROM src."user"')
+            conn.execute("INSERT INTO food (food_id, name, kcal_per_portion) "
+                         "SELECT food_id, name, kcal_per_portion FROM src.food")
+        conn.execute("DETACH DATABASE src")
+        conn.close()
+        keyed_rate = insert_logs(keyed_db, LOG_INSERTS['food'], logs, args.batch_size)
+
+        before, after = sizes(before_db), sizes(after_db)
+        print(f"\n{args.rows} food logs, {args.users} users, {FOOD_COUNT} foods")
+        print(f"Migration to version {SCHEMA_VERSION}: {migrate_seconds:.2f} s")
+        print(f"{'':<32} {'UUID keys':>12} {'integer keys':>14}")
+        for name in sorted(set(before) | set(after), key=lambda n: (n == 'file', n)):
+            print(f"{name:<32} {mib(before.get(name, 0))} {mib(after.get(name, 0)):>16}")
+        print(f"{'insert rows/s':<32} {uuid_rate:12.0f} {keyed_rate:14.0f}")
+        print(f"{'daily totals ms/query':<32} {time_totals(before_db, 'uuid', user_ids):12.2f} "
+              f"{time_totals(after_db, 'keyed', user_ids):14.2f}")
+
+
+if __name__ == "__main__":
+    main()
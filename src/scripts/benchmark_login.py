@@ -0,0 +1,75 @@
+"""
+scripts/benchmark_login.py
+CLI: Measure login latency for the supported password hash settings.
+For every setting a user is created in a fresh temporary database and
+UserRepository.authenticate is timed (median of --rounds logins), together
+with the first login of a legacy PBKDF2 account, which includes the rehash.
+Usage:
+    python3 scripts/benchmark_login.py [--rounds N]
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from create_db import create_db
+from repositories import credentials
+from repositories.credentials import HashPolicy
+from repositories.user_repository import UserRepository
+
+POLICIES = [
+    ("pbkdf2-sha256 100k (legacy)", HashPolicy(scheme="pbkdf2-sha256", pbkdf2_iterations=100_000)),
+    ("pbkdf2-sha256 600k", HashPolicy(scheme="pbkdf2-sha256", pbkdf2_iterations=600_000)),
+    ("scrypt n=2^14 r=8 (default)", HashPolicy()),
+    ("scrypt n=2^15 r=8", HashPolicy(scrypt_n=2 ** 15)),
+]
+
+
+def time_logins(repo: UserRepository, username: str, password: str, rounds: int) -> float:
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        assert repo.authenticate(username, password)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark login latency")
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"\n{'setting':<30} {'login':>10}")
+        for index, (label, policy) in enumerate(POLICIES):
+            db_path = os.path.join(tmp, f"login{index}.db")
+            create_db(db_path, insert_test=False)
+            # Hash and verify with this setting (no rehash while timing)
+            credentials.DEFAULT_POLICY = policy
+            repo = UserRepository(db_path)
+            repo.create_user("bench", "correct horse")
+            median = time_logins(repo, "bench", "correct horse", args.rounds)
+            print(f"{label:<30} {median * 1000:8.1f} ms")
+
+        # Legacy account: first login verifies PBKDF2 100k and rehashes
+        credentials.DEFAULT_POLICY = HashPolicy()
+        db_path = os.path.join(tmp, "legacy.db")
+        create_db(db_path, insert_test=False)
+        repo = UserRepository(db_path)
+        legacy = HashPolicy(scheme="pbkdf2-sha256", pbkdf2_iterations=100_000)
+        encoded, salt = credentials.hash_password("correct horse", legacy)
+        user = repo.create_user("legacy", "x")
+        repo.update_password_hash(user.user_id, encoded.split("$")[-1], salt)
+        start = time.perf_counter()
+        assert repo.authenticate("legacy", "correct horse")
+        print(f"{'legacy first login + rehash':<30} {(time.perf_counter() - start) * 1000:8.1f} ms")
+        rehashed = repo.find_by_username("legacy").password_hash
+        print(f"  stored hash now: {rehashed.split('$')[1]} {rehashed.split('$')[2]}")
+
+
+if __name__ == "__main__":
+    main()
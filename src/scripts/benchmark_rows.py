@@ -0,0 +1,201 @@
+"""
+scripts/benchmark_rows.py
+CLI: Measure the memory of one log row in the history listings.
+A temporary database gets one user with --rows food logs, activity logs and
+weigh-ins. Each listing is built twice: the way it was built before the row
+records (the repository's dicts copied into new dicts per row) and with the
+service method, which returns slotted records (repositories/models.py) built
+by a row factory. tracemalloc measures the memory held by the result list
+and the peak while building it; both are printed per row.
+Usage:
+    python3 scripts/benchmark_rows.py [--rows N] [--seed N]
+Example:
+    python3 scripts/benchmark_rows.py --rows 100000
+"""
+import argparse
+import gc
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+import uuid
+from datetime import date, timedelta
+from typing import Callable, Dict, List
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from benchmark_services import fresh_db
+from repositories.connection_pool import close_all_pools
+from repositories.engine_settings import connect
+from services.activity_service import ActivityService
+from services.food_service import FoodService
+from services.period_index import PeriodIndex
+from services.weightlog_service import WeightLogService
+
+# Columns the listings selected before the row records
+FOOD_COLUMNS = ('date', 'log_id', 'name', 'portion_size_g', 'kcal_per_portion')
+ACTIVITY_COLUMNS = ('date', 'log_id', 'name', 'activity_count', 'kcal_burned')
+
+LOGS_PER_DAY = 25
+FOOD_COUNT = 200
+ACTIVITY_COUNT = 30
+
+
+def seed(db_path: str, rows: int, rng: random.Random) -> str:
+    """One user with `rows` logs of each kind ending today; returns the user_id"""
+    user_id = str(uuid.uuid4())
+    days = -(-rows // LOGS_PER_DAY)
+    first_day = date.today() - timedelta(days=days - 1)
+    dates = [(first_day + timedelta(days=i // LOGS_PER_DAY)).isoformat() for i in range(rows)]
+
+    conn = connect(db_path)
+    try:
+        with conn:
+            conn.executemany(
+                "INSERT INTO food (food_id, name, kcal_per_portion, carbs_per_portion, "
+                "protein_per_portion, fat_per_portion) VALUES (?, ?, ?, ?, ?, ?)",
+                [(str(uuid.uuid4()), f"Benchmark food {i}", 40 + i % 500, i % 60, i % 30, i % 25)
+                 for i in range(FOOD_COUNT)]
+            )
+            conn.executemany(
+                "INSERT INTO activity (activity_id, name, unit, kcal_per_unit) VALUES (?, ?, ?, ?)",
+                [(str(uuid.uuid4()), f"Benchmark activity {i}", "min", 3 + i % 12)
+                 for i in range(ACTIVITY_COUNT)]
+            )
+            conn.execute(
+                'INSERT INTO "user" (user_id, username, password_hash, salt) VALUES (?, ?, ?, ?)',
+                (user_id, "rows", "-", "-")
+            )
+            user_key = conn.execute('SELECT user_key FROM "user" WHERE user_id = ?', (user_id,)).fetchone()[0]
+            food_keys = [row[0] for row in conn.execute("SELECT food_key FROM food")]
+            activity_keys = [row[0] for row in conn.execute("SELECT activity_key FROM activity")]
+            conn.executemany(
+                "INSERT INTO foodlog (log_id, user_key, food_key, date, portion_size_g) VALUES (?, ?, ?, ?, ?)",
+                [(str(uuid.uuid4()), user_key, rng.choice(food_keys), day, float(rng.randint(30, 400)))
+                 for day in dates]
+            )
+            conn.executemany(
+                "INSERT INTO activitylog (log_id, user_key, activity_key, date, activity_count, kcal_burned) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [(str(uuid.uuid4()), user_key, rng.choice(activity_keys), day, 30.0, rng.uniform(50, 400))
+                 for day in dates]
+            )
+            conn.executemany(
+                "INSERT INTO weightlog (log_id, user_id, date, weight, notes) VALUES (?, ?, ?, ?, ?)",
+                [(str(uuid.uuid4()), user_id, day, round(rng.uniform(70, 90), 1), None) for day in dates]
+            )
+    finally:
+        conn.close()
+    return user_id
+
+
+# --- Listings as built before the row records -------------------------------
+
+def dict_food_logs(food: FoodService, user_id: str) -> List[Dict]:
+    logs = []
+    for log in food.foodlog_repo.iter_for_user(user_id, columns=FOOD_COLUMNS):
+        portion = int(log.get("portion_size_g") or 100)
+        cal_per = int(log.get("kcal_per_portion") or 0)
+        logs.append({
+            'date': log['date'],
+            'name': log.get("name") or "?",
+            'portion': portion,
+            'calories': float((portion / 100.0) * cal_per),
+            'log_id': log['log_id']
+        })
+    return logs
+
+
+def dict_activity_logs(activity: ActivityService, user_id: str) -> List[Dict]:
+    return [{
+        'date': log.get('date'),
+        'name': log.get('name') or '?',
+        'count': int(log.get('activity_count') or 0),
+        'kcal_burned': float(log.get('kcal_burned') or 0),
+        'log_id': log.get('log_id')
+    } for log in activity.activitylog_repo.iter_for_user(user_id, columns=ACTIVITY_COLUMNS)]
+
+
+def dict_weight_history(weight: WeightLogService, user_id: str, days: int) -> List[Dict]:
+    end_date = date.today()
+    history = weight.weightlog_repo.find_by_date_range_with_weeks(
+        user_id, (end_date - timedelta(days=days)).isoformat(), end_date.isoformat())
+    annotations = PeriodIndex([]).annotate(log['date'] for log in history)
+    enriched, current_week = [], None
+    for log in history:
+        is_week_start = current_week != log['week_start_date']
+        current_week = log['week_start_date']
+        active_periods, period_markers = annotations[log['date']]
+        enriched.append({
+            **log,
+            'week_label': f"Week {log['week_number']}, {log['year']}",
+            'is_week_start': is_week_start,
+            'active_periods': active_periods,
+            'period_markers': period_markers,
+            'has_periods': len(active_periods) > 0
+        })
+    return enriched
+
+
+# --- Measurement ------------------------------------------------------------
+
+def measure(build: Callable[[], list]) -> Dict[str, float]:
+    """Bytes held by the built list and peak bytes while building it, per row"""
+    build()  # warm up connections, caches and statements
+    gc.collect()
+    tracemalloc.start()
+    try:
+        base = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        rows = build()
+        elapsed = time.perf_counter() - start
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    count = len(rows)
+    return {
+        'rows': count,
+        'held': (current - base) / count,
+        'peak': (peak - base) / count,
+        'ms': elapsed * 1000,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure the memory per row of the log listings")
+    parser.add_argument("--rows", type=int, default=100_000, help="logs of each kind")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        db_path = os.path.join(directory, "rows.db")
+        fresh_db(db_path)
+        user_id = seed(db_path, args.rows, random.Random(args.seed))
+        days = (date.today() - date(1970, 1, 1)).days
+
+        food = FoodService(db_path)
+        activity = ActivityService(db_path)
+        weight = WeightLogService(db_path)
+        listings = [
+            ("food logs", lambda: dict_food_logs(food, user_id),
+             lambda: food.get_all_food_logs(user_id)),
+            ("activity logs", lambda: dict_activity_logs(activity, user_id),
+             lambda: activity.get_all_activity_logs(user_id)),
+            ("weight history", lambda: dict_weight_history(weight, user_id, days),
+             lambda: weight.get_weight_history_with_weeks(user_id, days=days, include_periods=False)),
+        ]
+
+        print(f"{'listing':<16} {'rows':>8} {'dict B/row':>11} {'record B/row':>13} "
+              f"{'dict peak':>10} {'record peak':>12} {'dict ms':>8} {'record ms':>10}")
+        for name, before, after in listings:
+            old, new = measure(before), measure(after)
+            print(f"{name:<16} {new['rows']:>8} {old['held']:>11.0f} {new['held']:>13.0f} "
+                  f"{old['peak']:>10.0f} {new['peak']:>12.0f} {old['ms']:>8.0f} {new['ms']:>10.0f}")
+        close_all_pools()
+
+
+if __name__ == "__main__":
+    main()
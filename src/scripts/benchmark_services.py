@@ -0,0 +1,576 @@
+"""
+scripts/benchmark_services.py
+CLI: Time the service methods the views call on a synthetic dataset.
+A temporary database (or --db) is seeded with --users users, each logging
+--per-day foods plus a few activities every day for --years years, with
+weigh-ins and dietary periods. Every registered benchmark is run --repeat
+times after one warm-up call; median and min milliseconds are printed and
+written to a JSON file. With --baseline the run is compared with an earlier
+JSON file and the exit status is 1 when a benchmark got slower than
+--threshold allows. The cold start of the application (import of ui.app
+and time to the login window) is timed in new interpreters with
+-X importtime, and the slowest imports are listed.
+Usage:
+    python3 scripts/benchmark_services.py [--users N] [--years N] [--per-day N]
+        [--repeat N] [--seed N] [--db PATH] [--only TEXT]
+        [--output FILE] [--baseline FILE] [--threshold RATIO] [--startup-runs N]
+Example:
+    python3 scripts/benchmark_services.py --users 20 --years 3 --output before.json
+    python3 scripts/benchmark_services.py --users 20 --years 3 --baseline before.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from create_db import create_db
+from migrations.run_migrations import run_migrations
+from repositories.admin_repository import AdminRepository
+from repositories.credentials import hash_password
+from repositories.engine_settings import connect
+from repositories.models import ActivityLogEntry, FoodLogEntry
+from services.activity_service import ActivityService
+from services.admin_service import AdminService
+from services.dietary_period_service import DietaryPeriodService
+from services.food_service import FoodService
+from services.report_service import ReportService
+from services.user_service import UserService
+from services.weightlog_service import WeightLogService
+
+PASSWORD = "benchmark"
+FOOD_COUNT = 200
+ACTIVITY_COUNT = 30
+PERIOD_EVERY_DAYS = 120
+PERIOD_LENGTH_DAYS = 60
+# Differences below this are timer noise, whatever the ratio
+NOISE_FLOOR_MS = 0.1
+COUNTED_TABLES = ("user", "foodlog", "activitylog", "weightlog", "dietary_period", "statistics")
+
+
+@dataclass
+class Fixture:
+    """Services and sample arguments shared by the benchmarks"""
+    user: UserService
+    admin: AdminService
+    food: FoodService
+    activity: ActivityService
+    weight: WeightLogService
+    period: DietaryPeriodService
+    report: ReportService
+    username: str
+    user_id: str
+    food_id: str
+    food_name: str
+    activity_id: str
+    activity_name: str
+    period_id: str
+    first_day: str
+    last_day: str
+    food_after: Optional[FoodLogEntry] = None
+    activity_after: Optional[ActivityLogEntry] = None
+
+
+# name -> function(fixture) making one service call
+BENCHMARKS: Dict[str, Callable[[Fixture], object]] = {}
+
+
+def benchmark(name: str):
+    """Register a benchmark under the given name"""
+    def register(func):
+        BENCHMARKS[name] = func
+        return func
+    return register
+
+
+# --- Dataset --------------------------------------------------------------
+
+def fresh_db(db_path: str):
+    """Empty database with every table of the app at the latest schema version"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        create_db(db_path, insert_test=False)
+
+
+def seed_database(db_path: str, users: int, years: int, per_day: int, seed: int):
+    """Fill an empty database with generated users, catalogs and logs"""
+    rng = random.Random(seed)
+    password_hash, salt = hash_password(PASSWORD)
+    last_day = date.today()
+    first_day = last_day - timedelta(days=365 * years - 1)
+    days = [(first_day + timedelta(days=n)).isoformat() for n in range((last_day - first_day).days + 1)]
+    activities_per_day = max(1, per_day // 3)
+
+    conn = connect(db_path)
+    try:
+        with conn:
+            conn.executemany(
+                "INSERT INTO food (food_id, name, kcal_per_portion, carbs_per_portion, "
+                "protein_per_portion, fat_per_portion) VALUES (?, ?, ?, ?, ?, ?)",
+                [(str(uuid.uuid4()), f"Benchmark food {i}", 40 + i % 500, i % 60, i % 30, i % 25)
+                 for i in range(FOOD_COUNT)]
+            )
+            conn.executemany(
+                "INSERT INTO activity (activity_id, name, unit, kcal_per_unit) VALUES (?, ?, ?, ?)",
+                [(str(uuid.uuid4()), f"Benchmark activity {i}", "min", 3 + i % 12)
+                 for i in range(ACTIVITY_COUNT)]
+            )
+            conn.executemany(
+                'INSERT INTO "user" (user_id, username, password_hash, salt, weight, kcal_min, kcal_max, '
+                'weight_loss_target) VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                [(str(uuid.uuid4()), f"bench{i}", password_hash, salt, 70 + i % 40, 1600, 2200, 5)
+                 for i in range(users)]
+            )
+        food_keys = [row[0] for row in conn.execute("SELECT food_key FROM food ORDER BY food_key")]
+        activities = conn.execute(
+            "SELECT activity_key, kcal_per_unit FROM activity ORDER BY activity_key").fetchall()
+        user_rows = conn.execute('SELECT user_key, user_id, weight FROM "user" ORDER BY user_key').fetchall()
+
+        for user_key, user_id, weight in user_rows:
+            food_logs, activity_logs, weights, periods = [], [], [], []
+            for index, day in enumerate(days):
+                for _ in range(per_day):
+                    food_logs.append((str(uuid.uuid4()), user_key, rng.choice(food_keys), day,
+                                      float(rng.randint(30, 400))))
+                for _ in range(activities_per_day):
+                    activity_key, kcal_per_unit = rng.choice(activities)
+                    minutes = float(rng.randint(10, 90))
+                    activity_logs.append((str(uuid.uuid4()), user_key, activity_key, day,
+                                          minutes, minutes * kcal_per_unit))
+                weight += rng.uniform(-0.25, 0.22)
+                if rng.random() < 0.4:
+                    weights.append((str(uuid.uuid4()), user_id, day, round(weight, 1)))
+                if index % PERIOD_EVERY_DAYS == 0:
+                    end = index + PERIOD_LENGTH_DAYS
+                    end_date = days[end] if end < len(days) else None
+                    periods.append((str(uuid.uuid4()), user_id, day, end_date,
+                                    f"Benchmark period {index // PERIOD_EVERY_DAYS}",
+                                    "low_carb", int(end_date is None)))
+            with conn:
+                conn.executemany(
+                    "INSERT INTO foodlog (log_id, user_key, food_key, date, portion_size_g) "
+                    "VALUES (?, ?, ?, ?, ?)", food_logs)
+                conn.executemany(
+                    "INSERT INTO activitylog (log_id, user_key, activity_key, date, activity_count, "
+                    "kcal_burned) VALUES (?, ?, ?, ?, ?, ?)", activity_logs)
+                conn.executemany(
+                    "INSERT INTO weightlog (log_id, user_id, date, weight) VALUES (?, ?, ?, ?)", weights)
+                conn.executemany(
+                    "INSERT INTO dietary_period (period_id, user_id, start_date, end_date, period_name, "
+                    "protocol_type, is_active) VALUES (?, ?, ?, ?, ?, ?, ?)", periods)
+        conn.execute("ANALYZE")
+    finally:
+        conn.close()
+    AdminRepository(db_path).create_admin("bench_admin", PASSWORD)
+
+
+def table_counts(db_path: str) -> Dict[str, int]:
+    conn = sqlite3.connect(db_path)
+    try:
+        return {table: conn.execute(f'SELECT COUNT(*) FROM "{table}"').fetchone()[0]
+                for table in COUNTED_TABLES}
+    finally:
+        conn.close()
+
+
+def make_fixture(db_path: str) -> Fixture:
+    """Services plus the first user's arguments; pages start halfway through the history"""
+    conn = sqlite3.connect(db_path)
+    try:
+        username, user_id = conn.execute(
+            'SELECT username, user_id FROM "user" ORDER BY user_key LIMIT 1').fetchone()
+        food_id, food_name = conn.execute(
+            "SELECT food_id, name FROM food ORDER BY food_key LIMIT 1").fetchone()
+        activity_id, activity_name = conn.execute(
+            "SELECT activity_id, name FROM activity ORDER BY activity_key LIMIT 1").fetchone()
+        period_id = conn.execute(
+            "SELECT period_id FROM dietary_period WHERE user_id = ? ORDER BY start_date LIMIT 1",
+            (user_id,)).fetchone()[0]
+        first_day, last_day = conn.execute("SELECT MIN(date), MAX(date) FROM weightlog").fetchone()
+    finally:
+        conn.close()
+
+    fx = Fixture(
+        user=UserService(db_path), admin=AdminService(db_path), food=FoodService(db_path),
+        activity=ActivityService(db_path), weight=WeightLogService(db_path),
+        period=DietaryPeriodService(db_path), report=ReportService(db_path), username=username, user_id=user_id,
+        food_id=food_id, food_name=food_name, activity_id=activity_id, activity_name=activity_name,
+        period_id=period_id, first_day=first_day, last_day=last_day,
+    )
+    middle = fx.food.count_food_logs(user_id) // 2
+    fx.food_after = next(row for i, row in enumerate(fx.food.iter_food_logs(user_id)) if i == middle)
+    middle = fx.activity.count_activity_logs(user_id) // 2
+    fx.activity_after = next(row for i, row in enumerate(fx.activity.iter_activity_logs(user_id)) if i == middle)
+    return fx
+
+
+# --- Benchmarks (service calls made by ui/views) --------------------------
+
+@benchmark("user.authenticate_user")
+def bench_authenticate_user(fx):
+    return fx.user.authenticate_user(fx.username, PASSWORD)
+
+
+@benchmark("admin.authenticate_admin")
+def bench_authenticate_admin(fx):
+    return fx.admin.authenticate_admin("bench_admin", PASSWORD)
+
+
+@benchmark("user.get_user")
+def bench_get_user(fx):
+    return fx.user.get_user(fx.username)
+
+
+@benchmark("user.get_user_summary")
+def bench_get_user_summary(fx):
+    return fx.user.get_user_summary(fx.username)
+
+
+@benchmark("food.get_daily_food_totals")
+def bench_daily_food_totals(fx):
+    return fx.food.get_daily_food_totals(fx.user_id)
+
+
+@benchmark("food.get_daily_nutrition (30 days)")
+def bench_daily_nutrition_month(fx):
+    start = (date.fromisoformat(fx.last_day) - timedelta(days=29)).isoformat()
+    return fx.food.get_daily_nutrition(fx.user_id, start, fx.last_day)
+
+
+@benchmark("report.get_rollups (ISO weeks, all history)")
+def bench_weekly_rollups(fx):
+    return fx.report.get_rollups(fx.user_id, 'iso_week')
+
+
+@benchmark("report.get_rollups (months, all history)")
+def bench_monthly_rollups(fx):
+    return fx.report.get_rollups(fx.user_id, 'month')
+
+
+@benchmark("report.get_weekly_summary")
+def bench_weekly_summary(fx):
+    return fx.report.get_weekly_summary(fx.user_id, fx.last_day)
+
+
+@benchmark("food.get_food_log_page")
+def bench_food_log_page(fx):
+    return fx.food.get_food_log_page(fx.user_id)
+
+
+@benchmark("food.get_food_log_page (middle)")
+def bench_food_log_page_middle(fx):
+    return fx.food.get_food_log_page(fx.user_id, fx.food_after)
+
+
+@benchmark("food.count_food_logs")
+def bench_count_food_logs(fx):
+    return fx.food.count_food_logs(fx.user_id)
+
+
+@benchmark("food.get_all_food_logs")
+def bench_all_food_logs(fx):
+    return fx.food.get_all_food_logs(fx.user_id)
+
+
+@benchmark("food.get_food_id_by_name")
+def bench_food_id_by_name(fx):
+    return fx.food.get_food_id_by_name(fx.food_name)
+
+
+@benchmark("food.search_food_names")
+def bench_search_food_names(fx):
+    return fx.food.search_food_names("food 1")
+
+
+@benchmark("food.log_food")
+def bench_log_food(fx):
+    return fx.food.log_food(fx.user_id, f"{fx.food_name}|{fx.food_id}", 150.0, fx.last_day)
+
+
+@benchmark("activity.get_daily_activity_totals")
+def bench_daily_activity_totals(fx):
+    return fx.activity.get_daily_activity_totals(fx.user_id)
+
+
+@benchmark("activity.get_activity_log_page")
+def bench_activity_log_page(fx):
+    return fx.activity.get_activity_log_page(fx.user_id)
+
+
+@benchmark("activity.get_activity_log_page (middle)")
+def bench_activity_log_page_middle(fx):
+    return fx.activity.get_activity_log_page(fx.user_id, fx.activity_after)
+
+
+@benchmark("activity.count_activity_logs")
+def bench_count_activity_logs(fx):
+    return fx.activity.count_activity_logs(fx.user_id)
+
+
+@benchmark("activity.get_all_activity_logs")
+def bench_all_activity_logs(fx):
+    return fx.activity.get_all_activity_logs(fx.user_id)
+
+
+@benchmark("activity.get_activity_id_by_name")
+def bench_activity_id_by_name(fx):
+    return fx.activity.get_activity_id_by_name(fx.activity_name)
+
+
+@benchmark("activity.log_activity")
+def bench_log_activity(fx):
+    return fx.activity.log_activity(fx.user_id, f"{fx.activity_name}|{fx.activity_id}", 30.0, fx.last_day)
+
+
+@benchmark("weight.get_weight_history_with_weeks")
+def bench_weight_history_with_weeks(fx):
+    return fx.weight.get_weight_history_with_weeks(fx.user_id)
+
+
+@benchmark("weight.get_weight_history_with_weeks (1 year)")
+def bench_weight_history_with_weeks_year(fx):
+    return fx.weight.get_weight_history_with_weeks(fx.user_id, days=365)
+
+
+@benchmark("weight.get_progress_summary")
+def bench_progress_summary(fx):
+    return fx.weight.get_progress_summary(fx.user_id)
+
+
+@benchmark("weight.get_weight_logs_between")
+def bench_weight_logs_between(fx):
+    return fx.weight.get_weight_logs_between(fx.user_id, fx.first_day, fx.last_day)
+
+
+@benchmark("period.summarize_periods")
+def bench_summarize_periods(fx):
+    return fx.period.summarize_periods(fx.user_id)
+
+
+@benchmark("period.get_period_summary")
+def bench_period_summary(fx):
+    return fx.period.get_period_summary(fx.period_id)
+
+
+@benchmark("period.get_active_periods")
+def bench_active_periods(fx):
+    return fx.period.get_active_periods(fx.user_id)
+
+
+@benchmark("period.get_suggested_protocols")
+def bench_suggested_protocols(fx):
+    return fx.period.get_suggested_protocols()
+
+
+# --- Startup --------------------------------------------------------------
+
+# Run in a fresh interpreter under -X importtime; prints one JSON line
+STARTUP_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+sys.path.insert(0, {src!r})
+from ui.app import LaihdutanytApp
+result = {{'import_ms': (time.perf_counter() - start) * 1000}}
+try:
+    app = LaihdutanytApp({db!r})
+    app.update()
+    result['login_window_ms'] = (time.perf_counter() - start) * 1000
+    result['services_built'] = app.services.built()
+    app.destroy()
+except Exception as e:  # tkinter.TclError without a display
+    result['error'] = str(e)
+print(json.dumps(result))
+"""
+
+
+def parse_importtime(stderr: str) -> List[Dict]:
+    """Rows of a -X importtime report: module, self and cumulative ms, nesting depth"""
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        if not self_us.strip().isdigit():
+            continue  # header
+        modules.append({
+            'module': name.strip(),
+            'depth': (len(name) - len(name.lstrip()) - 1) // 2,
+            'self_ms': int(self_us) / 1000,
+            'cumulative_ms': int(cumulative_us) / 1000,
+        })
+    return modules
+
+
+def startup_trace(db_path: str, runs: int, top: int = 15):
+    """
+    Cold start of the application: import of ui.app and time until the
+    login window is drawn, each in a new interpreter.
+
+    Returns:
+        (results in run_benchmark format, trace of the last run)
+    """
+    src = os.path.join(os.path.dirname(__file__), "..")
+    script = STARTUP_SCRIPT.format(src=os.path.abspath(src), db=db_path)
+    samples, trace = {}, {}
+    for _ in range(runs + 1):  # the first run writes the .pyc files
+        proc = subprocess.run([sys.executable, "-X", "importtime", "-c", script],
+                              capture_output=True, text=True, check=True)
+        result = json.loads(proc.stdout.strip().splitlines()[-1])
+        for key in ('import_ms', 'login_window_ms'):
+            if key in result:
+                samples.setdefault(key, []).append(result[key])
+        trace = {
+            'services_built': result.get('services_built'),
+            'error': result.get('error'),
+            'slowest_imports': sorted(parse_importtime(proc.stderr), key=lambda m: -m['self_ms'])[:top],
+        }
+    results = {
+        f"startup.{'import ui.app' if key == 'import_ms' else 'login window'}": {
+            'median_ms': round(statistics.median(values[1:]), 4),
+            'min_ms': round(min(values[1:]), 4),
+            'runs': runs,
+        }
+        for key, values in samples.items() if len(values) > 1
+    }
+    return results, trace
+
+
+# --- Running and reporting ------------------------------------------------
+
+def run_benchmark(func, fx: Fixture, repeat: int) -> Dict[str, float]:
+    """Milliseconds per call after one warm-up call"""
+    func(fx)
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(fx)
+        samples.append((time.perf_counter() - start) * 1000)
+    return {
+        'median_ms': round(statistics.median(samples), 4),
+        'min_ms': round(min(samples), 4),
+        'runs': repeat,
+    }
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True, cwd=os.path.dirname(__file__)).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: Dict, baseline: Dict, threshold: float) -> List[str]:
+    """Print current vs. baseline medians; returns the names that got slower than threshold"""
+    regressions = []
+    print(f"\n{'benchmark':<48} {'baseline':>10} {'current':>10} {'ratio':>7}")
+    for name, result in results.items():
+        before = baseline.get('results', {}).get(name)
+        if not before:
+            print(f"{name:<48} {'-':>10} {result['median_ms']:8.2f}ms {'new':>7}")
+            continue
+        ratio = result['median_ms'] / before['median_ms'] if before['median_ms'] else float('inf')
+        marker = ""
+        if ratio > threshold and result['median_ms'] - before['median_ms'] > NOISE_FLOOR_MS:
+            regressions.append(name)
+            marker = "  slower"
+        print(f"{name:<48} {before['median_ms']:8.2f}ms {result['median_ms']:8.2f}ms {ratio:6.2f}x{marker}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the service methods used by the views")
+    parser.add_argument("--users", type=int, default=5)
+    parser.add_argument("--years", type=int, default=2)
+    parser.add_argument("--per-day", type=int, default=6, help="food logs per user and day")
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--db", help="seed this file once and reuse it on later runs")
+    parser.add_argument("--only", help="run only benchmarks whose name contains this text")
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--baseline", help="earlier --output file to compare with")
+    parser.add_argument("--threshold", type=float, default=1.25,
+                        help="current/baseline median ratio counted as a regression")
+    parser.add_argument("--startup-runs", type=int, default=5,
+                        help="cold starts of the application to time (0 = skip)")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = args.db or os.path.join(tmp, "bench.db")
+        start = time.perf_counter()
+        if os.path.exists(db_path):
+            with contextlib.redirect_stdout(io.StringIO()):
+                run_migrations(db_path)
+            print(f"Reusing {db_path}")
+        else:
+            fresh_db(db_path)
+            seed_database(db_path, args.users, args.years, args.per_day, args.seed)
+            print(f"Seeded {db_path} in {time.perf_counter() - start:.1f} s")
+
+        rows = table_counts(db_path)
+        print(", ".join(f"{count} {table}" for table, count in rows.items()))
+
+        fx = make_fixture(db_path)
+        results = {}
+        print(f"\n{'benchmark':<48} {'median':>10} {'min':>10}")
+        for name, func in BENCHMARKS.items():
+            if args.only and args.only not in name:
+                continue
+            results[name] = run_benchmark(func, fx, args.repeat)
+            print(f"{name:<48} {results[name]['median_ms']:8.2f}ms {results[name]['min_ms']:8.2f}ms")
+
+        startup = {}
+        if args.startup_runs:
+            startup_results, startup = startup_trace(db_path, args.startup_runs)
+            for name, result in startup_results.items():
+                results[name] = result
+                print(f"{name:<48} {result['median_ms']:8.2f}ms {result['min_ms']:8.2f}ms")
+            if startup['error']:
+                print(f"  (no login window: {startup['error']})")
+            else:
+                print(f"  services built before login: {', '.join(startup['services_built']) or 'none'}")
+            print("\nSlowest imports at startup (self time):")
+            for module in startup['slowest_imports'][:10]:
+                print(f"  {module['self_ms']:7.2f}ms {module['module']}")
+
+    report = {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'commit': git_commit(),
+        'dataset': {'users': args.users, 'years': args.years, 'per_day': args.per_day,
+                    'seed': args.seed, 'rows': rows},
+        'environment': {'python': platform.python_version(), 'sqlite': sqlite3.sqlite_version,
+                        'platform': platform.platform()},
+        'results': results,
+        'startup': startup,
+    }
+    with open(args.output, "w", encoding="utf-8") as fh:
+        json.dump(report, fh, indent=2)
+    print(f"\nResults written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as fh:
+            baseline = json.load(fh)
+        if baseline.get('dataset', {}).get('rows') != rows:
+            print("Note: the baseline was measured on a different dataset")
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} benchmark(s) slower than {args.threshold:.2f}x the baseline")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
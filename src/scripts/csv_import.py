@@ -0,0 +1,200 @@
+"""
+scripts/csv_import.py
+Shared streaming CSV import engine for the food and activity catalogs.
+
+The CSV is read row by row and written with executemany in batches of
+`batch_size` rows, all inside one transaction, so memory stays bounded by the
+batch size and a failed import leaves the catalog untouched. With upsert=True
+rows whose name already exists are updated instead of duplicated.
+
+Used by import_foods.py and import_activities.py; run those as CLIs.
+"""
+import csv
+import os
+import sqlite3
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from repositories.engine_settings import connect
+
+DEFAULT_BATCH_SIZE = 5000
+# Invalid rows are counted; only the first ones are kept for the report
+MAX_REPORTED_ERRORS = 10
+
+# progress(rows_processed, fraction_of_file_read)
+ProgressCallback = Callable[[int, float], None]
+
+
+@dataclass
+class ImportResult:
+    """Outcome of one CSV import"""
+    inserted: int = 0
+    updated: int = 0
+    skipped: int = 0
+    errors: List[str] = field(default_factory=list)
+
+    def summary(self, what: str) -> str:
+        text = f"Imported {self.inserted} new and updated {self.updated} {what}"
+        if self.skipped:
+            text += f", skipped {self.skipped} invalid rows"
+        return text
+
+
+@dataclass
+class CatalogTable:
+    """Where and how parsed CSV rows are written"""
+    table: str
+    id_column: str
+    columns: Tuple[str, ...]  # written columns, the first one is always name
+    parse: Callable[[Dict[str, str]], Tuple]  # CSV row -> values for columns
+    search_table: Optional[str] = None  # FTS table filled by trg_<table>_fts_insert
+
+
+def _read_lines(fh, counter: List[int]) -> Iterator[str]:
+    """Yield data lines, skipping comment lines and counting characters read"""
+    for line in fh:
+        counter[0] += len(line)
+        if line.lstrip().startswith("#"):
+            continue
+        yield line
+
+
+def _batches(rows: Iterable, batch_size: int) -> Iterator[list]:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _write_batch(cur: sqlite3.Cursor, spec: CatalogTable, batch: List[Tuple],
+                 upsert: bool, result: ImportResult):
+    columns = ", ".join(spec.columns)
+    placeholders = ", ".join("?" for _ in spec.columns)
+    insert = f"""
+        INSERT INTO {spec.table} ({spec.id_column}, {columns})
+        SELECT lower(hex(randomblob(16))), {placeholders}
+    """
+    if not upsert:
+        cur.executemany(insert, batch)
+        result.inserted += len(batch)
+        return
+
+    # Last row wins when a name repeats inside the batch
+    by_name = {values[0]: values for values in batch}
+    assignments = ", ".join(f"{c} = ?" for c in spec.columns[1:])
+    cur.executemany(
+        f"UPDATE {spec.table} SET {assignments} WHERE name = ?",
+        [values[1:] + (name,) for name, values in by_name.items()],
+    )
+    updated = cur.rowcount
+    cur.executemany(
+        insert + f" WHERE NOT EXISTS (SELECT 1 FROM {spec.table} WHERE name = ?)",
+        [values + (name,) for name, values in by_name.items()],
+    )
+    result.inserted += cur.rowcount
+    result.updated += updated
+
+
+def _suspend_search_trigger(cur: sqlite3.Cursor, spec: CatalogTable) -> Optional[str]:
+    """
+    Drop the per-row FTS insert trigger for the duration of the import.
+
+    Returns:
+        The trigger's CREATE statement (None if the trigger does not exist)
+    """
+    if not spec.search_table:
+        return None
+    name = f"trg_{spec.table}_fts_insert"
+    cur.execute("SELECT sql FROM sqlite_master WHERE type = 'trigger' AND name = ?", (name,))
+    row = cur.fetchone()
+    if row:
+        cur.execute(f"DROP TRIGGER {name}")
+    return row[0] if row else None
+
+
+def import_catalog_csv(csv_path: str, db_path: str, spec: CatalogTable,
+                       batch_size: int = DEFAULT_BATCH_SIZE, upsert: bool = True,
+                       progress: Optional[ProgressCallback] = None) -> ImportResult:
+    """
+    Stream a CSV file into a catalog table in one transaction.
+
+    Args:
+        csv_path: CSV file with a header row
+        db_path: SQLite database
+        spec: Target table and row parser
+        batch_size: Rows per executemany call
+        upsert: Update rows with an existing name instead of inserting duplicates
+        progress: Called after every batch and once more before the commit
+
+    Returns:
+        ImportResult with counts of inserted, updated and skipped rows
+    """
+    result = ImportResult()
+    file_size = os.path.getsize(csv_path) or 1
+    chars_read = [0]
+
+    def parsed_rows():
+        with open(csv_path, newline="", encoding="utf-8") as fh:
+            reader = csv.DictReader(_read_lines(fh, chars_read))
+            for row in reader:
+                try:
+                    values = spec.parse(row)
+                except (TypeError, ValueError):
+                    values = None
+                if values is None or not values[0]:
+                    result.skipped += 1
+                    if len(result.errors) < MAX_REPORTED_ERRORS:
+                        result.errors.append(f"line {reader.line_num}: {row}")
+                    continue
+                yield values
+
+    processed = 0
+    # WAL and busy timeout: the app's views keep reading during the import
+    conn = connect(db_path)
+    try:
+        cur = conn.cursor()
+        # Explicit BEGIN: the trigger DDL below must be part of the transaction.
+        # IMMEDIATE takes the write lock now (waiting for other writers); a
+        # deferred transaction that reads first can fail with "database is locked".
+        cur.execute("BEGIN IMMEDIATE")
+        cur.execute(f"SELECT COALESCE(MAX(rowid), 0) FROM {spec.table}")
+        last_rowid = cur.fetchone()[0]
+        trigger_sql = _suspend_search_trigger(cur, spec)
+
+        for batch in _batches(parsed_rows(), batch_size):
+            _write_batch(cur, spec, batch, upsert, result)
+            processed += len(batch)
+            if progress:
+                progress(processed, min(chars_read[0] / file_size, 1.0))
+
+        if trigger_sql:
+            # Index the new rows in one statement instead of one trigger call per row
+            cur.execute(f"""
+                INSERT INTO {spec.search_table} (name, {spec.id_column})
+                SELECT name, {spec.id_column} FROM {spec.table} WHERE rowid > ?
+            """, (last_rowid,))
+            cur.execute(trigger_sql)
+        # Last call before the commit: a callback that raises still rolls back
+        if progress:
+            progress(processed, 1.0)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+    return result
+
+
+def number(row: Dict[str, str], *keys: str) -> float:
+    """First non-empty value of the given CSV columns as a float (0.0 if none)"""
+    for key in keys:
+        value = row.get(key)
+        if value not in (None, ""):
+            return float(value)
+    return 0.0
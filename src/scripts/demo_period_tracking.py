@@ -82,27 +82,27 @@ def demo_period_tracking():
     current_week = None
     for log in history[:15]:  # Show first 15 entries
         # Week separator
-        if log['is_week_start']:
+        if log.is_week_start:
             print("\n" + "=" * 70)
-            print(f"  {log['week_label']} (Week starts: {log['week_start_date']})")
+            print(f"  {log.week_label} (Week starts: {log.week_start_date})")
             print("=" * 70)
         
         # Date and weight (bold if week start)
-        bold_start = "**" if log['is_week_start'] else "  "
-        bold_end = "**" if log['is_week_start'] else ""
+        bold_start = "**" if log.is_week_start else "  "
+        bold_end = "**" if log.is_week_start else ""
         
-        print(f"{bold_start}{log['date']}  {log['weight']} kg{bold_end}", end="")
-        if log.get('notes'):
-            print(f"  ({log['notes']})", end="")
+        print(f"{bold_start}{log.date}  {log.weight} kg{bold_end}", end="")
+        if log.notes:
+            print(f"  ({log.notes})", end="")
         print()
         
         # Period markers (START/END)
-        for marker in log.get('period_markers', []):
+        for marker in log.period_markers:
             print(f"    {marker}")
         
         # Active periods
-        if log.get('has_periods'):
-            for period_name in log['active_periods']:
+        if log.has_periods:
+            for period_name in log.active_periods:
                 print(f"    📍 {period_name}")
     
     print("\n\n4️⃣  PERIOD SUMMARY & EFFECTIVENESS")
@@ -121,7 +121,8 @@ def demo_period_tracking():
             print(f"  Start weight: {wc['start_weight']} kg ({summary['start_date']})")
             print(f"  Current weight: {wc['end_weight']} kg")
             print(f"  Total change: {wc['change']:+.1f} kg")
-            print(f"  Per week: {wc['change_per_week']:+.2f} kg/week")
+            if wc['change_per_week'] is not None:
+                print(f"  Per week: {wc['change_per_week']:+.2f} kg/week")
             
             if wc['change'] < 0:
                 print(f"  ✅ Successfully losing weight during this period!")
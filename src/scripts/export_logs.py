@@ -0,0 +1,89 @@
+"""
+scripts/export_logs.py
+CLI: Export a user's food, activity or weight history to CSV.
+Rows are streamed from the keyset-paginated repository iterators, so memory
+use stays at one page however long the history is.
+Usage:
+    python3 scripts/export_logs.py username {food,activity,weight,periods} [-o out.csv] [--db path_to_db]
+Example:
+    python3 scripts/export_logs.py user food -o food_logs.csv
+"""
+import argparse
+import csv
+import os
+import sqlite3
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from repositories.activitylog_repository import ActivityLogRepository
+from repositories.dietary_period_repository import DietaryPeriodRepository
+from repositories.foodlog_repository import FoodLogRepository
+from repositories.weightlog_repository import WeightLogRepository
+
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+DEFAULT_DB = os.path.join(BASE_DIR, "data", "laihdutanyt.db")
+
+# kind -> (repository factory, iterator method, exported columns)
+EXPORTS = {
+    "food": (FoodLogRepository, "iter_for_user",
+             ("date", "name", "portion_size_g", "kcal_per_portion", "kcal", "carbs_g", "protein_g",
+              "fat_g", "log_id")),
+    "activity": (ActivityLogRepository, "iter_for_user",
+                 ("date", "name", "activity_count", "kcal_burned", "log_id")),
+    "weight": (WeightLogRepository, "iter_all",
+               ("date", "weight", "notes", "log_id")),
+    "periods": (DietaryPeriodRepository, "iter_all",
+                ("start_date", "end_date", "period_name", "protocol_type", "description", "period_id")),
+}
+
+
+def find_user_id(db_path: str, username: str):
+    conn = sqlite3.connect(db_path)
+    try:
+        row = conn.execute('SELECT user_id FROM "user" WHERE username = ?', (username,)).fetchone()
+        return row[0] if row else None
+    finally:
+        conn.close()
+
+
+def export_csv(db_path: str, user_id: str, kind: str, out) -> int:
+    """Write one history as CSV to a file object; returns the number of rows"""
+    repo_class, method, columns = EXPORTS[kind]
+    rows = getattr(repo_class(db_path), method)(user_id, columns=columns)
+    writer = csv.DictWriter(out, fieldnames=columns, extrasaction="ignore")
+    writer.writeheader()
+    count = 0
+    for row in rows:
+        writer.writerow(row)
+        count += 1
+    return count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export a user's history to CSV")
+    parser.add_argument("username")
+    parser.add_argument("kind", choices=sorted(EXPORTS))
+    parser.add_argument("-o", "--output", help="CSV file (default: stdout)")
+    parser.add_argument("--db", help="path to SQLite DB", default=DEFAULT_DB)
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.db):
+        print(f"Database not found: {args.db}\nRun create_db.py first.")
+        sys.exit(1)
+
+    user_id = find_user_id(args.db, args.username)
+    if not user_id:
+        print(f"User not found: {args.username}")
+        sys.exit(1)
+
+    if args.output:
+        with open(args.output, "w", newline="", encoding="utf-8") as out:
+            count = export_csv(args.db, user_id, args.kind, out)
+        print(f"Exported {count} {args.kind} rows to {args.output}")
+    else:
+        export_csv(args.db, user_id, args.kind, sys.stdout)
+
+
+if __name__ == "__main__":
+    main()
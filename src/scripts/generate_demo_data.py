@@ -1,24 +1,53 @@
 """
-Generate realistic 30-day demo data for testing
-Version: 2.1.0
-Date: 2025-12-20
-
-Generates:
-- Daily food logs (2-4 meals per day)
-- Daily activity logs (1-2 activities)
-- Weekly weight logs (showing gradual weight loss)
-- Daily statistics records
+Generate realistic demo data for testing and load tests
+Version: 2.2.0
+
+For every demo user and day:
+- Food logs (breakfast, lunch and dinner, a snack on 70% of days)
+- Activity logs (1-2 activities on 80% of days)
+- A weight log once a week (gradual weight loss)
+- The daily statistics row
+
+The users are 'user' (the create_db.py test user) and demo2..demoN; missing
+ones are created with the password 'pass'. Catalog names are resolved to
+keys once, rows are built per user and year and written with executemany,
+and the whole run is one transaction. The statistics and rollup triggers
+are dropped for the run and restored before the commit, the statistics
+rows of the demo users are rebuilt with one set-based query per user
+(repositories/statistics_repository.rebuild_statistics) and their cached
+rollups are cleared (repositories/rollup_repository.clear_rollups).
+
+Usage:
+    python3 scripts/generate_demo_data.py [--users N] [--days N | --years N] [--seed N] [--db PATH]
+Example:
+    python3 scripts/generate_demo_data.py --users 100 --years 5 --seed 1
 """
 
-import sqlite3
-import uuid
+import argparse
 import os
-from datetime import date, timedelta
 import random
+import sys
+import time
+import uuid
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Tuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from repositories.credentials import hash_password
+from repositories.engine_settings import connect
+from repositories.rollup_repository import clear_rollups
+from repositories.statistics_repository import rebuild_statistics
 
 DB_DIR = os.path.join(os.path.dirname(__file__), "..", "data")
 DB_PATH = os.path.join(DB_DIR, "laihdutanyt.db")
 
+DEMO_PASSWORD = "pass"
+DEFAULT_WEIGHT = 80.0  # kg, for users without a weight
+WEEKLY_WEIGHT_LOSS = 0.5  # kg
+# Days of logs built in memory before they are written
+CHUNK_DAYS = 365
+
 # Sample meals with realistic portions
 BREAKFAST_OPTIONS = [
     ('Boiled Egg', 100),
@@ -55,237 +84,167 @@ ACTIVITY_OPTIONS = [
     ('Weight Training', 45),  # 45 minutes
 ]
 
-def get_user_id(conn):
-    """Get test user ID"""
-    cur = conn.cursor()
-    cur.execute('SELECT user_id FROM "user" WHERE username = ?', ('user',))
-    row = cur.fetchone()
-    if not row:
-        raise Exception("Test user 'user' not found. Run create_db.py first.")
-    return row[0]
-
-def get_food_id(conn, food_name):
-    """Get food ID by name"""
-    cur = conn.cursor()
-    cur.execute('SELECT food_id FROM food WHERE name = ?', (food_name,))
-    row = cur.fetchone()
-    return row[0] if row else None
-
-def get_activity_id(conn, activity_name):
-    """Get activity ID by name"""
-    cur = conn.cursor()
-    cur.execute('SELECT activity_id FROM activity WHERE name = ?', (activity_name,))
-    row = cur.fetchone()
-    return row[0] if row else None
-
-def get_food_details(conn, food_id):
-    """Get food nutritional details"""
-    cur = conn.cursor()
-    cur.execute('''
-        SELECT kcal_per_portion, carbs_per_portion, protein_per_portion, fat_per_portion
-        FROM food WHERE food_id = ?
-    ''', (food_id,))
-    return cur.fetchone()
-
-def get_activity_details(conn, activity_id):
-    """Get activity calorie details"""
-    cur = conn.cursor()
-    cur.execute('SELECT kcal_per_unit FROM activity WHERE activity_id = ?', (activity_id,))
-    row = cur.fetchone()
-    return row[0] if row else 0.0
-
-def log_food(conn, user_id, food_name, portion_g, date_str):
-    """Log a food entry"""
-    food_id = get_food_id(conn, food_name)
-    if not food_id:
-        print(f"  ! Warning: Food '{food_name}' not found, skipping")
-        return None
-    
-    log_id = str(uuid.uuid4())
-    cur = conn.cursor()
-    cur.execute('''
-        INSERT INTO foodlog (log_id, user_id, food_id, date, portion_size_g)
-        VALUES (?, ?, ?, ?, ?)
-    ''', (log_id, user_id, food_id, date_str, portion_g))
-    
-    return {
-        'food_id': food_id,
-        'portion_g': portion_g
+FOOD_INSERT = """
+    INSERT INTO foodlog (log_id, user_key, food_key, date, portion_size_g)
+    VALUES (?, ?, ?, ?, ?)
+"""
+ACTIVITY_INSERT = """
+    INSERT INTO activitylog (log_id, user_key, activity_key, date, activity_count, kcal_burned)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+WEIGHT_INSERT = """
+    INSERT INTO weightlog (log_id, user_id, date, weight, notes)
+    VALUES (?, ?, ?, ?, ?)
+"""
+
+
+def catalog_keys(conn, table: str, key: str, names) -> Dict[str, int]:
+    """name -> catalog key for the given names, warning once about missing ones"""
+    names = sorted(set(names))
+    placeholders = ", ".join("?" * len(names))
+    keys = dict(conn.execute(f"SELECT name, {key} FROM {table} WHERE name IN ({placeholders})", names))
+    for name in names:
+        if name not in keys:
+            print(f"  ! Warning: {table} '{name}' not found, skipping")
+    return keys
+
+
+def load_menu(conn) -> Dict[str, list]:
+    """Meal and activity options resolved to catalog keys, once per run"""
+    meals = {
+        'breakfast': BREAKFAST_OPTIONS,
+        'lunch': LUNCH_OPTIONS,
+        'dinner': DINNER_OPTIONS,
+        'snack': SNACK_OPTIONS,
     }
+    food_keys = catalog_keys(conn, 'food', 'food_key',
+                             [name for options in meals.values() for name, _ in options])
+    if not food_keys:
+        raise Exception("None of the demo foods are in the catalog. Import foods first.")
+    menu = {meal: [(food_keys[name], portion) for name, portion in options if name in food_keys]
+            for meal, options in meals.items()}
+
+    activity_keys = catalog_keys(conn, 'activity', 'activity_key', [name for name, _ in ACTIVITY_OPTIONS])
+    kcal_per_unit = dict(conn.execute("SELECT activity_key, COALESCE(kcal_per_unit, 0.0) FROM activity"))
+    # kcal burned is per 1000 units
+    menu['activity'] = [(activity_keys[name], count, count / 1000.0 * kcal_per_unit[activity_keys[name]])
+                        for name, count in ACTIVITY_OPTIONS if name in activity_keys]
+    return menu
+
+
+def ensure_users(conn, count: int) -> List[Tuple[int, str, float]]:
+    """(user_key, user_id, start weight) of the demo users, creating missing ones"""
+    usernames = ['user'] + [f"demo{i}" for i in range(2, count + 1)]
+    placeholders = ", ".join("?" * len(usernames))
+    existing = {row[0] for row in conn.execute(
+        f'SELECT username FROM "user" WHERE username IN ({placeholders})', usernames)}
+    missing = [name for name in usernames if name not in existing]
+    if missing:
+        # One hash for all of them: scrypt is slow on purpose
+        password_hash, salt = hash_password(DEMO_PASSWORD)
+        conn.executemany(
+            'INSERT INTO "user" (user_id, username, password_hash, salt, weight) VALUES (?, ?, ?, ?, ?)',
+            [(str(uuid.uuid4()), name, password_hash, salt, DEFAULT_WEIGHT) for name in missing]
+        )
+    rows = conn.execute(
+        f'SELECT user_key, user_id, COALESCE(weight, ?) FROM "user" WHERE username IN ({placeholders}) '
+        f'ORDER BY user_key', [DEFAULT_WEIGHT] + usernames
+    ).fetchall()
+    return [tuple(row) for row in rows]
+
 
-def log_activity(conn, user_id, activity_name, count, date_str):
-    """Log an activity entry"""
-    activity_id = get_activity_id(conn, activity_name)
-    if not activity_id:
-        print(f"  ! Warning: Activity '{activity_name}' not found, skipping")
-        return None
-    
-    # Calculate calories burned
-    kcal_per_unit = get_activity_details(conn, activity_id)
-    kcal_burned = (count / 1000.0) * kcal_per_unit
-    
-    log_id = str(uuid.uuid4())
-    cur = conn.cursor()
-    cur.execute('''
-        INSERT INTO activitylog (log_id, user_id, activity_id, date, activity_count, kcal_burned)
-        VALUES (?, ?, ?, ?, ?, ?)
-    ''', (log_id, user_id, activity_id, date_str, count, kcal_burned))
-    
-    return kcal_burned
-
-def log_weight(conn, user_id, weight, date_str, notes=""):
-    """Log a weight measurement"""
-    log_id = str(uuid.uuid4())
-    cur = conn.cursor()
-    cur.execute('''
-        INSERT INTO weightlog (log_id, user_id, date, weight, notes)
-        VALUES (?, ?, ?, ?, ?)
-    ''', (log_id, user_id, date_str, weight, notes))
-
-def calculate_daily_stats(conn, user_id, date_str):
-    """Calculate and store daily statistics"""
-    cur = conn.cursor()
-    
-    # Calculate food stats
-    cur.execute('''
-        SELECT 
-            SUM((fl.portion_size_g / 100.0) * f.kcal_per_portion) as total_kcal,
-            SUM((fl.portion_size_g / 100.0) * f.carbs_per_portion) as total_carbs,
-            SUM((fl.portion_size_g / 100.0) * f.protein_per_portion) as total_protein,
-            SUM((fl.portion_size_g / 100.0) * f.fat_per_portion) as total_fat,
-            COUNT(*) as food_count
-        FROM foodlog fl
-        JOIN food f ON fl.food_id = f.food_id
-        WHERE fl.user_id = ? AND fl.date = ?
-    ''', (user_id, date_str))
-    
-    food_stats = cur.fetchone()
-    total_kcal_consumed = food_stats[0] or 0.0
-    total_carbs = food_stats[1] or 0.0
-    total_protein = food_stats[2] or 0.0
-    total_fat = food_stats[3] or 0.0
-    food_count = food_stats[4] or 0
-    
-    # Calculate activity stats
-    cur.execute('''
-        SELECT SUM(kcal_burned), COUNT(*)
-        FROM activitylog
-        WHERE user_id = ? AND date = ?
-    ''', (user_id, date_str))
-    
-    activity_stats = cur.fetchone()
-    total_kcal_burned = activity_stats[0] or 0.0
-    activity_count = activity_stats[1] or 0
-    
-    # Calculate net calories
-    net_kcal = total_kcal_consumed - total_kcal_burned
-    
-    # Insert or update statistics
-    stats_id = str(uuid.uuid4())
-    cur.execute('''
-        INSERT OR REPLACE INTO statistics 
-        (stats_id, user_id, date, total_kcal_consumed, total_kcal_burned, net_kcal,
-         total_carbs_g, total_protein_g, total_fat_g, 
-         food_entries_count, activity_entries_count)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-    ''', (stats_id, user_id, date_str, total_kcal_consumed, total_kcal_burned, net_kcal,
-          total_carbs, total_protein, total_fat, food_count, activity_count))
-
-def generate_demo_data():
-    """Generate 30 days of realistic demo data"""
-    
-    if not os.path.exists(DB_PATH):
-        print(f"Database not found at {DB_PATH}")
+def pick(rng: random.Random, options: list, count: int) -> list:
+    """count different options, or all of them when there are fewer"""
+    return rng.sample(options, min(count, len(options)))
+
+
+def build_rows(rng: random.Random, menu: Dict[str, list], user: Tuple[int, str, float],
+               first_day: date, days: range, weight: float):
+    """
+    Log rows of one user for the given day offsets.
+
+    Returns:
+        (food rows, activity rows, weight rows, weight after the last day)
+    """
+    user_key, user_id, _ = user
+    daily_loss = WEEKLY_WEIGHT_LOSS / 7
+    foods, activities, weights = [], [], []
+    for offset in days:
+        date_str = (first_day + timedelta(days=offset)).isoformat()
+        meals = pick(rng, menu['breakfast'], 1) + pick(rng, menu['lunch'], 2) + pick(rng, menu['dinner'], 2)
+        if rng.random() < 0.7:
+            meals += pick(rng, menu['snack'], 1)
+        for food_key, portion in meals:
+            foods.append((str(uuid.uuid4()), user_key, food_key, date_str, portion))
+        if menu['activity'] and rng.random() < 0.8:
+            for activity_key, count, kcal in pick(rng, menu['activity'], rng.choice([1, 1, 2])):
+                activities.append((str(uuid.uuid4()), user_key, activity_key, date_str, count, kcal))
+        weight -= daily_loss
+        if offset % 7 == 0:
+            weights.append((str(uuid.uuid4()), user_id, date_str, round(weight + rng.uniform(-0.3, 0.3), 1),
+                            f"Week {offset // 7 + 1} measurement"))
+    return foods, activities, weights, weight
+
+
+def log_triggers(conn) -> List[Tuple[str, str]]:
+    """(name, CREATE statement) of the statistics and rollup triggers as installed"""
+    return conn.execute(
+        "SELECT name, sql FROM sqlite_master WHERE type = 'trigger' "
+        "AND (name LIKE 'trg_%_stats_%' OR name LIKE 'trg_%_rollup_%')"
+    ).fetchall()
+
+
+def generate_demo_data(db_path: str = DB_PATH, users: int = 1, days: int = 30,
+                       seed: Optional[int] = None) -> Dict[str, int]:
+    """
+    Generate `days` days of demo data, ending today, for `users` users.
+
+    Returns:
+        Number of rows written per table
+    """
+    if not os.path.exists(db_path):
+        print(f"Database not found at {db_path}")
         print("Please run create_db.py first")
-        return
-    
-    conn = sqlite3.connect(DB_PATH)
+        return {}
+
+    rng = random.Random(seed)
+    first_day = date.today() - timedelta(days=days - 1)
+    counts = {'foodlog': 0, 'activitylog': 0, 'weightlog': 0, 'statistics': 0}
+
+    # Busy timeout: the app may be writing to the same database
+    conn = connect(db_path)
     try:
-        user_id = get_user_id(conn)
-        print(f"Generating 30-day demo data for user: {user_id}")
-        
-        # Starting weight and target weight loss
-        current_weight = 80.0  # kg
-        weekly_weight_loss = 0.5  # kg per week
-        daily_weight_loss = weekly_weight_loss / 7
-        
-        # Generate data for last 30 days
-        today = date.today()
-        
-        for days_ago in range(30, -1, -1):
-            current_date = today - timedelta(days=days_ago)
-            date_str = current_date.isoformat()
-            
-            print(f"\nGenerating data for {date_str}...")
-            
-            # Breakfast (always)
-            breakfast = random.choice(BREAKFAST_OPTIONS)
-            log_food(conn, user_id, breakfast[0], breakfast[1], date_str)
-            print(f"  + Breakfast: {breakfast[0]} ({breakfast[1]}g)")
-            
-            # Lunch (always)
-            lunch_items = random.sample(LUNCH_OPTIONS, 2)
-            for item, portion in lunch_items:
-                log_food(conn, user_id, item, portion, date_str)
-            print(f"  + Lunch: {lunch_items[0][0]}, {lunch_items[1][0]}")
-            
-            # Dinner (always)
-            dinner_items = random.sample(DINNER_OPTIONS, 2)
-            for item, portion in dinner_items:
-                log_food(conn, user_id, item, portion, date_str)
-            print(f"  + Dinner: {dinner_items[0][0]}, {dinner_items[1][0]}")
-            
-            # Snacks (70% of days)
-            if random.random() < 0.7:
-                snack = random.choice(SNACK_OPTIONS)
-                log_food(conn, user_id, snack[0], snack[1], date_str)
-                print(f"  + Snack: {snack[0]}")
-            
-            # Activities (80% of days, 1-2 activities)
-            if random.random() < 0.8:
-                num_activities = random.choice([1, 1, 2])  # More likely to do 1 activity
-                activities = random.sample(ACTIVITY_OPTIONS, num_activities)
-                for activity_name, count in activities:
-                    kcal = log_activity(conn, user_id, activity_name, count, date_str)
-                    if kcal:
-                        print(f"  + Activity: {activity_name} ({count} units, {kcal:.1f} kcal)")
-            
-            # Log weight weekly (every 7 days)
-            if days_ago % 7 == 0:
-                current_weight -= (7 * daily_weight_loss)
-                log_weight(conn, user_id, round(current_weight, 1), date_str, 
-                          f"Week {30 - days_ago} measurement")
-                print(f"  + Weight logged: {current_weight:.1f} kg")
-            
-            # Calculate and store daily statistics
-            calculate_daily_stats(conn, user_id, date_str)
-            print(f"  ✓ Daily statistics calculated")
-        
+        # One write transaction: nobody else writes logs while the triggers are gone
+        conn.execute("BEGIN IMMEDIATE")
+        menu = load_menu(conn)
+        demo_users = ensure_users(conn, users)
+        print(f"Generating {days} days of demo data for {len(demo_users)} user(s)...")
+
+        triggers = log_triggers(conn)
+        for name, _ in triggers:
+            conn.execute(f"DROP TRIGGER {name}")
+
+        for user in demo_users:
+            weight = user[2]
+            for start in range(0, days, CHUNK_DAYS):
+                foods, activities, weights, weight = build_rows(
+                    rng, menu, user, first_day, range(start, min(start + CHUNK_DAYS, days)), weight)
+                conn.executemany(FOOD_INSERT, foods)
+                conn.executemany(ACTIVITY_INSERT, activities)
+                conn.executemany(WEIGHT_INSERT, weights)
+                counts['foodlog'] += len(foods)
+                counts['activitylog'] += len(activities)
+                counts['weightlog'] += len(weights)
+
+        for _, sql in triggers:
+            conn.execute(sql)
+        for _, user_id, _ in demo_users:
+            counts['statistics'] += rebuild_statistics(conn, user_id)
+            clear_rollups(conn, user_id)
+
         conn.commit()
-        print("\n" + "="*50)
-        print("✓ Demo data generation completed!")
-        print("="*50)
-        print(f"\nGenerated:")
-        
-        # Summary statistics
-        cur = conn.cursor()
-        cur.execute('SELECT COUNT(*) FROM foodlog WHERE user_id = ?', (user_id,))
-        food_count = cur.fetchone()[0]
-        
-        cur.execute('SELECT COUNT(*) FROM activitylog WHERE user_id = ?', (user_id,))
-        activity_count = cur.fetchone()[0]
-        
-        cur.execute('SELECT COUNT(*) FROM weightlog WHERE user_id = ?', (user_id,))
-        weight_count = cur.fetchone()[0]
-        
-        cur.execute('SELECT COUNT(*) FROM statistics WHERE user_id = ?', (user_id,))
-        stats_count = cur.fetchone()[0]
-        
-        print(f"  - {food_count} food log entries")
-        print(f"  - {activity_count} activity log entries")
-        print(f"  - {weight_count} weight log entries")
-        print(f"  - {stats_count} daily statistics records")
-        
+        return counts
+
     except Exception as e:
         conn.rollback()
         print(f"\n✗ Error generating demo data: {e}")
@@ -293,5 +252,35 @@ def generate_demo_data():
     finally:
         conn.close()
 
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate demo data")
+    parser.add_argument("--users", type=int, default=1, help="'user' plus demo2..demoN")
+    period = parser.add_mutually_exclusive_group()
+    period.add_argument("--days", type=int, default=30)
+    period.add_argument("--years", type=int)
+    parser.add_argument("--seed", type=int, help="same seed, same data (default: random)")
+    parser.add_argument("--db", help="path to SQLite DB", default=DB_PATH)
+    args = parser.parse_args(argv)
+
+    days = args.years * 365 if args.years else args.days
+    start = time.perf_counter()
+    counts = generate_demo_data(args.db, args.users, days, args.seed)
+    if not counts:
+        sys.exit(1)
+    elapsed = time.perf_counter() - start
+    rows = counts['foodlog'] + counts['activitylog'] + counts['weightlog']
+
+    print("\n" + "="*50)
+    print("✓ Demo data generation completed!")
+    print("="*50)
+    print(f"\nGenerated:")
+    print(f"  - {counts['foodlog']} food log entries")
+    print(f"  - {counts['activitylog']} activity log entries")
+    print(f"  - {counts['weightlog']} weight log entries")
+    print(f"  - {counts['statistics']} daily statistics records")
+    print(f"\n{rows} log rows in {elapsed:.1f} s ({rows / elapsed * 60:,.0f} rows/min)")
+
+
 if __name__ == "__main__":
-    generate_demo_data()
+    main()
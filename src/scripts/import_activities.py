@@ -4,53 +4,65 @@ import_activities.py path/to/sample_activities.csv
 CSV import tool to add activities into the SQLite 'activity' table.
 CSV format (header):
 name,calories_per_activity,
+(kcal_per_unit is accepted instead of calories_per_activity)
+Activities whose name already exists are updated unless --no-upsert is given.
 """
-import csv
+import argparse
 import os
 import sys
-import uuid
-import sqlite3
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from scripts.csv_import import (
+    DEFAULT_BATCH_SIZE, CatalogTable, ImportResult, import_catalog_csv, number
+)
 
 BASE_DIR = os.path.dirname(os.path.dirname(__file__))
 DB_PATH = os.path.join(BASE_DIR, "data", "laihdutanyt.db")
 
-def import_csv(csv_path: str, db_path: str = DB_PATH):
+
+def parse_activity(row):
+    # Support both old and new CSV formats
+    return (
+        (row.get("name") or "").strip(),
+        number(row, "calories_per_activity", "kcal_per_unit"),
+    )
+
+
+ACTIVITY_TABLE = CatalogTable(
+    table="activity",
+    id_column="activity_id",
+    # Use correct column name: kcal_per_unit (not calories_per_activity)
+    columns=("name", "kcal_per_unit"),
+    search_table="activity_fts",
+    parse=parse_activity,
+)
+
+
+def import_csv(csv_path: str, db_path: str = DB_PATH, batch_size: int = DEFAULT_BATCH_SIZE,
+               upsert: bool = True, progress=None) -> ImportResult:
     if not os.path.exists(csv_path):
-        print("CSV file not found:", csv_path)
-        return
+        raise FileNotFoundError(f"CSV file not found: {csv_path}")
     if not os.path.exists(db_path):
-        print("Database not found:", db_path, "create_db.py first.")
-        return
-
-    conn = sqlite3.connect(db_path)
-    cur = conn.cursor()
-    inserted = 0
-    with open(csv_path, newline="", encoding="utf-8") as fh:
-        reader = csv.DictReader(fh)
-        for row in reader:
-            name = row.get("name")
-            try:
-                # Support both old and new CSV formats
-                calories = float(row.get("calories_per_activity") or row.get("kcal_per_unit") or 0.0)
-            except ValueError:
-                print("Skipping invalid row:", row)
-                continue
-
-            activity_id = str(uuid.uuid4())
-            # Use correct column name: kcal_per_unit (not calories_per_activity)
-            cur.execute("""
-                INSERT INTO activity (activity_id, name, kcal_per_unit)
-                VALUES (?, ?, ?)
-            """, (activity_id, name, calories))
-            inserted += 1
-
-    conn.commit()
-    conn.close()
-    print(f"Imported {inserted} activities into {db_path}")
+        raise FileNotFoundError(f"Database not found: {db_path} (run create_db.py first)")
+
+    result = import_catalog_csv(csv_path, db_path, ACTIVITY_TABLE, batch_size, upsert, progress)
+    print(f"{result.summary('activities')} in {db_path}")
+    return result
+
 
 if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        print("Usage: import_activities.py sample_activities.csv")
+    parser = argparse.ArgumentParser(description="Import activities from a CSV file")
+    parser.add_argument("csv_path", help="CSV file to import")
+    parser.add_argument("--db", help="path to SQLite DB", default=DB_PATH)
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--no-upsert", action="store_true", help="always insert, even if the name exists")
+    args = parser.parse_args()
+    try:
+        outcome = import_csv(args.csv_path, args.db, args.batch_size, not args.no_upsert)
+    except FileNotFoundError as e:
+        print(e)
         sys.exit(1)
-    import_csv(sys.argv[1])
+    for error in outcome.errors:
+        print("Skipped invalid row,", error)
 # week4: modifioitu generoitu koodi loppuu
@@ -4,54 +4,66 @@ import_foods.py path/to/sample_foods.csv
 CSV import tool to add foods into the SQLite 'food' table.
 CSV format (header):
 name,calories_per_portion,carbs_per_portion,protein_per_portion,fat_per_portion
+(kcal_per_portion is accepted instead of calories_per_portion)
+Foods whose name already exists are updated unless --no-upsert is given.
 """
-import csv
+import argparse
 import os
 import sys
-import uuid
-import sqlite3
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from scripts.csv_import import (
+    DEFAULT_BATCH_SIZE, CatalogTable, ImportResult, import_catalog_csv, number
+)
 
 BASE_DIR = os.path.dirname(os.path.dirname(__file__))
 DB_PATH = os.path.join(BASE_DIR, "data", "laihdutanyt.db")
 
-def import_csv(csv_path: str, db_path: str = DB_PATH):
+
+def parse_food(row):
+    return (
+        (row.get("name") or "").strip(),
+        number(row, "kcal_per_portion", "calories_per_portion"),
+        number(row, "carbs_per_portion"),
+        number(row, "protein_per_portion"),
+        number(row, "fat_per_portion"),
+    )
+
+
+FOOD_TABLE = CatalogTable(
+    table="food",
+    id_column="food_id",
+    columns=("name", "kcal_per_portion", "carbs_per_portion", "protein_per_portion", "fat_per_portion"),
+    search_table="food_fts",
+    parse=parse_food,
+)
+
+
+def import_csv(csv_path: str, db_path: str = DB_PATH, batch_size: int = DEFAULT_BATCH_SIZE,
+               upsert: bool = True, progress=None) -> ImportResult:
     if not os.path.exists(csv_path):
-        print("CSV file not found:", csv_path)
-        return
+        raise FileNotFoundError(f"CSV file not found: {csv_path}")
     if not os.path.exists(db_path):
-        print("Database not found:", db_path, "create_db.py first.")
-        return
-
-    conn = sqlite3.connect(db_path)
-    cur = conn.cursor()
-    inserted = 0
-    with open(csv_path, newline="", encoding="utf-8") as fh:
-        reader = csv.DictReader(fh)
-        for row in reader:
-            name = row.get("name")
-            try:
-                calories = float(row.get("calories_per_portion") or 0.0)
-                carbs = float(row.get("carbs_per_portion") or 0.0)
-                protein = float(row.get("protein_per_portion") or 0.0)
-                fat = float(row.get("fat_per_portion") or 0.0)
-            except ValueError:
-                print("Skipping invalid row:", row)
-                continue
-
-            food_id = str(uuid.uuid4())
-            cur.execute("""
-                INSERT INTO food (food_id, name, calories_per_portion, carbs_per_portion, protein_per_portion, fat_per_portion)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """, (food_id, name, calories, carbs, protein, fat))
-            inserted += 1
-
-    conn.commit()
-    conn.close()
-    print(f"Imported {inserted} foods into {db_path}")
+        raise FileNotFoundError(f"Database not found: {db_path} (run create_db.py first)")
+
+    result = import_catalog_csv(csv_path, db_path, FOOD_TABLE, batch_size, upsert, progress)
+    print(f"{result.summary('foods')} in {db_path}")
+    return result
+
 
 if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        print("Usage: import_foods.py sample_foods.csv")
+    parser = argparse.ArgumentParser(description="Import foods from a CSV file")
+    parser.add_argument("csv_path", help="CSV file to import")
+    parser.add_argument("--db", help="path to SQLite DB", default=DB_PATH)
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--no-upsert", action="store_true", help="always insert, even if the name exists")
+    args = parser.parse_args()
+    try:
+        outcome = import_csv(args.csv_path, args.db, args.batch_size, not args.no_upsert)
+    except FileNotFoundError as e:
+        print(e)
         sys.exit(1)
-    import_csv(sys.argv[1])
-    # generoitu koodi päättyy
\ No newline at end of file
+    for error in outcome.errors:
+        print("Skipped invalid row,", error)
+    # generoitu koodi päättyy
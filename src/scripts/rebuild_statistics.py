@@ -0,0 +1,56 @@
+"""
+scripts/rebuild_statistics.py
+CLI: Recompute the per-day statistics table from foodlog and activitylog.
+The statistics triggers keep the table current; run this to backfill after
+bulk edits the triggers cannot see (e.g. changed food nutrient values).
+Usage:
+    python3 scripts/rebuild_statistics.py [username] [--db path_to_db]
+Example:
+    python3 scripts/rebuild_statistics.py user
+"""
+import argparse
+import os
+import sqlite3
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from repositories.statistics_repository import StatisticsRepository
+
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+DEFAULT_DB = os.path.join(BASE_DIR, "data", "laihdutanyt.db")
+
+
+def find_user_id(db_path: str, username: str):
+    conn = sqlite3.connect(db_path)
+    try:
+        row = conn.execute('SELECT user_id FROM "user" WHERE username = ?', (username,)).fetchone()
+        return row[0] if row else None
+    finally:
+        conn.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rebuild daily statistics from the logs")
+    parser.add_argument("username", nargs="?", help="only rebuild this user (default: all users)")
+    parser.add_argument("--db", help="path to SQLite DB", default=DEFAULT_DB)
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.db):
+        print(f"Database not found: {args.db}\nRun create_db.py first.")
+        sys.exit(1)
+
+    user_id = None
+    if args.username:
+        user_id = find_user_id(args.db, args.username)
+        if not user_id:
+            print(f"User not found: {args.username}")
+            sys.exit(1)
+
+    written = StatisticsRepository(args.db).rebuild(user_id)
+    target = f"user '{args.username}'" if args.username else "all users"
+    print(f"Rebuilt {written} daily statistics rows for {target}")
+
+
+if __name__ == "__main__":
+    main()
@@ -80,8 +80,8 @@ def test_weight_logging():
         
         if summary.get('goal_progress'):
             goal = summary['goal_progress']
-            print(f"   - Goal: Lose {goal['target_loss']} kg")
-            print(f"   - Progress: {goal['actual_loss']:.1f} kg ({goal['progress_percentage']:.1f}%)")
+            print(f"   - Goal: {goal['goal_weight']} kg, {goal['remaining']:.1f} kg above it (trend weight)")
+            print(f"   - Projected: {goal['projected_date'] or 'not on track'}")
     else:
         print(f"   ℹ️  {summary['message']}")
     
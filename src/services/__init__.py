@@ -1,9 +1,23 @@
 # Services package
 # Business logic layer
+#
+# The service classes are imported on first access (PEP 562), so importing
+# one service module does not import all of them.
 
-from services.user_service import UserService
-from services.food_service import FoodService
-from services.activity_service import ActivityService
-from services.admin_service import AdminService
+import importlib
 
-__all__ = ['UserService', 'FoodService', 'ActivityService', 'AdminService']
+_SERVICES = {
+    'UserService': 'services.user_service',
+    'FoodService': 'services.food_service',
+    'ActivityService': 'services.activity_service',
+    'AdminService': 'services.admin_service',
+    'ServiceProvider': 'services.provider',
+}
+
+__all__ = list(_SERVICES)
+
+
+def __getattr__(name):
+    if name in _SERVICES:
+        return getattr(importlib.import_module(_SERVICES[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,11 +1,21 @@
 # activity_service.py
 # Business logic for activity and activity logging operations
 
-from typing import List, Dict
+from typing import Iterator, List, Dict, Optional
 from datetime import date
-import sqlite3
+from repositories.connection_pool import get_connection
 from repositories.activity_repository import ActivityRepository
+from repositories.catalog_cache import get_activity_catalog
+from repositories.day_numbers import normalize_date
 from repositories.activitylog_repository import ActivityLogRepository
+from repositories.models import ActivityLogEntry
+from repositories.statistics_repository import StatisticsRepository
+from repositories.planned_log_repository import PlannedLogRepository
+from services.recurrence import HISTORY_DAYS, PREVIEW_DAYS, Recurrence, horizon, plan_occurrences, planned_day_totals
+
+# ActivityLogEntry columns; kcal_burned is defaulted in SQL
+LOG_ENTRY_COLUMNS = ('date', 'log_id', 'name', 'activity_count', 'kcal')
+
 
 class ActivityService:
     """Service layer for activity-related business logic"""
@@ -13,31 +23,44 @@ class ActivityService:
     def __init__(self, db_path: str):
         self.db_path = db_path
         self.activity_repo = ActivityRepository(db_path)
+        self.activity_catalog = get_activity_catalog(db_path)
         self.activitylog_repo = ActivityLogRepository(db_path)
+        self.statistics_repo = StatisticsRepository(db_path)
+        self.plan_repo = PlannedLogRepository(db_path)
     
     def get_all_activities(self) -> List[Dict]:
         """Get all available activities"""
-        return self.activity_repo.find_all()
+        return self.activity_catalog.find_all()
     
     def get_activity_display_list(self) -> List[str]:
         """Get formatted activity list for UI dropdown (name|id format)"""
-        activities = self.activity_repo.find_all()
+        activities = self.activity_catalog.find_all()
         # Return dict with display name and internal ID mapping
         # For now, keep name|id format for backward compatibility with parsing logic
         return [f"{a['name']}|{a['activity_id']}" for a in activities]
     
     def get_activity_name_only_list(self) -> List[str]:
         """Get activity names only (without IDs) for display"""
-        activities = self.activity_repo.find_all()
-        return [a['name'] for a in activities]
+        return self.activity_catalog.names()
+    
+    def search_activity_names(self, query: str, limit: int = 20) -> List[str]:
+        """Get best matching activity names for search-as-you-type"""
+        return [a['name'] for a in self.activity_repo.search(query, limit)]
     
     def get_activity_id_by_name(self, activity_name: str) -> str:
         """Get activity ID by name"""
-        activities = self.activity_repo.find_all()
-        for activity in activities:
-            if activity['name'] == activity_name:
-                return activity['activity_id']
-        raise ValueError(f"Activity '{activity_name}' not found")
+        activity = self.activity_catalog.find_by_exact_name(activity_name)
+        if not activity:
+            raise ValueError(f"Activity '{activity_name}' not found")
+        return activity['activity_id']
+    
+    def create_activity(self, name: str, unit: str, kcal_per_unit: float = 0.0) -> Dict:
+        """Add an activity to the catalog"""
+        return self.activity_catalog.create(name, unit, kcal_per_unit)
+    
+    def reload_catalog(self):
+        """Drop the cached activity catalog (e.g. after a CSV import)"""
+        self.activity_catalog.invalidate()
     
     def log_activity(self, user_id: str, activity_selection: str, activity_count: float, date_str: str):
         """Log an activity entry for a user"""
@@ -52,11 +75,106 @@ class ActivityService:
             raise ValueError("Activity count must be greater than zero")
         
         # Calculate calories burned
-        activity = self.activity_repo.find_by_id(activity_id)
+        activity = self.activity_catalog.find_by_id(activity_id)
+        if not activity:
+            raise ValueError("Activity not found")
         kcal_burned = (activity_count / 1000.0) * activity.get("kcal_per_unit", 0)
         
         # Create log entry
-        return self.activitylog_repo.create_log(user_id, activity_id, date_str, activity_count, kcal_burned)
+        return self.activitylog_repo.create_log(user_id, activity_id, normalize_date(date_str),
+                                                activity_count, kcal_burned)
+
+    def _find_activity(self, activity_ref: str) -> Dict:
+        """Catalog activity by id or exact name"""
+        activity = self.activity_catalog.find_by_id(activity_ref) or self.activity_catalog.find_by_exact_name(activity_ref)
+        if not activity:
+            raise ValueError(f"Activity '{activity_ref}' not found")
+        return activity
+
+    @staticmethod
+    def _kcal_burned(activity: Optional[Dict], activity_count: float) -> float:
+        return (activity_count / 1000.0) * ((activity or {}).get("kcal_per_unit") or 0)
+
+    def schedule_activity(self, user_id: str, activity_ref: str, activity_count: float, rule: str,
+                          start_date: str, today: Optional[date] = None) -> Dict:
+        """
+        Plan a repeated activity entry, e.g. a walk every weekday for 4 weeks.
+
+        Occurrences up to the materialisation horizon are logged right away,
+        in the same transaction as the plan; later ones are logged by
+        materialize_activity_plans() as the horizon moves.
+
+        Args:
+            user_id: User planning the activity
+            activity_ref: activity_id or exact activity name
+            activity_count: Count of every occurrence (e.g. steps)
+            rule: RRULE-style rule, e.g. "FREQ=DAILY;UNTIL=20261231"
+            start_date: YYYY-MM-DD first possible occurrence
+            today: Reference date of the horizon (default: today)
+
+        Returns:
+            The plan dictionary plus 'logged' (number of logs written now)
+
+        Raises:
+            ValueError: Unknown activity, non-positive count, invalid date or rule
+        """
+        activity = self._find_activity(activity_ref)
+        if activity_count <= 0:
+            raise ValueError("Activity count must be greater than zero")
+        start_date = normalize_date(start_date)
+        recurrence = Recurrence.parse(rule, start_date)
+
+        through = horizon(today)
+        kcal = self._kcal_burned(activity, activity_count)
+        logs = [
+            {'user_id': user_id, 'item_id': activity['activity_id'], 'date': day,
+             'amount': activity_count, 'kcal': kcal}
+            for day in recurrence.occurrences(through=through)
+        ]
+        plan = self.plan_repo.create({
+            'user_id': user_id, 'kind': 'activity', 'item_id': activity['activity_id'],
+            'amount': activity_count, 'rule': recurrence.rule, 'start_date': start_date,
+            'end_date': recurrence.last_date(), 'materialized_through': through,
+        }, logs)
+        plan['logged'] = len(logs)
+        return plan
+
+    def materialize_activity_plans(self, user_id: str, today: Optional[date] = None) -> int:
+        """
+        Log planned activities up to the materialisation horizon.
+
+        Returns:
+            Number of logs written
+        """
+        through = horizon(today)
+        plans = self.plan_repo.find_behind(user_id, 'activity', through)
+        if not plans:
+            return 0
+        logs = []
+        for plan in plans:
+            kcal = self._plan_kcal(plan)
+            logs.extend(
+                {'user_id': user_id, 'item_id': plan['item_id'], 'date': day,
+                 'amount': plan['amount'], 'kcal': kcal}
+                for day in plan_occurrences(plan, through)
+            )
+        self.plan_repo.materialize('activity', logs, [(through, plan['plan_id']) for plan in plans])
+        return len(logs)
+
+    def get_activity_plans(self, user_id: str) -> List[Dict]:
+        """Recurring activity plans of a user with the activity's name"""
+        plans = self.plan_repo.find_for_user(user_id, 'activity')
+        for plan in plans:
+            activity = self.activity_catalog.find_by_id(plan['item_id'])
+            plan['name'] = activity['name'] if activity else "?"
+        return plans
+
+    def delete_activity_plan(self, plan_id: str) -> bool:
+        """Stop a plan; occurrences already logged stay as ordinary logs"""
+        return self.plan_repo.delete(plan_id)
+
+    def _plan_kcal(self, plan: Dict) -> float:
+        return self._kcal_burned(self.activity_catalog.find_by_id(plan['item_id']), plan['amount'])
     
     def get_user_activity_logs(self, user_id: str, date_str: str) -> List[Dict]:
         """Get activity logs for a specific user and date"""
@@ -66,93 +184,93 @@ class ActivityService:
         """Get all activity logs for a user"""
         return self.activitylog_repo.find_all_for_user(user_id)
     
-    def get_daily_activity_totals(self, user_id: str) -> List[Dict]:
-        """Get aggregated daily activity totals with date highlighting"""
+    def get_daily_activity_totals(self, user_id: str, start_date: Optional[str] = None,
+                                  end_date: Optional[str] = None) -> List[Dict]:
+        """
+        Get aggregated daily activity totals with date highlighting.
+        
+        Read like FoodService.get_daily_food_totals: only days from start_date
+        (default HISTORY_DAYS back) through end_date (default PREVIEW_DAYS ahead).
+        """
         today = date.today().isoformat()
+        start_date = start_date or horizon(days=-HISTORY_DAYS)
+        end_date = end_date or horizon(days=PREVIEW_DAYS)
         
-        conn = sqlite3.connect(self.db_path)
-        try:
-            cur = conn.cursor()
-            cur.execute("""
-                SELECT al.date AS date,
-                       SUM(COALESCE(al.kcal_burned, 0.0)) AS total_calories,
-                       COUNT(*) AS entries
-                FROM activitylog al
-                WHERE al.user_id = ?
-                GROUP BY al.date
-                ORDER BY al.date DESC
-            """, (user_id,))
-            
-            results = []
-            for date_str, total_cal, entries in cur.fetchall():
-                # Determine time category
-                if date_str < today:
-                    category = 'past'
-                    display_date = date_str
-                elif date_str == today:
-                    category = 'today'
-                    display_date = f"{date_str} 📍 TODAY"
-                else:
-                    category = 'future'
-                    display_date = f"{date_str} 🔮 PLANNED"
-
-                results.append({
-                    'date': display_date,
-                    'total_kcal_burned': f"{total_cal:.1f}",
-                    'entries': entries,
-                    'category': category
-                })
+        # Per-day rows are kept current by the statistics triggers
+        days = {
+            day['date']: (day['total_kcal_burned'], day['activity_entries_count'])
+            for day in self.statistics_repo.find_daily_totals(user_id, start_date, end_date)
+            if day['activity_entries_count']
+        }
+        
+        # Plan occurrences beyond the materialisation horizon come from the rules
+        planned = planned_day_totals(self.plan_repo.find_for_user(user_id, 'activity'),
+                                     end_date, self._plan_kcal)
+        for date_str, (kcal, entries) in planned.items():
+            if date_str < start_date:
+                continue
+            logged_kcal, logged_entries = days.get(date_str, (0.0, 0))
+            days[date_str] = (logged_kcal + kcal, logged_entries + entries)
+        
+        results = []
+        for date_str in sorted(days, reverse=True):
+            total_kcal, entries = days[date_str]
             
-            return results
-        finally:
-            conn.close()
+            # Determine time category
+            if date_str < today:
+                category = 'past'
+                display_date = date_str
+            elif date_str == today:
+                category = 'today'
+                display_date = f"{date_str} 📍 TODAY"
+            else:
+                category = 'future'
+                display_date = f"{date_str} 🔮 PLANNED"
+
+            results.append({
+                'date': display_date,
+                'total_kcal_burned': f"{total_kcal:.1f}",
+                'entries': entries,
+                'category': category
+            })
+        
+        return results
     
-    def update_activity_log(self, log_id: str, activity_count: int, date_str: str):
+    def update_activity_log(self, log_id: str, activity_count: float, date_str: str):
         """Update an existing activity log entry"""
-        conn = sqlite3.connect(self.db_path)
-        try:
-            cur = conn.cursor()
-            cur.execute(
+        date_str = normalize_date(date_str)
+        with get_connection(self.db_path) as conn:
+            conn.execute(
                 "UPDATE activitylog SET activity_count = ?, date = ? WHERE log_id = ?",
                 (activity_count, date_str, log_id)
             )
-            conn.commit()
-        finally:
-            conn.close()
     
     def delete_activity_log(self, log_id: str):
         """Delete an activity log entry"""
-        conn = sqlite3.connect(self.db_path)
-        try:
-            cur = conn.cursor()
-            cur.execute("DELETE FROM activitylog WHERE log_id = ?", (log_id,))
-            conn.commit()
-        finally:
-            conn.close()
-    
-    def get_activity_logs_by_date(self, user_id: str, date_str: str):
-        """Get formatted activity logs for a specific date"""
-        logs = self.activitylog_repo.find_by_user_and_date(user_id, date_str)
-        formatted_logs = []
-        for log in logs:
-            name = log.get('name') or '?'
-            count = int(log.get('activity_count') or 0)
-            kcal_burned = float(log.get('kcal_burned') or 0)
-            # Return formatted string with better spacing for display
-            # Using wider spacing between fields for better readability
-            formatted_logs.append(f"{name:<35} x{count:<4}     {kcal_burned:>6.2f} kcal burned")
-        return formatted_logs
-    
-    def get_all_activity_logs(self, user_id: str):
+        with get_connection(self.db_path) as conn:
+            conn.execute("DELETE FROM activitylog WHERE log_id = ?", (log_id,))
+    
+    def get_activity_logs_by_date(self, user_id: str, date_str: str) -> List[ActivityLogEntry]:
+        """Get the activity logs of a date (see ui/formatting.py for display)"""
+        return self.activitylog_repo.find_by_user_and_date(user_id, date_str, columns=LOG_ENTRY_COLUMNS,
+                                                           row_factory=ActivityLogEntry.from_row)
+    
+    def get_all_activity_logs(self, user_id: str) -> List[ActivityLogEntry]:
         """Get all activity logs for a user"""
-        logs = self.activitylog_repo.find_all_for_user(user_id)
-        formatted_logs = []
-        for log in logs:
-            formatted_logs.append({
-                'date': log.get('date'),
-                'name': log.get('name') or '?',
-                'count': int(log.get('activity_count') or 0),
-                'kcal_burned': float(log.get('kcal_burned') or 0),
-                'log_id': log.get('log_id')
-            })
-        return formatted_logs
+        return list(self.iter_activity_logs(user_id))
+
+    def iter_activity_logs(self, user_id: str) -> Iterator[ActivityLogEntry]:
+        """Stream all activity logs of a user in date order, one page in memory at a time"""
+        return self.activitylog_repo.iter_for_user(user_id, columns=LOG_ENTRY_COLUMNS,
+                                                   row_factory=ActivityLogEntry.from_row)
+
+    def get_activity_log_page(self, user_id: str, after: Optional[ActivityLogEntry] = None,
+                              limit: int = 200) -> List[ActivityLogEntry]:
+        """Get the activity logs following `after` (a log from the previous page) in date order"""
+        key = (after.date, after.log_id) if after else None
+        return self.activitylog_repo.find_page_for_user(user_id, key, limit, columns=LOG_ENTRY_COLUMNS,
+                                                        row_factory=ActivityLogEntry.from_row)
+
+    def count_activity_logs(self, user_id: str) -> int:
+        """Get the number of activity logs for a user"""
+        return self.activitylog_repo.count_for_user(user_id)
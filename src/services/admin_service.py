@@ -2,18 +2,18 @@
 # Business logic for admin operations
 
 from typing import List, Dict, Optional
-import sqlite3
 import uuid
+from repositories.connection_pool import get_connection
 from repositories.admin_repository import AdminRepository
 from repositories.user_repository import UserRepository
 
 class AdminService:
     """Service layer for admin-related business logic"""
     
-    def __init__(self, db_path: str):
+    def __init__(self, db_path: str, user_repo: Optional[UserRepository] = None):
         self.db_path = db_path
         self.admin_repo = AdminRepository(db_path)
-        self.user_repo = UserRepository(db_path)
+        self.user_repo = user_repo or UserRepository(db_path)
     
     def authenticate_admin(self, username: str, password: str) -> bool:
         """Authenticate an admin user"""
@@ -21,17 +21,14 @@ class AdminService:
     
     def get_all_users_summary(self) -> List[tuple]:
         """Get summary of all users for admin dashboard"""
-        conn = sqlite3.connect(self.db_path)
-        try:
+        with get_connection(self.db_path) as conn:
             cur = conn.cursor()
             cur.execute("""
                 SELECT username, weight, weight_loss_target, kcal_min, kcal_max, activity_level, allergies
                 FROM user
                 ORDER BY username
             """)
-            return cur.fetchall()
-        finally:
-            conn.close()
+            return [tuple(row) for row in cur.fetchall()]
     
     def create_recommendation(self, username: str, admin_username: str, 
                             rec_type: str, title: str, kcal_min: Optional[float], 
@@ -47,8 +44,7 @@ class AdminService:
         
         rec_id = str(uuid.uuid4())
         
-        conn = sqlite3.connect(self.db_path)
-        try:
+        with get_connection(self.db_path) as conn:
             cur = conn.cursor()
             cur.execute("""
                 INSERT INTO recommendation 
@@ -57,10 +53,7 @@ class AdminService:
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 'active')
             """, (rec_id, user.user_id, admin.admin_id if admin else None, rec_type, title, "", 
                   kcal_min, kcal_max, activities, notes))
-            conn.commit()
             return rec_id
-        finally:
-            conn.close()
     
     def get_user_constraints(self, username: str) -> List[tuple]:
         """Get all constraints for a specific user"""
@@ -68,8 +61,7 @@ class AdminService:
         if not user:
             return []
         
-        conn = sqlite3.connect(self.db_path)
-        try:
+        with get_connection(self.db_path) as conn:
             cur = conn.cursor()
             cur.execute("""
                 SELECT constraint_type, description, severity
@@ -77,9 +69,7 @@ class AdminService:
                 WHERE user_id = ?
                 ORDER BY severity DESC, constraint_type
             """, (user.user_id,))
-            return cur.fetchall()
-        finally:
-            conn.close()
+            return [tuple(row) for row in cur.fetchall()]
     
     def add_user_constraint(self, username: str, constraint_type: str, 
                           description: str, severity: str):
@@ -90,25 +80,18 @@ class AdminService:
         
         constraint_id = str(uuid.uuid4())
         
-        conn = sqlite3.connect(self.db_path)
-        try:
+        with get_connection(self.db_path) as conn:
             cur = conn.cursor()
             cur.execute("""
                 INSERT INTO user_constraint 
                 (constraint_id, user_id, constraint_type, description, severity)
                 VALUES (?, ?, ?, ?, ?)
             """, (constraint_id, user.user_id, constraint_type, description, severity))
-            conn.commit()
             return constraint_id
-        finally:
-            conn.close()
     
     def get_usernames_list(self) -> List[str]:
         """Get list of all usernames"""
-        conn = sqlite3.connect(self.db_path)
-        try:
+        with get_connection(self.db_path) as conn:
             cur = conn.cursor()
             cur.execute("SELECT username FROM user ORDER BY username")
             return [row[0] for row in cur.fetchall()]
-        finally:
-            conn.close()
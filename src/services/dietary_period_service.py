@@ -12,7 +12,7 @@ Examples:
 - "Low-Carb Experiment"
 """
 
-from typing import List, Dict, Optional
+from typing import Iterator, List, Dict, Optional
 from datetime import datetime, date
 from repositories.dietary_period_repository import DietaryPeriodRepository
 
@@ -100,6 +100,10 @@ class DietaryPeriodService:
         """Get all dietary periods for a user (descending order)"""
         return self.period_repo.find_all(user_id)
     
+    def iter_periods(self, user_id: str) -> Iterator[Dict]:
+        """Stream all dietary periods of a user in start date order"""
+        return self.period_repo.iter_all(user_id)
+    
     def get_active_periods(self, user_id: str) -> List[Dict]:
         """Get currently active/ongoing periods"""
         return self.period_repo.find_active(user_id)
@@ -183,44 +187,56 @@ class DietaryPeriodService:
         Returns:
             Dictionary with period info, duration, and weight loss during period
         """
-        from services.weightlog_service import WeightLogService
-        
         period = self.period_repo.find_by_id(period_id)
         if not period:
             return None
         
-        # Calculate duration
-        start = datetime.strptime(period['start_date'], '%Y-%m-%d').date()
-        
-        if period['end_date']:
-            end = datetime.strptime(period['end_date'], '%Y-%m-%d').date()
-            is_ongoing = False
-        else:
-            end = date.today()
-            is_ongoing = True
+        rows = self.period_repo.summarize(period['user_id'], date.today().isoformat(), period_id)
+        return self._summary(rows[0]) if rows else None
+    
+    def summarize_periods(self, user_id: str) -> List[Dict]:
+        """
+        Get the summaries of all periods of a user with one query.
         
-        duration_days = (end - start).days + 1
+        Weights are the weigh-ins nearest to the start and end dates, so a
+        period is measured even when nobody weighed in on exactly those days.
         
-        # Get weight change during this period
-        weight_service = WeightLogService(self.db_path)
+        Returns:
+            List of summaries as in get_period_summary (descending order),
+            plus kcal_in / kcal_out totals
+        """
+        rows = self.period_repo.summarize(user_id, date.today().isoformat())
+        return [self._summary(row) for row in rows]
+    
+    @staticmethod
+    def _summary(row: Dict) -> Dict:
+        """Build a period summary from a DietaryPeriodRepository.summarize row"""
+        summary = dict(row)
+        start_weight = summary.pop('start_weight')
+        start_weight_date = summary.pop('start_weight_date')
+        end_weight = summary.pop('end_weight')
+        end_weight_date = summary.pop('end_weight_date')
+        # The weigh-ins may lie up to NEAREST_WEIGHIN_DAYS outside the period
+        weighin_days = summary.pop('weighin_days')
         
-        start_weight = weight_service.get_weight_on_date(period['user_id'], period['start_date'])
-        end_weight = weight_service.get_weight_on_date(period['user_id'], 
-                                                       period['end_date'] if period['end_date'] else end.isoformat())
+        # Computed from the day numbers in SQL (ongoing periods run until today)
+        duration_days = summary.pop('duration_days')
         
         weight_change = None
         if start_weight and end_weight:
             weight_change = {
                 'start_weight': start_weight,
+                'start_date': start_weight_date,
                 'end_weight': end_weight,
+                'end_date': end_weight_date,
                 'change': end_weight - start_weight,
-                'change_per_week': ((end_weight - start_weight) / duration_days) * 7 if duration_days > 0 else 0
+                'change_per_week': ((end_weight - start_weight) / weighin_days) * 7 if weighin_days else None
             }
         
         return {
-            **period,
+            **summary,
             'duration_days': duration_days,
-            'is_ongoing': is_ongoing,
+            'is_ongoing': not summary['end_date'],
             'weight_change': weight_change
         }
     
@@ -1,11 +1,24 @@
 # food_service.py
 # Business logic for food and food logging operations
 
-from typing import List, Dict, Optional
+from typing import Iterator, List, Dict, Optional, Tuple
 from datetime import date
-import sqlite3
+from repositories.connection_pool import get_connection
 from repositories.food_repository import FoodRepository
+from repositories.catalog_cache import get_food_catalog
+from repositories.day_numbers import normalize_date
 from repositories.foodlog_repository import FoodLogRepository
+from repositories.models import DailyNutrition, FoodLogEntry
+from repositories.nutrition_repository import NutritionRepository
+from repositories.planned_log_repository import PlannedLogRepository
+from repositories.statistics_repository import StatisticsRepository
+from services.recurrence import HISTORY_DAYS, PREVIEW_DAYS, Recurrence, horizon, plan_occurrences
+
+# FoodLogEntry columns; kcal and macros of each portion are computed in SQL
+LOG_ENTRY_COLUMNS = ('date', 'log_id', 'name', 'portion_size_g', 'kcal', 'carbs_g', 'protein_g', 'fat_g')
+# Food columns of the nutrients per 100 g, in DailyNutrition order
+NUTRIENT_COLUMNS = ('kcal_per_portion', 'carbs_per_portion', 'protein_per_portion', 'fat_per_portion')
+
 
 class FoodService:
     """Service layer for food-related business logic"""
@@ -13,31 +26,46 @@ class FoodService:
     def __init__(self, db_path: str):
         self.db_path = db_path
         self.food_repo = FoodRepository(db_path)
+        self.food_catalog = get_food_catalog(db_path)
         self.foodlog_repo = FoodLogRepository(db_path)
+        self.plan_repo = PlannedLogRepository(db_path)
+        self.nutrition_repo = NutritionRepository(db_path)
+        self.statistics_repo = StatisticsRepository(db_path)
     
     def get_all_foods(self) -> List[Dict]:
         """Get all available foods"""
-        return self.food_repo.find_all()
+        return self.food_catalog.find_all()
     
     def get_food_display_list(self) -> List[str]:
         """Get formatted food list for UI dropdown (name only, id stored internally)"""
-        foods = self.food_repo.find_all()
+        foods = self.food_catalog.find_all()
         # Return dict with display name and internal ID mapping
         # For now, keep name|id format for backward compatibility with parsing logic
         return [f"{f['name']}|{f['food_id']}" for f in foods]
     
     def get_food_name_only_list(self) -> List[str]:
         """Get food names only (without IDs) for display"""
-        foods = self.food_repo.find_all()
-        return [f['name'] for f in foods]
+        return self.food_catalog.names()
+    
+    def search_food_names(self, query: str, limit: int = 20) -> List[str]:
+        """Get best matching food names for search-as-you-type"""
+        return [f['name'] for f in self.food_repo.search(query, limit)]
     
     def get_food_id_by_name(self, food_name: str) -> str:
         """Get food ID by name"""
-        foods = self.food_repo.find_all()
-        for food in foods:
-            if food['name'] == food_name:
-                return food['food_id']
-        raise ValueError(f"Food '{food_name}' not found")
+        food = self.food_catalog.find_by_exact_name(food_name)
+        if not food:
+            raise ValueError(f"Food '{food_name}' not found")
+        return food['food_id']
+    
+    def create_food(self, name: str, kcal_per_portion: float, carbs: float = 0.0,
+                    protein: float = 0.0, fat: float = 0.0) -> Dict:
+        """Add a food to the catalog"""
+        return self.food_catalog.create(name, kcal_per_portion, carbs, protein, fat)
+    
+    def reload_catalog(self):
+        """Drop the cached food catalog (e.g. after a CSV import)"""
+        self.food_catalog.invalidate()
     
     def log_food(self, user_id: str, food_selection: str, portion_g: float, date_str: str):
         """Log a food entry for a user"""
@@ -52,8 +80,130 @@ class FoodService:
             raise ValueError("Portion must be greater than zero")
         
         # Create log entry
-        return self.foodlog_repo.create_log(user_id, food_id, date_str, portion_g)
-    
+        return self.foodlog_repo.create_log(user_id, food_id, normalize_date(date_str), portion_g)
+
+    def log_meal(self, user_id: str, date_str: str, items: List[Tuple[str, float]]) -> List[Dict]:
+        """
+        Log several foods for one date in a single transaction.
+
+        Every item is validated against the cached catalog before anything is
+        written, so a bad item leaves no partial meal behind.
+
+        Args:
+            user_id: User logging the meal
+            date_str: YYYY-MM-DD date of the meal
+            items: (food_id or exact food name, portion in grams) pairs
+
+        Returns:
+            Created log rows in item order, with the food's name and kcal_per_portion
+
+        Raises:
+            ValueError: Empty meal, unknown food, non-positive portion or invalid date
+        """
+        if not items:
+            raise ValueError("Meal has no foods")
+        date_str = normalize_date(date_str)
+
+        foods = []
+        for food_ref, portion_g in items:
+            food = self._find_food(food_ref)
+            if portion_g <= 0:
+                raise ValueError(f"Portion of '{food['name']}' must be greater than zero")
+            foods.append(food)
+
+        rows = self.foodlog_repo.create_logs(
+            user_id, date_str, [(food['food_id'], portion_g) for food, (_, portion_g) in zip(foods, items)]
+        )
+        for row, food in zip(rows, foods):
+            row['name'] = food['name']
+            row['kcal_per_portion'] = food['kcal_per_portion']
+        return rows
+
+    def _find_food(self, food_ref: str) -> Dict:
+        """Catalog food by id or exact name"""
+        food = self.food_catalog.find_by_id(food_ref) or self.food_catalog.find_by_exact_name(food_ref)
+        if not food:
+            raise ValueError(f"Food '{food_ref}' not found")
+        return food
+
+    def schedule_food(self, user_id: str, food_ref: str, portion_g: float, rule: str,
+                      start_date: str, today: Optional[date] = None) -> Dict:
+        """
+        Plan a repeated food entry, e.g. breakfast every weekday for 4 weeks.
+
+        Occurrences up to the materialisation horizon are logged right away,
+        in the same transaction as the plan; later ones are logged by
+        materialize_food_plans() as the horizon moves.
+
+        Args:
+            user_id: User planning the food
+            food_ref: food_id or exact food name
+            portion_g: Portion of every occurrence in grams
+            rule: RRULE-style rule, e.g. "FREQ=WEEKLY;BYDAY=MO,TU,WE,TH,FR;COUNT=20"
+            start_date: YYYY-MM-DD first possible occurrence
+            today: Reference date of the horizon (default: today)
+
+        Returns:
+            The plan dictionary plus 'logged' (number of logs written now)
+
+        Raises:
+            ValueError: Unknown food, non-positive portion, invalid date or rule
+        """
+        food = self._find_food(food_ref)
+        if portion_g <= 0:
+            raise ValueError("Portion must be greater than zero")
+        start_date = normalize_date(start_date)
+        recurrence = Recurrence.parse(rule, start_date)
+
+        through = horizon(today)
+        logs = [
+            {'user_id': user_id, 'item_id': food['food_id'], 'date': day, 'amount': portion_g}
+            for day in recurrence.occurrences(through=through)
+        ]
+        plan = self.plan_repo.create({
+            'user_id': user_id, 'kind': 'food', 'item_id': food['food_id'], 'amount': portion_g,
+            'rule': recurrence.rule, 'start_date': start_date, 'end_date': recurrence.last_date(),
+            'materialized_through': through,
+        }, logs)
+        plan['logged'] = len(logs)
+        return plan
+
+    def materialize_food_plans(self, user_id: str, today: Optional[date] = None) -> int:
+        """
+        Log planned foods up to the materialisation horizon.
+
+        Returns:
+            Number of logs written
+        """
+        through = horizon(today)
+        plans = self.plan_repo.find_behind(user_id, 'food', through)
+        if not plans:
+            return 0
+        logs = [
+            {'user_id': user_id, 'item_id': plan['item_id'], 'date': day, 'amount': plan['amount']}
+            for plan in plans
+            for day in plan_occurrences(plan, through)
+        ]
+        self.plan_repo.materialize('food', logs, [(through, plan['plan_id']) for plan in plans])
+        return len(logs)
+
+    def get_food_plans(self, user_id: str) -> List[Dict]:
+        """Recurring food plans of a user with the food's name"""
+        plans = self.plan_repo.find_for_user(user_id, 'food')
+        for plan in plans:
+            food = self.food_catalog.find_by_id(plan['item_id'])
+            plan['name'] = food['name'] if food else "?"
+        return plans
+
+    def delete_food_plan(self, plan_id: str) -> bool:
+        """Stop a plan; occurrences already logged stay as ordinary logs"""
+        return self.plan_repo.delete(plan_id)
+
+    def _plan_nutrients(self, plan: Dict) -> Tuple[float, ...]:
+        """kcal, carbs, protein and fat of one occurrence of a plan"""
+        food = self.food_catalog.find_by_id(plan['item_id']) or {}
+        return tuple((plan['amount'] / 100.0) * (food.get(column) or 0.0) for column in NUTRIENT_COLUMNS)
+
     def get_user_food_logs(self, user_id: str, date_str: str) -> List[Dict]:
         """Get food logs for a specific user and date"""
         return self.foodlog_repo.find_by_user_and_date(user_id, date_str)
@@ -62,99 +212,123 @@ class FoodService:
         """Get all food logs for a user"""
         return self.foodlog_repo.find_all_for_user(user_id)
     
-    def get_daily_food_totals(self, user_id: str) -> List[Dict]:
-        """Get aggregated daily food totals with date highlighting"""
+    def get_daily_nutrition(self, user_id: str, start_date: Optional[str] = None,
+                            end_date: Optional[str] = None) -> List[DailyNutrition]:
+        """
+        Get kcal, carbs, protein, fat, activity burn and net kcal per day.
+        
+        Computed from the logs in one grouped query, so the figures follow
+        edits of a food's nutrients too.
+        
+        Args:
+            user_id: The user's ID
+            start_date: First date (YYYY-MM-DD, inclusive; None = no limit)
+            end_date: Last date (YYYY-MM-DD, inclusive; None = no limit)
+        
+        Returns:
+            DailyNutrition per day with logs, newest first
+        """
+        return self.nutrition_repo.find_daily(user_id, start_date, end_date)
+    
+    def get_daily_food_totals(self, user_id: str, start_date: Optional[str] = None,
+                              end_date: Optional[str] = None) -> List[Dict]:
+        """
+        Get aggregated daily food totals (kcal, macros, burn, net) with date highlighting.
+        
+        Only days from start_date (default HISTORY_DAYS back) through end_date
+        (default PREVIEW_DAYS ahead) are read and shown.
+        """
         today = date.today().isoformat()
+        start_date = start_date or horizon(days=-HISTORY_DAYS)
+        end_date = end_date or horizon(days=PREVIEW_DAYS)
         
-        conn = sqlite3.connect(self.db_path)
-        try:
-            cur = conn.cursor()
-            cur.execute("""
-                SELECT fl.date AS date,
-                       SUM( (fl.portion_size_g / 100) * COALESCE(f.kcal_per_portion, 0.0) ) AS total_calories,
-                       COUNT(*) AS entries
-                FROM foodlog fl
-                LEFT JOIN food f ON fl.food_id = f.food_id
-                WHERE fl.user_id = ?
-                GROUP BY fl.date
-                ORDER BY fl.date DESC
-            """, (user_id,))
+        # Per-day rows are kept current by the statistics triggers
+        statistics = self.statistics_repo.find_daily_totals(user_id, start_date, end_date)
+        burned = {day['date']: day['total_kcal_burned'] for day in statistics}
+        # date -> [kcal, carbs, protein, fat, entries]
+        days = {
+            day['date']: [day['total_kcal_consumed'], day['total_carbs_g'], day['total_protein_g'],
+                          day['total_fat_g'], day['food_entries_count']]
+            for day in statistics
+            if day['food_entries_count']
+        }
+        
+        # Plan occurrences beyond the materialisation horizon come from the rules
+        for plan in self.plan_repo.find_for_user(user_id, 'food'):
+            nutrients = self._plan_nutrients(plan)
+            for date_str in plan_occurrences(plan, end_date):
+                if date_str < start_date:
+                    continue
+                totals = days.setdefault(date_str, [0.0, 0.0, 0.0, 0.0, 0])
+                for i, value in enumerate(nutrients):
+                    totals[i] += value
+                totals[4] += 1
+        
+        results = []
+        for date_str in sorted(days, reverse=True):
+            total_kcal, carbs, protein, fat, entries = days[date_str]
+            burned_kcal = burned.get(date_str, 0.0)
             
-            results = []
-            for date_str, total_cal, entries in cur.fetchall():
-                # Determine time category
-                if date_str < today:
-                    category = 'past'
-                    display_date = date_str
-                elif date_str == today:
-                    category = 'today'
-                    display_date = f"{date_str} 📍 TODAY"
-                else:
-                    category = 'future'
-                    display_date = f"{date_str} 🔮 PLANNED"
-                
-                results.append({
-                    'date': display_date,
-                    'total_kcal': f"{total_cal:.1f}",
-                    'entries': entries,
-                    'category': category
-                })
+            # Determine time category
+            if date_str < today:
+                category = 'past'
+                display_date = date_str
+            elif date_str == today:
+                category = 'today'
+                display_date = f"{date_str} 📍 TODAY"
+            else:
+                category = 'future'
+                display_date = f"{date_str} 🔮 PLANNED"
             
-            return results
-        finally:
-            conn.close()
+            results.append({
+                'date': display_date,
+                'total_kcal': total_kcal,
+                'carbs': carbs,
+                'protein': protein,
+                'fat': fat,
+                'burned': burned_kcal,
+                'net_kcal': total_kcal - burned_kcal,
+                'entries': entries,
+                'category': category
+            })
+        
+        return results
     
     def update_food_log(self, log_id: str, portion_g: float, date_str: str):
         """Update an existing food log entry"""
-        conn = sqlite3.connect(self.db_path)
-        try:
-            cur = conn.cursor()
-            cur.execute(
+        date_str = normalize_date(date_str)
+        with get_connection(self.db_path) as conn:
+            conn.execute(
                 "UPDATE foodlog SET portion_size_g = ?, date = ? WHERE log_id = ?",
                 (portion_g, date_str, log_id)
             )
-            conn.commit()
-        finally:
-            conn.close()
     
     def delete_food_log(self, log_id: str):
         """Delete a food log entry"""
-        conn = sqlite3.connect(self.db_path)
-        try:
-            cur = conn.cursor()
-            cur.execute("DELETE FROM foodlog WHERE log_id = ?", (log_id,))
-            conn.commit()
-        finally:
-            conn.close()
-    
-    def get_food_logs_by_date(self, user_id: str, date_str: str):
-        """Get formatted food logs for a specific date"""
-        logs = self.foodlog_repo.find_by_user_and_date(user_id, date_str)
-        formatted_logs = []
-        for log in logs:
-            name = log.get("name") or "?"
-            portion = int(log.get("portion_size_g") or 100)
-            cal_per = int(log.get("kcal_per_portion") or 0)
-            total_cal = float((portion / 100.0) * cal_per)
-            # Return formatted string with better spacing for display
-            # Using wider spacing between fields for better readability
-            formatted_logs.append(f"{name:<35} {portion:>5}g      {total_cal:>6.1f} kcal")
-        return formatted_logs
-    
-    def get_all_food_logs(self, user_id: str):
+        with get_connection(self.db_path) as conn:
+            conn.execute("DELETE FROM foodlog WHERE log_id = ?", (log_id,))
+    
+    def get_food_logs_by_date(self, user_id: str, date_str: str) -> List[FoodLogEntry]:
+        """Get the food logs of a date with kcal and macros (see ui/formatting.py for display)"""
+        return self.foodlog_repo.find_by_user_and_date(user_id, date_str, columns=LOG_ENTRY_COLUMNS,
+                                                       row_factory=FoodLogEntry.from_row)
+    
+    def get_all_food_logs(self, user_id: str) -> List[FoodLogEntry]:
         """Get all food logs for a user"""
-        logs = self.foodlog_repo.find_all_for_user(user_id)
-        formatted_logs = []
-        for log in logs:
-            name = log.get("name") or "?"
-            portion = int(log.get("portion_size_g") or 100)
-            cal_per = int(log.get("kcal_per_portion") or 0)
-            total_cal = float((portion / 100.0) * cal_per)
-            formatted_logs.append({
-                'date': log['date'],
-                'name': name,
-                'portion': portion,
-                'calories': total_cal,
-                'log_id': log['log_id']
-            })
-        return formatted_logs
+        return list(self.iter_food_logs(user_id))
+
+    def iter_food_logs(self, user_id: str) -> Iterator[FoodLogEntry]:
+        """Stream all food logs of a user in date order, one page in memory at a time"""
+        return self.foodlog_repo.iter_for_user(user_id, columns=LOG_ENTRY_COLUMNS,
+                                               row_factory=FoodLogEntry.from_row)
+
+    def get_food_log_page(self, user_id: str, after: Optional[FoodLogEntry] = None,
+                          limit: int = 200) -> List[FoodLogEntry]:
+        """Get the food logs following `after` (a log from the previous page) in date order"""
+        key = (after.date, after.log_id) if after else None
+        return self.foodlog_repo.find_page_for_user(user_id, key, limit, columns=LOG_ENTRY_COLUMNS,
+                                                    row_factory=FoodLogEntry.from_row)
+
+    def count_food_logs(self, user_id: str) -> int:
+        """Get the number of food logs for a user"""
+        return self.foodlog_repo.count_for_user(user_id)
@@ -0,0 +1,64 @@
+"""
+PeriodIndex: dietary periods sorted for annotating many dates at once.
+
+Weight history rows are annotated with the periods that contain their date.
+Checking every period for every row is O(rows x periods); the index instead
+sweeps the dates in ascending order, adding periods as their start date is
+reached and expiring them from a heap keyed by end date, so each period is
+pushed and popped once: O((rows + periods) log periods).
+"""
+
+import heapq
+from typing import Dict, Iterable, List, Tuple
+
+# End date used for ongoing periods (end_date NULL)
+OPEN_END = "9999-12-31"
+
+
+class PeriodIndex:
+    """Interval index over a user's dietary periods"""
+
+    def __init__(self, periods: List[Dict]):
+        """
+        Args:
+            periods: Period dictionaries; annotations list them in this order
+        """
+        self.periods = periods
+        self._by_start = sorted(range(len(periods)), key=lambda i: periods[i]['start_date'])
+
+    def annotate(self, dates: Iterable[str]) -> Dict[str, Tuple[List[str], List[str]]]:
+        """
+        Find the periods containing each date.
+
+        Args:
+            dates: YYYY-MM-DD dates in any order (duplicates allowed)
+
+        Returns:
+            Dictionary date -> (active period names, start/end markers)
+        """
+        periods = self.periods
+        result = {}
+        active: List[Tuple[str, int]] = []  # heap of (end date, period index)
+        next_start = 0
+
+        for day in sorted(set(dates)):
+            while next_start < len(self._by_start):
+                index = self._by_start[next_start]
+                if periods[index]['start_date'] > day:
+                    break
+                heapq.heappush(active, (periods[index]['end_date'] or OPEN_END, index))
+                next_start += 1
+            while active and active[0][0] < day:
+                heapq.heappop(active)
+
+            names = []
+            markers = []
+            for _, index in sorted(active, key=lambda item: item[1]):
+                period = periods[index]
+                names.append(period['period_name'])
+                if period['start_date'] == day:
+                    markers.append(f"▶ START: {period['period_name']}")
+                if period['end_date'] == day:
+                    markers.append(f"⏹ END: {period['period_name']}")
+            result[day] = (names, markers)
+        return result
@@ -0,0 +1,66 @@
+"""
+ServiceProvider: services built on first use.
+
+The application used to construct all six services (and import their
+modules, repositories and models) before the login window could appear.
+The provider imports and builds a service the first time it is asked for,
+and passes one UserRepository to every service that needs one.
+
+Usage:
+    services = ServiceProvider(db_path)
+    services.user.authenticate_user(username, password)
+"""
+from functools import cached_property
+
+
+class ServiceProvider:
+    """Lazily constructed services for one database"""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+
+    @cached_property
+    def user_repo(self):
+        """The UserRepository shared by the user, admin and weight services"""
+        from repositories.user_repository import UserRepository
+        return UserRepository(self.db_path)
+
+    @cached_property
+    def user(self):
+        from services.user_service import UserService
+        return UserService(self.db_path, user_repo=self.user_repo)
+
+    @cached_property
+    def admin(self):
+        from services.admin_service import AdminService
+        return AdminService(self.db_path, user_repo=self.user_repo)
+
+    @cached_property
+    def food(self):
+        from services.food_service import FoodService
+        return FoodService(self.db_path)
+
+    @cached_property
+    def activity(self):
+        from services.activity_service import ActivityService
+        return ActivityService(self.db_path)
+
+    @cached_property
+    def weightlog(self):
+        from services.weightlog_service import WeightLogService
+        return WeightLogService(self.db_path, user_repo=self.user_repo)
+
+    @cached_property
+    def dietary_period(self):
+        from services.dietary_period_service import DietaryPeriodService
+        return DietaryPeriodService(self.db_path)
+
+    @cached_property
+    def report(self):
+        from services.report_service import ReportService
+        return ReportService(self.db_path)
+
+    def built(self) -> list:
+        """Names of the services constructed so far"""
+        return [name for name in ('user', 'admin', 'food', 'activity', 'weightlog', 'dietary_period', 'report')
+                if name in self.__dict__]
@@ -0,0 +1,235 @@
+"""
+Recurrence: RRULE-style repeat rules for planned food and activity logs.
+
+A plan stores its rule as text, e.g. "this breakfast every weekday for 4 weeks":
+    FREQ=WEEKLY;BYDAY=MO,TU,WE,TH,FR;UNTIL=20261115
+Supported parts (a subset of RFC 5545 RRULE, whole days only):
+    FREQ      DAILY or WEEKLY
+    INTERVAL  every n-th day/week (default 1)
+    BYDAY     MO,TU,WE,TH,FR,SA,SU (WEEKLY default: the start date's weekday)
+    UNTIL     last possible date, YYYYMMDD or YYYY-MM-DD (inclusive)
+    COUNT     number of occurrences
+
+Occurrences are generated lazily, so an open-ended rule costs nothing until
+a date range is asked for. Plans are written to foodlog/activitylog only up
+to a materialisation horizon (MATERIALIZE_DAYS ahead); the totals views read
+the days beyond it straight from the rules.
+"""
+
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Plans are copied into the log tables this many days ahead of today
+MATERIALIZE_DAYS = 14
+# Totals views show unexpanded plans this many days ahead of today
+PREVIEW_DAYS = 90
+# ...and logged days this many days back
+HISTORY_DAYS = 365
+
+DAILY = "DAILY"
+WEEKLY = "WEEKLY"
+WEEKDAY_CODES = ("MO", "TU", "WE", "TH", "FR", "SA", "SU")
+
+# Rules offered by the log forms' Repeat choice
+REPEAT_PRESETS = {
+    "Every day": "FREQ=DAILY",
+    "Weekdays": "FREQ=WEEKLY;BYDAY=MO,TU,WE,TH,FR",
+    "Every week": "FREQ=WEEKLY",
+}
+
+
+@dataclass(frozen=True)
+class Recurrence:
+    """Repeat rule anchored at a start date"""
+    start_date: str
+    freq: str = DAILY
+    interval: int = 1
+    weekdays: Tuple[int, ...] = ()  # 0 = Monday, like date.weekday()
+    until: Optional[str] = None     # YYYY-MM-DD, inclusive
+    count: Optional[int] = None
+
+    def __post_init__(self):
+        if self.freq not in (DAILY, WEEKLY):
+            raise ValueError(f"Unsupported frequency: {self.freq}")
+        if self.interval < 1:
+            raise ValueError("INTERVAL must be at least 1")
+        if self.count is not None and self.count < 1:
+            raise ValueError("COUNT must be at least 1")
+        if self.until is not None and self.until < self.start_date:
+            raise ValueError("UNTIL is before the start date")
+        start = date.fromisoformat(self.start_date)
+        if self.freq == DAILY and self.weekdays:
+            # e.g. every 7th day from a Monday never falls on a Tuesday
+            reachable = {(start.weekday() + k * self.interval) % 7 for k in range(7)}
+            if not reachable & set(self.weekdays):
+                raise ValueError("Rule never matches: INTERVAL skips every BYDAY weekday")
+
+    @classmethod
+    def parse(cls, rule: str, start_date: str) -> 'Recurrence':
+        """
+        Parse a rule string.
+
+        Args:
+            rule: "FREQ=...;BYDAY=...;..." (case-insensitive, optional "RRULE:" prefix)
+            start_date: YYYY-MM-DD first possible occurrence
+
+        Raises:
+            ValueError: Malformed or unsupported rule
+        """
+        text = rule.strip().upper()
+        if text.startswith("RRULE:"):
+            text = text[len("RRULE:"):]
+        parts = {}
+        for part in filter(None, text.split(";")):
+            name, sep, value = part.partition("=")
+            if not sep or not value:
+                raise ValueError(f"Malformed rule part: {part}")
+            parts[name] = value
+
+        unknown = set(parts) - {"FREQ", "INTERVAL", "BYDAY", "UNTIL", "COUNT"}
+        if unknown:
+            raise ValueError(f"Unsupported rule parts: {', '.join(sorted(unknown))}")
+        if "FREQ" not in parts:
+            raise ValueError("Rule has no FREQ")
+        if "UNTIL" in parts and "COUNT" in parts:
+            raise ValueError("Rule cannot have both UNTIL and COUNT")
+
+        try:
+            weekdays = tuple(sorted({WEEKDAY_CODES.index(code) for code in parts["BYDAY"].split(",")})) \
+                if "BYDAY" in parts else ()
+        except ValueError:
+            raise ValueError(f"Invalid BYDAY: {parts['BYDAY']}") from None
+        until = parts.get("UNTIL")
+        if until is not None:
+            until = until.replace("-", "")
+            if len(until) != 8 or not until.isdigit():
+                raise ValueError(f"Invalid UNTIL: {parts['UNTIL']}")
+            until = f"{until[:4]}-{until[4:6]}-{until[6:]}"
+            date.fromisoformat(until)
+        return cls(
+            start_date=start_date,
+            freq=parts["FREQ"],
+            interval=int(parts.get("INTERVAL", 1)),
+            weekdays=weekdays,
+            until=until,
+            count=int(parts["COUNT"]) if "COUNT" in parts else None,
+        )
+
+    @property
+    def rule(self) -> str:
+        """Rule string that parse() reads back"""
+        parts = [f"FREQ={self.freq}"]
+        if self.interval != 1:
+            parts.append(f"INTERVAL={self.interval}")
+        if self.weekdays:
+            parts.append("BYDAY=" + ",".join(WEEKDAY_CODES[d] for d in self.weekdays))
+        if self.until:
+            parts.append("UNTIL=" + self.until.replace("-", ""))
+        if self.count:
+            parts.append(f"COUNT={self.count}")
+        return ";".join(parts)
+
+    def _candidates(self, from_day: date) -> Iterator[date]:
+        """Matching days from the first period containing from_day on, unbounded"""
+        start = date.fromisoformat(self.start_date)
+        if self.freq == DAILY:
+            skipped = max(0, -(-(from_day - start).days // self.interval))
+            day = start + timedelta(days=skipped * self.interval)
+            step = timedelta(days=self.interval)
+            while True:
+                if not self.weekdays or day.weekday() in self.weekdays:
+                    yield day
+                day += step
+        else:
+            weekdays = self.weekdays or (start.weekday(),)
+            first_week = start - timedelta(days=start.weekday())
+            skipped = max(0, (from_day - first_week).days // 7 // self.interval)
+            week = first_week + timedelta(weeks=skipped * self.interval)
+            step = timedelta(weeks=self.interval)
+            while True:
+                for weekday in weekdays:
+                    day = week + timedelta(days=weekday)
+                    if day >= start:
+                        yield day
+                week += step
+
+    def occurrences(self, after: Optional[str] = None, through: Optional[str] = None) -> Iterator[str]:
+        """
+        Occurrence dates in ascending order.
+
+        Args:
+            after: Only dates later than this (exclusive)
+            through: Only dates up to this (inclusive); None = until the rule ends
+
+        Yields:
+            YYYY-MM-DD dates; endless for an open rule without `through`
+        """
+        start = date.fromisoformat(self.start_date)
+        if self.count is not None:
+            # COUNT numbers occurrences from the start, so they cannot be skipped
+            from_day = start
+        else:
+            from_day = max(start, date.fromisoformat(after) + timedelta(days=1)) if after else start
+        last = min(filter(None, (self.until, through)), default=None)
+        last_day = date.fromisoformat(last) if last else None
+
+        for number, day in enumerate(self._candidates(from_day), 1):
+            if last_day is not None and day > last_day:
+                return
+            if self.count is not None and number > self.count:
+                return
+            value = day.isoformat()
+            if after is None or value > after:
+                yield value
+
+    def last_date(self) -> Optional[str]:
+        """Final occurrence, or None for an open-ended rule"""
+        if self.until is None and self.count is None:
+            return None
+        last = None
+        for last in self.occurrences():
+            pass
+        return last
+
+
+def plan_occurrences(plan: Dict, through: str) -> Iterator[str]:
+    """Dates of a planned_log row not yet materialised, up to `through`"""
+    recurrence = Recurrence.parse(plan['rule'], plan['start_date'])
+    return recurrence.occurrences(after=plan['materialized_through'], through=through)
+
+
+def planned_day_totals(plans: Iterable[Dict], through: str,
+                       kcal_of: Callable[[Dict], float]) -> Dict[str, Tuple[float, int]]:
+    """
+    Sum unexpanded plan occurrences per day.
+
+    Args:
+        plans: planned_log rows
+        through: Last date to include (YYYY-MM-DD)
+        kcal_of: kcal of one occurrence of a plan
+
+    Returns:
+        Dictionary date -> (kcal, entries)
+    """
+    totals: Dict[str, List] = {}
+    for plan in plans:
+        kcal = kcal_of(plan)
+        for day in plan_occurrences(plan, through):
+            entry = totals.setdefault(day, [0.0, 0])
+            entry[0] += kcal
+            entry[1] += 1
+    return {day: (kcal, entries) for day, (kcal, entries) in totals.items()}
+
+
+def for_weeks(rule: str, start_date: str, weeks: int) -> str:
+    """Limit a rule to `weeks` weeks from start_date"""
+    if weeks < 1:
+        raise ValueError("Number of weeks must be at least 1")
+    until = date.fromisoformat(start_date) + timedelta(weeks=weeks, days=-1)
+    return f"{rule};UNTIL={until.strftime('%Y%m%d')}"
+
+
+def horizon(today: Optional[date] = None, days: int = MATERIALIZE_DAYS) -> str:
+    """Date `days` after today (YYYY-MM-DD)"""
+    return ((today or date.today()) + timedelta(days=days)).isoformat()
@@ -0,0 +1,81 @@
+"""
+ReportService: Week and month reports of a user's logs.
+
+The figures come from the rollup table (repositories/rollup_repository.py).
+A report first reads the cached periods of its range; periods that are
+missing, because they were never read or a log inside them changed since,
+are computed from the logs and stored, and the range is read again. A
+weekly report over years of logs is then two or three indexed reads.
+
+Averages and adherence are per logged day (a day with a food or activity
+log), so a week in progress is not diluted by the days still to come.
+"""
+
+from datetime import date
+from typing import List, Optional
+
+from repositories.day_numbers import epoch_day
+from repositories.models import Rollup
+from repositories.rollup_repository import GRANULARITIES, RollupRepository, periods_between
+
+
+class ReportService:
+    """Service layer for weekly and monthly reports"""
+
+    GRANULARITIES = GRANULARITIES
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self.rollup_repo = RollupRepository(db_path)
+
+    def get_rollups(self, user_id: str, granularity: str = 'iso_week',
+                    start_date: Optional[str] = None, end_date: Optional[str] = None) -> List[Rollup]:
+        """
+        Get the totals of every period overlapping a date range.
+
+        Args:
+            user_id: The user's ID
+            granularity: 'week' (Sunday to Saturday), 'iso_week' or 'month'
+            start_date: First date (YYYY-MM-DD; None = the user's first log)
+            end_date: Last date (YYYY-MM-DD; None = the user's last log)
+
+        Returns:
+            One Rollup per period, newest first; periods without logs have zero totals
+
+        Raises:
+            ValueError: Unknown granularity
+        """
+        if granularity not in GRANULARITIES:
+            raise ValueError(f"Unknown granularity '{granularity}', expected one of {', '.join(GRANULARITIES)}")
+        if start_date is None or end_date is None:
+            log_days = self.rollup_repo.find_log_days(user_id)
+            if log_days is None:
+                return []
+            first_day = epoch_day(start_date) if start_date is not None else log_days[0]
+            last_day = epoch_day(end_date) if end_date is not None else log_days[1]
+        else:
+            first_day, last_day = epoch_day(start_date), epoch_day(end_date)
+        if first_day > last_day:
+            return []
+
+        periods = periods_between(granularity, first_day, last_day)
+        first_start, last_start = periods[0][0], periods[-1][0]
+        rollups = self.rollup_repo.find_range(user_id, granularity, first_start, last_start)
+        if len(rollups) == len(periods):
+            return rollups
+
+        cached = {epoch_day(rollup.start_date) for rollup in rollups}
+        missing = [period for period in periods if period[0] not in cached]
+        self.rollup_repo.refresh(user_id, granularity, missing)
+        return self.rollup_repo.find_range(user_id, granularity, first_start, last_start)
+
+    def get_weekly_summary(self, user_id: str, date_str: Optional[str] = None) -> Rollup:
+        """
+        Get the totals of the ISO week (Monday to Sunday) containing a date.
+
+        Args:
+            user_id: The user's ID
+            date_str: A date in the week (YYYY-MM-DD; None = today)
+        """
+        day = date_str or date.today().isoformat()
+        return self.get_rollups(user_id, 'iso_week', day, day)[0]
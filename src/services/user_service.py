@@ -8,8 +8,8 @@ from datetime import date
 class UserService:
     """Service layer for user-related business logic"""
     
-    def __init__(self, db_path: str):
-        self.user_repo = UserRepository(db_path)
+    def __init__(self, db_path: str, user_repo: Optional[UserRepository] = None):
+        self.user_repo = user_repo or UserRepository(db_path)
     
     def authenticate_user(self, username: str, password: str) -> bool:
         """Authenticate a user with username and password"""
@@ -0,0 +1,185 @@
+"""
+Weight trend analytics.
+
+Computes, in one pass over a chronologically ordered weight series:
+- exponentially smoothed trend weight (irregular weigh-in gaps are weighted
+  by the number of days between them)
+- 7- and 30-day rolling means (calendar windows, not entry counts)
+- least-squares slope in kg/week over the last REGRESSION_DAYS
+- projected date for reaching a goal weight at the current slope
+
+The series are stored in array('d') columns and all windows are maintained
+with running sums, so the cost is O(n) in time and 8 bytes per value per
+column in memory; decades of daily weigh-ins are a few hundred KiB.
+"""
+
+import math
+from array import array
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Share of today's weigh-in in the trend weight (10% per day)
+DEFAULT_SMOOTHING = 0.1
+ROLLING_WINDOWS = (7, 30)
+REGRESSION_DAYS = 30
+# Projections further out than this are reported as "not reachable"
+MAX_PROJECTION_DAYS = 3650
+
+
+@dataclass
+class WeightTrend:
+    """Per-entry trend columns plus summary figures of a weight series"""
+    dates: List[str] = field(default_factory=list)
+    days: array = field(default_factory=lambda: array('l'))  # date ordinals
+    weights: array = field(default_factory=lambda: array('d'))
+    trend: array = field(default_factory=lambda: array('d'))
+    mean_7: array = field(default_factory=lambda: array('d'))
+    mean_30: array = field(default_factory=lambda: array('d'))
+    slope_kg_per_week: Optional[float] = None
+    goal_weight: Optional[float] = None
+    goal_date: Optional[str] = None
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    @property
+    def current_trend(self) -> Optional[float]:
+        return self.trend[-1] if self.trend else None
+
+    def since(self, start_date: str) -> 'WeightTrend':
+        """Entries from start_date on (the trend is still warmed up by the older ones)"""
+        start = bisect_left(self.days, date.fromisoformat(start_date).toordinal())
+        return WeightTrend(
+            dates=self.dates[start:], days=self.days[start:],
+            weights=self.weights[start:], trend=self.trend[start:],
+            mean_7=self.mean_7[start:], mean_30=self.mean_30[start:],
+            slope_kg_per_week=self.slope_kg_per_week,
+            goal_weight=self.goal_weight, goal_date=self.goal_date,
+        )
+
+    def change_over(self, days_back: int, today: Optional[date] = None) -> Optional[Dict]:
+        """
+        Weight change between the oldest and newest entry of the last days_back + 1 days.
+
+        Same result as WeightLogService.calculate_weight_change, without a query.
+
+        Returns:
+            Dictionary with weight change info or None if insufficient data
+        """
+        end_day = (today or date.today()).toordinal()
+        first = bisect_left(self.days, end_day - days_back - 1)
+        last = bisect_right(self.days, end_day) - 1
+        if last - first < 1:
+            return None
+
+        current_weight = self.weights[last]
+        start_weight = self.weights[first]
+        weight_change = current_weight - start_weight
+        if weight_change < 0:
+            trend = 'losing'
+        elif weight_change > 0:
+            trend = 'gaining'
+        else:
+            trend = 'stable'
+        return {
+            'current_weight': current_weight,
+            'current_date': self.dates[last],
+            'start_weight': start_weight,
+            'start_date': self.dates[first],
+            'weight_change': weight_change,
+            'change_percentage': (weight_change / start_weight) * 100 if start_weight > 0 else 0,
+            'days_elapsed': days_back,
+            'trend': trend
+        }
+
+
+def analyze_weights(series: Iterable[Tuple[str, float]],
+                    smoothing: float = DEFAULT_SMOOTHING,
+                    regression_days: int = REGRESSION_DAYS,
+                    goal_weight: Optional[float] = None) -> WeightTrend:
+    """
+    Analyze a weight series in a single pass.
+
+    Args:
+        series: (YYYY-MM-DD, kg) pairs in ascending date order
+        smoothing: Daily smoothing factor of the trend weight (0..1)
+        regression_days: Window of the least-squares slope
+        goal_weight: Target weight for the goal date projection
+
+    Returns:
+        WeightTrend with per-entry columns and summary figures
+    """
+    result = WeightTrend(goal_weight=goal_weight)
+    days, weights = result.days, result.weights
+    keep = 1.0 - smoothing
+
+    windows = ROLLING_WINDOWS
+    starts = [0] * len(windows)
+    sums = [0.0] * len(windows)
+    means = (result.mean_7, result.mean_30)
+
+    # Sliding least-squares sums; x is days since the first entry
+    reg_start = 0
+    sx = sy = sxx = sxy = 0.0
+    origin = None
+    trend = 0.0
+
+    for i, (date_str, weight) in enumerate(series):
+        day = date.fromisoformat(date_str).toordinal()
+        if origin is None:
+            origin = day
+            trend = weight
+        else:
+            gap = max(day - days[-1], 1)
+            trend += (1.0 - keep ** gap) * (weight - trend)
+        result.dates.append(date_str)
+        days.append(day)
+        weights.append(weight)
+        result.trend.append(trend)
+
+        for w, window in enumerate(windows):
+            sums[w] += weight
+            while days[starts[w]] <= day - window:
+                sums[w] -= weights[starts[w]]
+                starts[w] += 1
+            means[w].append(sums[w] / (i + 1 - starts[w]))
+
+        x = day - origin
+        sx += x
+        sy += weight
+        sxx += x * x
+        sxy += x * weight
+        while days[reg_start] <= day - regression_days:
+            old_x = days[reg_start] - origin
+            old_y = weights[reg_start]
+            sx -= old_x
+            sy -= old_y
+            sxx -= old_x * old_x
+            sxy -= old_x * old_y
+            reg_start += 1
+
+    n = len(days) - reg_start
+    denominator = n * sxx - sx * sx
+    if n >= 2 and denominator > 0:
+        slope_per_day = (n * sxy - sx * sy) / denominator
+        result.slope_kg_per_week = slope_per_day * 7
+        result.goal_date = _project_goal_date(days[-1], trend, slope_per_day, goal_weight)
+    return result
+
+
+def _project_goal_date(last_day: int, trend: float, slope_per_day: float,
+                       goal_weight: Optional[float]) -> Optional[str]:
+    """Date the trend weight reaches goal_weight, or None if it is moving away"""
+    if goal_weight is None:
+        return None
+    remaining = goal_weight - trend
+    if abs(remaining) < 0.05:
+        return date.fromordinal(last_day).isoformat()
+    if slope_per_day == 0 or (remaining > 0) != (slope_per_day > 0):
+        return None
+    days_needed = math.ceil(remaining / slope_per_day)
+    if days_needed > MAX_PROJECTION_DAYS:
+        return None
+    return date.fromordinal(last_day + days_needed).isoformat()
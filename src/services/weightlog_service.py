@@ -4,53 +4,28 @@ WeightLogService: Business logic for weight tracking operations.
 Handles:
 - Weight logging with validation
 - Weight history retrieval with week numbering
-- Weight trend calculations
+- Weight trend calculations (see weight_analytics)
 - Progress tracking against goals
 - Dietary period annotations for log entries
 """
 
-from typing import List, Dict, Optional
-from datetime import datetime, timedelta
+from typing import Iterator, List, Dict, Optional
+from datetime import date, datetime, timedelta
+from repositories.day_numbers import normalize_date
 from repositories.weightlog_repository import WeightLogRepository
 from repositories.user_repository import UserRepository
-
-
-def get_week_info(date_str: str) -> Dict:
-    """
-    Get week number and week start date for a given date.
-    
-    Args:
-        date_str: Date in YYYY-MM-DD format
-        
-    Returns:
-        Dictionary with week_number, week_start_date, year
-    """
-    date_obj = datetime.strptime(date_str, '%Y-%m-%d').date()
-    
-    # ISO week date: week starts on Monday
-    iso_calendar = date_obj.isocalendar()
-    week_number = iso_calendar[1]
-    year = iso_calendar[0]
-    
-    # Calculate Monday of this week (Monday = 0 in weekday())
-    days_since_monday = date_obj.weekday()
-    week_start = date_obj - timedelta(days=days_since_monday)
-    
-    return {
-        'week_number': week_number,
-        'week_start_date': week_start.isoformat(),
-        'year': year,
-        'week_label': f"Week {week_number}, {year}"
-    }
+from repositories.models import WeightHistoryEntry
+from services.period_index import PeriodIndex
+from services.weight_analytics import WeightTrend, analyze_weights
 
 
 class WeightLogService:
     """Service layer for weight tracking business logic"""
     
-    def __init__(self, db_path: str):
+    def __init__(self, db_path: str, user_repo: Optional[UserRepository] = None):
         self.db_path = db_path
         self.weightlog_repo = WeightLogRepository(db_path)
-        self.user_repo = UserRepository(db_path)
+        self.user_repo = user_repo or UserRepository(db_path)
     
     def log_weight(self, user_id: str, date_str: str, weight: float, notes: Optional[str] = None) -> Dict:
         """
@@ -72,21 +47,19 @@ class WeightLogService:
         if weight > 500:  # Sanity check
             return {'success': False, 'error': 'Weight value seems unrealistic (max 500 kg)'}
         
-        # Validate date format
+        # Validate date format (zero-padded, e.g. 2025-1-5 -> 2025-01-05)
         try:
-            datetime.strptime(date_str, '%Y-%m-%d')
+            log_date = date.fromisoformat(normalize_date(date_str))
         except ValueError:
             return {'success': False, 'error': 'Invalid date format. Use YYYY-MM-DD'}
         
         # Check if date is not in future
-        today = datetime.now().date()
-        log_date = datetime.strptime(date_str, '%Y-%m-%d').date()
-        if log_date > today:
+        if log_date > datetime.now().date():
             return {'success': False, 'error': 'Cannot log weight for future dates'}
         
         # Create the weight log
         try:
-            log = self.weightlog_repo.create(user_id, date_str, weight, notes)
+            log = self.weightlog_repo.create(user_id, log_date.isoformat(), weight, notes)
             return {'success': True, 'log': log, 'message': 'Weight logged successfully'}
         except Exception as e:
             return {'success': False, 'error': f'Database error: {str(e)}'}
@@ -111,6 +84,20 @@ class WeightLogService:
             end_date.isoformat()
         )
     
+    def get_weight_logs_between(self, user_id: str, start_date: str, end_date: str) -> List[Dict]:
+        """
+        Get weight logs for a user within a date range (inclusive).
+        
+        Args:
+            user_id: The user's ID
+            start_date: Start date (YYYY-MM-DD format)
+            end_date: End date (YYYY-MM-DD format)
+            
+        Returns:
+            List of weight log dictionaries, ordered by date descending
+        """
+        return self.weightlog_repo.find_by_date_range(user_id, start_date, end_date)
+    
     def get_all_weight_history(self, user_id: str) -> List[Dict]:
         """
         Get complete weight history for a user.
@@ -123,6 +110,18 @@ class WeightLogService:
         """
         return self.weightlog_repo.find_all(user_id)
     
+    def iter_weight_logs(self, user_id: str) -> Iterator[Dict]:
+        """
+        Stream the weight history in date order without loading all of it.
+        
+        Args:
+            user_id: The user's ID
+            
+        Returns:
+            Iterator of weight log dictionaries
+        """
+        return self.weightlog_repo.iter_all(user_id)
+    
     def get_latest_weight(self, user_id: str) -> Optional[float]:
         """
         Get the most recent weight measurement for a user.
@@ -196,42 +195,59 @@ class WeightLogService:
             'trend': trend
         }
     
+    def get_weight_trend(self, user_id: str, goal_weight: Optional[float] = None) -> WeightTrend:
+        """
+        Analyze the complete weight history of a user.
+        
+        Args:
+            user_id: The user's ID
+            goal_weight: Target weight for the goal date (default: the user's
+                weight loss target)
+            
+        Returns:
+            WeightTrend with trend weight, rolling means, slope and goal date
+        """
+        if goal_weight is None:
+            goal_weight = self.user_repo.find_weight_target(user_id)
+        return analyze_weights(self.weightlog_repo.find_series(user_id), goal_weight=goal_weight)
+    
     def get_progress_summary(self, user_id: str) -> Dict:
         """
         Get comprehensive weight progress summary.
         
+        All figures come from one read of the weight series.
+        
         Args:
             user_id: The user's ID
             
         Returns:
-            Dictionary with current weight, weekly/monthly changes, and goal progress
+            Dictionary with current weight, weekly/monthly changes, trend and goal progress
         """
-        latest_weight = self.get_latest_weight(user_id)
+        analysis = self.get_weight_trend(user_id)
         
-        if not latest_weight:
+        if not analysis:
             return {
                 'has_data': False,
                 'message': 'No weight logs found. Start tracking your weight!'
             }
         
-        # Calculate weekly change
-        weekly_change = self.calculate_weight_change(user_id, days_back=7)
-        
-        # Calculate monthly change
-        monthly_change = self.calculate_weight_change(user_id, days_back=30)
-        
-        # Calculate goal progress
         goal_progress = None
-        # Removed goal tracking as UserRepository doesn't have find_by_id method
-        # Would need to implement this differently to get user's starting weight and target
+        if analysis.goal_weight:
+            goal_progress = {
+                'goal_weight': analysis.goal_weight,
+                'remaining': analysis.current_trend - analysis.goal_weight,
+                'projected_date': analysis.goal_date
+            }
         
         return {
             'has_data': True,
-            'current_weight': latest_weight,
-            'weekly_change': weekly_change,
-            'monthly_change': monthly_change,
+            'current_weight': analysis.weights[-1],
+            'trend_weight': analysis.current_trend,
+            'weekly_change': analysis.change_over(7),
+            'monthly_change': analysis.change_over(30),
+            'slope_kg_per_week': analysis.slope_kg_per_week,
             'goal_progress': goal_progress,
-            'total_logs': self.weightlog_repo.count_logs(user_id)
+            'total_logs': len(analysis)
         }
     
     def update_weight_log(self, log_id: str, weight: float, notes: Optional[str] = None) -> Dict:
@@ -287,54 +303,41 @@ class WeightLogService:
             days: Number of days to include (default: 30)
             
         Returns:
-            Dictionary with dates and weights for plotting
+            Dictionary with dates, weights, trend weight and rolling means
+            (ascending order) for plotting
         """
-        history = self.get_weight_history(user_id, days=days)
+        analysis = self.get_weight_trend(user_id)
+        start_date = (datetime.now().date() - timedelta(days=days)).isoformat()
+        window = analysis.since(start_date)
         
-        if not history:
+        if not window:
             return {'dates': [], 'weights': [], 'has_data': False}
         
-        # Sort by date ascending for chronological plotting
-        history.sort(key=lambda x: x['date'])
-        
-        dates = [log['date'] for log in history]
-        weights = [log['weight'] for log in history]
-        
         return {
-            'dates': dates,
-            'weights': weights,
+            'dates': window.dates,
+            'weights': list(window.weights),
+            'trend': list(window.trend),
+            'mean_7': list(window.mean_7),
+            'mean_30': list(window.mean_30),
+            'slope_kg_per_week': analysis.slope_kg_per_week,
+            'goal_date': analysis.goal_date,
             'has_data': True,
-            'count': len(history)
+            'count': len(window)
         }
     
     def _find_periods_for_date(self, log_date: str, periods: List[Dict]) -> tuple:
         """
         Helper: Find periods containing a date and detect start/end markers.
         
+        For many dates build one PeriodIndex instead of calling this per date.
+        
         Returns:
             Tuple of (active_period_names, period_markers)
         """
-        active_periods = []
-        period_markers = []
-        
-        for period in periods:
-            # Check if log date falls within period
-            in_period_start = period['start_date'] <= log_date
-            in_period_end = (period['end_date'] is None or period['end_date'] >= log_date)
-            
-            if in_period_start and in_period_end:
-                active_periods.append(period['period_name'])
-                
-                # Mark period start/end
-                if period['start_date'] == log_date:
-                    period_markers.append(f"▶ START: {period['period_name']}")
-                if period['end_date'] == log_date:
-                    period_markers.append(f"⏹ END: {period['period_name']}")
-        
-        return (active_periods, period_markers)
+        return PeriodIndex(periods).annotate([log_date])[log_date]
     
     def get_weight_history_with_weeks(self, user_id: str, days: int = 30, 
-                                      include_periods: bool = True) -> List[Dict]:
+                                      include_periods: bool = True) -> List[WeightHistoryEntry]:
         """
         Get weight history with week numbering and optional dietary period annotations.
         Entries are returned in DESCENDING order (most recent first).
@@ -345,49 +348,37 @@ class WeightLogService:
             include_periods: Include dietary period annotations (default: True)
             
         Returns:
-            List of dictionaries with weight log + week info + period markers
+            WeightHistoryEntry records: weight log + week info + period markers
         """
         from repositories.dietary_period_repository import DietaryPeriodRepository
         
-        # Get weight history (already in descending order)
-        history = self.get_weight_history(user_id, days)
+        # Get weight history with ISO weeks (already in descending order)
+        end_date = datetime.now().date()
+        history = self.weightlog_repo.find_by_date_range_with_weeks(
+            user_id,
+            (end_date - timedelta(days=days)).isoformat(),
+            end_date.isoformat(),
+            row_factory=WeightHistoryEntry.from_row
+        )
         
         if not history:
             return []
         
-        # Get active dietary periods if requested
+        # Get dietary periods if requested and index them once for all rows
         periods = []
         if include_periods:
             period_repo = DietaryPeriodRepository(self.db_path)
             periods = period_repo.find_all(user_id)
+        annotations = PeriodIndex(periods).annotate(entry.date for entry in history)
         
-        # Enrich each log entry
-        enriched_history = []
+        # Annotate the entries in place
         current_week = None
-        
-        for log in history:
-            # Add week information
-            week_info = get_week_info(log['date'])
-            
+        for entry in history:
             # Mark if this is the first entry of a new week
-            is_week_start = (current_week != week_info['week_number'])
-            current_week = week_info['week_number']
-            
-            # Find periods containing this date
-            active_periods, period_markers = self._find_periods_for_date(log['date'], periods)
-            
-            enriched_entry = {
-                **log,
-                'week_number': week_info['week_number'],
-                'week_start_date': week_info['week_start_date'],
-                'week_label': week_info['week_label'],
-                'year': week_info['year'],
-                'is_week_start': is_week_start,
-                'active_periods': active_periods,
-                'period_markers': period_markers,
-                'has_periods': len(active_periods) > 0
-            }
+            entry.is_week_start = (current_week != entry.week_start_date)
+            current_week = entry.week_start_date
             
-            enriched_history.append(enriched_entry)
+            # Periods containing this date
+            entry.active_periods, entry.period_markers = annotations[entry.date]
         
-        return enriched_history
+        return history
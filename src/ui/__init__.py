@@ -1,8 +1,16 @@
 """
 UI Package - Presentation Layer
 Contains all user interface components and views
-"""
 
-from ui.app import LaihdutanytApp
+LaihdutanytApp is imported on first access, so importing a single view
+module does not pull in the whole application window.
+"""
 
 __all__ = ['LaihdutanytApp']
+
+
+def __getattr__(name):
+    if name == 'LaihdutanytApp':
+        from ui.app import LaihdutanytApp
+        return LaihdutanytApp
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,26 +1,20 @@
 """
-Main Applicati    def __init__(self, db_path: str):
-        super().__init__()
-        self.title("Laihdutanyt - Weight Loss Tracker")
-        self.geometry("420x750")  # Increased height for description panel
-        self.db_path = db_path
-        
-        # Position main menu at left edge of screen by default
-        self.geometry("420x750+10+50")  # x=10 (left edge), y=50 (top margin)
-        
-        # Initialize servicesow - Application Orchestrator
+Main Application Window - Application Orchestrator
 Manages window lifecycle, navigation, and view coordination
 """
 
 import os
 import tkinter as tk
-from tkinter import messagebox, filedialog
+from tkinter import messagebox, filedialog, ttk
 import importlib
 
-from services import UserService, FoodService, ActivityService, AdminService
-from services.weightlog_service import WeightLogService
-from services.dietary_period_service import DietaryPeriodService
+from repositories.connection_pool import checkpoint
+from services.provider import ServiceProvider
 from ui.views.login_view import LoginFrame
+from ui.task_runner import TaskRunner
+
+# Interval of the background WAL checkpoint (see repositories/engine_settings.py)
+CHECKPOINT_INTERVAL_MS = 60_000
 
 
 class LaihdutanytApp(tk.Tk):
@@ -32,13 +26,12 @@ class LaihdutanytApp(tk.Tk):
         self.geometry("420x600")  # Increased height for description panel
         self.db_path = db_path
         
-        # Initialize services
-        self.user_service = UserService(db_path)
-        self.food_service = FoodService(db_path)
-        self.activity_service = ActivityService(db_path)
-        self.admin_service = AdminService(db_path)
-        self.weightlog_service = WeightLogService(db_path)
-        self.dietary_period_service = DietaryPeriodService(db_path)
+        # Services are built on first use (see services/provider.py)
+        self.services = ServiceProvider(db_path)
+        
+        # Background workers for service calls (see ui/task_runner.py)
+        self.task_runner = TaskRunner(self)
+        self._checkpoint_job = self.after(CHECKPOINT_INTERVAL_MS, self._checkpoint)
         
         # Current user state
         self.current_username = None
@@ -64,6 +57,43 @@ class LaihdutanytApp(tk.Tk):
         self._build_menu()
         self._build_login()
 
+    @property
+    def user_service(self):
+        return self.services.user
+
+    @property
+    def food_service(self):
+        return self.services.food
+
+    @property
+    def activity_service(self):
+        return self.services.activity
+
+    @property
+    def admin_service(self):
+        return self.services.admin
+
+    @property
+    def weightlog_service(self):
+        return self.services.weightlog
+
+    @property
+    def dietary_period_service(self):
+        return self.services.dietary_period
+
+    def destroy(self):
+        """Stop background tasks before closing the application"""
+        self.after_cancel(self._checkpoint_job)
+        self.task_runner.shutdown()
+        super().destroy()
+
+    def _checkpoint(self):
+        """Copy the WAL back into the database file now and then, off the Tk thread"""
+        # PASSIVE never waits, so a running import or open reader just defers it
+        self.task_runner.submit(checkpoint, self.db_path, key="checkpoint",
+                                owner=self, on_error=lambda e: None)
+        self._checkpoint_job = self.after(CHECKPOINT_INTERVAL_MS, self._checkpoint)
+
     def _build_menu(self):
         """Build the application menu bar"""
         menubar = tk.Menu(self)
@@ -71,6 +101,7 @@ class LaihdutanytApp(tk.Tk):
         filemenu = tk.Menu(menubar, tearoff=0)
         filemenu.add_command(label="Import Foods (CSV)", command=self._on_import_foods)
         filemenu.add_command(label="Import Activities (CSV)", command=self._on_import_activities)
+        self.filemenu = filemenu
         filemenu.add_separator()
         filemenu.add_command(label="Exit", command=self.destroy)
         menubar.add_cascade(label="File", menu=filemenu)
@@ -86,13 +117,7 @@ class LaihdutanytApp(tk.Tk):
         if not filename:
             return
         
-        try:
-            mod = importlib.import_module("scripts.import_foods")
-            mod.import_csv(filename, self.db_path)
-            messagebox.showinfo("Import complete", 
-                              f"Imported foods from {os.path.basename(filename)}")
-        except Exception as e:
-            messagebox.showerror("Import error", f"Import failed: {e}")
+        self._run_import("scripts.import_foods", filename, "foods", self.food_service)
 
     def _on_import_activities(self):
         """Import activities from CSV file"""
@@ -103,20 +128,83 @@ class LaihdutanytApp(tk.Tk):
         if not filename:
             return
         
-        try:
-            mod = importlib.import_module("scripts.import_activities")
-            mod.import_csv(filename, self.db_path)
+        self._run_import("scripts.import_activities", filename, "activities", self.activity_service)
+
+    def _run_import(self, module_name: str, filename: str, what: str, service):
+        """Run a CSV import script in the background, showing its progress in a small window"""
+        progress_win = tk.Toplevel(self)
+        progress_win.title("Importing")
+        progress_win.transient(self)
+        # One import at a time: nothing else can cancel it, and the menu comes
+        # back when the window closes (on done, error and cancel alike)
+        self._set_import_state("disabled")
+
+        def on_close(event):
+            if event.widget is progress_win:
+                self._set_import_state("normal")
+
+        progress_win.bind("<Destroy>", on_close)
+        status = tk.Label(progress_win, text=f"Importing {what}...", font=("Arial", 11))
+        status.pack(padx=20, pady=(15, 5))
+        bar = ttk.Progressbar(progress_win, length=300, maximum=1.0)
+        bar.pack(padx=20, pady=(0, 5))
+
+        def show_progress(rows: int, fraction: float):
+            bar["value"] = fraction
+            status.config(text=f"Importing {what}... {rows} rows")
+
+        def run(task):
+            mod = importlib.import_module(module_name)
+
+            def on_progress(rows: int, fraction: float):
+                # Cancelling raises here: the import transaction is rolled back
+                task.check()
+                self.task_runner.post(task, show_progress, rows, fraction)
+
+            try:
+                result = mod.import_csv(filename, self.db_path, progress=on_progress)
+            finally:
+                # Also when cancelled: on_done is not delivered then, and the
+                # cache must not outlive rows that may already be committed
+                service.reload_catalog()
+            # A bulk import leaves a large WAL behind
+            checkpoint(self.db_path)
+            return result
+
+        def on_done(result):
+            progress_win.destroy()
             messagebox.showinfo("Import complete", 
-                              f"Imported activities from {os.path.basename(filename)}")
-        except Exception as e:
+                              f"{result.summary(what)} from {os.path.basename(filename)}")
+
+        def on_error(e: Exception):
+            progress_win.destroy()
             messagebox.showerror("Import error", f"Import failed: {e}")
 
+        def cancel():
+            task.cancel()
+            progress_win.destroy()
+
+        task = self.task_runner.submit(
+            run, on_done=on_done, on_error=on_error,
+            owner=progress_win, pass_handle=True
+        )
+        tk.Button(progress_win, text="Cancel", command=cancel,
+                  font=("Arial", 11)).pack(pady=(0, 10))
+        progress_win.protocol("WM_DELETE_WINDOW", cancel)
+
+    def _set_import_state(self, state: str):
+        """Enable ("normal") or disable the CSV import menu entries"""
+        try:
+            for label in ("Import Foods (CSV)", "Import Activities (CSV)"):
+                self.filemenu.entryconfigure(label, state=state)
+        except tk.TclError:
+            pass  # the application is closing
+
     def _build_login(self):
         """Build and show the login frame"""
         self.login_frame = LoginFrame(
             self,
-            self.user_service,
-            self.admin_service,
+            self.services,
             self._on_user_login_success,
             self._on_admin_login_success
         )
@@ -133,7 +221,11 @@ class LaihdutanytApp(tk.Tk):
         # Store user information
         self.current_username = username
         self.current_user_id = user.user_id
-        
+
+        # Log recurring plans up to the materialisation horizon
+        self.task_runner.submit(self.food_service.materialize_food_plans, user.user_id, owner=self)
+        self.task_runner.submit(self.activity_service.materialize_activity_plans, user.user_id, owner=self)
+
         # Switch to user dashboard
         self.login_frame.pack_forget()
         self._build_user_dashboard()
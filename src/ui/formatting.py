@@ -0,0 +1,39 @@
+"""
+Formatting - Display text of the log records and the user info headers
+The services return numbers (kcal and macros come from SQL); the text is
+made here, only for the records a view actually shows: the visible window
+of a VirtualTable or the few logs of one day in a list box.
+"""
+
+from typing import TYPE_CHECKING, Dict
+
+if TYPE_CHECKING:
+    from repositories.models import ActivityLogEntry, FoodLogEntry
+
+
+def grams(value: float) -> str:
+    """Amount to two decimals without trailing zeros, e.g. 150, 12.5 or 1234567"""
+    return f"{value:.2f}".rstrip("0").rstrip(".")
+
+
+def food_log_line(log: 'FoodLogEntry') -> str:
+    """One food log as a list box line: name, portion, kcal and macros"""
+    return (f"{log.name:<35} {grams(log.portion):>5}g      {log.kcal:>6.1f} kcal"
+            f"   C {log.carbs:.1f} g  P {log.protein:.1f} g  F {log.fat:.1f} g")
+
+
+def activity_log_line(log: 'ActivityLogEntry') -> str:
+    """One activity log as a list box line: name, count and kcal burned"""
+    return f"{log.name:<35} x{grams(log.count):<4}     {log.kcal_burned:>6.2f} kcal burned"
+
+
+def goal_header(summary: Dict) -> str:
+    """User info header of the food views (UserService.get_user_summary)"""
+    return (f"Weight: {summary['weight']}kg | Target: {summary['target']}kg | "
+            f"Daily Goal: {summary['kcal_min']}-{summary['kcal_max']} kcal")
+
+
+def activity_header(summary: Dict) -> str:
+    """User info header of the activity views (UserService.get_user_summary)"""
+    return (f"Weight: {summary['weight']}kg | Activity Level: {summary['activity_level']} | "
+            f"Target: {summary['target']}kg")
@@ -0,0 +1,196 @@
+"""
+Task Runner - Background execution of blocking service calls
+Runs database queries, password hashing and imports on worker threads so
+the Tk main loop keeps redrawing. Results are handed back through a queue
+that the main loop polls with after(); callbacks therefore always run on the
+Tk thread and may touch widgets.
+
+Usage in a view:
+    tasks = TaskRunner.for_widget(self)
+    tasks.submit(service.get_something, user_id,
+                 on_done=self._show, owner=self, key="history")
+
+Tasks submitted with the same key follow "latest request wins": a newer
+submission cancels the older one, whose result is never delivered.
+"""
+
+import queue
+import sys
+import threading
+import tkinter as tk
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+# Poll interval while tasks are in flight: one frame at 60 fps
+POLL_INTERVAL_MS = 16
+DEFAULT_WORKERS = 4
+
+
+class TaskCancelled(Exception):
+    """Raised inside a task that noticed its cancellation"""
+
+
+class TaskHandle:
+    """A submitted task; cancel() prevents its callbacks from running"""
+
+    def __init__(self, key: Optional[str], owner: Optional[tk.Misc]):
+        self.key = key
+        self.owner = owner
+        self.future = None
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        """Cancel the task (a running task finishes, but its result is dropped)"""
+        self._cancelled.set()
+        if self.future is not None:
+            self.future.cancel()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def check(self):
+        """Call from long-running work to stop early once cancelled"""
+        if self.cancelled:
+            raise TaskCancelled()
+
+
+class TaskRunner:
+    """Thread pool whose results are delivered on the Tk main loop"""
+
+    def __init__(self, root: tk.Misc, max_workers: int = DEFAULT_WORKERS):
+        self.root = root
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ui-task")
+        self._results: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._latest: Dict[str, TaskHandle] = {}
+        self._pending = 0
+        self._poll_job = None
+        self._closed = False
+
+    @classmethod
+    def for_widget(cls, widget: tk.Misc) -> "TaskRunner":
+        """Get the runner shared by every widget of the application"""
+        root = widget.nametowidget(".")
+        runner = getattr(root, "task_runner", None)
+        if runner is None:
+            runner = cls(root)
+            root.task_runner = runner
+        return runner
+
+    def submit(self, func: Callable, *args,
+               on_done: Optional[Callable[[Any], None]] = None,
+               on_error: Optional[Callable[[Exception], None]] = None,
+               key: Optional[str] = None,
+               owner: Optional[tk.Misc] = None,
+               pass_handle: bool = False,
+               **kwargs) -> TaskHandle:
+        """
+        Run func(*args, **kwargs) on a worker thread.
+
+        Args:
+            func: Blocking callable (service method)
+            on_done: Called on the Tk thread with the return value
+            on_error: Called on the Tk thread with the exception
+                (default: error dialog)
+            key: Cancel the previous task with the same key (latest wins)
+            owner: Widget the callbacks belong to; dropped if it is destroyed
+            pass_handle: Pass the TaskHandle as keyword argument `task`,
+                so func can call task.check() or report progress
+
+        Returns:
+            TaskHandle for cancellation
+        """
+        handle = TaskHandle(key, owner)
+        if key is not None:
+            previous = self._latest.get(key)
+            if previous is not None:
+                previous.cancel()
+            self._latest[key] = handle
+        if pass_handle:
+            kwargs["task"] = handle
+
+        def work():
+            if handle.cancelled:
+                return
+            try:
+                result = func(*args, **kwargs)
+            except TaskCancelled:
+                return
+            except Exception as e:  # delivered to on_error on the Tk thread
+                self._results.put((handle, on_error or self._show_error, e))
+            else:
+                if on_done is not None:
+                    self._results.put((handle, on_done, result))
+
+        def finished(_future):
+            self._results.put((handle, None, None))
+
+        self._pending += 1
+        handle.future = self._executor.submit(work)
+        handle.future.add_done_callback(finished)
+        self._schedule_poll()
+        return handle
+
+    def post(self, handle: TaskHandle, callback: Callable, *args):
+        """From a worker thread: run callback(*args) on the Tk thread (e.g. progress)"""
+        self._results.put((handle, lambda values: callback(*values), args))
+
+    def cancel(self, key: str):
+        """Cancel the latest task submitted with key"""
+        handle = self._latest.pop(key, None)
+        if handle is not None:
+            handle.cancel()
+
+    def shutdown(self):
+        """Cancel queued work and stop polling (running tasks finish in the background)"""
+        self._closed = True
+        for handle in self._latest.values():
+            handle.cancel()
+        self._latest.clear()
+        if self._poll_job is not None:
+            try:
+                self.root.after_cancel(self._poll_job)
+            except tk.TclError:
+                pass
+            self._poll_job = None
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _schedule_poll(self):
+        if self._poll_job is None and not self._closed:
+            self._poll_job = self.root.after(POLL_INTERVAL_MS, self._poll)
+
+    def _poll(self):
+        """Deliver finished results on the Tk thread"""
+        self._poll_job = None
+        while True:
+            try:
+                handle, callback, value = self._results.get_nowait()
+            except queue.Empty:
+                break
+            if callback is None:
+                # Task finished: forget it unless a newer one took its key
+                self._pending -= 1
+                if handle.key is not None and self._latest.get(handle.key) is handle:
+                    del self._latest[handle.key]
+                continue
+            if handle.cancelled or self._closed or not self._owner_alive(handle):
+                continue
+            try:
+                callback(value)
+            except Exception:
+                self.root.report_callback_exception(*sys.exc_info())
+        if self._pending > 0:
+            self._schedule_poll()
+
+    @staticmethod
+    def _owner_alive(handle: TaskHandle) -> bool:
+        if handle.owner is None:
+            return True
+        try:
+            return bool(handle.owner.winfo_exists())
+        except tk.TclError:
+            return False
+
+    def _show_error(self, error: Exception):
+        from tkinter import messagebox
+        messagebox.showerror("Error", str(error))
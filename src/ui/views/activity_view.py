@@ -12,11 +12,21 @@ from typing import TYPE_CHECKING
 from services.user_service import UserService """
 
 from services import ActivityService, UserService
+from services.recurrence import REPEAT_PRESETS, for_weeks
+from ui.formatting import activity_header, activity_log_line
+from ui.task_runner import TaskRunner
 
 if TYPE_CHECKING:
     from ui.app import LaihdutanytApp
 
 
+# Search-as-you-type: suggestions shown and delay after the last keystroke
+SEARCH_LIMIT = 20
+SEARCH_DELAY_MS = 150
+NAVIGATION_KEYS = {'Up', 'Down', 'Left', 'Right', 'Return', 'Escape', 'Tab'}
+REPEAT_ONCE = "Once"
+
+
 class ActivityLogFrame(tk.Frame):
     """Activity logging form component"""
     
@@ -30,10 +40,15 @@ class ActivityLogFrame(tk.Frame):
         
         # Activity dropdown
         self.activity_var = tk.StringVar()
+        self._search_job = None
         
         # Count input
         self.count_var = tk.IntVar(value=1)
         
+        # Repeat: "Once" logs a single entry, presets create a recurring plan
+        self.repeat_var = tk.StringVar(value=REPEAT_ONCE)
+        self.weeks_var = tk.IntVar(value=4)
+        
         # Logs list with improved spacing
         self.logs_list = tk.Listbox(self, height=12, font=("Arial", 12))
         
@@ -49,6 +64,7 @@ class ActivityLogFrame(tk.Frame):
         tk.Label(topframe, text="Activity", font=("Arial", 11)).grid(row=0, column=0, sticky="w", padx=5)
         self.activity_cb = ttk.Combobox(topframe, textvariable=self.activity_var, width=30, font=("Arial", 11))
         self.activity_cb.grid(row=0, column=1, padx=5)
+        self.activity_cb.bind("<KeyRelease>", self._on_activity_typed)
         
         tk.Label(topframe, text="Count", font=("Arial", 11)).grid(row=1, column=0, sticky="w", padx=5)
         tk.Spinbox(topframe, from_=1, to=100, textvariable=self.count_var, width=10, font=("Arial", 11)).grid(row=1, column=1, sticky="w", padx=5)
@@ -56,7 +72,16 @@ class ActivityLogFrame(tk.Frame):
         tk.Label(topframe, text="Date (YYYY-MM-DD)", font=("Arial", 11)).grid(row=2, column=0, sticky="w", padx=5)
         tk.Entry(topframe, textvariable=self.date_var, width=15, font=("Arial", 11)).grid(row=2, column=1, sticky="w", padx=5)
         
-        tk.Button(topframe, text="Add Activity", command=self._add_activity, font=("Arial", 11, "bold"), bg="#4CAF50").grid(row=3, column=0, columnspan=2, pady=10)
+        tk.Label(topframe, text="Repeat", font=("Arial", 11)).grid(row=3, column=0, sticky="w", padx=5)
+        repeatframe = tk.Frame(topframe)
+        repeatframe.grid(row=3, column=1, sticky="w", padx=5)
+        ttk.Combobox(repeatframe, textvariable=self.repeat_var, values=[REPEAT_ONCE, *REPEAT_PRESETS],
+                     state="readonly", width=12, font=("Arial", 11)).pack(side="left")
+        tk.Label(repeatframe, text="for", font=("Arial", 11)).pack(side="left", padx=5)
+        tk.Spinbox(repeatframe, from_=1, to=52, textvariable=self.weeks_var, width=4, font=("Arial", 11)).pack(side="left")
+        tk.Label(repeatframe, text="weeks", font=("Arial", 11)).pack(side="left", padx=5)
+        
+        tk.Button(topframe, text="Add Activity", command=self._add_activity, font=("Arial", 11, "bold"), bg="#4CAF50").grid(row=4, column=0, columnspan=2, pady=10)
         
         # Today's logs section
         tk.Label(self, text="Today's Activity Log", font=("Arial", 12, "bold")).pack(pady=5)
@@ -75,56 +100,118 @@ class ActivityLogFrame(tk.Frame):
     
     def _load_activity_list(self):
         """Load available activities into dropdown"""
-        # Load names only for clean display
-        display_names = self.activity_service.get_activity_name_only_list()
+        # Only the first matches: catalogs can hold tens of thousands of rows
+        TaskRunner.for_widget(self).submit(
+            self.activity_service.search_activity_names, "", SEARCH_LIMIT,
+            on_done=self._show_activity_list, owner=self, key=f"{self}:search"
+        )
+    
+    def _show_activity_list(self, display_names):
         self.activity_cb['values'] = display_names
         if display_names:
             self.activity_cb.current(0)
     
+    def _on_activity_typed(self, event):
+        """Refresh suggestions shortly after the user stops typing"""
+        if event.keysym in NAVIGATION_KEYS:
+            return
+        if self._search_job is not None:
+            self.after_cancel(self._search_job)
+        self._search_job = self.after(SEARCH_DELAY_MS, self._refresh_activity_suggestions)
+    
+    def _refresh_activity_suggestions(self):
+        """Show the best catalog matches for the typed text"""
+        self._search_job = None
+        # Latest wins: an older search still running is discarded
+        TaskRunner.for_widget(self).submit(
+            self.activity_service.search_activity_names, self.activity_var.get(), SEARCH_LIMIT,
+            on_done=self._show_suggestions, owner=self, key=f"{self}:search"
+        )
+    
+    def _show_suggestions(self, names):
+        self.activity_cb['values'] = names
+    
     def _load_todays_logs(self):
         """Load today's activity logs"""
-        self.logs_list.delete(0, tk.END)
         today = date.today().strftime('%Y-%m-%d')
-        logs = self.activity_service.get_activity_logs_by_date(self.user_id, today)
+        TaskRunner.for_widget(self).submit(
+            self.activity_service.get_activity_logs_by_date, self.user_id, today,
+            on_done=self._show_todays_logs, owner=self, key=f"{self}:logs"
+        )
+    
+    def _show_todays_logs(self, logs):
+        self.logs_list.delete(0, tk.END)
         
         if not logs:
             self.logs_list.insert(tk.END, "No activities logged for today")
             return
         
-        for log_text in logs:
-            self.logs_list.insert(tk.END, log_text)
+        for log in logs:
+            self.logs_list.insert(tk.END, activity_log_line(log))
     
     def _add_activity(self):
         """Add new activity log with smart feedback"""
-        from datetime import date as date_class
-        
         activity_name = self.activity_var.get().strip()
         count = self.count_var.get()
         date_str = self.date_var.get()
+        repeat = self.repeat_var.get()
         
         if not activity_name:
             messagebox.showwarning("Input Required", "Please select an activity", parent=self)
             return
         
-        try:
+        if repeat != REPEAT_ONCE:
+            weeks = self.weeks_var.get()
+            
+            def schedule():
+                rule = for_weeks(REPEAT_PRESETS[repeat], date_str, weeks)
+                plan = self.activity_service.schedule_activity(self.user_id, activity_name, count, rule, date_str)
+                return dict(plan, name=activity_name)
+            
+            TaskRunner.for_widget(self).submit(
+                schedule,
+                on_done=self._on_scheduled,
+                on_error=lambda e: messagebox.showerror("Error", str(e), parent=self),
+                owner=self
+            )
+            return
+        
+        def log():
             # Get activity ID by name
             activity_id = self.activity_service.get_activity_id_by_name(activity_name)
             
             # Log activity using ID (create selection string for compatibility)
             activity_selection = f"{activity_name}|{activity_id}"
             self.activity_service.log_activity(self.user_id, activity_selection, count, date_str)
-            
-            # Show feedback only for future dates
-            today = date_class.today().strftime('%Y-%m-%d')
-            if date_str > today:
-                messagebox.showinfo("Planned!", 
-                                  f"{activity_name} scheduled for {date_str}\n\nView in 'All Activity Logs'", 
-                                  parent=self)
-            
-            self._load_todays_logs()
-            
-        except Exception as e:
-            messagebox.showerror("Error", str(e), parent=self)
+        
+        TaskRunner.for_widget(self).submit(
+            log,
+            on_done=lambda _: self._on_logged(activity_name, date_str),
+            on_error=lambda e: messagebox.showerror("Error", str(e), parent=self),
+            owner=self
+        )
+    
+    def _on_scheduled(self, plan):
+        """Feedback after a recurring plan was created"""
+        messagebox.showinfo("Planned!",
+                            f"{plan['name']} repeats until {plan['end_date']}\n\n"
+                            f"{plan['logged']} entries logged up to {plan['materialized_through']}; "
+                            f"later ones are added as the dates approach.",
+                            parent=self)
+        self._load_todays_logs()
+    
+    def _on_logged(self, activity_name: str, date_str: str):
+        """Feedback after an activity was logged"""
+        from datetime import date as date_class
+        
+        # Show feedback only for future dates
+        today = date_class.today().strftime('%Y-%m-%d')
+        if date_str > today:
+            messagebox.showinfo("Planned!", 
+                              f"{activity_name} scheduled for {date_str}\n\nView in 'All Activity Logs'", 
+                              parent=self)
+        
+        self._load_todays_logs()
 
 
 class Dashboard_activity(tk.Toplevel):
@@ -139,17 +226,18 @@ class Dashboard_activity(tk.Toplevel):
         self.user_id = user_id
         self.activity_service = activity_service
         
-        # Get user info
-        user_summary = user_service.get_user_summary(username)
-        
-        # User info header
+        # User info header, filled in by _show_summary
         info_frame = tk.Frame(self, bg="#e8f8e8", relief="ridge", borderwidth=2)
         info_frame.pack(fill="x", padx=10, pady=10)
         
         tk.Label(info_frame, text=f"Daily Activities - {username}", font=("Arial", 16, "bold"), bg="#e8f8e8").pack(pady=5)
         
-        info_text = f"Weight: {user_summary['weight']}kg | Activity Level: {user_summary['activity_level']} | Target: {user_summary['target']}kg"
-        tk.Label(info_frame, text=info_text, font=("Arial", 11), bg="#e8f8e8").pack(pady=5)
+        self.summary_label = tk.Label(info_frame, text="Loading...", font=("Arial", 11), bg="#e8f8e8")
+        self.summary_label.pack(pady=5)
+        TaskRunner.for_widget(self).submit(
+            user_service.get_user_summary, username,
+            on_done=self._show_summary, owner=self
+        )
         
         # Navigation buttons
         nav_frame = tk.Frame(self)
@@ -167,6 +255,10 @@ class Dashboard_activity(tk.Toplevel):
     def _back_to_menu(self):
         self.destroy()
     
+    def _show_summary(self, user_summary):
+        """Show the user info fetched in the background"""
+        self.summary_label.config(text=activity_header(user_summary))
+    
     def _open_all_logs(self):
         """Open all activity logs window"""
         from ui.views.logs_view import AllActivityLogsWindow
@@ -9,11 +9,21 @@ from datetime import date
 from typing import TYPE_CHECKING
 
 from services import FoodService, UserService
+from services.recurrence import REPEAT_PRESETS, for_weeks
+from ui.formatting import food_log_line, goal_header
+from ui.task_runner import TaskRunner
 
 if TYPE_CHECKING:
     from ui.app import LaihdutanytApp
 
 
+# Search-as-you-type: suggestions shown and delay after the last keystroke
+SEARCH_LIMIT = 20
+SEARCH_DELAY_MS = 150
+NAVIGATION_KEYS = {'Up', 'Down', 'Left', 'Right', 'Return', 'Escape', 'Tab'}
+REPEAT_ONCE = "Once"
+
+
 class FoodLogFrame(tk.Frame):
     """Food logging form component"""
     
@@ -27,10 +37,18 @@ class FoodLogFrame(tk.Frame):
         
         # Food dropdown
         self.food_var = tk.StringVar()
+        self._search_job = None
         
         # Portion input
         self.portion_var = tk.DoubleVar(value=100.0)
         
+        # Repeat: "Once" logs a single entry, presets create a recurring plan
+        self.repeat_var = tk.StringVar(value=REPEAT_ONCE)
+        self.weeks_var = tk.IntVar(value=4)
+        
+        # Meal being built: (food name, portion g) pairs logged together
+        self.meal_items = []
+        
         # Logs list with improved spacing
         self.logs_list = tk.Listbox(self, height=10, font=("Arial", 12))
         
@@ -46,6 +64,7 @@ class FoodLogFrame(tk.Frame):
         tk.Label(topframe, text="Food", font=("Arial", 11)).grid(row=0, column=0, sticky="w", padx=5)
         self.food_cb = ttk.Combobox(topframe, textvariable=self.food_var, width=30, font=("Arial", 11))
         self.food_cb.grid(row=0, column=1, padx=5)
+        self.food_cb.bind("<KeyRelease>", self._on_food_typed)
         
         tk.Label(topframe, text="Portion (g)", font=("Arial", 11)).grid(row=1, column=0, sticky="w", padx=5)
         tk.Entry(topframe, textvariable=self.portion_var, width=10, font=("Arial", 11)).grid(row=1, column=1, sticky="w", padx=5)
@@ -53,7 +72,29 @@ class FoodLogFrame(tk.Frame):
         tk.Label(topframe, text="Date", font=("Arial", 11)).grid(row=2, column=0, sticky="w", padx=5)
         tk.Entry(topframe, textvariable=self.date_var, width=15, font=("Arial", 11)).grid(row=2, column=1, sticky="w", padx=5)
         
-        tk.Button(topframe, text="Add Food", command=self._on_add, font=("Arial", 11), bg="#90caf9").grid(row=3, column=0, columnspan=2, pady=10)
+        tk.Label(topframe, text="Repeat", font=("Arial", 11)).grid(row=3, column=0, sticky="w", padx=5)
+        repeatframe = tk.Frame(topframe)
+        repeatframe.grid(row=3, column=1, sticky="w", padx=5)
+        ttk.Combobox(repeatframe, textvariable=self.repeat_var, values=[REPEAT_ONCE, *REPEAT_PRESETS],
+                     state="readonly", width=12, font=("Arial", 11)).pack(side="left")
+        tk.Label(repeatframe, text="for", font=("Arial", 11)).pack(side="left", padx=5)
+        tk.Spinbox(repeatframe, from_=1, to=52, textvariable=self.weeks_var, width=4, font=("Arial", 11)).pack(side="left")
+        tk.Label(repeatframe, text="weeks", font=("Arial", 11)).pack(side="left", padx=5)
+        
+        buttons = tk.Frame(topframe)
+        buttons.grid(row=4, column=0, columnspan=2, pady=10)
+        tk.Button(buttons, text="Add Food", command=self._on_add, font=("Arial", 11), bg="#90caf9").pack(side="left", padx=5)
+        tk.Button(buttons, text="Add to Meal", command=self._on_add_to_meal, font=("Arial", 11)).pack(side="left", padx=5)
+        
+        # Meal builder: several foods logged in one go
+        mealframe = tk.LabelFrame(self, text="Meal", font=("Arial", 11))
+        mealframe.pack(fill="x", padx=10, pady=5)
+        self.meal_list = tk.Listbox(mealframe, height=5, font=("Arial", 11), selectmode=tk.EXTENDED)
+        self.meal_list.pack(side="left", fill="x", expand=True, padx=5, pady=5)
+        meal_buttons = tk.Frame(mealframe)
+        meal_buttons.pack(side="right", padx=5)
+        tk.Button(meal_buttons, text="Remove Selected", command=self._on_remove_from_meal, font=("Arial", 10)).pack(fill="x", pady=2)
+        tk.Button(meal_buttons, text="Log Meal", command=self._on_log_meal, font=("Arial", 11), bg="#a5d6a7").pack(fill="x", pady=2)
 
         # Today's logs section
         tk.Label(self, text="Today's Food Log", font=("Arial", 12, "bold")).pack(pady=5)
@@ -72,56 +113,171 @@ class FoodLogFrame(tk.Frame):
     
     def _load_food_list(self):
         """Load food list from service"""
-        # Load names only for clean display
-        display_names = self.food_service.get_food_name_only_list()
+        # Only the first matches: catalogs can hold tens of thousands of rows
+        TaskRunner.for_widget(self).submit(
+            self.food_service.search_food_names, "", SEARCH_LIMIT,
+            on_done=self._show_food_list, owner=self, key=f"{self}:search"
+        )
+    
+    def _show_food_list(self, display_names):
         self.food_cb["values"] = display_names
         if display_names:
             self.food_cb.current(0)
     
+    def _on_food_typed(self, event):
+        """Refresh suggestions shortly after the user stops typing"""
+        if event.keysym in NAVIGATION_KEYS:
+            return
+        if self._search_job is not None:
+            self.after_cancel(self._search_job)
+        self._search_job = self.after(SEARCH_DELAY_MS, self._refresh_food_suggestions)
+    
+    def _refresh_food_suggestions(self):
+        """Show the best catalog matches for the typed text"""
+        self._search_job = None
+        # Latest wins: an older search still running is discarded
+        TaskRunner.for_widget(self).submit(
+            self.food_service.search_food_names, self.food_var.get(), SEARCH_LIMIT,
+            on_done=self._show_suggestions, owner=self, key=f"{self}:search"
+        )
+    
+    def _show_suggestions(self, names):
+        self.food_cb["values"] = names
+    
     def _load_todays_logs(self):
         """Load today's logs using service"""
-        self.logs_list.delete(0, tk.END)
         date_str = self.date_var.get()
-        logs = self.food_service.get_food_logs_by_date(self.user_id, date_str)
+        TaskRunner.for_widget(self).submit(
+            self.food_service.get_food_logs_by_date, self.user_id, date_str,
+            on_done=self._show_todays_logs, owner=self, key=f"{self}:logs"
+        )
+    
+    def _show_todays_logs(self, logs):
+        self.logs_list.delete(0, tk.END)
         
         if not logs:
             self.logs_list.insert(tk.END, "No foods logged for this date")
             return
         
-        for log_text in logs:
-            self.logs_list.insert(tk.END, log_text)
+        for log in logs:
+            self.logs_list.insert(tk.END, food_log_line(log))
     
     def _on_add(self):
         """Handle add food button with smart feedback"""
-        from datetime import date as date_class
-        
         try:
             food_name = self.food_var.get().strip()
             portion = self.portion_var.get()
             date_str = self.date_var.get()
+            repeat = self.repeat_var.get()
+            weeks = self.weeks_var.get()
+        except tk.TclError as e:
+            messagebox.showerror("Error", str(e), parent=self)
+            return
+        
+        if not food_name:
+            messagebox.showwarning("Input Required", "Please select a food", parent=self)
+            return
+        
+        if repeat != REPEAT_ONCE:
+            def schedule():
+                rule = for_weeks(REPEAT_PRESETS[repeat], date_str, weeks)
+                plan = self.food_service.schedule_food(self.user_id, food_name, portion, rule, date_str)
+                return dict(plan, name=food_name)
             
-            if not food_name:
-                messagebox.showwarning("Input Required", "Please select a food", parent=self)
-                return
-            
+            TaskRunner.for_widget(self).submit(
+                schedule,
+                on_done=self._on_scheduled,
+                on_error=lambda e: messagebox.showerror("Error", str(e), parent=self),
+                owner=self
+            )
+            return
+        
+        def log():
             # Get food ID by name
             food_id = self.food_service.get_food_id_by_name(food_name)
             
             # Log food using ID (create selection string for compatibility)
             food_selection = f"{food_name}|{food_id}"
             self.food_service.log_food(self.user_id, food_selection, portion, date_str)
-            
-            # Show feedback only for future dates
-            today = date_class.today().strftime('%Y-%m-%d')
-            if date_str > today:
-                messagebox.showinfo("Planned!", 
-                                  f"{food_name} scheduled for {date_str}\n\nView in 'All Food Logs'", 
-                                  parent=self)
-            
-            self._load_todays_logs()
-            
-        except Exception as e:
+        
+        TaskRunner.for_widget(self).submit(
+            log,
+            on_done=lambda _: self._on_logged(food_name, date_str),
+            on_error=lambda e: messagebox.showerror("Error", str(e), parent=self),
+            owner=self
+        )
+    
+    def _on_scheduled(self, plan):
+        """Feedback after a recurring plan was created"""
+        messagebox.showinfo("Planned!",
+                            f"{plan['name']} repeats until {plan['end_date']}\n\n"
+                            f"{plan['logged']} entries logged up to {plan['materialized_through']}; "
+                            f"later ones are added as the dates approach.",
+                            parent=self)
+        self._load_todays_logs()
+    
+    def _on_add_to_meal(self):
+        """Add the chosen food and portion to the meal being built"""
+        try:
+            food_name = self.food_var.get().strip()
+            portion = self.portion_var.get()
+        except tk.TclError as e:
             messagebox.showerror("Error", str(e), parent=self)
+            return
+        
+        if not food_name:
+            messagebox.showwarning("Input Required", "Please select a food", parent=self)
+            return
+        if portion <= 0:
+            messagebox.showwarning("Invalid Portion", "Portion must be greater than zero", parent=self)
+            return
+        
+        self.meal_items.append((food_name, portion))
+        self.meal_list.insert(tk.END, f"{food_name:<35} {portion:>7.0f}g")
+    
+    def _on_remove_from_meal(self):
+        """Remove the selected foods from the meal"""
+        for index in reversed(self.meal_list.curselection()):
+            self.meal_list.delete(index)
+            del self.meal_items[index]
+    
+    def _on_log_meal(self):
+        """Log every food of the meal in one transaction"""
+        if not self.meal_items:
+            messagebox.showwarning("Input Required", "Add foods to the meal first", parent=self)
+            return
+        try:
+            date_str = self.date_var.get()
+        except tk.TclError as e:
+            messagebox.showerror("Error", str(e), parent=self)
+            return
+        
+        items = list(self.meal_items)
+        TaskRunner.for_widget(self).submit(
+            self.food_service.log_meal, self.user_id, date_str, items,
+            on_done=lambda rows: self._on_meal_logged(rows, date_str),
+            on_error=lambda e: messagebox.showerror("Error", str(e), parent=self),
+            owner=self
+        )
+    
+    def _on_meal_logged(self, rows, date_str: str):
+        """Clear the meal builder and show the logged foods"""
+        self.meal_items = []
+        self.meal_list.delete(0, tk.END)
+        self._on_logged(f"Meal of {len(rows)} foods", date_str)
+    
+    def _on_logged(self, food_name: str, date_str: str):
+        """Feedback after a food was logged"""
+        from datetime import date as date_class
+        
+        # Show feedback only for future dates
+        today = date_class.today().strftime('%Y-%m-%d')
+        if date_str > today:
+            messagebox.showinfo("Planned!", 
+                              f"{food_name} scheduled for {date_str}\n\nView in 'All Food Logs'", 
+                              parent=self)
+        
+        self._load_todays_logs()
 
 
 class Dashboard_food(tk.Toplevel):
@@ -136,17 +292,18 @@ class Dashboard_food(tk.Toplevel):
         self.user_id = user_id
         self.food_service = food_service
         
-        # Get user info
-        user_summary = user_service.get_user_summary(username)
-        
-        # User info header
+        # User info header, filled in by _show_summary
         info_frame = tk.Frame(self, bg="#e8f4f8", relief="ridge", borderwidth=2)
         info_frame.pack(fill="x", padx=10, pady=10)
         
         tk.Label(info_frame, text=f"Daily Food Intake - {username}", font=("Arial", 16, "bold"), bg="#e8f4f8").pack(pady=5)
         
-        info_text = f"Weight: {user_summary['weight']}kg | Target: {user_summary['target']}kg | Daily Goal: {user_summary['kcal_min']}-{user_summary['kcal_max']} kcal"
-        tk.Label(info_frame, text=info_text, font=("Arial", 11), bg="#e8f4f8").pack(pady=5)
+        self.summary_label = tk.Label(info_frame, text="Loading...", font=("Arial", 11), bg="#e8f4f8")
+        self.summary_label.pack(pady=5)
+        TaskRunner.for_widget(self).submit(
+            user_service.get_user_summary, username,
+            on_done=self._show_summary, owner=self
+        )
         
         # Navigation buttons
         nav_frame = tk.Frame(self)
@@ -164,6 +321,10 @@ class Dashboard_food(tk.Toplevel):
     def _back_to_menu(self):
         self.destroy()
     
+    def _show_summary(self, user_summary):
+        """Show the user info fetched in the background"""
+        self.summary_label.config(text=goal_header(user_summary))
+    
     def _open_all_logs(self):
         """Open all food logs window"""
         from ui.views.logs_view import AllFoodLogsWindow
@@ -5,17 +5,22 @@ Handles user registration, user login, and admin login
 
 import tkinter as tk
 from tkinter import messagebox
-from services import UserService, AdminService
+from typing import TYPE_CHECKING
+
+from services.provider import ServiceProvider
+from ui.task_runner import TaskRunner
+
+if TYPE_CHECKING:
+    from services.user_service import UserService
 
 
 class LoginFrame(tk.Frame):
     """Main login frame with user/admin authentication"""
     
-    def __init__(self, master, user_service: UserService, admin_service: AdminService, 
-                 on_user_login, on_admin_login):
+    def __init__(self, master, services: ServiceProvider, on_user_login, on_admin_login):
         super().__init__(master)
-        self.user_service = user_service
-        self.admin_service = admin_service
+        # Services are built on the first login attempt, not before the window shows
+        self.services = services
         self.on_user_login = on_user_login
         self.on_admin_login = on_admin_login
         self._build()
@@ -90,7 +95,15 @@ class LoginFrame(tk.Frame):
             messagebox.showwarning("Missing info", "Please fill username and password.")
             return
         
-        if self.user_service.authenticate_user(username, password):
+        # Password hashing is slow on purpose: keep the window responsive
+        TaskRunner.for_widget(self).submit(
+            self.services.user.authenticate_user, username, password,
+            on_done=lambda ok: self._on_user_authenticated(username, ok),
+            owner=self, key="login"
+        )
+
+    def _on_user_authenticated(self, username: str, ok: bool):
+        if ok:
             messagebox.showinfo("Success", f"Logged in: {username}")
             self.on_user_login(username)
         else:
@@ -105,7 +118,14 @@ class LoginFrame(tk.Frame):
             messagebox.showwarning("Missing info", "Please fill username and password.")
             return
         
-        if self.admin_service.authenticate_admin(username, password):
+        TaskRunner.for_widget(self).submit(
+            self.services.admin.authenticate_admin, username, password,
+            on_done=lambda ok: self._on_admin_authenticated(username, ok),
+            owner=self, key="login"
+        )
+
+    def _on_admin_authenticated(self, username: str, ok: bool):
+        if ok:
             messagebox.showinfo("Success", f"Admin logged in: {username}")
             self.on_admin_login(username)
         else:
@@ -113,13 +133,13 @@ class LoginFrame(tk.Frame):
 
     def _on_open_register(self):
         """Open registration window"""
-        RegisterWindow(self.master, self.user_service)
+        RegisterWindow(self.master, self.services.user)
 
 
 class RegisterWindow(tk.Toplevel):
     """User registration window with validation and placeholders"""
     
-    def __init__(self, master, user_service: UserService):
+    def __init__(self, master, user_service: 'UserService'):
         super().__init__(master)
         self.user_service = user_service
         self.title("Register New User")
@@ -376,21 +396,24 @@ class RegisterWindow(tk.Toplevel):
         # Get allergies
         allergies = self._get_value_or_none(self.allergies_var, "e.g., nuts, dairy")
 
-        # Use service layer to register user
-        try:
-            user = self.user_service.register_user(
-                username=username,
-                password=password,
-                weight=weight,
-                length=length,
-                age=age,
-                activity_level=activity_level,
-                allergies=allergies,
-                kcal_min=kcal_min,
-                kcal_max=kcal_max,
-                weight_loss_target=weight_loss_target
-            )
-            messagebox.showinfo("Success!", f"User '{user.username}' has been created successfully!\n\nYou can now log in.")
-            self.destroy()
-        except ValueError as e:
-            messagebox.showerror("Error", str(e))
+        # Use service layer to register user (hashes the password on a worker thread)
+        TaskRunner.for_widget(self).submit(
+            self.user_service.register_user,
+            username=username,
+            password=password,
+            weight=weight,
+            length=length,
+            age=age,
+            activity_level=activity_level,
+            allergies=allergies,
+            kcal_min=kcal_min,
+            kcal_max=kcal_max,
+            weight_loss_target=weight_loss_target,
+            on_done=self._on_registered,
+            on_error=lambda e: messagebox.showerror("Error", str(e), parent=self),
+            owner=self
+        )
+
+    def _on_registered(self, user):
+        messagebox.showinfo("Success!", f"User '{user.username}' has been created successfully!\n\nYou can now log in.")
+        self.destroy()
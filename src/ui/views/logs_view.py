@@ -7,6 +7,9 @@ import tkinter as tk
 from tkinter import messagebox, ttk, simpledialog
 
 from services import FoodService, ActivityService
+from ui.formatting import grams
+from ui.task_runner import TaskRunner
+from ui.virtual_table import VirtualTable
 
 
 class AllFoodLogsWindow(tk.Toplevel):
@@ -17,7 +20,7 @@ class AllFoodLogsWindow(tk.Toplevel):
         self.food_service = food_service
         self.user_id = user_id
         self.title("All Food Logs")
-        self.geometry("500x700")  # Narrower width to match other windows
+        self.geometry("720x700")  # Wide enough for the macro columns
         self._build()
         self.refresh_logs()
 
@@ -32,21 +35,33 @@ class AllFoodLogsWindow(tk.Toplevel):
         style.configure("FoodLogs.Treeview", font=("Arial", 12), rowheight=25)
         style.configure("FoodLogs.Treeview.Heading", font=("Arial", 12, "bold"))
         
-        columns = ("date", "food", "portion", "kcal", "log_id")
-        self.tree = ttk.Treeview(self, columns=columns, show="headings", selectmode="browse", style="FoodLogs.Treeview")
+        columns = ("date", "food", "portion", "kcal", "carbs", "protein", "fat", "log_id")
+        self.table = VirtualTable(self, columns, row_values=self._row_values, show="headings",
+                                  selectmode="browse", style="FoodLogs.Treeview")
+        self.tree = self.table.tree
         
         self.tree.heading("date", text="Date")
         self.tree.heading("food", text="Food")
         self.tree.heading("portion", text="Portion (g)")
         self.tree.heading("kcal", text="Calories")
+        self.tree.heading("carbs", text="Carbs (g)")
+        self.tree.heading("protein", text="Protein (g)")
+        self.tree.heading("fat", text="Fat (g)")
         
         self.tree.column("date", width=85, anchor='center')
         self.tree.column("food", width=170, anchor='center')
         self.tree.column("portion", width=75, anchor='center')
         self.tree.column("kcal", width=75, anchor='center')
+        self.tree.column("carbs", width=70, anchor='center')
+        self.tree.column("protein", width=70, anchor='center')
+        self.tree.column("fat", width=60, anchor='center')
         self.tree.column("log_id", width=0, stretch=False)
         
-        self.tree.pack(fill="both", expand=True, padx=5, pady=12)
+        self.table.set_source(
+            lambda after, limit: self.food_service.get_food_log_page(self.user_id, after, limit),
+            count=lambda: self.food_service.count_food_logs(self.user_id)
+        )
+        self.table.pack(fill="both", expand=True, padx=5, pady=12)
 
         btnframe = tk.Frame(self)
         btnframe.pack(fill="x", pady=12)
@@ -55,29 +70,31 @@ class AllFoodLogsWindow(tk.Toplevel):
         tk.Button(btnframe, text="Close", command=self.destroy, font=("Arial", 15)).pack(side="right", padx=5)
 
     def refresh_logs(self):
-        for r in self.tree.get_children():
-            self.tree.delete(r)
-        
-        logs = self.food_service.get_all_food_logs(self.user_id)
-        for log in logs:
-            self.tree.insert("", "end", values=(
-                log['date'], log['name'], log['portion'], 
-                f"{log['calories']:.1f}", log['log_id']
-            ))
+        self.table.reload()
+
+    @staticmethod
+    def _row_values(log):
+        return log.log_id, (
+            log.date, log.name, grams(log.portion), f"{log.kcal:.1f}",
+            f"{log.carbs:.1f}", f"{log.protein:.1f}", f"{log.fat:.1f}", log.log_id
+        ), ()
+
+    def _on_saved(self, title: str, message: str):
+        messagebox.showinfo(title, message)
+        self.refresh_logs()
 
     def _selected_log(self):
-        sel = self.tree.selection()
-        if not sel:
+        """Log record of the selected row (the stored values, not the shown text)"""
+        log = self.table.selected_record()
+        if log is None:
             messagebox.showwarning("Select row", "Please select a log row first.")
-            return None
-        vals = self.tree.item(sel[0], "values")
-        return {"date": vals[0], "food": vals[1], "portion": vals[2], "kcal": vals[3], "log_id": vals[4]}
+        return log
 
     def _on_edit(self):
-        sel = self._selected_log()
-        if not sel:
+        log = self._selected_log()
+        if log is None:
             return
-        new_portion = simpledialog.askstring("Edit portion", f"Portion(g) for {sel['food']} on {sel['date']}:", initialvalue=sel["portion"], parent=self)
+        new_portion = simpledialog.askstring("Edit portion", f"Portion(g) for {log.name} on {log.date}:", initialvalue=grams(log.portion), parent=self)
         if new_portion is None:
             return
         try:
@@ -85,28 +102,28 @@ class AllFoodLogsWindow(tk.Toplevel):
         except ValueError:
             messagebox.showwarning("Invalid", "Portion must be numeric.")
             return
-        new_date = simpledialog.askstring("Edit date", "YYYY-MM-DD:", initialvalue=sel["date"], parent=self)
+        new_date = simpledialog.askstring("Edit date", "YYYY-MM-DD:", initialvalue=log.date, parent=self)
         if new_date is None:
             return
-        try:
-            self.food_service.update_food_log(sel["log_id"], new_portion_val, new_date)
-            messagebox.showinfo("Updated", "Log updated.")
-            self.refresh_logs()
-        except Exception as e:
-            messagebox.showerror("Error", f"Could not update log: {e}")
+        TaskRunner.for_widget(self).submit(
+            self.food_service.update_food_log, log.log_id, new_portion_val, new_date,
+            on_done=lambda _: self._on_saved("Updated", "Log updated."),
+            on_error=lambda e: messagebox.showerror("Error", f"Could not update log: {e}", parent=self),
+            owner=self
+        )
 
     def _on_delete(self):
-        sel = self._selected_log()
-        if not sel:
+        log = self._selected_log()
+        if log is None:
             return
-        if not messagebox.askyesno("Confirm", f"Delete log for {sel['food']} on {sel['date']}?"):
+        if not messagebox.askyesno("Confirm", f"Delete log for {log.name} on {log.date}?"):
             return
-        try:
-            self.food_service.delete_food_log(sel["log_id"])
-            messagebox.showinfo("Deleted", "Log deleted.")
-            self.refresh_logs()
-        except Exception as e:
-            messagebox.showerror("Error", f"Could not delete log: {e}")
+        TaskRunner.for_widget(self).submit(
+            self.food_service.delete_food_log, log.log_id,
+            on_done=lambda _: self._on_saved("Deleted", "Log deleted."),
+            on_error=lambda e: messagebox.showerror("Error", f"Could not delete log: {e}", parent=self),
+            owner=self
+        )
 
 
 class AllActivityLogsWindow(tk.Toplevel):
@@ -133,7 +150,9 @@ class AllActivityLogsWindow(tk.Toplevel):
         style.configure("ActivityLogs.Treeview.Heading", font=("Arial", 12, "bold"))
         
         columns = ("date", "activity", "count", "kcal", "log_id")
-        self.tree = ttk.Treeview(self, columns=columns, show="headings", selectmode="browse", style="ActivityLogs.Treeview")
+        self.table = VirtualTable(self, columns, row_values=self._row_values, show="headings",
+                                  selectmode="browse", style="ActivityLogs.Treeview")
+        self.tree = self.table.tree
         
         self.tree.heading("date", text="Date")
         self.tree.heading("activity", text="Activity")
@@ -146,7 +165,11 @@ class AllActivityLogsWindow(tk.Toplevel):
         self.tree.column("kcal", width=75, anchor='center')
         self.tree.column("log_id", width=0, stretch=False)
         
-        self.tree.pack(fill="both", expand=True, padx=5, pady=12)
+        self.table.set_source(
+            lambda after, limit: self.activity_service.get_activity_log_page(self.user_id, after, limit),
+            count=lambda: self.activity_service.count_activity_logs(self.user_id)
+        )
+        self.table.pack(fill="both", expand=True, padx=5, pady=12)
 
         btnframe = tk.Frame(self)
         btnframe.pack(fill="x", pady=12)
@@ -155,55 +178,57 @@ class AllActivityLogsWindow(tk.Toplevel):
         tk.Button(btnframe, text="Close", command=self.destroy, font=("Arial", 15)).pack(side="right", padx=5)
 
     def refresh_logs(self):
-        for r in self.tree.get_children():
-            self.tree.delete(r)
-        
-        logs = self.activity_service.get_all_activity_logs(self.user_id)
-        for log in logs:
-            self.tree.insert("", "end", values=(
-                log['date'], log['name'], log['count'],
-                f"{log['kcal_burned']:.1f}", log['log_id']
-            ))
+        self.table.reload()
+
+    @staticmethod
+    def _row_values(log):
+        return log.log_id, (
+            log.date, log.name, grams(log.count),
+            f"{log.kcal_burned:.1f}", log.log_id
+        ), ()
+
+    def _on_saved(self, title: str, message: str):
+        messagebox.showinfo(title, message)
+        self.refresh_logs()
 
     def _selected_log(self):
-        sel = self.tree.selection()
-        if not sel:
+        """Log record of the selected row (the stored values, not the shown text)"""
+        log = self.table.selected_record()
+        if log is None:
             messagebox.showwarning("Select row", "Please select a log row first.")
-            return None
-        vals = self.tree.item(sel[0], "values")
-        return {"date": vals[0], "activity": vals[1], "count": vals[2], "kcal": vals[3], "log_id": vals[4]}
+        return log
 
     def _on_edit(self):
-        sel = self._selected_log()
-        if not sel:
+        log = self._selected_log()
+        if log is None:
             return
-        new_count = simpledialog.askstring("Edit count", f"Count for {sel['activity']} on {sel['date']}:", initialvalue=sel["count"], parent=self)
+        new_count = simpledialog.askstring("Edit count", f"Count for {log.name} on {log.date}:", initialvalue=grams(log.count), parent=self)
         if new_count is None:
             return
         try:
-            new_count_val = int(new_count)
+            new_count_val = float(new_count)
         except ValueError:
-            messagebox.showwarning("Invalid", "Count must be integer.")
+            messagebox.showwarning("Invalid", "Count must be numeric.")
             return
-        new_date = simpledialog.askstring("Edit date", "YYYY-MM-DD:", initialvalue=sel["date"], parent=self)
+        new_date = simpledialog.askstring("Edit date", "YYYY-MM-DD:", initialvalue=log.date, parent=self)
         if new_date is None:
             return
-        try:
-            self.activity_service.update_activity_log(sel["log_id"], new_count_val, new_date)
-            messagebox.showinfo("Updated", "Log updated.")
-            self.refresh_logs()
-        except Exception as e:
-            messagebox.showerror("Error", f"Could not update log: {e}")
+        TaskRunner.for_widget(self).submit(
+            self.activity_service.update_activity_log, log.log_id, new_count_val, new_date,
+            on_done=lambda _: self._on_saved("Updated", "Log updated."),
+            on_error=lambda e: messagebox.showerror("Error", f"Could not update log: {e}", parent=self),
+            owner=self
+        )
 
     def _on_delete(self):
-        sel = self._selected_log()
-        if not sel:
+        log = self._selected_log()
+        if log is None:
             return
-        if not messagebox.askyesno("Confirm", f"Delete log for {sel['activity']} on {sel['date']}?"):
+        if not messagebox.askyesno("Confirm", f"Delete log for {log.name} on {log.date}?"):
             return
-        try:
-            self.activity_service.delete_activity_log(sel["log_id"])
-            messagebox.showinfo("Deleted", "Log deleted.")
-            self.refresh_logs()
-        except Exception as e:
-            messagebox.showerror("Error", f"Could not delete log: {e}")
+        TaskRunner.for_widget(self).submit(
+            self.activity_service.delete_activity_log, log.log_id,
+            on_done=lambda _: self._on_saved("Deleted", "Log deleted."),
+            on_error=lambda e: messagebox.showerror("Error", f"Could not delete log: {e}", parent=self),
+            owner=self
+        )
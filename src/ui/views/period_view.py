@@ -8,6 +8,8 @@ from tkinter import messagebox, ttk
 from datetime import date, datetime
 from typing import TYPE_CHECKING, Optional
 
+from ui.task_runner import TaskRunner
+
 if TYPE_CHECKING:
     from services.dietary_period_service import DietaryPeriodService
 
@@ -221,15 +223,19 @@ class PeriodCreateFrame(tk.Frame):
             messagebox.showerror("Error", "Please enter a start date")
             return
         
-        result = self.period_service.create_period(
+        TaskRunner.for_widget(self).submit(
+            self.period_service.create_period,
             user_id=self.user_id,
             period_name=period_name,
             start_date=start_date_str,
             end_date=end_date_str,
             protocol_type=protocol_type,
-            description=description
+            description=description,
+            on_done=self._on_created, owner=self
         )
-        
+    
+    def _on_created(self, result):
+        """Handle the result of create_period"""
         if result["success"]:
             messagebox.showinfo("Success", result["message"])
             if self.dashboard:
@@ -255,6 +261,7 @@ class PeriodListFrame(tk.Frame):
         self.period_service = period_service
         self.user_id = user_id
         self.dashboard = dashboard  # Reference to parent dashboard
+        self._summaries = {}  # period_id -> summary, filled by _show_completed
         
         self._setup_ui()
         self.refresh()
@@ -409,13 +416,18 @@ class PeriodListFrame(tk.Frame):
     
     def _refresh_active(self):
         """Refresh active periods list"""
+        # Get active periods - returns List[Dict] directly
+        TaskRunner.for_widget(self).submit(
+            self.period_service.get_active_periods, self.user_id,
+            on_done=self._show_active, owner=self, key=f"{self}:active"
+        )
+    
+    def _show_active(self, periods):
+        """Show active periods fetched by _refresh_active"""
         # Clear existing
         for item in self.active_tree.get_children():
             self.active_tree.delete(item)
         
-        # Get active periods - returns List[Dict] directly
-        periods = self.period_service.get_active_periods(self.user_id)
-        
         if not periods:
             return
         
@@ -439,26 +451,30 @@ class PeriodListFrame(tk.Frame):
     
     def _refresh_completed(self):
         """Refresh completed periods list"""
+        TaskRunner.for_widget(self).submit(
+            self._load_completed,
+            on_done=self._show_completed, owner=self, key=f"{self}:completed"
+        )
+    
+    def _load_completed(self):
+        """Fetch the summaries of all periods in one query (runs on a worker thread)"""
+        return self.period_service.summarize_periods(self.user_id)
+    
+    def _show_completed(self, summaries):
+        """Show completed periods fetched by _refresh_completed"""
+        # Kept for the details window, which needs no further summary query
+        self._summaries = {summary["period_id"]: summary for summary in summaries}
+        
         # Clear existing
         for item in self.completed_tree.get_children():
             self.completed_tree.delete(item)
         
-        # Get all periods - returns List[Dict] directly
-        periods = self.period_service.get_all_periods(self.user_id)
-        
-        if not periods:
-            return
-        
-        # Filter completed and populate tree
-        for period in periods:
+        # Populate tree
+        for period in summaries:
             if period["is_active"]:
                 continue
-            
-            # Calculate duration
             if period["end_date"]:
-                start = datetime.strptime(period["start_date"], "%Y-%m-%d")
-                end = datetime.strptime(period["end_date"], "%Y-%m-%d")
-                duration = (end - start).days
+                duration = period["duration_days"]
                 date_range = f"{period['start_date']} to {period['end_date']}"
             else:
                 duration = "N/A"
@@ -466,9 +482,8 @@ class PeriodListFrame(tk.Frame):
             
             # Get effectiveness
             effectiveness = "No data"
-            summary = self.period_service.get_period_summary(period["period_id"])
-            if summary and summary.get("weight_change"):
-                weight_data = summary["weight_change"]
+            if period.get("weight_change"):
+                weight_data = period["weight_change"]
                 effectiveness = f"{weight_data['change']:+.1f} kg"
             
             self.completed_tree.insert(
@@ -520,16 +535,19 @@ class PeriodListFrame(tk.Frame):
         )
         
         if confirm:
-            result = self.period_service.end_period(
-                period_id, date.today().strftime('%Y-%m-%d')
+            # Refresh the period lists afterwards to show period moved to completed
+            TaskRunner.for_widget(self).submit(
+                self.period_service.end_period, period_id, date.today().strftime('%Y-%m-%d'),
+                on_done=self._on_period_changed, owner=self
             )
-            
-            if result["success"]:
-                messagebox.showinfo("Success", result["message"])
-                # Refresh the period lists to show period moved to completed
-                self.refresh()
-            else:
-                messagebox.showerror("Error", result["message"])
+    
+    def _on_period_changed(self, result):
+        """Handle the result of end_period / delete_period"""
+        if result["success"]:
+            messagebox.showinfo("Success", result["message"])
+            self.refresh()
+        else:
+            messagebox.showerror("Error", result["message"])
     
     def _open_weight_logging(self, event=None):
         """Open weight logging dashboard (double-click handler)"""
@@ -570,7 +588,31 @@ class PeriodListFrame(tk.Frame):
     
     def _show_period_details(self, period_id):
         """Show detailed information about a period"""
-        summary_result = self.period_service.get_period_summary(period_id)
+        TaskRunner.for_widget(self).submit(
+            self._load_period_details, period_id, self._summaries.get(period_id),
+            on_done=self._open_period_details, owner=self, key=f"{self}:details"
+        )
+    
+    def _load_period_details(self, period_id, summary):
+        """Fetch the period's weight logs (runs on a worker thread)"""
+        if summary is None:
+            summary = self.period_service.get_period_summary(period_id)
+        if not summary:
+            return None, []
+        
+        # Get weight logs for this period
+        from services.weightlog_service import WeightLogService
+        weight_service = WeightLogService(self.period_service.db_path)
+        
+        # Get all logs during period date range (ongoing periods end today)
+        end_date = summary.get('end_date') or date.today().isoformat()
+        return summary, weight_service.get_weight_logs_between(
+            self.user_id, summary['start_date'], end_date
+        )
+    
+    def _open_period_details(self, details):
+        """Open the details window for data fetched by _show_period_details"""
+        summary_result, period_logs = details
         
         if not summary_result:
             messagebox.showerror("Error", "Could not load period details")
@@ -628,10 +670,15 @@ Effectiveness Results:
             details_content += f"Start Weight: {weight_data['start_weight']:.1f} kg\n"
             details_content += f"End Weight: {weight_data['end_weight']:.1f} kg\n"
             details_content += f"Total Change: {weight_data['change']:+.1f} kg\n"
-            details_content += f"Average Weekly: {weight_data['change_per_week']:+.2f} kg/week\n"
+            if weight_data['change_per_week'] is not None:
+                details_content += f"Average Weekly: {weight_data['change_per_week']:+.2f} kg/week\n"
         else:
             details_content += "No weight data available for this period\n"
         
+        if 'kcal_in' in summary:
+            details_content += f"\nCalories In: {summary['kcal_in']:.0f} kcal\n"
+            details_content += f"Calories Burned: {summary['kcal_out']:.0f} kcal\n"
+        
         if summary.get('notes'):
             details_content += f"\nNotes:\n{summary['notes']}\n"
         
@@ -642,24 +689,6 @@ Effectiveness Results:
         logs_frame = tk.Frame(notebook)
         notebook.add(logs_frame, text="Weight Logs")
         
-        # Get weight logs for this period
-        from services.weightlog_service import WeightLogService
-        weight_service = WeightLogService(self.period_service.db_path)
-        
-        # Get all logs during period date range
-        all_logs = weight_service.get_weight_history(self.user_id)
-        
-        # Filter logs within period date range
-        period_logs = []
-        for log in all_logs:
-            log_date = log['date']
-            if log_date >= summary['start_date']:
-                if summary.get('end_date'):
-                    if log_date <= summary['end_date']:
-                        period_logs.append(log)
-                else:
-                    period_logs.append(log)
-        
         # Display logs in treeview
         tk.Label(
             logs_frame, 
@@ -726,13 +755,10 @@ Effectiveness Results:
         )
         
         if confirm:
-            result = self.period_service.delete_period(self.user_id, period_id)
-            
-            if result["success"]:
-                messagebox.showinfo("Success", result["message"])
-                self.refresh()
-            else:
-                messagebox.showerror("Error", result["message"])
+            TaskRunner.for_widget(self).submit(
+                self.period_service.delete_period, self.user_id, period_id,
+                on_done=self._on_period_changed, owner=self
+            )
 
 
 class DashboardPeriods(tk.Toplevel):
@@ -8,6 +8,9 @@ from tkinter import ttk
 from typing import TYPE_CHECKING
 
 from services import FoodService, ActivityService, UserService
+from ui.formatting import activity_header, goal_header
+from ui.task_runner import TaskRunner
+from ui.virtual_table import VirtualTable
 
 if TYPE_CHECKING:
     from ui.app import LaihdutanytApp
@@ -20,23 +23,24 @@ class Dashboard_daily_foods_totals(tk.Toplevel):
                  food_service: FoodService, username: str, user_id: str):
         super().__init__(master)
         self.title(f"Daily Food Totals - {username}")
-        self.geometry("500x700") 
+        self.geometry("900x700") 
         self.master = master
         self.username = username
         self.user_id = user_id
         self.food_service = food_service
         
-        # Get user info
-        user_summary = user_service.get_user_summary(username)
-        
-        # User info header
+        # User info header, filled in by _show_summary
         info_frame = tk.Frame(self, bg="#e8f4f8", relief="ridge", borderwidth=2)
         info_frame.pack(fill="x", padx=10, pady=10)
         
         tk.Label(info_frame, text=f"Daily Food Totals - {username}", font=("Arial", 16, "bold"), bg="#e8f4f8").pack(pady=5)
         
-        info_text = f"Weight: {user_summary['weight']}kg | Target: {user_summary['target']}kg | Daily Goal: {user_summary['kcal_min']}-{user_summary['kcal_max']} kcal"
-        tk.Label(info_frame, text=info_text, font=("Arial", 11), bg="#e8f4f8").pack(pady=5)
+        self.summary_label = tk.Label(info_frame, text="Loading...", font=("Arial", 11), bg="#e8f4f8")
+        self.summary_label.pack(pady=5)
+        TaskRunner.for_widget(self).submit(
+            user_service.get_user_summary, username,
+            on_done=self._show_summary, owner=self
+        )
         
         # Navigation buttons
         nav_frame = tk.Frame(self)
@@ -58,17 +62,29 @@ class Dashboard_daily_foods_totals(tk.Toplevel):
         style.configure("FoodTotals.Treeview.Heading", font=("Arial", 12, "bold"))
         
         # Create treeview
-        columns = ("date", "total_kcal", "entries")
-        self.tree = ttk.Treeview(self, columns=columns, show="headings", selectmode="browse", style="FoodTotals.Treeview")
+        columns = ("date", "total_kcal", "carbs", "protein", "fat", "burned", "net_kcal", "entries")
+        self.table = VirtualTable(self, columns, row_values=self._row_values,
+                                  placeholder=("No food data",) + ("",) * 7, show="headings",
+                                  selectmode="browse", style="FoodTotals.Treeview")
+        self.tree = self.table.tree
         self.tree.heading("date", text="Date")
-        self.tree.heading("total_kcal", text="Total Calories (kcal)")
+        self.tree.heading("total_kcal", text="Calories (kcal)")
+        self.tree.heading("carbs", text="Carbs (g)")
+        self.tree.heading("protein", text="Protein (g)")
+        self.tree.heading("fat", text="Fat (g)")
+        self.tree.heading("burned", text="Burned (kcal)")
+        self.tree.heading("net_kcal", text="Net (kcal)")
         self.tree.heading("entries", text="# of Entries")
         
         self.tree.column("date", width=180, anchor="center")  # Wider for "📍 TODAY"
-        self.tree.column("total_kcal", width=180, anchor="center")
-        self.tree.column("entries", width=120, anchor="center")
+        self.tree.column("total_kcal", width=120, anchor="center")
+        for column in ("carbs", "protein", "fat"):
+            self.tree.column(column, width=85, anchor="center")
+        self.tree.column("burned", width=110, anchor="center")
+        self.tree.column("net_kcal", width=100, anchor="center")
+        self.tree.column("entries", width=100, anchor="center")
         
-        self.tree.pack(fill="both", expand=True, padx=10, pady=10)
+        self.table.pack(fill="both", expand=True, padx=10, pady=10)
         
         # Configure tags for date highlighting
         self.tree.tag_configure('past', background='white')
@@ -80,26 +96,29 @@ class Dashboard_daily_foods_totals(tk.Toplevel):
     def _back_to_menu(self):
         self.destroy()
     
+    def _show_summary(self, user_summary):
+        """Show the user info fetched in the background"""
+        self.summary_label.config(text=goal_header(user_summary))
+    
     def refresh_totals(self):
         """Refresh totals using service layer with date categorization"""
-        # Clear existing rows
-        for r in self.tree.get_children():
-            self.tree.delete(r)
-        
-        # Get data from service (includes date categorization)
-        totals = self.food_service.get_daily_food_totals(self.user_id)
-        
-        # Debug: Check if we got data
-        if not totals:
-            # No data - insert a message row
-            self.tree.insert("", "end", values=("No food data", "", ""))
-            return
-        
-        # Insert data rows
-        for item in totals:
-            self.tree.insert("", "end", 
-                           values=(item['date'], item['total_kcal'], item['entries']), 
-                           tags=(item['category'],))
+        # Get data from service in the background (includes date categorization)
+        TaskRunner.for_widget(self).submit(
+            self.food_service.get_daily_food_totals, self.user_id,
+            on_done=self._show_totals, owner=self, key=f"{self}:totals"
+        )
+    
+    def _show_totals(self, totals):
+        """Show totals fetched by refresh_totals"""
+        # Only rows whose totals changed are touched
+        self.table.set_rows(totals)
+
+    @staticmethod
+    def _row_values(item):
+        values = (item['date'],) + tuple(
+            f"{item[key]:.1f}" for key in ("total_kcal", "carbs", "protein", "fat", "burned", "net_kcal")
+        ) + (item['entries'],)
+        return item['date'], values, (item['category'],)
 
 
 class Dashboard_daily_activities_totals(tk.Toplevel):
@@ -115,17 +134,18 @@ class Dashboard_daily_activities_totals(tk.Toplevel):
         self.user_id = user_id
         self.activity_service = activity_service
         
-        # Get user info
-        user_summary = user_service.get_user_summary(username)
-        
-        # User info header
+        # User info header, filled in by _show_summary
         info_frame = tk.Frame(self, bg="#e8f8e8", relief="ridge", borderwidth=2)
         info_frame.pack(fill="x", padx=10, pady=10)
         
         tk.Label(info_frame, text=f"Daily Activity Totals - {username}", font=("Arial", 16, "bold"), bg="#e8f8e8").pack(pady=5)
         
-        info_text = f"Weight: {user_summary['weight']}kg | Activity Level: {user_summary['activity_level']} | Target: {user_summary['target']}kg"
-        tk.Label(info_frame, text=info_text, font=("Arial", 11), bg="#e8f8e8").pack(pady=5)
+        self.summary_label = tk.Label(info_frame, text="Loading...", font=("Arial", 11), bg="#e8f8e8")
+        self.summary_label.pack(pady=5)
+        TaskRunner.for_widget(self).submit(
+            user_service.get_user_summary, username,
+            on_done=self._show_summary, owner=self
+        )
         
         # Navigation buttons
         nav_frame = tk.Frame(self)
@@ -148,7 +168,10 @@ class Dashboard_daily_activities_totals(tk.Toplevel):
         
         # Create treeview
         columns = ("date", "total_kcal", "entries")
-        self.tree = ttk.Treeview(self, columns=columns, show="headings", selectmode="browse", style="ActivityTotals.Treeview")
+        self.table = VirtualTable(self, columns, row_values=self._row_values,
+                                  placeholder=("No activity data", "", ""), show="headings",
+                                  selectmode="browse", style="ActivityTotals.Treeview")
+        self.tree = self.table.tree
         self.tree.heading("date", text="Date")
         self.tree.heading("total_kcal", text="Calories Burned (kcal)")
         self.tree.heading("entries", text="Activities")
@@ -157,7 +180,7 @@ class Dashboard_daily_activities_totals(tk.Toplevel):
         self.tree.column("total_kcal", width=180, anchor="center")
         self.tree.column("entries", width=120, anchor="center")
         
-        self.tree.pack(fill="both", expand=True, padx=10, pady=10)
+        self.table.pack(fill="both", expand=True, padx=10, pady=10)
         
         # Configure tags for date highlighting
         self.tree.tag_configure('past', background='white')
@@ -168,25 +191,25 @@ class Dashboard_daily_activities_totals(tk.Toplevel):
     
     def _back_to_menu(self):
         self.destroy()
+    
+    def _show_summary(self, user_summary):
+        """Show the user info fetched in the background"""
+        self.summary_label.config(text=activity_header(user_summary))
             
     def refresh_totals(self):
         """Refresh totals using service layer with date categorization"""
-        # Clear existing rows
-        for r in self.tree.get_children():
-            self.tree.delete(r)
-        
-        # Get data from service (includes date categorization)
-        totals = self.activity_service.get_daily_activity_totals(self.user_id)
-        
-        # Debug: Check if we got data
-        if not totals:
-            # No data - insert a message row
-            self.tree.insert("", "end", values=("No activity data", "", ""))
-            return
-        
-        # Insert data rows
-        for item in totals:
-            self.tree.insert("", "end", 
-                           values=(item['date'], item['total_kcal_burned'], item['entries']), 
-                           tags=(item['category'],))
+        # Get data from service in the background (includes date categorization)
+        TaskRunner.for_widget(self).submit(
+            self.activity_service.get_daily_activity_totals, self.user_id,
+            on_done=self._show_totals, owner=self, key=f"{self}:totals"
+        )
+    
+    def _show_totals(self, totals):
+        """Show totals fetched by refresh_totals"""
+        # Only rows whose totals changed are touched
+        self.table.set_rows(totals)
+
+    @staticmethod
+    def _row_values(item):
+        return item['date'], (item['date'], item['total_kcal_burned'], item['entries']), (item['category'],)
 
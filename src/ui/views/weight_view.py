@@ -8,6 +8,9 @@ from tkinter import messagebox, ttk
 from datetime import date, datetime
 from typing import TYPE_CHECKING, Optional
 
+from ui.task_runner import TaskRunner
+from ui.virtual_table import VirtualTable
+
 if TYPE_CHECKING:
     from services.weightlog_service import WeightLogService
     from services.dietary_period_service import DietaryPeriodService
@@ -102,27 +105,31 @@ class WeightLogFrame(tk.Frame):
             weight = self.weight_var.get()
             date_str = self.date_var.get()
             notes = self.notes_var.get().strip() or None
-            
-            result = self.weightlog_service.log_weight(
-                user_id=self.user_id,
-                date_str=date_str,
-                weight=weight,
-                notes=notes
-            )
-            
-            if result["success"]:
-                messagebox.showinfo("Success", result["message"])
-                # Notify parent to refresh history
-                if self.dashboard:
-                    self.dashboard.refresh_history()
-                # Clear notes but keep weight for next entry
-                self.notes_var.set("")
-            else:
-                error_msg = result.get("message") or result.get("error", "Unknown error")
-                messagebox.showerror("Error", error_msg)
-                
         except tk.TclError:
             messagebox.showerror("Error", "Please enter a valid weight value")
+            return
+        
+        TaskRunner.for_widget(self).submit(
+            self.weightlog_service.log_weight,
+            user_id=self.user_id,
+            date_str=date_str,
+            weight=weight,
+            notes=notes,
+            on_done=self._on_logged, owner=self
+        )
+    
+    def _on_logged(self, result):
+        """Handle the result of log_weight"""
+        if result["success"]:
+            messagebox.showinfo("Success", result["message"])
+            # Notify parent to refresh history
+            if self.dashboard:
+                self.dashboard.refresh_history()
+            # Clear notes but keep weight for next entry
+            self.notes_var.set("")
+        else:
+            error_msg = result.get("message") or result.get("error", "Unknown error")
+            messagebox.showerror("Error", error_msg)
 
 
 class WeightHistoryFrame(tk.Frame):
@@ -153,13 +160,11 @@ class WeightHistoryFrame(tk.Frame):
         )
         self.summary_label.pack(pady=2)
         
-        # Create frame for treeview with scrollbar
-        tree_frame = tk.Frame(self)
-        tree_frame.pack(fill="both", expand=True, padx=10, pady=5)
-        
-        # Create treeview
+        # Create treeview (only the visible rows are rendered)
         columns = ("date", "week", "weight", "change", "periods")
-        self.tree = ttk.Treeview(tree_frame, columns=columns, show="headings", height=15)
+        self.table = VirtualTable(self, columns, row_values=self._row_values,
+                                  show="headings", height=15)
+        self.tree = self.table.tree
         
         # Column headings
         self.tree.heading("date", text="Date")
@@ -175,13 +180,10 @@ class WeightHistoryFrame(tk.Frame):
         self.tree.column("change", width=70)
         self.tree.column("periods", width=450)  # More space for multiple period names
         
-        # Scrollbar
-        scrollbar = ttk.Scrollbar(tree_frame, orient="vertical", command=self.tree.yview)
-        self.tree.configure(yscrollcommand=scrollbar.set)
+        self.table.pack(fill="both", expand=True, padx=10, pady=5)
         
-        # Pack tree and scrollbar
-        self.tree.pack(side="left", fill="both", expand=True)
-        scrollbar.pack(side="right", fill="y")
+        # Configure tag for week starts (bold)
+        self.tree.tag_configure("week_start", font=("Arial", 11, "bold"))
         
         # Context menu for delete
         self.tree.bind("<Button-3>", self._show_context_menu)
@@ -198,15 +200,31 @@ class WeightHistoryFrame(tk.Frame):
     
     def refresh(self):
         """Refresh the weight history display"""
-        # Clear existing items
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        
+        # A newer refresh (e.g. right after logging) replaces a pending one
+        TaskRunner.for_widget(self).submit(
+            self._load_history,
+            on_done=self._show_history, owner=self, key=f"{self}:history"
+        )
+    
+    def _load_history(self):
+        """Fetch history and progress summary (runs on a worker thread)"""
         # Get weight history with weeks and periods
         history = self.weightlog_service.get_weight_history_with_weeks(
             user_id=self.user_id,
             days=365  # Get full year of data
         )
+        if not history:
+            return history, None
+        
+        # Get progress summary from service
+        return history, self.weightlog_service.get_progress_summary(self.user_id)
+    
+    def _show_history(self, data):
+        """Show data fetched by refresh"""
+        history, progress_result = data
+        
+        # Rows are diffed by log_id, so unchanged entries are not redrawn
+        self.table.set_rows(history or [])
         
         if not history:
             self.summary_label.config(text="No weight entries yet")
@@ -214,10 +232,7 @@ class WeightHistoryFrame(tk.Frame):
         
         # Calculate summary statistics
         total_entries = len(history)
-        current_weight = history[0]["weight"]  # Most recent (first in descending order)
-        
-        # Get progress summary from service
-        progress_result = self.weightlog_service.get_progress_summary(self.user_id)
+        current_weight = history[0].weight  # Most recent (first in descending order)
         
         if progress_result.get("has_data"):
             summary_text = (
@@ -234,51 +249,41 @@ class WeightHistoryFrame(tk.Frame):
             monthly = progress_result.get("monthly_change")
             if monthly and isinstance(monthly, dict):
                 summary_text += f" | Monthly: {monthly.get('weight_change', 0):+.2f} kg"
+            
+            # Add smoothed trend and goal projection if available
+            slope = progress_result.get("slope_kg_per_week")
+            if slope is not None:
+                summary_text += f" | Trend: {slope:+.2f} kg/week"
+            goal = progress_result.get("goal_progress")
+            if goal and goal.get("projected_date"):
+                summary_text += f" | Goal by {goal['projected_date']}"
         else:
             summary_text = f"📊 Total Entries: {total_entries} | Current: {current_weight:.1f} kg"
         
         self.summary_label.config(text=summary_text)
         
-        # Populate tree
-        for entry in history:
-            # Get current week for formatting
-            current_week = entry.get("week_number")
-            
-            # Format date
-            log_date = entry["date"]
-            
-            # Format week info
-            week_info = ""
-            if entry.get("is_week_start"):
-                week_info = f"★ Week {current_week}"
-            else:
-                week_info = f"Week {current_week}"
-            
-            # Format weight
-            weight = f"{entry['weight']:.1f}"
-            
-            # Format change
-            change = ""
-            if entry.get("weight_change") is not None:
-                weight_change = entry["weight_change"]
-                change = f"{weight_change:+.1f} kg"
-            
-            # Format periods - use period_markers which contains formatted strings
-            periods_text = ""
-            if entry.get("period_markers"):
-                periods_text = " | ".join(entry["period_markers"])
-            
-            # Insert with tag for week starts and store log_id
-            tags = ("week_start",) if entry.get("is_week_start") else ()
-            
-            self.tree.insert(
-                "", "end", 
-                values=(log_date, week_info, weight, change, periods_text),
-                tags=(entry["log_id"], *tags)  # Store log_id in tags
-            )
+    @staticmethod
+    def _row_values(entry):
+        """Treeview item for one history entry: (log_id, values, tags)"""
+        # Format week info
+        if entry.is_week_start:
+            week_info = f"★ Week {entry.week_number}"
+        else:
+            week_info = f"Week {entry.week_number}"
         
-        # Configure tag for week starts (bold)
-        self.tree.tag_configure("week_start", font=("Arial", 11, "bold"))
+        # Format weight
+        weight = f"{entry.weight:.1f}"
+        
+        # The history entries carry no per-entry change; the column stays empty
+        change = ""
+        
+        # Format periods - use period_markers which contains formatted strings
+        periods_text = " | ".join(entry.period_markers)
+        
+        # Tag for week starts; log_id is also stored as the first tag
+        tags = ("week_start",) if entry.is_week_start else ()
+        values = (entry.date, week_info, weight, change, periods_text)
+        return entry.log_id, values, (entry.log_id, *tags)
     
     def _show_context_menu(self, event):
         """Show context menu for delete option"""
@@ -307,14 +312,19 @@ class WeightHistoryFrame(tk.Frame):
         )
         
         if confirm:
-            result = self.weightlog_service.delete_weight_log(log_id)
-            
-            if result["success"]:
-                messagebox.showinfo("Success", result["message"])
-                self.refresh()
-            else:
-                error_msg = result.get("message") or result.get("error", "Unknown error")
-                messagebox.showerror("Error", error_msg)
+            TaskRunner.for_widget(self).submit(
+                self.weightlog_service.delete_weight_log, log_id,
+                on_done=self._on_deleted, owner=self
+            )
+    
+    def _on_deleted(self, result):
+        """Handle the result of delete_weight_log"""
+        if result["success"]:
+            messagebox.showinfo("Success", result["message"])
+            self.refresh()
+        else:
+            error_msg = result.get("message") or result.get("error", "Unknown error")
+            messagebox.showerror("Error", error_msg)
 
 
 class DashboardWeight(tk.Toplevel):
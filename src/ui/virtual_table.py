@@ -0,0 +1,235 @@
+"""
+Virtual Table - Treeview that only renders the visible rows
+Holds the data as plain records and keeps just one screenful of them as
+Treeview items; scrolling moves a window over the records. Every render is a
+diff against the items on screen, keyed by the row id (e.g. log_id), so a
+refresh where one log changed costs one Tk call instead of N.
+
+Data comes either from a list (set_rows) or from a keyset-paginated source
+(set_source): fetch_page(last_record, limit) returns the records after
+last_record. Pages are fetched on the task runner as the user scrolls.
+
+Usage in a view:
+    self.table = VirtualTable(self, columns, row_values=self._row_values,
+                              show="headings", selectmode="browse")
+    self.table.tree.heading("date", text="Date")
+    self.table.set_source(fetch_page, count=count)
+    self.table.reload()
+"""
+
+import tkinter as tk
+from tkinter import ttk
+from typing import Callable, Dict, List, Optional, Tuple
+
+from ui.task_runner import TaskRunner
+
+PAGE_SIZE = 200
+DEFAULT_ROW_HEIGHT = 20
+PLACEHOLDER_ID = "__placeholder__"
+
+# row_values(record) -> (item id, column values, tags)
+RowValues = Callable[[Dict], Tuple[str, tuple, tuple]]
+
+
+class VirtualTable(tk.Frame):
+    """Scrollable table rendering only the rows in view"""
+
+    def __init__(self, master, columns, row_values: RowValues,
+                 page_size: int = PAGE_SIZE, placeholder: Optional[tuple] = None,
+                 **tree_options):
+        super().__init__(master)
+        self.row_values = row_values
+        self.page_size = page_size
+        self.placeholder = placeholder  # values shown when there are no rows
+
+        self.tree = ttk.Treeview(self, columns=columns, **tree_options)
+        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self._on_scrollbar)
+        self.tree.pack(side="left", fill="both", expand=True)
+        self.scrollbar.pack(side="right", fill="y")
+
+        self._rows: List[Dict] = []
+        self._complete = True
+        self._total: Optional[int] = None
+        self._fetch_page = None
+        self._count = None
+        self._loading = False
+        self._offset = 0
+        self._visible = int(tree_options.get("height", 10))
+        self._shown: Dict[str, Tuple[tuple, tuple]] = {}
+        self._records: Dict[str, Dict] = {}  # item id -> record, rows on screen
+
+        style = tree_options.get("style", "Treeview")
+        row_height = ttk.Style().lookup(style, "rowheight") or ttk.Style().lookup("Treeview", "rowheight")
+        self._row_height = int(row_height) if row_height else DEFAULT_ROW_HEIGHT
+
+        self.tree.bind("<Configure>", self._on_resize)
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.tree.bind(sequence, self._on_wheel)
+        self.tree.bind("<Prior>", lambda e: self._scroll_by(-self._visible))
+        self.tree.bind("<Next>", lambda e: self._scroll_by(self._visible))
+        self.tree.bind("<Up>", lambda e: self._on_arrow(-1))
+        self.tree.bind("<Down>", lambda e: self._on_arrow(1))
+
+    # ------------------------------------------------------------------ data
+
+    def set_rows(self, records: List[Dict]):
+        """Show an in-memory list (replaces any paged source)"""
+        self._fetch_page = None
+        self._count = None
+        self._rows = list(records)
+        self._complete = True
+        self._total = len(self._rows)
+        self._render()
+
+    def set_source(self, fetch_page: Callable[[Optional[Dict], int], List[Dict]],
+                   count: Optional[Callable[[], int]] = None):
+        """Use a keyset-paginated source; reload() reads it"""
+        self._fetch_page = fetch_page
+        self._count = count
+        self._offset = 0
+
+    def reload(self):
+        """Re-read the paged source up to the current scroll position"""
+        if self._fetch_page is None:
+            return
+        needed = max(self._offset + self._visible, self.page_size)
+        self._loading = True
+        TaskRunner.for_widget(self).submit(
+            self._load, None, needed, True,
+            on_done=self._on_loaded, owner=self, key=f"{self}:page"
+        )
+
+    def _load_more(self):
+        if self._loading or self._complete or self._fetch_page is None:
+            return
+        needed = self._offset + self._visible - len(self._rows)
+        last = self._rows[-1] if self._rows else None
+        self._loading = True
+        TaskRunner.for_widget(self).submit(
+            self._load, last, max(needed, self.page_size), False,
+            on_done=self._on_loaded, owner=self, key=f"{self}:page"
+        )
+
+    def _load(self, last: Optional[Dict], needed: int, replace: bool):
+        """Fetch pages until `needed` records arrived (runs on a worker thread)"""
+        records: List[Dict] = []
+        complete = False
+        while len(records) < needed:
+            page = self._fetch_page(last, self.page_size)
+            records.extend(page)
+            if len(page) < self.page_size:
+                complete = True
+                break
+            last = page[-1]
+        total = self._count() if replace and self._count else None
+        return replace, records, complete, total
+
+    def _on_loaded(self, result):
+        replace, records, complete, total = result
+        self._loading = False
+        if replace:
+            self._rows = records
+        else:
+            self._rows.extend(records)
+        self._complete = complete
+        if complete:
+            self._total = len(self._rows)
+        elif total is not None:
+            self._total = total
+        self._render()
+
+    def selected_record(self) -> Optional[Dict]:
+        """Record of the selected row, None if no row (or the placeholder) is selected"""
+        selection = self.tree.selection()
+        return self._records.get(selection[0]) if selection else None
+
+    # ------------------------------------------------------------- rendering
+
+    @property
+    def row_count(self) -> int:
+        """Number of rows in the table (estimate until a paged source is read)"""
+        if self._total is not None:
+            return max(self._total, len(self._rows))
+        return len(self._rows) + (0 if self._complete else self.page_size)
+
+    def _render(self):
+        """Show rows[offset:offset + visible], touching only the items that differ"""
+        self._offset = max(0, min(self._offset, self.row_count - self._visible))
+        window = self._rows[self._offset:self._offset + self._visible]
+        if len(window) < self._visible and not self._complete:
+            # Keep the current rows on screen until the missing pages arrive
+            self._load_more()
+            return
+
+        new_rows = [self.row_values(record) for record in window]
+        self._records = {iid: record for (iid, _, _), record in zip(new_rows, window)}
+        if not new_rows and self._complete and self.placeholder:
+            new_rows = [(PLACEHOLDER_ID, self.placeholder, ())]
+        new_ids = [iid for iid, _, _ in new_rows]
+
+        gone = set(self._shown) - set(new_ids)
+        if gone:
+            self.tree.delete(*gone)
+        shown = {}
+        for index, (iid, values, tags) in enumerate(new_rows):
+            previous = self._shown.get(iid)
+            if previous is None:
+                self.tree.insert("", index, iid=iid, values=values, tags=tags)
+            elif previous != (values, tags):
+                self.tree.item(iid, values=values, tags=tags)
+            shown[iid] = (values, tags)
+        self._shown = shown
+
+        if tuple(new_ids) != self.tree.get_children():
+            for index, iid in enumerate(new_ids):
+                self.tree.move(iid, "", index)
+
+        total = max(self.row_count, 1)
+        self.scrollbar.set(self._offset / total, min(1.0, (self._offset + len(window)) / total))
+
+    # ------------------------------------------------------------- scrolling
+
+    def _scroll_by(self, rows: int):
+        self._offset += rows
+        self._render()
+        return "break"
+
+    def _on_scrollbar(self, action, *args):
+        if action == "moveto":
+            self._offset = int(float(args[0]) * self.row_count)
+            self._render()
+        elif action == "scroll":
+            amount, unit = int(args[0]), args[1]
+            self._scroll_by(amount * (self._visible if unit == "pages" else 1))
+
+    def _on_wheel(self, event):
+        if event.num == 4 or getattr(event, "delta", 0) > 0:
+            return self._scroll_by(-3)
+        return self._scroll_by(3)
+
+    def _on_arrow(self, step: int):
+        """Move the selection, scrolling when it leaves the visible window"""
+        children = self.tree.get_children()
+        if not children:
+            return "break"
+        focus = self.tree.focus()
+        index = children.index(focus) if focus in children else -1
+        target = index + step
+        if 0 <= target < len(children):
+            iid = children[target]
+        else:
+            self._scroll_by(step)
+            children = self.tree.get_children()
+            if not children:
+                return "break"
+            iid = children[0] if step < 0 else children[-1]
+        self.tree.selection_set(iid)
+        self.tree.focus(iid)
+        return "break"
+
+    def _on_resize(self, event):
+        # One row's height is taken by the headings
+        visible = max(1, event.height // self._row_height - 1)
+        if visible != self._visible:
+            self._visible = visible
+            self._render()
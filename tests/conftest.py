@@ -0,0 +1,67 @@
+"""
+Shared fixtures: databases in a temporary directory.
+
+The shipped database (src/data/laihdutanyt.db) is only ever copied; tests
+migrate and write to the copy.
+"""
+import os
+import shutil
+import sqlite3
+import uuid
+
+import pytest
+
+from create_db import create_db
+from migrations.run_migrations import run_migrations
+from repositories.connection_pool import close_all_pools
+
+SHIPPED_DB = os.path.join(os.path.dirname(__file__), "..", "src", "data", "laihdutanyt.db")
+
+
+@pytest.fixture(autouse=True)
+def _close_pools():
+    """Pooled connections of one test must not outlive its temporary database"""
+    yield
+    close_all_pools()
+
+
+@pytest.fixture
+def shipped_db(tmp_path) -> str:
+    """Copy of the shipped database, not migrated"""
+    path = str(tmp_path / "shipped.db")
+    shutil.copyfile(SHIPPED_DB, path)
+    return path
+
+
+@pytest.fixture
+def migrated_db(shipped_db) -> str:
+    """Copy of the shipped database at the latest schema version"""
+    run_migrations(shipped_db)
+    return shipped_db
+
+
+@pytest.fixture
+def empty_db(tmp_path) -> str:
+    """Empty database built the way a new installation is, at the latest schema version"""
+    path = str(tmp_path / "empty.db")
+    create_db(path, insert_test=False)
+    return path
+
+
+@pytest.fixture
+def user_id(empty_db) -> str:
+    """A user (kcal range 150-250) in empty_db, plus food 'f1' (per 100 g: 100 kcal,
+    10 g carbs, 5 g protein, 2 g fat) and activity 'a1' (500 kcal per 1000)"""
+    user_id = str(uuid.uuid4())
+    conn = sqlite3.connect(empty_db)
+    try:
+        with conn:
+            conn.execute('INSERT INTO "user" (user_id, username, password_hash, salt, kcal_min, kcal_max) '
+                         'VALUES (?, ?, ?, ?, ?, ?)', (user_id, "tester", "-", "-", 150, 250))
+            conn.execute("INSERT INTO food (food_id, name, kcal_per_portion, carbs_per_portion, "
+                         "protein_per_portion, fat_per_portion) VALUES ('f1', 'Oats', 100, 10, 5, 2)")
+            conn.execute("INSERT INTO activity (activity_id, name, unit, kcal_per_unit) "
+                         "VALUES ('a1', 'Walking', 'steps', 500)")
+    finally:
+        conn.close()
+    return user_id
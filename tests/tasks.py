@@ -72,6 +72,16 @@ def init_db(ctx):
     ctx.run("python src/create_db.py", pty=False)
     print(" Database initialized!")
 
+@task
+def bench(ctx, users=5, years=2, per_day=6, repeat=10, output="bench_results.json", baseline=None):
+    """Benchmark the service methods used by the views on a synthetic dataset"""
+    print(" Running benchmarks...")
+    command = (f"python src/scripts/benchmark_services.py --users {users} --years {years} "
+               f"--per-day {per_day} --repeat {repeat} --output {output}")
+    if baseline:
+        command += f" --baseline {baseline}"
+    ctx.run(command, pty=False)
+
 @task(pre=[test, coverage, lint])
 def check(ctx):
     """Run all checks: tests, coverage, and linting"""
@@ -102,6 +112,9 @@ Basic Commands:
   poetry run invoke test               - Run all tests
   poetry run invoke coverage           - Run tests with coverage
   poetry run invoke lint               - Run pylint on all code
+  poetry run invoke bench              - Benchmark services, write bench_results.json
+  poetry run invoke bench --baseline bench_results.json --output new.json
+                                       - Compare with an earlier benchmark run
   
 Database:
   poetry run invoke init-db            - Initialize/recreate database
@@ -116,3 +129,4 @@ Maintenance:
   poetry run invoke install            - Install dependencies
   poetry run invoke update             - Update dependencies
 
+""")
@@ -0,0 +1,50 @@
+import hashlib
+
+import pytest
+
+from repositories.credentials import (
+    LEGACY_PBKDF2_ITERATIONS, HashPolicy, hash_password, needs_rehash, verify_dummy, verify_password,
+)
+
+# Cheap parameters; the format and the checks are the same as with the defaults
+FAST_SCRYPT = HashPolicy(scrypt_n=2 ** 4)
+FAST_PBKDF2 = HashPolicy(scheme="pbkdf2-sha256", pbkdf2_iterations=10)
+
+
+@pytest.mark.parametrize("policy", [FAST_SCRYPT, FAST_PBKDF2])
+def test_hash_and_verify(policy):
+    encoded, salt = hash_password("secret", policy)
+    assert encoded.startswith(f"${policy.scheme}$")
+    assert salt in encoded
+    assert verify_password("secret", encoded)
+    assert not verify_password("Secret", encoded)
+    assert not needs_rehash(encoded, policy)
+
+
+def test_salts_differ():
+    assert hash_password("secret", FAST_SCRYPT)[0] != hash_password("secret", FAST_SCRYPT)[0]
+
+
+def test_legacy_hash_verifies_with_salt_column():
+    salt = "00112233445566778899aabbccddeeff"
+    legacy = hashlib.pbkdf2_hmac("sha256", b"secret", bytes.fromhex(salt), LEGACY_PBKDF2_ITERATIONS).hex()
+    assert verify_password("secret", legacy, salt)
+    assert not verify_password("wrong", legacy, salt)
+    assert not verify_password("secret", legacy)
+    assert needs_rehash(legacy, FAST_SCRYPT)
+
+
+def test_needs_rehash_on_other_scheme_or_parameters():
+    encoded = hash_password("secret", FAST_SCRYPT)[0]
+    assert needs_rehash(encoded, FAST_PBKDF2)
+    assert needs_rehash(encoded, HashPolicy(scrypt_n=2 ** 5))
+    assert needs_rehash(encoded, HashPolicy(scrypt_n=2 ** 4, dklen=64))
+
+
+@pytest.mark.parametrize("encoded", ["", "$scrypt$n=16$zz$00", "$bcrypt$i=1$00$00", "not hex"])
+def test_malformed_hashes_never_verify(encoded):
+    assert not verify_password("secret", encoded, None)
+
+
+def test_verify_dummy_always_fails():
+    assert verify_dummy("") is False
@@ -0,0 +1,57 @@
+import sqlite3
+
+import pytest
+
+from scripts.csv_import import import_catalog_csv
+from scripts.import_foods import FOOD_TABLE
+
+CSV = "name,calories_per_portion,carbs_per_portion,protein_per_portion,fat_per_portion\n" + "".join(
+    f"Food {i},{100 + i},10,5,2\n" for i in range(25))
+
+
+class Cancelled(Exception):
+    pass
+
+
+def _food_names(db_path):
+    conn = sqlite3.connect(db_path)
+    try:
+        return [row[0] for row in conn.execute("SELECT name FROM food WHERE name LIKE 'Food %'")]
+    finally:
+        conn.close()
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    path = tmp_path / "foods.csv"
+    path.write_text(CSV, encoding="utf-8")
+    return str(path)
+
+
+def test_import_reports_progress_before_the_commit(empty_db, csv_path):
+    calls = []
+
+    def progress(rows, fraction):
+        calls.append((rows, fraction, len(_food_names(empty_db))))
+
+    result = import_catalog_csv(csv_path, empty_db, FOOD_TABLE, batch_size=10, progress=progress)
+    assert result.inserted == 25 and not result.skipped
+    assert len(calls) == 4 and calls[-1][:2] == (25, 1.0)
+    # No call sees committed rows, so cancelling from any of them rolls back
+    assert all(committed == 0 for *_, committed in calls)
+    assert len(_food_names(empty_db)) == 25
+
+
+# Three batches of up to 10 rows, then the final call
+@pytest.mark.parametrize("cancel_at", [1, 4])
+def test_cancelling_from_progress_rolls_back(empty_db, csv_path, cancel_at):
+    calls = []
+
+    def progress(rows, fraction):
+        calls.append(rows)
+        if len(calls) == cancel_at:
+            raise Cancelled
+
+    with pytest.raises(Cancelled):
+        import_catalog_csv(csv_path, empty_db, FOOD_TABLE, batch_size=10, progress=progress)
+    assert _food_names(empty_db) == []
@@ -0,0 +1,90 @@
+import sqlite3
+from datetime import date, timedelta
+
+import pytest
+
+from repositories.nutrition_repository import _DAILY_SQL
+from repositories.rollup_repository import _PERIOD_TOTALS_SQL, period_start_sql
+from services.activity_service import ActivityService
+from services.food_service import FoodService
+from services.recurrence import HISTORY_DAYS
+
+
+def _days_ago(days: int) -> str:
+    return (date.today() - timedelta(days=days)).isoformat()
+
+
+def test_totals_of_every_shipped_user(migrated_db):
+    conn = sqlite3.connect(migrated_db)
+    user_ids = [row[0] for row in conn.execute('SELECT user_id FROM "user"')]
+    conn.close()
+    food, activity = FoodService(migrated_db), ActivityService(migrated_db)
+    for user_id in user_ids:
+        for totals in (food.get_daily_food_totals(user_id, "2000-01-01"),
+                       activity.get_daily_activity_totals(user_id, "2000-01-01")):
+            dates = [item['date'][:10] for item in totals]
+            assert dates == sorted(dates, reverse=True)
+
+
+def test_logs_without_a_day_are_left_out(empty_db, user_id):
+    food, activity = FoodService(empty_db), ActivityService(empty_db)
+    food.log_food(user_id, "Oats|f1", 200.0, _days_ago(1))
+    activity.log_activity(user_id, "Walking|a1", 1000, _days_ago(1))
+    # A malformed date written before the date triggers existed
+    conn = sqlite3.connect(empty_db)
+    with conn:
+        conn.execute("DROP TRIGGER trg_foodlog_date_insert")
+        conn.execute("DROP TRIGGER trg_activitylog_date_insert")
+        conn.execute("INSERT INTO foodlog (log_id, user_key, food_key, date, portion_size_g) "
+                     "SELECT 'bad', user_key, 1, '2026-1-5', 100 FROM \"user\"")
+        conn.execute("INSERT INTO activitylog (log_id, user_key, activity_key, date, activity_count) "
+                     "SELECT 'bad', user_key, 1, '2026-1-5', 1000 FROM \"user\"")
+    conn.close()
+
+    [day] = food.get_daily_nutrition(user_id)
+    assert day.date == _days_ago(1)
+    assert day.kcal == pytest.approx(200.0) and day.food_entries == 1
+    assert day.burned == pytest.approx(500.0) and day.net_kcal == pytest.approx(-300.0)
+
+
+def test_totals_follow_the_statistics_rows(empty_db, user_id):
+    food, activity = FoodService(empty_db), ActivityService(empty_db)
+    log = food.log_food(user_id, "Oats|f1", 200.0, _days_ago(2))
+    activity.log_activity(user_id, "Walking|a1", 1000, _days_ago(1))
+    food.update_food_log(log['log_id'], 300.0, _days_ago(1))
+
+    [day] = food.get_daily_food_totals(user_id)
+    assert day['date'] == _days_ago(1) and day['entries'] == 1
+    assert day['total_kcal'] == pytest.approx(300.0) and day['carbs'] == pytest.approx(30.0)
+    assert day['burned'] == pytest.approx(500.0) and day['net_kcal'] == pytest.approx(-200.0)
+    assert activity.get_daily_activity_totals(user_id) == [
+        {'date': _days_ago(1), 'total_kcal_burned': "500.0", 'entries': 1, 'category': 'past'}]
+
+
+def test_totals_are_read_for_the_history_window(empty_db, user_id):
+    food, activity = FoodService(empty_db), ActivityService(empty_db)
+    for days in (HISTORY_DAYS + 10, 3):
+        food.log_food(user_id, "Oats|f1", 100.0, _days_ago(days))
+        activity.log_activity(user_id, "Walking|a1", 1000, _days_ago(days))
+
+    assert [item['date'] for item in food.get_daily_food_totals(user_id)] == [_days_ago(3)]
+    assert [item['date'] for item in activity.get_daily_activity_totals(user_id)] == [_days_ago(3)]
+    everything = _days_ago(HISTORY_DAYS + 10)
+    assert len(food.get_daily_food_totals(user_id, everything)) == 2
+    assert len(activity.get_daily_activity_totals(user_id, everything)) == 2
+
+
+@pytest.mark.parametrize("sql", [
+    _DAILY_SQL, _PERIOD_TOTALS_SQL.replace("{bucket}", period_start_sql('month', 'day')),
+])
+def test_day_sums_are_read_from_the_covering_indexes(migrated_db, sql):
+    day_range = " AND {alias}.date BETWEEN :first_date AND :last_date"
+    sql = sql.format(food_range=day_range.format(alias='fl'), activity_range=day_range.format(alias='al'))
+    conn = sqlite3.connect(migrated_db)
+    try:
+        plan = [row[-1] for row in conn.execute(
+            "EXPLAIN QUERY PLAN " + sql, {'user_id': "-", 'first_date': "2024-01-01", 'last_date': "2024-12-31"})]
+    finally:
+        conn.close()
+    assert any("COVERING INDEX idx_foodlog_user_date " in step for step in plan)
+    assert any("COVERING INDEX idx_activitylog_user_date " in step for step in plan)
@@ -0,0 +1,18 @@
+import pytest
+
+from ui.formatting import activity_header, goal_header, grams
+
+SUMMARY = {'weight': 82.5, 'target': 75.0, 'kcal_min': 1800, 'kcal_max': 2200, 'activity_level': 'moderate'}
+
+
+@pytest.mark.parametrize("value, text", [
+    (150.0, "150"), (12.5, "12.5"), (0.126, "0.13"), (1234567, "1234567"), (2000.25, "2000.25"), (0, "0"),
+])
+def test_grams(value, text):
+    assert grams(value) == text
+    assert float(text) == pytest.approx(value, abs=0.005)
+
+
+def test_user_info_headers():
+    assert goal_header(SUMMARY) == "Weight: 82.5kg | Target: 75.0kg | Daily Goal: 1800-2200 kcal"
+    assert activity_header(SUMMARY) == "Weight: 82.5kg | Activity Level: moderate | Target: 75.0kg"
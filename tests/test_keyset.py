@@ -0,0 +1,44 @@
+from types import SimpleNamespace
+
+import pytest
+
+from repositories.keyset import iter_keyset, keyset_clause, row_key, select_list
+
+ALLOWED = {'date': 'fl.date', 'log_id': 'fl.log_id', 'name': 'f.name'}
+
+
+def test_select_list_adds_key_columns():
+    assert select_list(['name'], ALLOWED, ('date', 'log_id')) == \
+        "f.name AS name, fl.date AS date, fl.log_id AS log_id"
+    assert select_list(None, ALLOWED, ('date',)) == "fl.date AS date, fl.log_id AS log_id, f.name AS name"
+
+
+def test_select_list_rejects_unknown_columns():
+    with pytest.raises(ValueError):
+        select_list(['name', 'password_hash'], ALLOWED, ('date',))
+
+
+def test_keyset_clause():
+    assert keyset_clause(['fl.date', 'fl.log_id'], descending=True) == \
+        ("(fl.date, fl.log_id) < (?, ?)", "fl.date DESC, fl.log_id DESC")
+    assert keyset_clause(['day']) == ("(day) > (?)", "day")
+
+
+def test_row_key_of_dicts_and_records():
+    assert row_key({'date': "2024-01-01", 'log_id': "a", 'name': "x"}, ('date', 'log_id')) == ("2024-01-01", "a")
+    assert row_key(SimpleNamespace(date="2024-01-01", log_id="a"), ('date', 'log_id')) == ("2024-01-01", "a")
+
+
+@pytest.mark.parametrize("rows, page_size, pages", [(7, 3, 3), (6, 3, 3), (0, 3, 1), (2, 3, 1)])
+def test_iter_keyset_pages(rows, page_size, pages):
+    data = [{'n': n} for n in range(rows)]
+    calls = []
+
+    def fetch_page(after, limit):
+        calls.append(after)
+        start = 0 if after is None else after[0] + 1
+        return data[start:start + limit]
+
+    assert list(iter_keyset(fetch_page, ('n',), page_size)) == data
+    assert len(calls) == pages
+    assert calls[0] is None
@@ -0,0 +1,86 @@
+import sqlite3
+from datetime import date
+
+import pytest
+
+from repositories.day_numbers import epoch_day, from_epoch_day, normalize_date
+from services.activity_service import ActivityService
+from services.food_service import FoodService
+from services.weightlog_service import WeightLogService
+
+
+def test_epoch_days():
+    assert epoch_day("1970-01-01") == 0
+    assert epoch_day(date(2024, 1, 1)) == 19723
+    assert from_epoch_day(19723) == "2024-01-01"
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("2026-1-5", "2026-01-05"),
+    ("2025-12-010", "2025-12-10"),
+    (" 2024-02-29 ", "2024-02-29"),
+    (date(2024, 3, 1), "2024-03-01"),
+])
+def test_normalize_date(value, expected):
+    assert normalize_date(value) == expected
+
+
+@pytest.mark.parametrize("value", ["", "2024-02-30", "2024/01/01", "1.1.2024", "2024-01", "2024-01-01T10:00"])
+def test_normalize_date_rejects(value):
+    with pytest.raises(ValueError):
+        normalize_date(value)
+
+
+def _dates(db_path, table):
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute(f"SELECT date, day FROM {table} ORDER BY date").fetchall()
+    finally:
+        conn.close()
+
+
+def test_food_log_dates_are_normalized(empty_db, user_id):
+    food = FoodService(empty_db)
+    log = food.log_food(user_id, "Oats|f1", 100.0, "2026-1-5")
+    food.log_meal(user_id, "2026-1-6", [("f1", 50.0)])
+    assert _dates(empty_db, 'foodlog') == [("2026-01-05", epoch_day("2026-01-05")),
+                                           ("2026-01-06", epoch_day("2026-01-06"))]
+
+    food.update_food_log(log['log_id'], 120.0, "2026-2-1")
+    assert _dates(empty_db, 'foodlog')[-1] == ("2026-02-01", epoch_day("2026-02-01"))
+    with pytest.raises(ValueError):
+        food.update_food_log(log['log_id'], 120.0, "2026-02-30")
+    with pytest.raises(ValueError):
+        food.log_food(user_id, "Oats|f1", 100.0, "5.1.2026")
+
+
+def test_activity_log_dates_are_normalized(empty_db, user_id):
+    activity = ActivityService(empty_db)
+    log = activity.log_activity(user_id, "Walking|a1", 1000, "2026-1-5")
+    activity.update_activity_log(log['log_id'], 2000, "2026-1-7")
+    assert _dates(empty_db, 'activitylog') == [("2026-01-07", epoch_day("2026-01-07"))]
+    with pytest.raises(ValueError):
+        activity.log_activity(user_id, "Walking|a1", 1000, "2026-13-01")
+
+
+def test_weight_log_dates_are_normalized(empty_db, user_id):
+    weight = WeightLogService(empty_db)
+    assert weight.log_weight(user_id, "2024-1-5", 80.0)['success']
+    assert not weight.log_weight(user_id, "2024-1-32", 80.0)['success']
+    assert _dates(empty_db, 'weightlog') == [("2024-01-05", epoch_day("2024-01-05"))]
+
+
+@pytest.mark.parametrize("statement", [
+    "INSERT INTO foodlog (log_id, user_key, food_key, date, portion_size_g) "
+    "SELECT 'x', user_key, 1, '2026-1-5', 100 FROM \"user\"",
+    "UPDATE foodlog SET date = '2025-12-010'",
+    "INSERT INTO weightlog (log_id, user_id, date, weight) SELECT 'w', user_id, '2026-02-30', 80 FROM \"user\"",
+])
+def test_malformed_dates_are_rejected_in_the_database(empty_db, user_id, statement):
+    FoodService(empty_db).log_food(user_id, "Oats|f1", 100.0, "2026-01-05")
+    conn = sqlite3.connect(empty_db)
+    try:
+        with pytest.raises(sqlite3.IntegrityError):
+            conn.execute(statement)
+    finally:
+        conn.close()
@@ -0,0 +1,80 @@
+import importlib
+import sqlite3
+
+import pytest
+
+from create_db import create_db
+from migrations import add_log_indexes
+from migrations.run_migrations import MIGRATIONS, get_schema_version, run_migrations
+from services.food_service import FoodService
+
+LATEST = MIGRATIONS[-1][0]
+
+
+def _scalar(db_path, sql):
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute(sql).fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_shipped_db_migrates_step_by_step(shipped_db):
+    # Each migration's own check runs against the schema it produced
+    for version, module_name in MIGRATIONS:
+        if version <= get_schema_version(shipped_db):
+            continue
+        assert run_migrations(shipped_db, target=version) == 1
+        assert get_schema_version(shipped_db) == version
+        importlib.import_module(f"migrations.{module_name}").verify_migration(shipped_db)
+
+
+def test_shipped_db_keeps_logs_of_existing_users(shipped_db):
+    kept = {
+        table: _scalar(shipped_db, f'SELECT COUNT(*) FROM {table} t JOIN "user" u ON u.user_id = t.user_id')
+        for table in ('foodlog', 'activitylog', 'weightlog')
+    }
+
+    run_migrations(shipped_db)
+
+    assert get_schema_version(shipped_db) == LATEST
+    for table, count in kept.items():
+        assert _scalar(shipped_db, f"SELECT COUNT(*) FROM {table}") == count
+
+
+def test_log_index_plans_hold_on_the_current_schema(migrated_db):
+    # Version 7 rebuilt the log tables with integer keys
+    add_log_indexes.verify_migration(migrated_db)
+
+
+def test_migrations_run_once(migrated_db):
+    assert run_migrations(migrated_db) == 0
+    assert get_schema_version(migrated_db) == LATEST
+
+
+def test_new_installation_is_at_latest_version(empty_db):
+    assert get_schema_version(empty_db) == LATEST
+    for name in ('rollup', 'planned_log', 'food_fts'):
+        assert _scalar(empty_db, f"SELECT COUNT(*) FROM sqlite_master WHERE name = '{name}'") == 1
+
+
+def test_created_database_with_test_data_is_usable(tmp_path):
+    path = str(tmp_path / "new.db")
+    create_db(path)
+    assert get_schema_version(path) == LATEST
+    user_id = _scalar(path, "SELECT user_id FROM \"user\" WHERE username = 'user'")
+    food = FoodService(path)
+    food.log_food(user_id, f"Apple|{food.get_all_foods()[0]['food_id']}", 150.0, "2024-01-01")
+    [day] = food.get_daily_nutrition(user_id)
+    assert day.kcal == pytest.approx(78.0)
+
+
+def test_malformed_log_dates_are_repaired(shipped_db):
+    # The shipped database has foodlog rows dated '2025-12-010'
+    assert _scalar(shipped_db, "SELECT COUNT(*) FROM foodlog WHERE date = '2025-12-010'") > 0
+
+    run_migrations(shipped_db)
+
+    for table in ('foodlog', 'activitylog', 'weightlog'):
+        assert _scalar(shipped_db, f"SELECT COUNT(*) FROM {table} WHERE day IS NULL") == 0
+    assert _scalar(shipped_db, "SELECT COUNT(*) FROM foodlog WHERE date = '2025-12-10'") >= 2
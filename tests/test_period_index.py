@@ -0,0 +1,34 @@
+from services.period_index import PeriodIndex
+
+PERIODS = [
+    {'period_name': "Low carb", 'start_date': "2024-01-10", 'end_date': "2024-01-20"},
+    {'period_name': "16:8", 'start_date': "2024-01-05", 'end_date': "2024-01-12"},
+    {'period_name': "Ongoing", 'start_date': "2024-01-15", 'end_date': None},
+]
+
+
+def test_dates_outside_all_periods():
+    result = PeriodIndex(PERIODS).annotate(["2024-01-01", "2024-01-04"])
+    assert result == {"2024-01-01": ([], []), "2024-01-04": ([], [])}
+
+
+def test_overlapping_periods_keep_input_order():
+    names, markers = PeriodIndex(PERIODS).annotate(["2024-01-12"])["2024-01-12"]
+    assert names == ["Low carb", "16:8"]
+    assert markers == ["⏹ END: 16:8"]
+
+
+def test_start_and_end_markers():
+    result = PeriodIndex(PERIODS).annotate(["2024-01-20", "2024-01-10", "2024-01-15"])
+    assert result["2024-01-10"][1] == ["▶ START: Low carb"]
+    assert result["2024-01-15"] == (["Low carb", "Ongoing"], ["▶ START: Ongoing"])
+    assert result["2024-01-20"] == (["Low carb", "Ongoing"], ["⏹ END: Low carb"])
+
+
+def test_open_period_never_ends():
+    result = PeriodIndex(PERIODS).annotate(["2030-01-01", "2030-01-01"])
+    assert result == {"2030-01-01": (["Ongoing"], [])}
+
+
+def test_no_periods():
+    assert PeriodIndex([]).annotate(["2024-01-01"]) == {"2024-01-01": ([], [])}
@@ -0,0 +1,29 @@
+import pytest
+
+from services.dietary_period_service import DietaryPeriodService
+from services.weightlog_service import WeightLogService
+
+
+def _period_summary(db_path, user_id, weigh_ins):
+    weights = WeightLogService(db_path)
+    for day, weight in weigh_ins:
+        assert weights.log_weight(user_id, day, weight)['success']
+    periods = DietaryPeriodService(db_path)
+    created = periods.create_period(user_id, "2024-01-08", "Week", end_date="2024-01-14")
+    return periods.get_period_summary(created['period']['period_id'])
+
+
+def test_weekly_change_is_measured_between_the_weigh_ins(empty_db, user_id):
+    # Nearest weigh-ins a week before the start and a week after the end
+    summary = _period_summary(empty_db, user_id, [("2024-01-01", 80.0), ("2024-01-21", 78.0)])
+    assert summary['duration_days'] == 7
+    change = summary['weight_change']
+    assert (change['start_date'], change['end_date']) == ("2024-01-01", "2024-01-21")
+    assert change['change'] == pytest.approx(-2.0)
+    assert change['change_per_week'] == pytest.approx(-2.0 / 20 * 7)
+
+
+def test_one_weigh_in_has_no_weekly_change(empty_db, user_id):
+    change = _period_summary(empty_db, user_id, [("2024-01-10", 80.0)])['weight_change']
+    assert change['change'] == 0.0
+    assert change['change_per_week'] is None
@@ -0,0 +1,78 @@
+import pytest
+
+from services.recurrence import Recurrence, for_weeks, horizon, plan_occurrences, planned_day_totals
+
+# 2024-01-01 is a Monday
+
+
+def test_weekdays_until_sunday():
+    rule = Recurrence.parse("FREQ=WEEKLY;BYDAY=MO,TU,WE,TH,FR;UNTIL=20240107", "2024-01-01")
+    assert list(rule.occurrences()) == ["2024-01-01", "2024-01-02", "2024-01-03", "2024-01-04", "2024-01-05"]
+
+
+def test_daily_interval_and_count():
+    rule = Recurrence.parse("FREQ=DAILY;INTERVAL=2;COUNT=3", "2024-01-01")
+    assert list(rule.occurrences()) == ["2024-01-01", "2024-01-03", "2024-01-05"]
+    assert rule.last_date() == "2024-01-05"
+
+
+def test_weekly_defaults_to_start_weekday():
+    rule = Recurrence.parse("FREQ=WEEKLY;COUNT=3", "2024-01-03")
+    assert list(rule.occurrences()) == ["2024-01-03", "2024-01-10", "2024-01-17"]
+
+
+def test_occurrences_between_after_and_through():
+    rule = Recurrence.parse("FREQ=DAILY", "2024-01-01")
+    assert list(rule.occurrences(after="2024-01-03", through="2024-01-06")) == \
+        ["2024-01-04", "2024-01-05", "2024-01-06"]
+    assert rule.last_date() is None
+
+
+def test_count_is_numbered_from_the_start():
+    rule = Recurrence.parse("FREQ=DAILY;COUNT=3", "2024-01-01")
+    assert list(rule.occurrences(after="2024-01-01")) == ["2024-01-02", "2024-01-03"]
+
+
+def test_rule_round_trip():
+    rule = Recurrence.parse("rrule:freq=weekly;interval=2;byday=fr,mo;until=2024-03-01", "2024-01-01")
+    assert rule.rule == "FREQ=WEEKLY;INTERVAL=2;BYDAY=MO,FR;UNTIL=20240301"
+    assert Recurrence.parse(rule.rule, "2024-01-01") == rule
+
+
+@pytest.mark.parametrize("text", [
+    "FREQ=HOURLY",
+    "BYDAY=MO",
+    "FREQ=WEEKLY;BYDAY=XX",
+    "FREQ=DAILY;UNTIL=20240301;COUNT=2",
+    "FREQ=DAILY;UNTIL=2024",
+    "FREQ=DAILY;BYSETPOS=1",
+    "FREQ=DAILY;COUNT=0",
+    "FREQ=DAILY;UNTIL=20231231",
+    # every 7th day from a Monday never falls on a Tuesday
+    "FREQ=DAILY;INTERVAL=7;BYDAY=TU",
+])
+def test_invalid_rules(text):
+    with pytest.raises(ValueError):
+        Recurrence.parse(text, "2024-01-01")
+
+
+def test_plan_occurrences_skip_materialized_days():
+    plan = {'rule': "FREQ=DAILY", 'start_date': "2024-01-01", 'materialized_through': "2024-01-02"}
+    assert list(plan_occurrences(plan, "2024-01-04")) == ["2024-01-03", "2024-01-04"]
+
+
+def test_planned_day_totals():
+    plans = [
+        {'rule': "FREQ=DAILY", 'start_date': "2024-01-01", 'materialized_through': None, 'kcal': 100.0},
+        {'rule': "FREQ=DAILY;INTERVAL=2", 'start_date': "2024-01-01", 'materialized_through': None, 'kcal': 50.0},
+    ]
+    totals = planned_day_totals(plans, "2024-01-03", lambda plan: plan['kcal'])
+    assert totals == {"2024-01-01": (150.0, 2), "2024-01-02": (100.0, 1), "2024-01-03": (150.0, 2)}
+
+
+def test_for_weeks_and_horizon():
+    from datetime import date
+    assert for_weeks("FREQ=DAILY", "2024-01-01", 2) == "FREQ=DAILY;UNTIL=20240114"
+    with pytest.raises(ValueError):
+        for_weeks("FREQ=DAILY", "2024-01-01", 0)
+    assert horizon(date(2024, 1, 1), days=14) == "2024-01-15"
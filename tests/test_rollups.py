@@ -0,0 +1,111 @@
+import sqlite3
+import uuid
+from datetime import date, timedelta
+
+import pytest
+
+from repositories.day_numbers import epoch_day, from_epoch_day
+from repositories.rollup_repository import (
+    GRANULARITIES, period_end, period_label, period_start, period_start_sql, periods_between,
+)
+from services.report_service import ReportService
+
+# 2024-01-03 is a Wednesday
+WEDNESDAY = epoch_day("2024-01-03")
+
+
+@pytest.mark.parametrize("granularity, first, last", [
+    ('week', "2023-12-31", "2024-01-06"),
+    ('iso_week', "2024-01-01", "2024-01-07"),
+    ('month', "2024-01-01", "2024-01-31"),
+])
+def test_period_of_a_day(granularity, first, last):
+    start = period_start(granularity, WEDNESDAY)
+    assert from_epoch_day(start) == first
+    assert from_epoch_day(period_end(granularity, start)) == last
+
+
+@pytest.mark.parametrize("day, last", [("2024-02-10", "2024-02-29"), ("2023-02-10", "2023-02-28"),
+                                       ("2023-12-31", "2023-12-31")])
+def test_month_ends(day, last):
+    assert from_epoch_day(period_end('month', period_start('month', epoch_day(day)))) == last
+
+
+@pytest.mark.parametrize("granularity, day, label", [
+    ('week', "2024-01-03", "2023-12-31"),
+    ('iso_week', "2024-12-30", "2025-W01"),
+    ('iso_week', "2021-01-03", "2020-W53"),
+    ('month', "2024-02-29", "2024-02"),
+])
+def test_period_labels(granularity, day, label):
+    assert period_label(granularity, period_start(granularity, epoch_day(day))) == label
+
+
+def test_periods_between_cover_the_range_without_gaps():
+    periods = periods_between('month', epoch_day("2024-01-15"), epoch_day("2024-04-01"))
+    assert [period_label('month', first) for first, _ in periods] == ["2024-01", "2024-02", "2024-03", "2024-04"]
+    for (_, end), (start, _) in zip(periods, periods[1:]):
+        assert start == end + 1
+
+
+def test_unknown_granularity():
+    with pytest.raises(ValueError):
+        period_start('day', WEDNESDAY)
+    with pytest.raises(ValueError):
+        period_start_sql('fortnight', 'day')
+
+
+@pytest.mark.parametrize("granularity", GRANULARITIES)
+def test_sql_period_start_matches_python(granularity):
+    days = list(range(epoch_day("2023-12-01"), epoch_day("2025-03-01")))
+    conn = sqlite3.connect(":memory:")
+    try:
+        sql = f"SELECT {period_start_sql(granularity, 'day')} FROM (SELECT ? AS day)"
+        assert [conn.execute(sql, (day,)).fetchone()[0] for day in days] == \
+            [period_start(granularity, day) for day in days]
+    finally:
+        conn.close()
+
+
+def _log_food(conn, user_id, day: str, grams: float):
+    conn.execute("""
+        INSERT INTO foodlog (log_id, user_key, food_key, date, portion_size_g)
+        SELECT ?, u.user_key, f.food_key, ?, ? FROM "user" u, food f
+        WHERE u.user_id = ? AND f.food_id = 'f1'
+    """, (str(uuid.uuid4()), day, grams, user_id))
+
+
+def test_report_totals_cache_and_invalidation(empty_db, user_id):
+    conn = sqlite3.connect(empty_db)
+    first = date(2024, 1, 1)
+    for i in range(21):
+        _log_food(conn, user_id, (first + timedelta(days=i)).isoformat(), 200.0)
+    conn.execute("INSERT INTO weightlog (log_id, user_id, date, weight) VALUES ('w1', ?, '2024-01-02', 80.0)",
+                 (user_id,))
+    conn.execute("INSERT INTO weightlog (log_id, user_id, date, weight) VALUES ('w2', ?, '2024-01-06', 79.2)",
+                 (user_id,))
+    conn.commit()
+
+    reports = ReportService(empty_db)
+    weeks = reports.get_rollups(user_id, 'iso_week')
+    assert [week.period for week in weeks] == ["2024-W03", "2024-W02", "2024-W01"]
+    oldest = weeks[-1]
+    assert oldest.days_logged == 7 and oldest.kcal == pytest.approx(1400.0)
+    assert oldest.carbs == pytest.approx(140.0) and oldest.avg_kcal == pytest.approx(200.0)
+    assert oldest.days_on_target == 7 and oldest.adherence_pct == pytest.approx(100.0)
+    assert oldest.weigh_ins == 2 and oldest.weight_change == pytest.approx(-0.8)
+    assert weeks[0].weight_change is None
+
+    cached = lambda: conn.execute(
+        "SELECT granularity, period FROM rollup WHERE user_id = ? ORDER BY 1, 2", (user_id,)).fetchall()
+    reports.get_rollups(user_id, 'month')
+    assert len(cached()) == 4
+
+    # Only the periods containing the new log's day are recomputed
+    _log_food(conn, user_id, "2024-01-09", 100.0)
+    conn.commit()
+    assert cached() == [('iso_week', "2024-W01"), ('iso_week', "2024-W03")]
+    week = reports.get_weekly_summary(user_id, "2024-01-09")
+    assert week.period == "2024-W02" and week.kcal == pytest.approx(1500.0) and week.food_entries == 8
+    assert reports.get_rollups(user_id, 'month')[0].kcal == pytest.approx(4300.0)
+    conn.close()
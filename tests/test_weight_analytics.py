@@ -0,0 +1,63 @@
+from datetime import date, timedelta
+
+import pytest
+
+from services.weight_analytics import analyze_weights
+
+
+def _series(start: str, weights):
+    first = date.fromisoformat(start)
+    return [((first + timedelta(days=i)).isoformat(), w) for i, w in enumerate(weights)]
+
+
+def test_trend_weights_gaps_by_days():
+    trend = analyze_weights([("2024-01-01", 100.0), ("2024-01-03", 90.0)], smoothing=0.1)
+    # Two days of 10% each: 1 - 0.9 ** 2 of the difference
+    assert list(trend.trend) == pytest.approx([100.0, 98.1])
+
+
+def test_rolling_means_use_calendar_days():
+    trend = analyze_weights([("2024-01-01", 80.0), ("2024-01-05", 82.0), ("2024-01-11", 84.0)])
+    assert list(trend.mean_7) == pytest.approx([80.0, 81.0, 83.0])
+    assert list(trend.mean_30) == pytest.approx([80.0, 81.0, 82.0])
+
+
+def test_slope_covers_only_the_regression_window():
+    # 60 days up by 0.2 kg/day, then 30 days down by 0.1 kg/day
+    weights = [70.0 + 0.2 * i for i in range(60)] + [82.0 - 0.1 * i for i in range(30)]
+    trend = analyze_weights(_series("2024-01-01", weights), regression_days=30)
+    assert trend.slope_kg_per_week == pytest.approx(-0.7)
+
+
+def test_goal_date_projection():
+    weights = [90.0 - 0.1 * i for i in range(30)]
+    trend = analyze_weights(_series("2024-01-01", weights), goal_weight=80.0)
+    last = date.fromisoformat(trend.dates[-1])
+    assert date.fromisoformat(trend.goal_date) > last
+    remaining_days = (date.fromisoformat(trend.goal_date) - last).days
+    assert remaining_days == pytest.approx((trend.current_trend - 80.0) / 0.1, abs=1)
+
+
+def test_goal_moving_away_or_reached():
+    weights = [90.0 - 0.1 * i for i in range(30)]
+    assert analyze_weights(_series("2024-01-01", weights), goal_weight=95.0).goal_date is None
+    flat = analyze_weights(_series("2024-01-01", [80.0] * 10), goal_weight=80.0)
+    assert flat.slope_kg_per_week == pytest.approx(0.0)
+    assert flat.goal_date == flat.dates[-1]
+
+
+def test_single_entry_has_no_slope():
+    trend = analyze_weights([("2024-01-01", 80.0)], goal_weight=70.0)
+    assert trend.slope_kg_per_week is None and trend.goal_date is None
+    assert trend.current_trend == 80.0
+
+
+def test_since_and_change_over():
+    trend = analyze_weights(_series("2024-01-01", [80.0, 79.5, 79.0, 78.0]))
+    assert trend.since("2024-01-03").dates == ["2024-01-03", "2024-01-04"]
+    # Like WeightLogService.calculate_weight_change: from days_back + 1 days ago
+    change = trend.change_over(2, today=date(2024, 1, 4))
+    assert change['start_date'] == "2024-01-01"
+    assert change['start_weight'] == 80.0 and change['current_weight'] == 78.0
+    assert change['trend'] == 'losing'
+    assert trend.change_over(7, today=date(2024, 3, 1)) is None